@@ -0,0 +1,152 @@
+"""full-text and trigram search on contacts
+
+Revision ID: d4e5f6a7b8c9
+Revises: b3c4d5e6f7a8
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, Sequence[str], None] = 'b3c4d5e6f7a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Names, contact method values, address cities and tag names of one contact
+SEARCH_TEXT_FUNCTION = """
+CREATE FUNCTION contact_search_text(
+    cid uuid, first_name text, last_name text, nickname text
+) RETURNS text LANGUAGE sql STABLE AS $$
+    SELECT concat_ws(' ', first_name, last_name, nickname,
+        (SELECT string_agg(m.value, ' ') FROM contact_methods m
+         WHERE m.contact_id = cid AND m.deleted_at IS NULL),
+        (SELECT string_agg(a.city, ' ') FROM addresses a
+         WHERE a.contact_id = cid AND a.deleted_at IS NULL),
+        (SELECT string_agg(t.name, ' ') FROM contact_tags ct
+         JOIN tags t ON t.id = ct.tag_id
+         WHERE ct.contact_id = cid AND t.deleted_at IS NULL))
+$$
+"""
+
+# Recompute on the contact row itself when its names change
+CONTACT_TRIGGER_FUNCTION = """
+CREATE FUNCTION contacts_search_text_row() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_text := contact_search_text(
+        NEW.id, NEW.first_name, NEW.last_name, NEW.nickname
+    );
+    RETURN NEW;
+END
+$$
+"""
+
+# Recompute the owning contact(s) when a method, address or tag link changes
+CHILD_TRIGGER_FUNCTION = """
+CREATE FUNCTION contacts_search_text_child() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE contacts
+        SET search_text = contact_search_text(id, first_name, last_name, nickname)
+        WHERE id = OLD.contact_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE contacts
+        SET search_text = contact_search_text(id, first_name, last_name, nickname)
+        WHERE id = NEW.contact_id;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+# Recompute every tagged contact when a tag is renamed or deleted
+TAG_TRIGGER_FUNCTION = """
+CREATE FUNCTION contacts_search_text_tag() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE contacts
+    SET search_text = contact_search_text(id, first_name, last_name, nickname)
+    WHERE id IN (SELECT contact_id FROM contact_tags WHERE tag_id = NEW.id);
+    RETURN NULL;
+END
+$$
+"""
+
+CHILD_TABLES = ('contact_methods', 'addresses', 'contact_tags')
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    op.add_column('contacts', sa.Column('search_text', sa.Text(), nullable=True))
+    op.add_column(
+        'contacts',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple', coalesce(search_text, ''))", persisted=True
+            ),
+        ),
+    )
+
+    op.execute(SEARCH_TEXT_FUNCTION)
+    op.execute(CONTACT_TRIGGER_FUNCTION)
+    op.execute(CHILD_TRIGGER_FUNCTION)
+    op.execute(TAG_TRIGGER_FUNCTION)
+    op.execute(
+        'CREATE TRIGGER contacts_search_text BEFORE INSERT OR UPDATE OF '
+        'first_name, last_name, nickname ON contacts '
+        'FOR EACH ROW EXECUTE FUNCTION contacts_search_text_row()'
+    )
+    for table in CHILD_TABLES:
+        op.execute(
+            f'CREATE TRIGGER {table}_search_text AFTER INSERT OR UPDATE OR DELETE '
+            f'ON {table} FOR EACH ROW EXECUTE FUNCTION contacts_search_text_child()'
+        )
+    op.execute(
+        'CREATE TRIGGER tags_search_text AFTER UPDATE OF name, deleted_at ON tags '
+        'FOR EACH ROW EXECUTE FUNCTION contacts_search_text_tag()'
+    )
+
+    op.execute(
+        'UPDATE contacts SET search_text = '
+        'contact_search_text(id, first_name, last_name, nickname)'
+    )
+
+    op.create_index(
+        'ix_contacts_search_vector',
+        'contacts',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_contacts_search_text_trgm',
+        'contacts',
+        ['search_text'],
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_search_text_trgm', table_name='contacts')
+    op.drop_index('ix_contacts_search_vector', table_name='contacts')
+
+    op.execute('DROP TRIGGER tags_search_text ON tags')
+    for table in CHILD_TABLES:
+        op.execute(f'DROP TRIGGER {table}_search_text ON {table}')
+    op.execute('DROP TRIGGER contacts_search_text ON contacts')
+    op.execute('DROP FUNCTION contacts_search_text_tag()')
+    op.execute('DROP FUNCTION contacts_search_text_child()')
+    op.execute('DROP FUNCTION contacts_search_text_row()')
+    op.execute('DROP FUNCTION contact_search_text(uuid, text, text, text)')
+
+    op.drop_column('contacts', 'search_vector')
+    op.drop_column('contacts', 'search_text')
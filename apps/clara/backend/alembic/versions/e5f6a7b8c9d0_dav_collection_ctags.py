@@ -0,0 +1,30 @@
+"""ctags of synced DAV collections
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, Sequence[str], None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('dav_sync_accounts', sa.Column('ctag_card', sa.String(length=500), nullable=True))
+    op.add_column('dav_sync_accounts', sa.Column('ctag_cal', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('dav_sync_accounts', 'ctag_cal')
+    op.drop_column('dav_sync_accounts', 'ctag_card')
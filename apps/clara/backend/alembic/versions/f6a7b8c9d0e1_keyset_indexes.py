@@ -0,0 +1,50 @@
+"""indexes for keyset pagination of vault lists
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, Sequence[str], None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Sort key of each list, with the row id that breaks ties; a list page is
+# a range scan of (vault_id, key, id) over live rows, read backwards for
+# newest first
+KEYSET_INDEXES = {
+    'contacts': 'created_at',
+    'notes': 'created_at',
+    'files': 'created_at',
+    'tasks': 'created_at',
+    'gifts': 'created_at',
+    'debts': 'created_at',
+    'templates': 'created_at',
+    'custom_field_definitions': 'created_at',
+    'journal_entries': 'entry_date',
+    'activities': 'happened_at',
+}
+
+
+def upgrade() -> None:
+    for table, key in KEYSET_INDEXES.items():
+        op.create_index(
+            f'ix_{table}_vault_id_{key}_id',
+            table,
+            ['vault_id', key, 'id'],
+            postgresql_where=sa.text('deleted_at IS NULL'),
+        )
+
+
+def downgrade() -> None:
+    for table, key in reversed(KEYSET_INDEXES.items()):
+        op.drop_index(f'ix_{table}_vault_id_{key}_id', table_name=table)
@@ -19,7 +19,7 @@ from clara.activities.schemas import (
     ParticipantRead,
 )
 from clara.activities.service import ActivityService, ActivityTypeService
-from clara.base.schema import PaginatedResponse, PaginationMeta
+from clara.base.schema import PaginatedResponse
 from clara.deps import Db, VaultAccess
 from clara.pagination import PaginationParams
 
@@ -58,13 +58,14 @@ async def list_activity_types(
     svc: TypeSvc, pagination: PaginationParams = Depends()
 ) -> PaginatedResponse[ActivityTypeRead]:
     items, total = await svc.list_types(
-        offset=pagination.offset, limit=pagination.limit
+        offset=pagination.offset,
+        limit=pagination.fetch_limit,
+        after=pagination.after,
+        count=pagination.count,
     )
     return PaginatedResponse(
-        items=[ActivityTypeRead.model_validate(t) for t in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[ActivityTypeRead.model_validate(t) for t in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
@@ -97,13 +98,15 @@ async def list_activities(
     q: str | None = None,
 ) -> PaginatedResponse[ActivityRead]:
     items, total = await svc.list_activities(
-        offset=pagination.offset, limit=pagination.limit, q=q
+        offset=pagination.offset,
+        limit=pagination.fetch_limit,
+        q=q,
+        after=pagination.after,
+        count=pagination.count,
     )
     return PaginatedResponse(
-        items=[ActivityRead.model_validate(a) for a in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[ActivityRead.model_validate(a) for a in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
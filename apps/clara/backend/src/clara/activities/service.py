@@ -14,6 +14,7 @@ from clara.activities.schemas import (
     ActivityUpdate,
     ParticipantInput,
 )
+from clara.base.repository import CountMode, Keyset
 from clara.exceptions import NotFoundError
 
 
@@ -22,9 +23,16 @@ class ActivityTypeService:
         self.repo = repo
 
     async def list_types(
-        self, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[ActivityType], int]:
-        return await self.repo.list(offset=offset, limit=limit)
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[ActivityType], int | None]:
+        return await self.repo.list(
+            offset=offset, limit=limit, after=after, count=count
+        )
 
     async def get_type(self, type_id: uuid.UUID) -> ActivityType:
         t = await self.repo.get_by_id(type_id)
@@ -56,9 +64,17 @@ class ActivityService:
         self.participant_repo = participant_repo
 
     async def list_activities(
-        self, *, offset: int = 0, limit: int = 50, q: str | None = None
-    ) -> tuple[Sequence[Activity], int]:
-        return await self.repo.list(offset=offset, limit=limit, q=q)
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        q: str | None = None,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Activity], int | None]:
+        return await self.repo.list(
+            offset=offset, limit=limit, q=q, after=after, count=count
+        )
 
     async def list_by_contact(
         self,
@@ -66,9 +82,11 @@ class ActivityService:
         *,
         offset: int = 0,
         limit: int = 50,
-    ) -> tuple[Sequence[Activity], int]:
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Activity], int | None]:
         return await self.repo.list_by_contact(
-            contact_id, offset=offset, limit=limit
+            contact_id, offset=offset, limit=limit, after=after, count=count
         )
 
     async def get_activity(self, activity_id: uuid.UUID) -> Activity:
@@ -4,14 +4,21 @@ import logging
 import secrets
 import string
 import uuid
-from datetime import UTC, datetime
 from typing import Annotated
 
 import pyotp
 import qrcode
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+)
 from sqlalchemy import delete, select
 
+from clara.auth.cache import revoke_jwt
 from clara.auth.models import PersonalAccessToken, RecoveryCode, TotpDevice, User
 from clara.auth.schemas import (
     AuthResponse,
@@ -46,7 +53,7 @@ from clara.auth.service import AuthService
 from clara.config import get_settings
 from clara.deps import CurrentUser, Db
 from clara.middleware import generate_csrf_token
-from clara.redis import blacklist_token, get_async_redis
+from clara.redis import evict_pat, get_async_redis
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -220,9 +227,7 @@ async def logout(request: Request, response: Response) -> dict[str, bool]:
     if access_token:
         payload = decode_access_token(access_token)
         if payload and payload.get("jti"):
-            exp = payload.get("exp", 0)
-            ttl = int(exp - datetime.now(UTC).timestamp())
-            await blacklist_token(payload["jti"], ttl)
+            await revoke_jwt(payload["jti"], payload.get("exp", 0))
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
     return {"ok": True}
@@ -480,9 +485,13 @@ async def create_token(body: PatCreate, user: CurrentUser, db: Db) -> PatCreateR
 
 
 @router.delete("/tokens/{token_id}", status_code=204)
-async def revoke_token(token_id: uuid.UUID, user: CurrentUser, db: Db) -> None:
+async def revoke_token(
+    token_id: uuid.UUID, user: CurrentUser, db: Db, background: BackgroundTasks
+) -> None:
     pat = await db.get(PersonalAccessToken, token_id)
     if pat is None or pat.user_id != user.id:
         raise HTTPException(status_code=404, detail="Token not found")
     await db.delete(pat)
     await db.flush()
+    # After commit; a cached token whose row is gone is rejected anyway
+    background.add_task(evict_pat, str(token_id))
@@ -0,0 +1,194 @@
+"""Per-process cache of authentication results.
+
+An authenticated vault request would otherwise check the token blacklist,
+load the user and load the vault membership before doing any work. The cache
+remembers, for `auth_cache_ttl_seconds`, that an access token belongs to an
+active user and which role a user holds in a vault. It also keeps a full copy
+of the JWT blacklist, seeded from Redis on subscribing, so revocation checks
+stay in memory.
+
+Changes that take access away are published on a Redis channel, and every API
+process drops the affected entries when it receives them. The cache only
+serves entries while its process is subscribed to that channel, so a lost
+subscription cannot leave stale grants in place; revocation checks then go to
+Redis. A quiet channel is pinged every `HEALTH_CHECK_SECONDS`, and a ping that
+goes unanswered, or a message the cache does not understand, drops the
+subscription and reseeds on the next one.
+"""
+
+import asyncio
+import time
+import uuid
+
+import structlog
+
+from clara.config import get_settings
+from clara.redis import (
+    AUTH_INVALIDATION_CHANNEL,
+    blacklist_token,
+    blacklisted_tokens,
+    get_async_redis,
+    is_token_blacklisted,
+    publish_auth_invalidation,
+)
+
+logger = structlog.get_logger()
+
+MAX_ENTRIES = 10_000
+HEALTH_CHECK_SECONDS = 30
+
+
+class AuthCache:
+    def __init__(self) -> None:
+        self.enabled = False
+        self._tokens: dict[str, tuple[float, uuid.UUID]] = {}
+        self._roles: dict[tuple[uuid.UUID, uuid.UUID], tuple[float, str]] = {}
+        # Blacklisted JWT IDs and their expiry (unix time)
+        self._revoked: dict[str, float] = {}
+        self._prune_revoked_at = 1000
+
+    def get_user_id(self, token_key: str) -> uuid.UUID | None:
+        return self._get(self._tokens, token_key)
+
+    def set_user_id(self, token_key: str, user_id: uuid.UUID) -> None:
+        self._set(self._tokens, token_key, user_id)
+
+    def get_role(self, user_id: uuid.UUID, vault_id: uuid.UUID) -> str | None:
+        return self._get(self._roles, (user_id, vault_id))
+
+    def set_role(self, user_id: uuid.UUID, vault_id: uuid.UUID, role: str) -> None:
+        self._set(self._roles, (user_id, vault_id), role)
+
+    def is_revoked(self, jti: str) -> bool | None:
+        """Whether a JWT ID is blacklisted, or None when only Redis can tell."""
+        if not self.enabled:
+            return None
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        self._tokens.pop(jti, None)
+        self._revoked[jti] = expires_at
+        if len(self._revoked) >= self._prune_revoked_at:
+            now = time.time()
+            self._revoked = {k: v for k, v in self._revoked.items() if v > now}
+            self._prune_revoked_at = max(1000, 2 * len(self._revoked))
+
+    def apply(self, message: str) -> None:
+        """Drop the entries an invalidation message names.
+
+        Raises ValueError for a message it cannot apply; the listener then
+        resubscribes rather than serve entries the message may have revoked.
+        """
+        kind, _, ident = message.partition(":")
+        if kind == "token":
+            jti, _, expires_at = ident.partition(":")
+            self.revoke(jti, float(expires_at))
+        elif kind == "user":
+            user_id = uuid.UUID(ident)
+            self._tokens = {
+                k: v for k, v in self._tokens.items() if v[1] != user_id
+            }
+            self._roles = {k: v for k, v in self._roles.items() if k[0] != user_id}
+        elif kind == "member":
+            member_id, _, member_vault = ident.partition(":")
+            self._roles.pop((uuid.UUID(member_id), uuid.UUID(member_vault)), None)
+        elif kind == "vault":
+            vault_id = uuid.UUID(ident)
+            self._roles = {
+                k: v for k, v in self._roles.items() if k[1] != vault_id
+            }
+        else:
+            raise ValueError(f"unknown auth invalidation: {message!r}")
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._roles.clear()
+        self._revoked.clear()
+
+    def _get[K, V](self, entries: dict[K, tuple[float, V]], key: K) -> V | None:
+        if not self.enabled:
+            return None
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del entries[key]
+            return None
+        return value
+
+    def _set[K, V](self, entries: dict[K, tuple[float, V]], key: K, value: V) -> None:
+        ttl = get_settings().auth_cache_ttl_seconds
+        if not self.enabled or ttl <= 0:
+            return
+        if len(entries) >= MAX_ENTRIES:
+            entries.pop(next(iter(entries)))
+        entries[key] = (time.monotonic() + ttl, value)
+
+
+auth_cache = AuthCache()
+
+
+async def _invalidate(message: str) -> None:
+    auth_cache.apply(message)
+    await publish_auth_invalidation(message)
+
+
+async def revoke_jwt(jti: str, expires_at: float) -> None:
+    """Blacklist a JWT ID until expires_at (unix time), here and everywhere."""
+    auth_cache.revoke(jti, expires_at)
+    await blacklist_token(jti, int(expires_at - time.time()))
+
+
+async def is_token_revoked(jti: str) -> bool:
+    revoked = auth_cache.is_revoked(jti)
+    if revoked is None:
+        return await is_token_blacklisted(jti)
+    return revoked
+
+
+async def invalidate_user(user_id: uuid.UUID) -> None:
+    """Call after deactivating a user."""
+    await _invalidate(f"user:{user_id}")
+
+
+async def invalidate_membership(user_id: uuid.UUID, vault_id: uuid.UUID) -> None:
+    await _invalidate(f"member:{user_id}:{vault_id}")
+
+
+async def invalidate_vault(vault_id: uuid.UUID) -> None:
+    await _invalidate(f"vault:{vault_id}")
+
+
+async def listen_for_invalidations() -> None:
+    """Apply published invalidations; runs for the lifetime of the app."""
+    while True:
+        pubsub = get_async_redis().pubsub()
+        try:
+            await pubsub.subscribe(AUTH_INVALIDATION_CHANNEL)
+            # Anything published while unsubscribed was missed. Revocations
+            # published from here on queue up and are applied after the seed.
+            auth_cache.clear()
+            for jti, expires_at in (await blacklisted_tokens()).items():
+                auth_cache.revoke(jti, expires_at)
+            auth_cache.enabled = True
+            pinged = False
+            while True:
+                message = await pubsub.get_message(timeout=HEALTH_CHECK_SECONDS)
+                if message is None:
+                    if pinged:
+                        raise ConnectionError("auth invalidation ping unanswered")
+                    await pubsub.ping()
+                    pinged = True
+                    continue
+                pinged = False
+                if message["type"] == "message":
+                    auth_cache.apply(message["data"].decode())
+        except Exception:
+            logger.warning("auth_cache_subscription_lost", exc_info=True)
+        finally:
+            auth_cache.enabled = False
+            auth_cache.clear()
+            await pubsub.aclose()  # type: ignore[no-untyped-call]
+        await asyncio.sleep(1)
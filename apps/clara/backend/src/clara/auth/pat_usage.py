@@ -0,0 +1,92 @@
+"""Write-behind for PersonalAccessToken.last_used_at.
+
+Writing the timestamp on every PAT request turned read-only scripted calls
+into write transactions contending for the token's row. Uses are recorded in
+memory instead, and each API process writes what it has collected every
+`pat_last_used_precision_seconds` in one batched UPDATE, so last_used_at is
+at most that far behind.
+"""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from typing import cast
+
+import structlog
+from sqlalchemy import Table, bindparam, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from clara.auth.models import PersonalAccessToken
+from clara.config import get_settings
+from clara.database import get_session
+
+logger = structlog.get_logger()
+
+
+class PatUsage:
+    def __init__(self) -> None:
+        self._pending: dict[uuid.UUID, datetime] = {}
+
+    def record(self, pat_id: uuid.UUID) -> None:
+        self._pending[pat_id] = datetime.now(UTC)
+
+    def take(self) -> dict[uuid.UUID, datetime]:
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, pending: dict[uuid.UUID, datetime]) -> None:
+        """Put back timestamps that failed to write, keeping newer ones."""
+        for pat_id, used_at in pending.items():
+            self._pending.setdefault(pat_id, used_at)
+
+
+pat_usage = PatUsage()
+
+
+async def write_last_used(
+    session: AsyncSession, pending: dict[uuid.UUID, datetime]
+) -> None:
+    if not pending:
+        return
+    # Core UPDATE: ORM bulk updates reject rows whose token was deleted
+    table = cast(Table, PersonalAccessToken.__table__)
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("pat_id"))
+        # Processes flush independently; never move the timestamp back
+        .where(
+            or_(
+                table.c.last_used_at.is_(None),
+                table.c.last_used_at < bindparam("used_at"),
+            )
+        )
+        .values(last_used_at=bindparam("used_at"))
+    )
+    await session.execute(
+        stmt,
+        [{"pat_id": pat_id, "used_at": used_at} for pat_id, used_at in pending.items()],
+    )
+
+
+async def flush_pat_usage() -> None:
+    pending = pat_usage.take()
+    if not pending:
+        return
+    try:
+        async with asynccontextmanager(get_session)() as session:
+            await write_last_used(session, pending)
+    except Exception:
+        pat_usage.restore(pending)
+        logger.warning("pat_usage_flush_failed", exc_info=True)
+
+
+async def write_pat_usage_periodically() -> None:
+    """Flush recorded PAT use; runs for the lifetime of the app."""
+    interval = get_settings().pat_last_used_precision_seconds
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            await flush_pat_usage()
+    finally:
+        await flush_pat_usage()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import base64
 import hashlib
+import hmac
 import uuid as uuid_mod
 from datetime import UTC, datetime, timedelta
 from typing import Any
@@ -36,6 +37,12 @@ def needs_rehash(hashed: str) -> bool:
     return not hashed.startswith("$argon2")
 
 
+def token_digest(token: str) -> str:
+    """Keyed HMAC of a presented token, for looking it up without storing it."""
+    key = get_settings().secret_key.get_secret_value().encode()
+    return hmac.new(key, token.encode(), hashlib.sha256).hexdigest()
+
+
 def create_access_token(
     subject: str, expires_delta: timedelta | None = None
 ) -> str:
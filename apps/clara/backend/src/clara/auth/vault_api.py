@@ -1,8 +1,9 @@
 import uuid
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from sqlalchemy import select
 
+from clara.auth.cache import invalidate_membership, invalidate_vault
 from clara.auth.models import User, Vault, VaultMembership, VaultSettings
 from clara.auth.schemas import (
     MemberInvite,
@@ -79,6 +80,7 @@ async def update_vault(
 async def delete_vault(
     vault_id: uuid.UUID,
     db: Db,
+    background: BackgroundTasks,
     _: VaultMembership = require_role("owner"),
 ) -> None:
     vault = await db.get(Vault, vault_id)
@@ -86,6 +88,8 @@ async def delete_vault(
         raise HTTPException(status_code=404, detail="Vault not found")
     await db.delete(vault)
     await db.flush()
+    # Background tasks run after the session commits
+    background.add_task(invalidate_vault, vault_id)
 
 
 # --- Member management ---
@@ -160,6 +164,7 @@ async def invite_member(
 async def update_member_role(
     vault_id: uuid.UUID,
     user_id: uuid.UUID,
+    background: BackgroundTasks,
     body: MemberUpdate,
     db: Db,
     _: VaultMembership = require_role("owner", "admin"),
@@ -185,6 +190,7 @@ async def update_member_role(
             raise HTTPException(status_code=400, detail="Cannot demote sole owner")
     membership.role = body.role
     await db.flush()
+    background.add_task(invalidate_membership, user_id, vault_id)
     user = await db.get(User, user_id)
     return MemberRead(
         user_id=user_id,
@@ -199,6 +205,7 @@ async def update_member_role(
 async def remove_member(
     vault_id: uuid.UUID,
     user_id: uuid.UUID,
+    background: BackgroundTasks,
     db: Db,
     _: VaultMembership = require_role("owner", "admin"),
 ) -> None:
@@ -223,6 +230,7 @@ async def remove_member(
             raise HTTPException(status_code=400, detail="Cannot remove sole owner")
     await db.delete(membership)
     await db.flush()
+    background.add_task(invalidate_membership, user_id, vault_id)
 
 
 # --- Vault settings ---
@@ -1,16 +1,72 @@
+import json
 import uuid
 from collections.abc import Sequence
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import Any, TypeVar
+from typing import Any, Literal, TypeVar
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import (
+    Column,
+    Result,
+    Select,
+    String,
+    and_,
+    false,
+    func,
+    literal,
+    or_,
+    select,
+    tuple_,
+    type_coerce,
+)
+from sqlalchemy.engine import FrozenResult
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.elements import ClauseElement, UnaryExpression
+from sqlalchemy.sql.expression import ColumnElement, Executable
 
 from clara.base.model import VaultScopedModel
-from clara.exceptions import NotFoundError
+from clara.exceptions import InvalidCursorError, NotFoundError
 
 ModelT = TypeVar("ModelT", bound=VaultScopedModel)
 
+# How list totals are computed: exact COUNT(*), planner estimate, or skipped
+CountMode = Literal["exact", "estimate", "none"]
+
+# Labels of the sort-key columns _paginate adds for keyset pagination
+KEYSET_LABEL = "keyset_"
+
+
+@dataclass
+class Keyset:
+    """Keyset position of one list request.
+
+    `values` are the sort-key values (row id last) of the row the page
+    starts behind, taken from the request's cursor; None on the first
+    page. `_execute_page` records the sort-key values of every fetched row
+    in `seen`, so the next cursor can point behind any of them.
+    """
+
+    values: tuple[Any, ...] | None = None
+    cursor: str | None = None
+    seen: list[tuple[Any, ...]] = field(default_factory=list)
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, run with its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
 
 class BaseRepository[ModelT: VaultScopedModel]:
     model: type[ModelT]
@@ -26,28 +82,110 @@ class BaseRepository[ModelT: VaultScopedModel]:
             .where(self.model.deleted_at.is_(None))
         )
 
+    def _is_postgres(self) -> bool:
+        return self.session.get_bind().dialect.name == "postgresql"
+
+    async def _count(self, stmt: Select[Any], count: CountMode) -> int | None:
+        """Number of rows stmt returns, or None when count is "none".
+
+        "estimate" reads the planner's row estimate (EXPLAIN) instead of
+        scanning the filtered set; it is exact off PostgreSQL.
+        """
+        if count == "none":
+            return None
+        if count == "estimate" and self._is_postgres():
+            return await self._estimate(stmt)
+        count_stmt = select(func.count()).select_from(
+            stmt.order_by(None).subquery()
+        )
+        total: int = (await self.session.execute(count_stmt)).scalar_one()
+        return total
+
+    async def _estimate(self, stmt: Select[Any]) -> int:
+        plan = (await self.session.execute(Explain(stmt))).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def _paginate(
+        self,
+        stmt: Select[Any],
+        *order_by: Any,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+    ) -> Select[Any]:
+        """Order stmt (default: newest first) and cut one page from it.
+
+        The row id breaks ties and NULL sort keys come last, so the order is
+        total. Given `after`, the sort-key values of each row are selected
+        too (run the statement with _execute_page), and if `after` holds the
+        values of the last row of the previous page, the page starts right
+        behind them (keyset) and offset is ignored.
+
+        Off PostgreSQL the values are the raw stored ones: SQLite sorts
+        timestamps as text, in whatever format each row was written with.
+        """
+        keys = [
+            (clause.element, clause.modifier is operators.desc_op)
+            if isinstance(clause, UnaryExpression)
+            and clause.modifier in (operators.desc_op, operators.asc_op)
+            else (clause, False)
+            for clause in order_by or (self.model.created_at.desc(),)
+        ]
+        keys.append((self.model.id, keys[0][1]))
+        stmt = stmt.order_by(*(_order(expr, desc) for expr, desc in keys))
+        if after is None:
+            return stmt.offset(offset).limit(limit)
+
+        raw = not self._is_postgres()
+        stmt = stmt.add_columns(*(
+            (type_coerce(expr, String) if raw else expr).label(f"{KEYSET_LABEL}{i}")
+            for i, (expr, _) in enumerate(keys)
+        ))
+        if after.values is None:
+            return stmt.offset(offset).limit(limit)
+        if len(after.values) != len(keys) or not (raw or all(
+            _fits(expr, value)
+            for (expr, _), value in zip(keys, after.values, strict=True)
+        )):
+            raise InvalidCursorError(after.cursor or "")
+        return stmt.where(_keyset_after(keys, after.values, raw)).limit(limit)
+
+    async def _execute_page(
+        self, stmt: Select[Any], after: Keyset | None
+    ) -> Result[Any]:
+        """Run a _paginate statement, recording the sort keys of its rows."""
+        result: Result[Any] = await self.session.execute(stmt)
+        if after is None:
+            return result
+        frozen: FrozenResult[Any] = result.freeze()
+        # Deduplicated like .unique(), so the keys line up with the items
+        after.seen = list(dict.fromkeys(
+            tuple(v for k, v in row.items() if k.startswith(KEYSET_LABEL))
+            for row in frozen().mappings()
+        ))
+        return frozen()
+
     async def get_by_id(self, id: uuid.UUID) -> ModelT | None:
         stmt = self._base_query().where(self.model.id == id)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
     async def list(
-        self, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[ModelT], int]:
-        count_stmt = (
-            select(func.count())
-            .select_from(self.model)
-            .where(self.model.vault_id == self.vault_id)
-            .where(self.model.deleted_at.is_(None))
-        )
-        total = (await self.session.execute(count_stmt)).scalar_one()
-        items_stmt = (
-            self._base_query()
-            .offset(offset)
-            .limit(limit)
-            .order_by(self.model.created_at.desc())
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[ModelT], int | None]:
+        base = self._base_query()
+        total = await self._count(base, count)
+        items_stmt = await self._paginate(
+            base, offset=offset, limit=limit, after=after
         )
-        result = await self.session.execute(items_stmt)
+        result = await self._execute_page(items_stmt, after)
         return result.scalars().all(), total
 
     async def filtered_list(
@@ -56,16 +194,21 @@ class BaseRepository[ModelT: VaultScopedModel]:
         order_by: Any = None,
         offset: int = 0,
         limit: int = 50,
-    ) -> tuple[Sequence[ModelT], int]:
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[ModelT], int | None]:
         base = self._base_query()
         for f in filters:
             base = base.where(f)
-        count_stmt = select(func.count()).select_from(base.subquery())
-        total: int = (await self.session.execute(count_stmt)).scalar_one()
-        items_stmt = base.order_by(
-            order_by if order_by is not None else self.model.created_at.desc()
-        ).offset(offset).limit(limit)
-        result = await self.session.execute(items_stmt)
+        total = await self._count(base, count)
+        items_stmt = await self._paginate(
+            base,
+            *(() if order_by is None else (order_by,)),
+            offset=offset,
+            limit=limit,
+            after=after,
+        )
+        result = await self._execute_page(items_stmt, after)
         return result.scalars().all(), total
 
     async def create(self, **kwargs: Any) -> ModelT:
@@ -91,3 +234,65 @@ class BaseRepository[ModelT: VaultScopedModel]:
             raise NotFoundError(self.model.__name__, id)
         obj.deleted_at = datetime.now(UTC)
         await self.session.flush()
+
+
+def _nullable(expr: Any) -> bool:
+    """Whether a sort key can be NULL; only table columns are known not to."""
+    column = getattr(expr, "expression", expr)
+    return not isinstance(column, Column) or bool(column.nullable)
+
+
+def _order(expr: Any, desc: bool) -> Any:
+    # Only nullable keys get NULLS LAST, so an index on the others serves
+    # the order in either direction
+    clause = expr.desc() if desc else expr.asc()
+    return clause.nulls_last() if _nullable(expr) else clause
+
+
+def _fits(expr: Any, value: Any) -> bool:
+    """Whether a cursor value can be compared with a sort key."""
+    if value is None:
+        return _nullable(expr)
+    try:
+        expected = expr.type.python_type
+    except NotImplementedError:
+        return True
+    return isinstance(value, expected) or (
+        expected is float and isinstance(value, int)
+    )
+
+
+def _keyset_after(
+    keys: Sequence[tuple[Any, bool]], values: Sequence[Any], raw: bool = False
+) -> ColumnElement[bool]:
+    """Rows ordered behind the row whose sort keys hold values.
+
+    A key and the non-null keys after it sorted the same way compare as one
+    row value, e.g. (created_at, id) < (:created_at, :id), which an index on
+    those columns serves as a range scan. NULLs sort last.
+    """
+    if not keys:
+        return false()
+    expr, desc = keys[0]
+    if values[0] is None:
+        # Only NULLs follow a NULL, in the order of the remaining keys
+        return and_(expr.is_(None), _keyset_after(keys[1:], values[1:], raw))
+    run = 1
+    while run < len(keys) and keys[run][1] == desc and not _nullable(keys[run][0]):
+        run += 1
+    exprs = [e for e, _ in keys[:run]]
+    bound = [
+        literal(v, String() if raw else e.type)
+        for e, v in zip(exprs, values, strict=False)
+    ]
+    left: Any = exprs[0] if run == 1 else tuple_(*exprs)
+    right: Any = bound[0] if run == 1 else tuple_(*bound)
+    clause: ColumnElement[bool] = left < right if desc else left > right
+    if run < len(keys):
+        clause = or_(
+            clause,
+            and_(left == right, _keyset_after(keys[run:], values[run:], raw)),
+        )
+    if _nullable(expr):
+        clause = or_(clause, expr.is_(None))
+    return clause
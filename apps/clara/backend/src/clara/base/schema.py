@@ -6,9 +6,11 @@ T = TypeVar("T")
 
 
 class PaginationMeta(BaseModel):
-    total: int
+    total: int | None
     offset: int
     limit: int
+    has_more: bool = False
+    next_cursor: str | None = None
 
 
 class PaginatedResponse[T](BaseModel):
@@ -25,6 +25,9 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 30
+    auth_cache_ttl_seconds: int = 30
+    pat_cache_ttl_seconds: int = 300
+    pat_last_used_precision_seconds: int = 60
     cookie_domain: str | None = None
     cookie_secure: bool = True
     cookie_httponly: bool = True
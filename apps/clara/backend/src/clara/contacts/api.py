@@ -1,14 +1,23 @@
 import uuid
 from datetime import date
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from clara.activities.repository import ActivityRepository
 from clara.activities.schemas import ActivityRead
-from clara.base.schema import PaginatedResponse, PaginationMeta
-from clara.contacts.repository import ContactRepository
-from clara.contacts.schemas import ContactCreate, ContactRead, ContactUpdate
+from clara.base.schema import PaginatedResponse
+from clara.contacts.includes import INCLUDE_LIMIT, INCLUDES, ContactIncludes
+from clara.contacts.repository import CONTACT_RELATIONS, ContactRepository
+from clara.contacts.schemas import (
+    SUMMARY_FIELDS,
+    SUMMARY_INCLUDE,
+    ContactCreate,
+    ContactDetail,
+    ContactFields,
+    ContactRead,
+    ContactUpdate,
+)
 from clara.contacts.service import ContactService
 from clara.deps import Db, VaultAccess
 from clara.pagination import PaginationParams
@@ -25,8 +34,52 @@ def get_contact_service(
 
 ContactSvc = Annotated[ContactService, Depends(get_contact_service)]
 
+CONTACT_COLUMNS = tuple(
+    name for name in ContactFields.model_fields if name not in CONTACT_RELATIONS
+)
+
+
+def _split_names(
+    value: str | None, default: tuple[str, ...], allowed: tuple[str, ...], kind: str
+) -> tuple[str, ...]:
+    if value is None:
+        return default
+    names = tuple(n.strip() for n in value.split(",") if n.strip())
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown contact {kind}: {', '.join(unknown)}"
+        )
+    return names
+
+
+def _parse_include(value: str) -> dict[str, int]:
+    """`notes,tasks:5` -> {"notes": INCLUDE_LIMIT, "tasks": 5}."""
+    include: dict[str, int] = {}
+    for entry in (e.strip() for e in value.split(",")):
+        if not entry:
+            continue
+        name, _, limit = entry.partition(":")
+        if name not in INCLUDES:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown contact include: {name}"
+            )
+        if not limit:
+            include[name] = INCLUDE_LIMIT
+        elif limit.isdigit() and 1 <= int(limit) <= 200:
+            include[name] = int(limit)
+        else:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid include limit: {entry}"
+            )
+    return include
+
 
-@router.get("", response_model=PaginatedResponse[ContactRead])
+@router.get(
+    "",
+    response_model=PaginatedResponse[ContactRead] | PaginatedResponse[ContactFields],
+    response_model_exclude_unset=True,
+)
 async def list_contacts(
     svc: ContactSvc,
     pagination: PaginationParams = Depends(),
@@ -35,15 +88,56 @@ async def list_contacts(
     favorites: bool | None = None,
     birthday_from: date | None = None,
     birthday_to: date | None = None,
-) -> PaginatedResponse[ContactRead]:
+    view: Literal["full", "summary"] = Query(
+        "full", description="summary: names, photo, favorite and tags only"
+    ),
+    fields: str | None = Query(
+        None, description="Comma-separated contact columns to return"
+    ),
+    include: str | None = Query(
+        None, description="Comma-separated relations to return"
+    ),
+) -> PaginatedResponse[ContactRead] | PaginatedResponse[ContactFields]:
     tag_ids = (
         [uuid.UUID(t.strip()) for t in tags.split(",") if t.strip()]
         if tags
         else None
     )
+    if view == "summary" or fields is not None or include is not None:
+        summary = view == "summary"
+        rows, total = await svc.list_contact_fields(
+            _split_names(
+                fields,
+                SUMMARY_FIELDS if summary else CONTACT_COLUMNS,
+                CONTACT_COLUMNS,
+                "fields",
+            ),
+            _split_names(
+                include,
+                SUMMARY_INCLUDE if summary else (),
+                tuple(CONTACT_RELATIONS),
+                "relations",
+            ),
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
+            q=q,
+            tag_ids=tag_ids,
+            favorites=favorites,
+            birthday_from=birthday_from,
+            birthday_to=birthday_to,
+        )
+        contacts = [ContactFields.model_validate(r) for r in rows]
+        return PaginatedResponse(
+            items=pagination.page(contacts), meta=pagination.meta(contacts, total)
+        )
+
     items, total = await svc.list_contacts(
         offset=pagination.offset,
-        limit=pagination.limit,
+        limit=pagination.fetch_limit,
+        after=pagination.after,
+        count=pagination.count,
         q=q,
         tag_ids=tag_ids,
         favorites=favorites,
@@ -51,16 +145,36 @@ async def list_contacts(
         birthday_to=birthday_to,
     )
     return PaginatedResponse(
-        items=[ContactRead.model_validate(c) for c in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[ContactRead.model_validate(c) for c in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
-@router.get("/{contact_id}", response_model=ContactRead)
-async def get_contact(contact_id: uuid.UUID, svc: ContactSvc) -> ContactRead:
-    return ContactRead.model_validate(await svc.get_contact(contact_id))
+@router.get(
+    "/{contact_id}",
+    response_model=ContactDetail,
+    response_model_exclude_unset=True,
+)
+async def get_contact(
+    vault_id: uuid.UUID,
+    contact_id: uuid.UUID,
+    db: Db,
+    svc: ContactSvc,
+    include: str | None = Query(
+        None,
+        description=(
+            "Comma-separated sub-resources to embed, each optionally with its "
+            f"own page size (name:limit, default {INCLUDE_LIMIT}): "
+            + ", ".join(INCLUDES)
+            + ". Only the first page of each is embedded, without "
+            "next_cursor; page on with the collection's own list endpoint."
+        ),
+    ),
+) -> ContactDetail:
+    requested = _parse_include(include) if include else {}
+    contact = ContactRead.model_validate(await svc.get_contact(contact_id))
+    loaded = await ContactIncludes(db, vault_id).load(contact_id, requested)
+    return ContactDetail(**contact.model_dump(), **loaded)
 
 
 @router.post("", response_model=ContactRead, status_code=201)
@@ -94,11 +208,13 @@ async def list_contact_activities(
 ) -> PaginatedResponse[ActivityRead]:
     repo = ActivityRepository(session=db, vault_id=vault_id)
     items, total = await repo.list_by_contact(
-        contact_id, offset=pagination.offset, limit=pagination.limit
+        contact_id,
+        offset=pagination.offset,
+        limit=pagination.fetch_limit,
+        after=pagination.after,
+        count=pagination.count,
     )
     return PaginatedResponse(
-        items=[ActivityRead.model_validate(a) for a in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[ActivityRead.model_validate(a) for a in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
@@ -0,0 +1,109 @@
+import uuid
+from collections.abc import Sequence
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from clara.activities.repository import ActivityRepository
+from clara.activities.schemas import ActivityRead
+from clara.base.schema import PaginatedResponse
+from clara.customization.models import CustomFieldValue
+from clara.customization.repository import CustomFieldValueRepository
+from clara.customization.schemas import CustomFieldValueRead
+from clara.files.models import FileLink
+from clara.files.repository import FileLinkRepository
+from clara.files.schemas import FileLinkRead
+from clara.finance.debt_repository import DebtRepository
+from clara.finance.debt_schemas import DebtRead
+from clara.finance.gift_repository import GiftRepository
+from clara.finance.gift_schemas import GiftRead
+from clara.notes.repository import NoteRepository
+from clara.notes.schemas import NoteRead
+from clara.pagination import PaginationParams
+from clara.reminders.repository import ReminderRepository, StayInTouchRepository
+from clara.reminders.schemas import ReminderRead, StayInTouchRead
+from clara.tasks.repository import TaskRepository
+from clara.tasks.schemas import TaskRead
+
+# Page size of an included collection when `include=` names no limit
+INCLUDE_LIMIT = 10
+
+# Collections read through their repository's list_by_contact
+BY_CONTACT: dict[str, tuple[type[Any], type[BaseModel]]] = {
+    "activities": (ActivityRepository, ActivityRead),
+    "tasks": (TaskRepository, TaskRead),
+    "notes": (NoteRepository, NoteRead),
+    "reminders": (ReminderRepository, ReminderRead),
+    "gifts": (GiftRepository, GiftRead),
+    "debts": (DebtRepository, DebtRead),
+}
+
+INCLUDES = (*BY_CONTACT, "custom_fields", "files", "stay_in_touch")
+
+
+class ContactIncludes:
+    """Sub-resources of one contact for `GET /contacts/{id}?include=`.
+
+    Everything is read on the request's session, so the page costs one
+    authentication and one transaction. Each collection is one page query
+    plus its count, bounded by its own limit.
+
+    An included collection is only its first page and carries no
+    next_cursor; when has_more is set, the rest is paged on the
+    collection's own list endpoint (e.g. `/notes?contact_id=`).
+    """
+
+    def __init__(self, session: AsyncSession, vault_id: uuid.UUID) -> None:
+        self.session = session
+        self.vault_id = vault_id
+
+    async def load(
+        self, contact_id: uuid.UUID, include: dict[str, int]
+    ) -> dict[str, Any]:
+        """The included sub-resources by name; include maps names to limits."""
+        loaded: dict[str, Any] = {}
+        for name, limit in include.items():
+            if name == "stay_in_touch":
+                repo = StayInTouchRepository(self.session, self.vault_id)
+                config = await repo.get_by_contact(contact_id)
+                loaded[name] = (
+                    StayInTouchRead.model_validate(config) if config else None
+                )
+                continue
+            page = PaginationParams(offset=0, limit=limit, cursor=None, count="exact")
+            items, total = await self._fetch(name, contact_id, page.fetch_limit)
+            schema = CustomFieldValueRead if name == "custom_fields" else (
+                FileLinkRead if name == "files" else BY_CONTACT[name][1]
+            )
+            loaded[name] = PaginatedResponse(
+                items=[schema.model_validate(i) for i in page.page(items)],
+                meta=page.meta(items, total),
+            )
+        return loaded
+
+    async def _fetch(
+        self, name: str, contact_id: uuid.UUID, limit: int
+    ) -> tuple[Sequence[Any], int | None]:
+        if name == "custom_fields":
+            return await CustomFieldValueRepository(
+                self.session, self.vault_id
+            ).filtered_list(
+                CustomFieldValue.entity_type == "contact",
+                CustomFieldValue.entity_id == contact_id,
+                limit=limit,
+            )
+        if name == "files":
+            return await FileLinkRepository(
+                self.session, self.vault_id
+            ).filtered_list(
+                FileLink.target_type == "contact",
+                FileLink.target_id == contact_id,
+                limit=limit,
+            )
+        repo_class, _ = BY_CONTACT[name]
+        repo = repo_class(self.session, self.vault_id)
+        result: tuple[Sequence[Any], int | None] = await repo.list_by_contact(
+            contact_id, limit=limit
+        )
+        return result
@@ -51,6 +51,10 @@ class Contact(VaultScopedModel):
     template_id: Mapped[uuid.UUID | None] = mapped_column(
         Uuid, ForeignKey("templates.id"), nullable=True
     )
+    # PostgreSQL also has `search_text` (names, method values, address cities
+    # and tag names, kept current by triggers) and the generated tsvector
+    # `search_vector`, both indexed for search. They are left unmapped; see
+    # ContactRepository._search_match.
 
     contact_methods: Mapped[list["ContactMethod"]] = relationship(
         back_populates="contact", cascade="all, delete-orphan"
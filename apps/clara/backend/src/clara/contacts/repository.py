@@ -1,12 +1,25 @@
 import uuid
+from collections import defaultdict
 from collections.abc import Sequence
 from datetime import date
-from typing import Any
+from typing import Any, cast
 
-from sqlalchemy import Select, func, or_, select
+from sqlalchemy import (
+    Float,
+    Select,
+    Text,
+    exists,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.expression import ColumnElement
 
-from clara.base.repository import BaseRepository
+from clara.base.repository import KEYSET_LABEL, BaseRepository, CountMode, Keyset
 from clara.contacts.models import (
     Address,
     Contact,
@@ -18,6 +31,22 @@ from clara.contacts.models import (
     contact_tags,
 )
 
+# Text search configuration: names and handles, so no stemming or stop words
+SEARCH_CONFIG = "simple"
+
+# PostgreSQL-only columns maintained by the database (see the migration)
+search_text = literal_column("contacts.search_text", Text)
+search_vector = literal_column("contacts.search_vector", TSVECTOR)
+
+# Contact relations list_projected can load, with the models holding them
+CONTACT_RELATIONS: dict[str, type[Any]] = {
+    "contact_methods": ContactMethod,
+    "addresses": Address,
+    "tags": Tag,
+    "pets": Pet,
+    "relationships": ContactRelationship,
+}
+
 
 class ContactRepository(BaseRepository[Contact]):
     model = Contact
@@ -42,18 +71,15 @@ class ContactRepository(BaseRepository[Contact]):
         birthday_to: date | None = None,
     ) -> Select[Any]:
         if q:
-            pattern = f"%{q}%"
+            stmt = stmt.where(self._search_match(q))
+        if tag_ids:
             stmt = stmt.where(
-                or_(
-                    Contact.first_name.ilike(pattern),
-                    Contact.last_name.ilike(pattern),
-                    Contact.nickname.ilike(pattern),
+                Contact.id.in_(
+                    select(contact_tags.c.contact_id).where(
+                        contact_tags.c.tag_id.in_(tag_ids)
+                    )
                 )
             )
-        if tag_ids:
-            stmt = stmt.join(
-                contact_tags, contact_tags.c.contact_id == Contact.id
-            ).where(contact_tags.c.tag_id.in_(tag_ids))
         if favorites is not None:
             stmt = stmt.where(Contact.favorite.is_(favorites))
         if birthday_from is not None:
@@ -62,6 +88,49 @@ class ContactRepository(BaseRepository[Contact]):
             stmt = stmt.where(Contact.birthdate <= birthday_to)
         return stmt
 
+    def _search_match(self, q: str) -> ColumnElement[bool]:
+        """Contacts whose names, method values, cities or tags match q.
+
+        On PostgreSQL this is a full-text match on `search_vector` (GIN) or a
+        substring / fuzzy trigram match on `search_text` (pg_trgm GIN). Other
+        databases fall back to substring matches on the same fields.
+        """
+        if self._is_postgres():
+            return or_(
+                search_vector.op("@@")(func.websearch_to_tsquery(SEARCH_CONFIG, q)),
+                search_text.icontains(q, autoescape=True),
+                literal(q).op("<%")(search_text),
+            )
+        return or_(
+            Contact.first_name.icontains(q, autoescape=True),
+            Contact.last_name.icontains(q, autoescape=True),
+            Contact.nickname.icontains(q, autoescape=True),
+            exists().where(
+                ContactMethod.contact_id == Contact.id,
+                ContactMethod.deleted_at.is_(None),
+                ContactMethod.value.icontains(q, autoescape=True),
+            ),
+            exists().where(
+                Address.contact_id == Contact.id,
+                Address.deleted_at.is_(None),
+                Address.city.icontains(q, autoescape=True),
+            ),
+            exists().where(
+                contact_tags.c.contact_id == Contact.id,
+                Tag.id == contact_tags.c.tag_id,
+                Tag.deleted_at.is_(None),
+                Tag.name.icontains(q, autoescape=True),
+            ),
+        )
+
+    def _search_rank(self, q: str) -> ColumnElement[float]:
+        """Relevance of a search match, higher first (constant off PostgreSQL)."""
+        if self._is_postgres():
+            return func.ts_rank_cd(
+                search_vector, func.websearch_to_tsquery(SEARCH_CONFIG, q)
+            ) + func.word_similarity(q, search_text)
+        return literal(0.0, Float)
+
     async def list_filtered(
         self,
         *,
@@ -72,35 +141,144 @@ class ContactRepository(BaseRepository[Contact]):
         favorites: bool | None = None,
         birthday_from: date | None = None,
         birthday_to: date | None = None,
-    ) -> tuple[Sequence[Contact], int]:
-        count_stmt = self._apply_filters(
-            select(func.count(func.distinct(self.model.id)))
-            .select_from(self.model)
-            .where(self.model.vault_id == self.vault_id)
-            .where(self.model.deleted_at.is_(None)),
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Contact], int | None]:
+        items_stmt = self._apply_filters(
+            self._base_query(),
             q=q, tag_ids=tag_ids, favorites=favorites,
             birthday_from=birthday_from, birthday_to=birthday_to,
         )
-        total: int = (await self.session.execute(count_stmt)).scalar_one()
+        total = await self._count(items_stmt, count)
+        items_stmt = await self._paginate(
+            items_stmt,
+            *self._list_order(q),
+            offset=offset,
+            limit=limit,
+            after=after,
+        )
+        result = await self._execute_page(items_stmt, after)
+        return result.scalars().all(), total
+
+    async def list_projected(
+        self,
+        fields: Sequence[str],
+        include: Sequence[str] = (),
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        q: str | None = None,
+        tag_ids: list[uuid.UUID] | None = None,
+        favorites: bool | None = None,
+        birthday_from: date | None = None,
+        birthday_to: date | None = None,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """list_filtered as plain dicts of the given columns and relations.
+
+        Columns are selected directly and each included relation (see
+        CONTACT_RELATIONS) is one query over the page's contact ids, so no
+        ORM objects are built. `id` is always returned.
+        """
+        columns = Contact.__table__.c
         items_stmt = self._apply_filters(
-            self._base_query(),
+            select(*(columns[f] for f in dict.fromkeys(["id", *fields])))
+            .where(Contact.vault_id == self.vault_id)
+            .where(Contact.deleted_at.is_(None)),
             q=q, tag_ids=tag_ids, favorites=favorites,
             birthday_from=birthday_from, birthday_to=birthday_to,
         )
-        if tag_ids:
-            items_stmt = items_stmt.distinct()
-        items_stmt = (
-            items_stmt.offset(offset)
-            .limit(limit)
-            .order_by(Contact.created_at.desc())
+        total = await self._count(items_stmt, count)
+        items_stmt = await self._paginate(
+            items_stmt,
+            *self._list_order(q),
+            offset=offset,
+            limit=limit,
+            after=after,
         )
-        result = await self.session.execute(items_stmt)
-        return result.scalars().all(), total
+        result = await self._execute_page(items_stmt, after)
+        rows = [
+            {k: v for k, v in row.items() if not k.startswith(KEYSET_LABEL)}
+            for row in result.mappings()
+        ]
+        ids = [row["id"] for row in rows]
+        for name in include:
+            related = await self._load_related(name, ids) if ids else {}
+            for row in rows:
+                row[name] = related.get(row["id"], [])
+        return rows, total
+
+    def _list_order(self, q: str | None) -> list[Any]:
+        if q:
+            return [self._search_rank(q).desc(), Contact.created_at.desc()]
+        return [Contact.created_at.desc()]
+
+    async def _load_related(
+        self, name: str, contact_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, list[dict[str, Any]]]:
+        """Live rows of one relation as dicts, grouped by contact id."""
+        model = CONTACT_RELATIONS[name]
+        if model is Tag:
+            owner = contact_tags.c.contact_id
+            stmt = select(owner.label("owner_id"), *Tag.__table__.c).join_from(
+                contact_tags, Tag.__table__, contact_tags.c.tag_id == Tag.id
+            )
+        else:
+            owner = model.contact_id
+            stmt = select(owner.label("owner_id"), *model.__table__.c)
+        stmt = stmt.where(owner.in_(contact_ids)).where(model.deleted_at.is_(None))
+        grouped: dict[uuid.UUID, list[dict[str, Any]]] = defaultdict(list)
+        for row in (await self.session.execute(stmt)).mappings():
+            item = dict(row)
+            grouped[item.pop("owner_id")].append(item)
+        return grouped
 
     async def search(
-        self, query: str, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Contact], int]:
-        return await self.list_filtered(q=query, offset=offset, limit=limit)
+        self,
+        query: str,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Contact], int | None]:
+        return await self.list_filtered(
+            q=query, offset=offset, limit=limit, after=after, count=count
+        )
+
+    async def search_ranked(
+        self,
+        query: str,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[list[tuple[Contact, float]], int | None]:
+        """Matching contacts with their rank, best first, without relationships."""
+        match = self._search_match(query)
+        total = await self._count(self._base_query().where(match), count)
+        rank = self._search_rank(query)
+        ranked = (
+            select(Contact, rank.label("rank"))
+            .where(Contact.vault_id == self.vault_id)
+            .where(Contact.deleted_at.is_(None))
+            .where(match)
+        )
+        items_stmt = await self._paginate(
+            # Two-column select; _paginate only adds ordering and limits
+            cast("Select[Any]", ranked),
+            rank.desc(),
+            Contact.created_at.desc(),
+            offset=offset,
+            limit=limit,
+            after=after,
+        )
+        result = await self._execute_page(items_stmt, after)
+        return [
+            (contact, float(score)) for contact, score, *_keys in result.all()
+        ], total
 
 
 class ContactMethodRepository(BaseRepository[ContactMethod]):
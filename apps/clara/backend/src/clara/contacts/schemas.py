@@ -3,6 +3,8 @@ from datetime import date, datetime
 
 from pydantic import BaseModel, ConfigDict
 
+from clara.activities.schemas import ActivityRead
+from clara.base.schema import PaginatedResponse
 from clara.contacts.sub_schemas import (
     AddressRead,
     ContactMethodRead,
@@ -10,6 +12,13 @@ from clara.contacts.sub_schemas import (
     PetRead,
     TagRead,
 )
+from clara.customization.schemas import CustomFieldValueRead
+from clara.files.schemas import FileLinkRead
+from clara.finance.debt_schemas import DebtRead
+from clara.finance.gift_schemas import GiftRead
+from clara.notes.schemas import NoteRead
+from clara.reminders.schemas import ReminderRead, StayInTouchRead
+from clara.tasks.schemas import TaskRead
 
 
 class ContactRead(BaseModel):
@@ -35,6 +44,56 @@ class ContactRead(BaseModel):
     updated_at: datetime
 
 
+class ContactDetail(ContactRead):
+    """A contact with the sub-resources asked for with `include`."""
+
+    activities: PaginatedResponse[ActivityRead] | None = None
+    tasks: PaginatedResponse[TaskRead] | None = None
+    notes: PaginatedResponse[NoteRead] | None = None
+    reminders: PaginatedResponse[ReminderRead] | None = None
+    gifts: PaginatedResponse[GiftRead] | None = None
+    debts: PaginatedResponse[DebtRead] | None = None
+    custom_fields: PaginatedResponse[CustomFieldValueRead] | None = None
+    files: PaginatedResponse[FileLinkRead] | None = None
+    stay_in_touch: StayInTouchRead | None = None
+
+
+class ContactFields(BaseModel):
+    """A contact reduced to the fields asked for with `fields` / `include`."""
+
+    id: uuid.UUID
+    vault_id: uuid.UUID | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+    nickname: str | None = None
+    birthdate: date | None = None
+    gender: str | None = None
+    pronouns: str | None = None
+    notes_summary: str | None = None
+    favorite: bool | None = None
+    photo_file_id: uuid.UUID | None = None
+    template_id: uuid.UUID | None = None
+    contact_methods: list[ContactMethodRead] | None = None
+    addresses: list[AddressRead] | None = None
+    tags: list[TagRead] | None = None
+    pets: list[PetRead] | None = None
+    relationships: list[ContactRelationshipRead] | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+
+# What a list row needs: name, avatar and tags (`view=summary`)
+SUMMARY_FIELDS = (
+    "vault_id",
+    "first_name",
+    "last_name",
+    "nickname",
+    "photo_file_id",
+    "favorite",
+)
+SUMMARY_INCLUDE = ("tags",)
+
+
 class ContactCreate(BaseModel):
     first_name: str
     last_name: str = ""
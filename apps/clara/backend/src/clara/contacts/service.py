@@ -1,7 +1,9 @@
 import uuid
 from collections.abc import Sequence
 from datetime import date
+from typing import Any
 
+from clara.base.repository import CountMode, Keyset
 from clara.contacts.models import Contact
 from clara.contacts.repository import ContactRepository
 from clara.contacts.schemas import ContactCreate, ContactUpdate
@@ -22,11 +24,35 @@ class ContactService:
         favorites: bool | None = None,
         birthday_from: date | None = None,
         birthday_to: date | None = None,
-    ) -> tuple[Sequence[Contact], int]:
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Contact], int | None]:
         return await self.repo.list_filtered(
             offset=offset, limit=limit, q=q, tag_ids=tag_ids,
             favorites=favorites, birthday_from=birthday_from,
-            birthday_to=birthday_to,
+            birthday_to=birthday_to, after=after, count=count,
+        )
+
+    async def list_contact_fields(
+        self,
+        fields: Sequence[str],
+        include: Sequence[str] = (),
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        q: str | None = None,
+        tag_ids: list[uuid.UUID] | None = None,
+        favorites: bool | None = None,
+        birthday_from: date | None = None,
+        birthday_to: date | None = None,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        return await self.repo.list_projected(
+            fields, include,
+            offset=offset, limit=limit, q=q, tag_ids=tag_ids,
+            favorites=favorites, birthday_from=birthday_from,
+            birthday_to=birthday_to, after=after, count=count,
         )
 
     async def get_contact(self, contact_id: uuid.UUID) -> Contact:
@@ -57,6 +83,14 @@ class ContactService:
         await self.repo.soft_delete(contact_id)
 
     async def search_contacts(
-        self, query: str, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Contact], int]:
-        return await self.repo.search(query, offset=offset, limit=limit)
+        self,
+        query: str,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Contact], int | None]:
+        return await self.repo.search(
+            query, offset=offset, limit=limit, after=after, count=count
+        )
@@ -3,7 +3,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
 
-from clara.base.schema import PaginatedResponse, PaginationMeta
+from clara.base.schema import PaginatedResponse
 from clara.customization.repository import (
     CustomFieldDefinitionRepository,
     CustomFieldValueRepository,
@@ -45,13 +45,18 @@ async def list_definitions(
     pagination: PaginationParams = Depends(),
 ) -> PaginatedResponse[CustomFieldDefinitionRead]:
     items, total = await svc.list_definitions(
-        scope=scope, offset=pagination.offset, limit=pagination.limit
+        scope=scope,
+        offset=pagination.offset,
+        limit=pagination.fetch_limit,
+        after=pagination.after,
+        count=pagination.count,
     )
     return PaginatedResponse(
-        items=[CustomFieldDefinitionRead.model_validate(d) for d in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[
+            CustomFieldDefinitionRead.model_validate(d)
+            for d in pagination.page(items)
+        ],
+        meta=pagination.meta(items, total),
     )
 
 
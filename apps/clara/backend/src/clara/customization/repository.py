@@ -1,10 +1,9 @@
 import uuid
 from collections.abc import Sequence
 
-from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload
 
-from clara.base.repository import BaseRepository
+from clara.base.repository import BaseRepository, CountMode, Keyset
 from clara.customization.models import (
     CustomFieldDefinition,
     CustomFieldValue,
@@ -33,27 +32,26 @@ class TemplateRepository(BaseRepository[Template]):
         return result.scalar_one_or_none()
 
     async def list_with_pages(
-        self, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Template], int]:
-        count_stmt = (
-            select(func.count())
-            .select_from(Template)
-            .where(Template.vault_id == self.vault_id)
-            .where(Template.deleted_at.is_(None))
-        )
-        total = (await self.session.execute(count_stmt)).scalar_one()
-        items_stmt = (
-            self._base_query()
-            .options(
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Template], int | None]:
+        base = self._base_query()
+        total = await self._count(base, count)
+        items_stmt = await self._paginate(
+            base.options(
                 selectinload(Template.pages).selectinload(
                     TemplatePage.modules
                 )
-            )
-            .offset(offset)
-            .limit(limit)
-            .order_by(Template.created_at.desc())
+            ),
+            offset=offset,
+            limit=limit,
+            after=after,
         )
-        result = await self.session.execute(items_stmt)
+        result = await self._execute_page(items_stmt, after)
         return result.scalars().unique().all(), total
 
 
@@ -69,24 +67,23 @@ class CustomFieldDefinitionRepository(BaseRepository[CustomFieldDefinition]):
     model = CustomFieldDefinition
 
     async def list_by_scope(
-        self, scope: str, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[CustomFieldDefinition], int]:
-        count_stmt = (
-            select(func.count())
-            .select_from(CustomFieldDefinition)
-            .where(CustomFieldDefinition.vault_id == self.vault_id)
-            .where(CustomFieldDefinition.deleted_at.is_(None))
-            .where(CustomFieldDefinition.scope == scope)
-        )
-        total = (await self.session.execute(count_stmt)).scalar_one()
-        items_stmt = (
-            self._base_query()
-            .where(CustomFieldDefinition.scope == scope)
-            .offset(offset)
-            .limit(limit)
-            .order_by(CustomFieldDefinition.created_at.desc())
+        self,
+        scope: str,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[CustomFieldDefinition], int | None]:
+        base = self._base_query().where(CustomFieldDefinition.scope == scope)
+        total = await self._count(base, count)
+        items_stmt = await self._paginate(
+            base,
+            offset=offset,
+            limit=limit,
+            after=after,
         )
-        result = await self.session.execute(items_stmt)
+        result = await self._execute_page(items_stmt, after)
         return result.scalars().all(), total
 
 
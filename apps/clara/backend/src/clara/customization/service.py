@@ -1,6 +1,7 @@
 import uuid
 from collections.abc import Sequence
 
+from clara.base.repository import CountMode, Keyset
 from clara.customization.models import (
     CustomFieldDefinition,
     CustomFieldValue,
@@ -37,9 +38,16 @@ class TemplateService:
         self.module_repo = module_repo
 
     async def list_templates(
-        self, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Template], int]:
-        return await self.repo.list_with_pages(offset=offset, limit=limit)
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Template], int | None]:
+        return await self.repo.list_with_pages(
+            offset=offset, limit=limit, after=after, count=count
+        )
 
     async def get_template(self, template_id: uuid.UUID) -> Template:
         template = await self.repo.get_by_id_with_pages(template_id)
@@ -127,13 +135,21 @@ class CustomFieldService:
         self.val_repo = val_repo
 
     async def list_definitions(
-        self, *, scope: str | None = None, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[CustomFieldDefinition], int]:
+        self,
+        *,
+        scope: str | None = None,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[CustomFieldDefinition], int | None]:
         if scope:
             return await self.def_repo.list_by_scope(
-                scope, offset=offset, limit=limit
+                scope, offset=offset, limit=limit, after=after, count=count
             )
-        return await self.def_repo.list(offset=offset, limit=limit)
+        return await self.def_repo.list(
+            offset=offset, limit=limit, after=after, count=count
+        )
 
     async def get_definition(
         self, definition_id: uuid.UUID
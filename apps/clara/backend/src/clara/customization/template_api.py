@@ -3,7 +3,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends
 
-from clara.base.schema import PaginatedResponse, PaginationMeta
+from clara.base.schema import PaginatedResponse
 from clara.customization.repository import (
     TemplateModuleRepository,
     TemplatePageRepository,
@@ -46,13 +46,14 @@ async def list_templates(
     svc: TplSvc, pagination: PaginationParams = Depends()
 ) -> PaginatedResponse[TemplateRead]:
     items, total = await svc.list_templates(
-        offset=pagination.offset, limit=pagination.limit
+        offset=pagination.offset,
+        limit=pagination.fetch_limit,
+        after=pagination.after,
+        count=pagination.count,
     )
     return PaginatedResponse(
-        items=[TemplateRead.model_validate(t) for t in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[TemplateRead.model_validate(t) for t in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
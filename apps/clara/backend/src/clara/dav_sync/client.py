@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
 from urllib.parse import urljoin
+from xml.sax.saxutils import escape
 
 import caldav
 import requests
@@ -21,6 +24,27 @@ class DavResource:
     data: str  # raw vCard/iCal text
 
 
+@dataclass
+class CollectionState:
+    """Cheap change markers of a collection; None when the server has none."""
+
+    sync_token: str | None
+    ctag: str | None
+
+
+@dataclass
+class DavChanges:
+    """Members of a collection changed or deleted since a sync-token."""
+
+    sync_token: str | None
+    changed: list[DavResource] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)  # absolute hrefs
+
+
+class SyncTokenExpired(Exception):
+    """The server no longer accepts a stored sync-token."""
+
+
 class DavClient:
     """Client for CalDAV/CardDAV operations."""
 
@@ -99,6 +123,10 @@ class DavClient:
                 )
         return resources
 
+    def sync_vcards(self, carddav_path: str, sync_token: str | None) -> DavChanges:
+        """vCards changed since sync_token; all of them when it is None."""
+        return self._sync_collection(carddav_path, sync_token, _CARDDAV)
+
     def put_vcard(
         self, carddav_path: str, uid: str, vcard_text: str, etag: str | None = None
     ) -> str | None:
@@ -153,12 +181,18 @@ class DavClient:
                 )
         return resources
 
-    def put_event(self, caldav_path: str, uid: str, ical_text: str) -> str | None:
-        """Create or update a calendar object."""
+    def sync_events(self, caldav_path: str, sync_token: str | None) -> DavChanges:
+        """Calendar objects changed since sync_token; all of them when None."""
+        return self._sync_collection(caldav_path, sync_token, _CALDAV)
+
+    def put_event(
+        self, caldav_path: str, uid: str, ical_text: str
+    ) -> tuple[str | None, str]:
+        """Create or update a calendar object. Returns new etag and its href."""
         client = self._get_caldav()
         cal = caldav.Calendar(client=client, url=caldav_path)
         obj = cal.save_event(ical_text)
-        return getattr(obj, "etag", None)
+        return getattr(obj, "etag", None), str(obj.url)
 
     def delete_event(self, href: str) -> None:
         """Delete a calendar object by href."""
@@ -166,6 +200,101 @@ class DavClient:
         obj = caldav.CalendarObjectResource(client=client, url=href)
         obj.delete()
 
+    # -- Incremental sync (RFC 6578) --
+
+    def collection_state(self, path: str) -> CollectionState:
+        """Read the collection's sync-token and CTag with one PROPFIND."""
+        resp = self._request("PROPFIND", path, _COLLECTION_STATE, depth="0")
+        resp.raise_for_status()
+        import defusedxml.ElementTree as ET
+
+        root = ET.fromstring(resp.text)
+        state = CollectionState(sync_token=None, ctag=None)
+        for propstat in root.findall(".//D:propstat", _NS):
+            status = propstat.find("D:status", _NS)
+            if status is not None and " 200 " not in f"{status.text} ":
+                continue
+            token = propstat.find(".//D:sync-token", _NS)
+            if token is not None and token.text:
+                state.sync_token = token.text.strip()
+            ctag = propstat.find(".//CS:getctag", _NS)
+            if ctag is not None and ctag.text:
+                state.ctag = ctag.text.strip()
+        return state
+
+    def _sync_collection(
+        self, path: str, sync_token: str | None, kind: _CollectionKind
+    ) -> DavChanges:
+        changes = DavChanges(sync_token=sync_token)
+        missing: list[str] = []
+        truncated = True
+        # A server may answer in parts, flagging the collection 507 until done
+        while truncated:
+            body = _SYNC_COLLECTION.format(
+                ns=kind.namespace,
+                token=escape(changes.sync_token or ""),
+                data=kind.data,
+            )
+            resp = self._request("REPORT", path, body)
+            if resp.status_code in (403, 409) and "valid-sync-token" in resp.text:
+                raise SyncTokenExpired(path)
+            resp.raise_for_status()
+            previous = changes.sync_token
+            members, changes.sync_token, truncated = _parse_sync_collection(
+                resp.text, self._resolve_url(path), kind
+            )
+            truncated = truncated and changes.sync_token not in (None, previous)
+            for href, status, etag, data in members:
+                if status == 404:
+                    changes.deleted.append(self._resolve_url(href))
+                elif data is None:
+                    missing.append(href)
+                else:
+                    self._add_resource(changes.changed, href, etag, data, kind)
+        # Servers may leave out the data; fetch those members in one go
+        if missing:
+            hrefs = "".join(f"<D:href>{escape(h)}</D:href>" for h in missing)
+            body = _MULTIGET.format(
+                ns=kind.namespace, report=kind.multiget, data=kind.data, hrefs=hrefs
+            )
+            resp = self._request("REPORT", path, body, depth="1")
+            resp.raise_for_status()
+            for href, etag, data in _parse_multistatus(resp.text, kind):
+                if data:
+                    self._add_resource(changes.changed, href, etag, data, kind)
+        return changes
+
+    def _add_resource(
+        self,
+        resources: list[DavResource],
+        href: str,
+        etag: str | None,
+        data: str,
+        kind: _CollectionKind,
+    ) -> None:
+        uid = kind.extract_uid(data)
+        if uid:
+            resources.append(
+                DavResource(
+                    uid=uid, href=self._resolve_url(href), etag=etag, data=data
+                )
+            )
+
+    def _request(
+        self, method: str, path: str, body: str, depth: str | None = None
+    ) -> requests.Response:
+        headers = {"Content-Type": "application/xml; charset=utf-8"}
+        if depth is not None:
+            headers["Depth"] = depth
+        return requests.request(
+            method,
+            self._resolve_url(path),
+            auth=(self.username, self.password),
+            headers=headers,
+            data=body.encode("utf-8"),
+            timeout=30,
+        )
+
 
 # -- Helpers --
 
@@ -178,6 +307,41 @@ _ADDRESSBOOK_QUERY = """<?xml version="1.0" encoding="utf-8"?>
 </C:addressbook-query>"""
 
 
+_NS = {
+    "D": "DAV:",
+    "C": "urn:ietf:params:xml:ns:carddav",
+    "CAL": "urn:ietf:params:xml:ns:caldav",
+    "CS": "http://calendarserver.org/ns/",
+}
+
+_COLLECTION_STATE = """<?xml version="1.0" encoding="utf-8"?>
+<D:propfind xmlns:D="DAV:" xmlns:CS="http://calendarserver.org/ns/">
+  <D:prop>
+    <D:sync-token/>
+    <CS:getctag/>
+  </D:prop>
+</D:propfind>"""
+
+_SYNC_COLLECTION = """<?xml version="1.0" encoding="utf-8"?>
+<D:sync-collection xmlns:D="DAV:" xmlns:C="{ns}">
+  <D:sync-token>{token}</D:sync-token>
+  <D:sync-level>1</D:sync-level>
+  <D:prop>
+    <D:getetag/>
+    <C:{data}/>
+  </D:prop>
+</D:sync-collection>"""
+
+_MULTIGET = """<?xml version="1.0" encoding="utf-8"?>
+<C:{report} xmlns:D="DAV:" xmlns:C="{ns}">
+  <D:prop>
+    <D:getetag/>
+    <C:{data}/>
+  </D:prop>
+  {hrefs}
+</C:{report}>"""
+
+
 def _discover_addressbooks(url: str, username: str, password: str) -> list[str]:
     """Try to discover CardDAV addressbooks via PROPFIND."""
     resp = requests.request(
@@ -210,24 +374,67 @@ def _discover_addressbooks(url: str, username: str, password: str) -> list[str]:
     return paths
 
 
-def _parse_multistatus(xml_text: str) -> list[tuple[str, str | None, str | None]]:
+def _parse_multistatus(
+    xml_text: str, kind: _CollectionKind | None = None
+) -> list[tuple[str, str | None, str | None]]:
     """Parse WebDAV multistatus XML into (href, etag, data) tuples."""
     import defusedxml.ElementTree as ET
 
+    kind = kind or _CARDDAV
     root = ET.fromstring(xml_text)
-    ns = {"D": "DAV:", "C": "urn:ietf:params:xml:ns:carddav"}
     results: list[tuple[str, str | None, str | None]] = []
-    for response in root.findall(".//D:response", ns):
-        href_el = response.find("D:href", ns)
-        href = href_el.text if href_el is not None else ""
-        etag_el = response.find(".//D:getetag", ns)
-        etag = etag_el.text.strip('"') if etag_el is not None and etag_el.text else None
-        data_el = response.find(".//C:address-data", ns)
-        data = data_el.text if data_el is not None else None
-        results.append((href or "", etag, data))
+    for response in root.findall(".//D:response", _NS):
+        href, etag, data = _parse_response(response, kind)
+        results.append((href, etag, data))
     return results
 
 
+def _parse_sync_collection(
+    xml_text: str, collection_url: str, kind: _CollectionKind
+) -> tuple[list[tuple[str, int, str | None, str | None]], str | None, bool]:
+    """Parse a sync-collection multistatus.
+
+    Returns (href, status, etag, data) per member, the new sync-token and
+    whether the server truncated the result.
+    """
+    import defusedxml.ElementTree as ET
+
+    root = ET.fromstring(xml_text)
+    members: list[tuple[str, int, str | None, str | None]] = []
+    truncated = False
+    for response in root.findall("D:response", _NS):
+        href, etag, data = _parse_response(response, kind)
+        status_el = response.find("D:status", _NS)
+        status = _status_code(status_el.text if status_el is not None else None)
+        if urljoin(collection_url, href).rstrip("/") == collection_url.rstrip("/"):
+            truncated = status == 507
+            continue
+        members.append((href, status, etag, data))
+    token_el = root.find("D:sync-token", _NS)
+    token = token_el.text.strip() if token_el is not None and token_el.text else None
+    return members, token, truncated
+
+
+def _parse_response(
+    response: Any, kind: _CollectionKind
+) -> tuple[str, str | None, str | None]:
+    href_el = response.find("D:href", _NS)
+    href = href_el.text if href_el is not None else ""
+    etag_el = response.find(".//D:getetag", _NS)
+    etag = etag_el.text.strip('"') if etag_el is not None and etag_el.text else None
+    data_el = response.find(f".//{{{kind.namespace}}}{kind.data}")
+    data = data_el.text if data_el is not None else None
+    return href or "", etag, data
+
+
+def _status_code(status_line: str | None) -> int:
+    """200 for a missing status line (members answer with propstats)."""
+    if not status_line:
+        return 200
+    parts = status_line.split()
+    return int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 200
+
+
 def _extract_vcard_uid(vcard_text: str) -> str | None:
     """Extract UID from vCard text."""
     try:
@@ -250,3 +457,25 @@ def _extract_ical_uid(ical_text: str) -> str | None:
     except Exception:
         pass
     return None
+
+
+@dataclass(frozen=True)
+class _CollectionKind:
+    namespace: str
+    data: str  # member data property
+    multiget: str  # REPORT fetching members by href
+    extract_uid: Callable[[str], str | None]
+
+
+_CARDDAV = _CollectionKind(
+    namespace=_NS["C"],
+    data="address-data",
+    multiget="addressbook-multiget",
+    extract_uid=_extract_vcard_uid,
+)
+_CALDAV = _CollectionKind(
+    namespace=_NS["CAL"],
+    data="calendar-data",
+    multiget="calendar-multiget",
+    extract_uid=_extract_ical_uid,
+)
@@ -35,6 +35,8 @@ class DavSyncAccount(VaultScopedModel):
     last_sync_error: Mapped[str | None] = mapped_column(Text, nullable=True)
     sync_token_card: Mapped[str | None] = mapped_column(String(500), nullable=True)
     sync_token_cal: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    ctag_card: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    ctag_cal: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
     mappings: Mapped[list["DavSyncMapping"]] = relationship(
         back_populates="account", cascade="all, delete-orphan"
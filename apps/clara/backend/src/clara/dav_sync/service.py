@@ -47,6 +47,11 @@ class DavSyncService:
         fields = data.model_dump(exclude_unset=True, exclude={"password"})
         if data.password is not None:
             fields["encrypted_password"] = encrypt_credential(data.password)
+        # Sync-tokens and CTags only hold for the collection they came from
+        if fields.keys() & {"server_url", "carddav_path"}:
+            fields.update(sync_token_card=None, ctag_card=None)
+        if fields.keys() & {"server_url", "caldav_path"}:
+            fields.update(sync_token_cal=None, ctag_cal=None)
         return await self.account_repo.update(account_id, **fields)
 
     async def delete_account(self, account_id: uuid.UUID) -> None:
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
+from urllib.parse import unquote, urlsplit
 
+import requests
 import structlog
 import vobject
 from icalendar import Calendar
@@ -15,7 +17,12 @@ from sqlalchemy.orm import Session
 
 from clara.activities.models import Activity
 from clara.contacts.models import Address, Contact, ContactMethod, Tag
-from clara.dav_sync.client import DavClient, DavResource
+from clara.dav_sync.client import (
+    CollectionState,
+    DavClient,
+    DavResource,
+    SyncTokenExpired,
+)
 from clara.dav_sync.converters.activity import (
     activity_to_vevent,
     vevent_to_activity_data,
@@ -49,26 +56,132 @@ class SyncItem:
     remote_resource: DavResource | None
 
 
+@dataclass
+class RemoteState:
+    """The remote side of one sync of a collection.
+
+    Either every resource in the collection (complete) or only those changed
+    since the stored sync-token plus the hrefs deleted since then; resources
+    in neither are as the mappings last saw them.
+    """
+
+    resources: list[DavResource]
+    deleted_hrefs: list[str] = field(default_factory=list)
+    complete: bool = True
+    sync_token: str | None = None
+    ctag: str | None = None
+    # Set when an item failed to sync, so its changes are fetched again
+    failed: bool = False
+
+
+# Collection each entity type lives in; activities, tasks and reminders share
+# the account's calendar and so its sync-token
+COLLECTIONS = {"contact": "card", "activity": "cal", "task": "cal", "reminder": "cal"}
+
+
+def fetch_collection(
+    client: DavClient, account: DavSyncAccount, collection: str
+) -> RemoteState | None:
+    """Fetch what changed in a collection since the account's last sync.
+
+    Nothing is downloaded while the sync-token and CTag are unchanged. With a
+    sync-token, an RFC 6578 sync-collection REPORT returns only changed and
+    deleted members; servers without one, or failing the REPORT, get a full
+    listing. Returns None when the collection is not synced.
+    """
+    if collection == "card":
+        if not account.carddav_enabled or not account.carddav_path:
+            return None
+        path, token, ctag = (
+            account.carddav_path,
+            account.sync_token_card,
+            account.ctag_card,
+        )
+    else:
+        if not account.caldav_enabled or not account.caldav_path:
+            return None
+        path, token, ctag = (
+            account.caldav_path,
+            account.sync_token_cal,
+            account.ctag_cal,
+        )
+
+    try:
+        state = client.collection_state(path)
+    except requests.RequestException:
+        logger.warning("dav_collection_state_failed", path=path, exc_info=True)
+        state = CollectionState(sync_token=None, ctag=None)
+    if (state.sync_token or state.ctag) and (state.sync_token, state.ctag) == (
+        token,
+        ctag,
+    ):
+        return RemoteState([], complete=False, sync_token=token, ctag=ctag)
+
+    if state.sync_token:
+        sync = client.sync_vcards if collection == "card" else client.sync_events
+        try:
+            try:
+                changes = sync(path, token)
+            except SyncTokenExpired:
+                logger.info("dav_sync_token_expired", path=path)
+                token = None
+                changes = sync(path, None)
+            return RemoteState(
+                changes.changed,
+                deleted_hrefs=changes.deleted,
+                complete=token is None,
+                sync_token=changes.sync_token,
+                ctag=state.ctag,
+            )
+        except requests.RequestException:
+            logger.warning("dav_sync_collection_failed", path=path, exc_info=True)
+
+    if collection == "card":
+        resources = client.list_vcards(path)
+    else:
+        resources = client.list_events(path)
+    return RemoteState(resources, ctag=state.ctag)
+
+
+def save_collection_state(
+    account: DavSyncAccount, collection: str, remote: RemoteState
+) -> None:
+    """Remember where a fully applied sync of a collection left off."""
+    if collection == "card":
+        account.sync_token_card = remote.sync_token
+        account.ctag_card = remote.ctag
+    else:
+        account.sync_token_cal = remote.sync_token
+        account.ctag_cal = remote.ctag
+
+
 def sync_entity_type(
     session: Session,
     client: DavClient,
     account: DavSyncAccount,
     entity_type: str,
+    remote: RemoteState | None = None,
 ) -> dict[str, int]:
-    """Sync one entity type for an account. Returns action counts."""
+    """Sync one entity type for an account. Returns action counts.
+
+    Without a fetched remote state the whole collection is listed.
+    """
     vault_id = account.vault_id
 
     # Fetch remote resources
     if entity_type == "contact":
         if not account.carddav_enabled or not account.carddav_path:
             return {}
-        remote_resources = client.list_vcards(account.carddav_path)
+        if remote is None:
+            remote = RemoteState(client.list_vcards(account.carddav_path))
     else:
         if not account.caldav_enabled or not account.caldav_path:
             return {}
-        remote_resources = client.list_events(account.caldav_path)
+        if remote is None:
+            remote = RemoteState(client.list_events(account.caldav_path))
 
-    remote_by_uid: dict[str, DavResource] = {r.uid: r for r in remote_resources}
+    remote_by_uid: dict[str, DavResource] = {r.uid: r for r in remote.resources}
+    deleted_hrefs = {_href_key(href) for href in remote.deleted_hrefs}
 
     # Fetch mappings
     mappings = (
@@ -99,25 +212,42 @@ def sync_entity_type(
     # Check mapped items
     for mapping in mappings:
         local = local_by_id.get(mapping.local_id)
-        remote = remote_by_uid.get(mapping.remote_uid)
+        resource = remote_by_uid.get(mapping.remote_uid)
+        if resource is not None:
+            if resource.href and resource.href != mapping.remote_href:
+                mapping.remote_href = resource.href
+        elif not remote.complete and (
+            _href_key(mapping.remote_href) not in deleted_hrefs
+        ):
+            # Unchanged since the sync-token: as the mapping last saw it
+            resource = DavResource(
+                uid=mapping.remote_uid,
+                href=mapping.remote_href or "",
+                etag=mapping.remote_etag,
+                data="",
+            )
 
         if local and local.deleted_at is not None:
-            items.append(SyncItem(SyncAction.DELETED_LOCAL, mapping, local, remote))
-        elif not remote:
+            items.append(SyncItem(SyncAction.DELETED_LOCAL, mapping, local, resource))
+        elif not resource:
             items.append(SyncItem(SyncAction.DELETED_REMOTE, mapping, local, None))
-        elif local and remote:
-            remote_changed = mapping.remote_etag and remote.etag != mapping.remote_etag
+        elif local and resource:
+            remote_changed = (
+                mapping.remote_etag and resource.etag != mapping.remote_etag
+            )
             local_changed = local.updated_at > mapping.local_updated_at
             if remote_changed and local_changed:
-                items.append(SyncItem(SyncAction.CONFLICT, mapping, local, remote))
+                items.append(SyncItem(SyncAction.CONFLICT, mapping, local, resource))
             elif remote_changed:
                 items.append(
-                    SyncItem(SyncAction.UPDATED_REMOTE, mapping, local, remote)
+                    SyncItem(SyncAction.UPDATED_REMOTE, mapping, local, resource)
                 )
             elif local_changed:
-                items.append(SyncItem(SyncAction.UPDATED_LOCAL, mapping, local, remote))
+                items.append(
+                    SyncItem(SyncAction.UPDATED_LOCAL, mapping, local, resource)
+                )
             else:
-                items.append(SyncItem(SyncAction.UNCHANGED, mapping, local, remote))
+                items.append(SyncItem(SyncAction.UNCHANGED, mapping, local, resource))
 
     # New remote (UID not in any mapping)
     for uid, resource in remote_by_uid.items():
@@ -136,6 +266,7 @@ def sync_entity_type(
             _execute_sync_item(session, client, account, entity_type, item)
             counts[item.action.value] = counts.get(item.action.value, 0) + 1
         except Exception:
+            remote.failed = True
             logger.exception(
                 "sync_item_failed",
                 entity_type=entity_type,
@@ -423,8 +554,8 @@ def _push_local_to_remote(
         cal.add_component(todo)
 
     ical_text = cal.to_ical().decode()
-    etag = client.put_event(account.caldav_path, uid, ical_text)
-    return DavResource(uid=uid, href="", etag=etag, data=ical_text)
+    etag, href = client.put_event(account.caldav_path, uid, ical_text)
+    return DavResource(uid=uid, href=href, etag=etag, data=ical_text)
 
 
 def _delete_remote(
@@ -434,3 +565,8 @@ def _delete_remote(
         client.delete_vcard(resource.href, resource.etag)
     else:
         client.delete_event(resource.href)
+
+
+def _href_key(href: str | None) -> str:
+    """Compare hrefs by path; servers mix absolute and relative forms."""
+    return unquote(urlsplit(href or "").path).rstrip("/")
@@ -6,10 +6,13 @@ from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from clara.auth.cache import auth_cache, is_token_revoked
 from clara.auth.models import PersonalAccessToken, User, VaultMembership
-from clara.auth.security import decode_access_token, verify_password
+from clara.auth.pat_usage import pat_usage
+from clara.auth.security import decode_access_token, token_digest, verify_password
+from clara.config import get_settings
 from clara.database import get_session
-from clara.redis import is_token_blacklisted
+from clara.redis import cache_pat, evict_pat, get_cached_pat
 
 Db = Annotated[AsyncSession, Depends(get_session)]
 
@@ -29,8 +32,35 @@ async def _extract_token(request: Request) -> str:
 
 async def _authenticate_pat(
     token: str, session: AsyncSession
-) -> tuple[User, PersonalAccessToken] | None:
-    """Look up user via Personal Access Token."""
+) -> tuple[User, list[str]] | None:
+    """Look up user and scopes via Personal Access Token.
+
+    Verified tokens are cached in Redis under an HMAC of the token, so repeat
+    calls skip the prefix lookup and the argon2 check. The cache entry never
+    outlives the token's expiry and is evicted when the token is revoked.
+    last_used_at is written behind in batches (see auth.pat_usage).
+    """
+    now = datetime.now(UTC)
+    digest = token_digest(token)
+    cached = await get_cached_pat(digest)
+    if cached is not None:
+        expires_at = cached["expires_at"]
+        if expires_at and datetime.fromisoformat(expires_at) < now:
+            return None
+        pat_id = uuid.UUID(cached["id"])
+        # Joining the token also confirms it was not deleted since caching
+        owner = (
+            select(User)
+            .join(PersonalAccessToken, PersonalAccessToken.user_id == User.id)
+            .where(PersonalAccessToken.id == pat_id)
+        )
+        user = (await session.execute(owner)).scalar_one_or_none()
+        if user is None:
+            await evict_pat(str(pat_id))
+            return None
+        pat_usage.record(pat_id)
+        return user, cached["scopes"]
+
     prefix = token[:12]
     stmt = select(PersonalAccessToken).where(
         PersonalAccessToken.token_prefix == prefix
@@ -38,23 +68,46 @@ async def _authenticate_pat(
     pats = (await session.execute(stmt)).scalars().all()
     for pat in pats:
         if verify_password(token, pat.token_hash):
-            if pat.expires_at and pat.expires_at < datetime.now(UTC):
+            expires = pat.expires_at
+            if expires and expires.tzinfo is None:
+                expires = expires.replace(tzinfo=UTC)
+            if expires and expires < now:
                 return None
-            pat.last_used_at = datetime.now(UTC)
-            await session.flush()
             user = await session.get(User, pat.user_id)
-            return (user, pat) if user else None
+            if user is None:
+                return None
+            ttl = get_settings().pat_cache_ttl_seconds
+            if expires:
+                ttl = min(ttl, int((expires - now).total_seconds()))
+            await cache_pat(
+                digest,
+                str(pat.id),
+                {
+                    "id": str(pat.id),
+                    "user_id": str(pat.user_id),
+                    "scopes": pat.scopes,
+                    "expires_at": expires.isoformat() if expires else None,
+                },
+                ttl,
+            )
+            pat_usage.record(pat.id)
+            return user, pat.scopes
     return None
 
 
 _WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
 
 
-async def get_current_user(
+async def get_current_user_id(
     request: Request,
     token: str = Depends(_extract_token),
     session: AsyncSession = Depends(get_session),
-) -> User:
+) -> uuid.UUID:
+    """Authenticate the request without necessarily loading the user row.
+
+    Vault endpoints only need the id; a cached JWT skips the user lookup, and
+    the blacklist is checked in memory (see auth.cache).
+    """
     # PAT auth
     if token.startswith("pat_"):
         result = await _authenticate_pat(token, session)
@@ -63,13 +116,12 @@ async def get_current_user(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid or expired token",
             )
-        user, pat = result
+        user, scopes = result
         if not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Account deactivated",
             )
-        scopes = pat.scopes
         if request.method in _WRITE_METHODS and "write" not in scopes:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -80,7 +132,7 @@ async def get_current_user(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Token scope insufficient",
             )
-        return user
+        return user.id
 
     # JWT auth
     payload = decode_access_token(token)
@@ -90,11 +142,15 @@ async def get_current_user(
             detail="Invalid or expired token",
         )
     jti = payload.get("jti")
-    if jti and await is_token_blacklisted(jti):
+    if jti and await is_token_revoked(jti):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has been revoked",
         )
+    cache_key = jti or payload["sub"]
+    cached = auth_cache.get_user_id(cache_key)
+    if cached is not None:
+        return cached
     jwt_user = await session.get(User, uuid.UUID(payload["sub"]))
     if jwt_user is None:
         raise HTTPException(
@@ -106,16 +162,40 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Account deactivated",
         )
-    return jwt_user
+    auth_cache.set_user_id(cache_key, jwt_user.id)
+    return jwt_user.id
+
+
+async def get_current_user(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    session: AsyncSession = Depends(get_session),
+) -> User:
+    # Already in the identity map unless the id came from the auth cache
+    user = await session.get(User, user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Account deactivated",
+        )
+    return user
 
 
 async def get_vault_membership(
     vault_id: uuid.UUID,
-    user: User = Depends(get_current_user),
+    user_id: uuid.UUID = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_session),
 ) -> VaultMembership:
+    role = auth_cache.get_role(user_id, vault_id)
+    if role is not None:
+        # Detached stand-in; callers only check the role
+        return VaultMembership(user_id=user_id, vault_id=vault_id, role=role)
     stmt = select(VaultMembership).where(
-        VaultMembership.user_id == user.id,
+        VaultMembership.user_id == user_id,
         VaultMembership.vault_id == vault_id,
     )
     membership = (await session.execute(stmt)).scalar_one_or_none()
@@ -124,6 +204,7 @@ async def get_vault_membership(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No access to this vault",
         )
+    auth_cache.set_role(user_id, vault_id, membership.role)
     return membership
 
 
@@ -24,3 +24,9 @@ class ConflictError(AppError):
 
 class InvalidCredentialsError(AppError):
     pass
+
+
+class InvalidCursorError(AppError):
+    def __init__(self, cursor: str) -> None:
+        self.cursor = cursor
+        super().__init__(f"Invalid or expired cursor {cursor!r}")
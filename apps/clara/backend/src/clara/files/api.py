@@ -4,7 +4,7 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, UploadFile
 from fastapi.responses import Response
 
-from clara.base.schema import PaginatedResponse, PaginationMeta
+from clara.base.schema import PaginatedResponse
 from clara.deps import CurrentUser, Db, VaultAccess
 from clara.files.repository import FileLinkRepository, FileRepository
 from clara.files.schemas import FileLinkCreate, FileLinkRead, FileRead, FileUpdate
@@ -42,13 +42,15 @@ async def list_files(
     q: str | None = None,
 ) -> PaginatedResponse[FileRead]:
     items, total = await svc.list_files(
-        offset=pagination.offset, limit=pagination.limit, q=q
+        offset=pagination.offset,
+        limit=pagination.fetch_limit,
+        q=q,
+        after=pagination.after,
+        count=pagination.count,
     )
     return PaginatedResponse(
-        items=[FileRead.model_validate(f) for f in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[FileRead.model_validate(f) for f in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
@@ -4,6 +4,7 @@ from typing import Any
 
 from fastapi import UploadFile
 
+from clara.base.repository import CountMode, Keyset
 from clara.exceptions import NotFoundError
 from clara.files.models import File, FileLink
 from clara.files.repository import FileLinkRepository, FileRepository
@@ -25,9 +26,17 @@ class FileService:
         self.uploader_id = uploader_id
 
     async def list_files(
-        self, *, offset: int = 0, limit: int = 50, q: str | None = None
-    ) -> tuple[Sequence[File], int]:
-        return await self.repo.list(offset=offset, limit=limit, q=q)
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        q: str | None = None,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[File], int | None]:
+        return await self.repo.list(
+            offset=offset, limit=limit, q=q, after=after, count=count
+        )
 
     async def get_file(self, file_id: uuid.UUID) -> File:
         file = await self.repo.get_by_id(file_id)
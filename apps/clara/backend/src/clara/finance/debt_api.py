@@ -3,7 +3,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
 
-from clara.base.schema import PaginatedResponse, PaginationMeta
+from clara.base.schema import PaginatedResponse
 from clara.deps import Db, VaultAccess
 from clara.finance.debt_repository import DebtRepository
 from clara.finance.debt_schemas import DebtCreate, DebtRead, DebtUpdate
@@ -33,25 +33,38 @@ async def list_debts(
 ) -> PaginatedResponse[DebtRead]:
     if settled is not None:
         items, total = await svc.list_settled(
-            settled, offset=pagination.offset, limit=pagination.limit
+            settled,
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     elif direction:
         items, total = await svc.list_by_direction(
-            direction, offset=pagination.offset, limit=pagination.limit
+            direction,
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     elif contact_id:
         items, total = await svc.list_by_contact(
-            contact_id, offset=pagination.offset, limit=pagination.limit
+            contact_id,
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     else:
         items, total = await svc.list_debts(
-            offset=pagination.offset, limit=pagination.limit
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     return PaginatedResponse(
-        items=[DebtRead.model_validate(d) for d in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[DebtRead.model_validate(d) for d in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
@@ -1,7 +1,7 @@
 import uuid
 from collections.abc import Sequence
 
-from clara.base.repository import BaseRepository
+from clara.base.repository import BaseRepository, CountMode, Keyset
 from clara.finance.models import Debt
 
 
@@ -9,22 +9,52 @@ class DebtRepository(BaseRepository[Debt]):
     model = Debt
 
     async def list_settled(
-        self, settled: bool, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Debt], int]:
+        self,
+        settled: bool,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Debt], int | None]:
         return await self.filtered_list(
-            Debt.settled == settled, offset=offset, limit=limit
+            Debt.settled == settled,
+            offset=offset,
+            limit=limit,
+            after=after,
+            count=count,
         )
 
     async def list_by_contact(
-        self, contact_id: uuid.UUID, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Debt], int]:
+        self,
+        contact_id: uuid.UUID,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Debt], int | None]:
         return await self.filtered_list(
-            Debt.contact_id == contact_id, offset=offset, limit=limit
+            Debt.contact_id == contact_id,
+            offset=offset,
+            limit=limit,
+            after=after,
+            count=count,
         )
 
     async def list_by_direction(
-        self, direction: str, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Debt], int]:
+        self,
+        direction: str,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Debt], int | None]:
         return await self.filtered_list(
-            Debt.direction == direction, offset=offset, limit=limit
+            Debt.direction == direction,
+            offset=offset,
+            limit=limit,
+            after=after,
+            count=count,
         )
@@ -3,7 +3,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
 
-from clara.base.schema import PaginatedResponse, PaginationMeta
+from clara.base.schema import PaginatedResponse
 from clara.deps import Db, VaultAccess
 from clara.finance.gift_repository import GiftRepository
 from clara.finance.gift_schemas import GiftCreate, GiftRead, GiftUpdate
@@ -32,21 +32,30 @@ async def list_gifts(
 ) -> PaginatedResponse[GiftRead]:
     if direction:
         items, total = await svc.list_by_direction(
-            direction, offset=pagination.offset, limit=pagination.limit
+            direction,
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     elif contact_id:
         items, total = await svc.list_by_contact(
-            contact_id, offset=pagination.offset, limit=pagination.limit
+            contact_id,
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     else:
         items, total = await svc.list_gifts(
-            offset=pagination.offset, limit=pagination.limit
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     return PaginatedResponse(
-        items=[GiftRead.model_validate(g) for g in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[GiftRead.model_validate(g) for g in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
@@ -1,6 +1,7 @@
 import uuid
 from collections.abc import Sequence
 
+from clara.base.repository import CountMode, Keyset
 from clara.exceptions import NotFoundError
 from clara.finance.gift_repository import GiftRepository
 from clara.finance.gift_schemas import GiftCreate, GiftUpdate
@@ -12,22 +13,41 @@ class GiftService:
         self.repo = repo
 
     async def list_gifts(
-        self, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Gift], int]:
-        return await self.repo.list(offset=offset, limit=limit)
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Gift], int | None]:
+        return await self.repo.list(
+            offset=offset, limit=limit, after=after, count=count
+        )
 
     async def list_by_direction(
-        self, direction: str, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Gift], int]:
+        self,
+        direction: str,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Gift], int | None]:
         return await self.repo.list_by_direction(
-            direction, offset=offset, limit=limit
+            direction, offset=offset, limit=limit, after=after, count=count
         )
 
     async def list_by_contact(
-        self, contact_id: uuid.UUID, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Gift], int]:
+        self,
+        contact_id: uuid.UUID,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Gift], int | None]:
         return await self.repo.list_by_contact(
-            contact_id, offset=offset, limit=limit
+            contact_id, offset=offset, limit=limit, after=after, count=count
         )
 
     async def get_gift(self, gift_id: uuid.UUID) -> Gift:
@@ -13,7 +13,13 @@ from sqlalchemy import select
 from clara.config import get_settings
 from clara.dav_sync.client import DavClient
 from clara.dav_sync.models import DavSyncAccount
-from clara.dav_sync.sync_engine import sync_entity_type
+from clara.dav_sync.sync_engine import (
+    COLLECTIONS,
+    RemoteState,
+    fetch_collection,
+    save_collection_state,
+    sync_entity_type,
+)
 from clara.integrations.crypto import decrypt_credential
 from clara.jobs.sync_db import get_sync_session
 
@@ -49,20 +55,35 @@ def sync_dav_account(account_id: str) -> None:
         had_errors = False
         entity_types = ("contact", "activity", "task", "reminder")
         failed_count = 0
+        # Each collection is fetched once and shared by its entity types
+        remotes: dict[str, RemoteState | None] = {}
         for entity_type in entity_types:
+            collection = COLLECTIONS[entity_type]
             try:
-                counts = sync_entity_type(session, client, account, entity_type)
+                if collection not in remotes:
+                    remotes[collection] = fetch_collection(client, account, collection)
+                counts = sync_entity_type(
+                    session, client, account, entity_type, remotes[collection]
+                )
                 for k, v in counts.items():
                     all_counts[k] = all_counts.get(k, 0) + v
             except Exception:
                 had_errors = True
                 failed_count += 1
+                remote = remotes.get(collection)
+                if remote is not None:
+                    remote.failed = True
                 logger.exception(
                     "dav_sync_entity_failed",
                     entity_type=entity_type,
                     account_id=account_id,
                 )
 
+        # Advance a sync-token only once all its changes are applied
+        for collection, remote in remotes.items():
+            if remote is not None and not remote.failed:
+                save_collection_state(account, collection, remote)
+
         account.last_synced_at = datetime.now(UTC)
         if failed_count == len(entity_types):
             account.last_sync_status = "error"
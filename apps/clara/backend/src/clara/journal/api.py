@@ -4,7 +4,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
 
-from clara.base.schema import PaginatedResponse, PaginationMeta
+from clara.base.schema import PaginatedResponse
 from clara.deps import CurrentUser, Db, VaultAccess
 from clara.journal.repository import JournalEntryRepository
 from clara.journal.schemas import (
@@ -40,17 +40,20 @@ async def list_entries(
             date_from,
             date_to,
             offset=pagination.offset,
-            limit=pagination.limit,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     else:
         items, total = await svc.list_entries(
-            offset=pagination.offset, limit=pagination.limit
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     return PaginatedResponse(
-        items=[JournalEntryRead.model_validate(e) for e in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[JournalEntryRead.model_validate(e) for e in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
@@ -1,10 +1,10 @@
 from collections.abc import Sequence
 from datetime import date
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import Select
 from sqlalchemy.orm import selectinload
 
-from clara.base.repository import BaseRepository
+from clara.base.repository import BaseRepository, CountMode, Keyset
 from clara.journal.models import JournalEntry
 
 
@@ -18,45 +18,48 @@ class JournalEntryRepository(BaseRepository[JournalEntry]):
         )
 
     async def list_by_date_range(
-        self, start: date, end: date, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[JournalEntry], int]:
+        self,
+        start: date,
+        end: date,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[JournalEntry], int | None]:
         base = self._base_query().where(
             JournalEntry.entry_date >= start,
             JournalEntry.entry_date <= end,
         )
-        count_stmt = (
-            select(func.count())
-            .select_from(JournalEntry)
-            .where(JournalEntry.vault_id == self.vault_id)
-            .where(JournalEntry.deleted_at.is_(None))
-            .where(JournalEntry.entry_date >= start)
-            .where(JournalEntry.entry_date <= end)
+        total = await self._count(base, count)
+        items_stmt = await self._paginate(
+            base,
+            JournalEntry.entry_date.desc(),
+            offset=offset,
+            limit=limit,
+            after=after,
         )
-        total = (await self.session.execute(count_stmt)).scalar_one()
         items = (
-            await self.session.execute(
-                base.order_by(JournalEntry.entry_date.desc())
-                .offset(offset)
-                .limit(limit)
-            )
+            await self._execute_page(items_stmt, after)
         ).scalars().unique().all()
         return items, total
 
     async def list(
-        self, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[JournalEntry], int]:
-        count_stmt = (
-            select(func.count())
-            .select_from(JournalEntry)
-            .where(JournalEntry.vault_id == self.vault_id)
-            .where(JournalEntry.deleted_at.is_(None))
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[JournalEntry], int | None]:
+        base = self._base_query()
+        total = await self._count(base, count)
+        items_stmt = await self._paginate(
+            base,
+            JournalEntry.entry_date.desc(),
+            offset=offset,
+            limit=limit,
+            after=after,
         )
-        total = (await self.session.execute(count_stmt)).scalar_one()
-        items_stmt = (
-            self._base_query()
-            .offset(offset)
-            .limit(limit)
-            .order_by(JournalEntry.entry_date.desc())
-        )
-        result = await self.session.execute(items_stmt)
+        result = await self._execute_page(items_stmt, after)
         return result.scalars().unique().all(), total
@@ -4,6 +4,7 @@ from datetime import date
 
 from sqlalchemy import delete
 
+from clara.base.repository import CountMode, Keyset
 from clara.exceptions import NotFoundError
 from clara.journal.models import JournalEntry, JournalEntryContact
 from clara.journal.repository import JournalEntryRepository
@@ -16,15 +17,29 @@ class JournalService:
         self.user_id = user_id
 
     async def list_entries(
-        self, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[JournalEntry], int]:
-        return await self.repo.list(offset=offset, limit=limit)
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[JournalEntry], int | None]:
+        return await self.repo.list(
+            offset=offset, limit=limit, after=after, count=count
+        )
 
     async def list_by_date_range(
-        self, start: date, end: date, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[JournalEntry], int]:
+        self,
+        start: date,
+        end: date,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[JournalEntry], int | None]:
         return await self.repo.list_by_date_range(
-            start, end, offset=offset, limit=limit
+            start, end, offset=offset, limit=limit, after=after, count=count
         )
 
     async def get_entry(self, entry_id: uuid.UUID) -> JournalEntry:
@@ -1,4 +1,6 @@
-from collections.abc import Callable, Coroutine
+import asyncio
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
 from typing import Any
 
 from pathlib import Path
@@ -12,16 +14,34 @@ from clara.exceptions import (
     ConflictError,
     ForbiddenError,
     InvalidCredentialsError,
+    InvalidCursorError,
     NotFoundError,
 )
 from clara.middleware import CSRFMiddleware, RequestSizeLimitMiddleware
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    from clara.auth.cache import listen_for_invalidations
+    from clara.auth.pat_usage import write_pat_usage_periodically
+
+    tasks = [
+        asyncio.create_task(listen_for_invalidations()),
+        asyncio.create_task(write_pat_usage_periodically()),
+    ]
+    yield
+    for task in tasks:
+        task.cancel()
+    # Let the PAT usage writer flush what it still holds
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
     app = FastAPI(
         title="CLARA",
         version="0.1.0",
+        lifespan=lifespan,
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
     )
@@ -61,6 +81,12 @@ def create_app() -> FastAPI:
     ) -> JSONResponse:
         return JSONResponse(status_code=401, content={"detail": "Invalid credentials"})
 
+    @app.exception_handler(InvalidCursorError)
+    async def invalid_cursor_handler(
+        request: Request, exc: InvalidCursorError
+    ) -> JSONResponse:
+        return JSONResponse(status_code=400, content={"detail": str(exc)})
+
     import time
 
     import structlog
@@ -143,6 +169,12 @@ def create_app() -> FastAPI:
         prefix="/api/v1/vaults/{vault_id}/relationship-types",
         tags=["contacts"],
     )
+    from clara.search.api import router as search_router
+    app.include_router(
+        search_router,
+        prefix="/api/v1/vaults/{vault_id}/search",
+        tags=["search"],
+    )
     from clara.activities.api import router as activities_router
     app.include_router(
         activities_router,
@@ -3,7 +3,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends
 
-from clara.base.schema import PaginatedResponse, PaginationMeta
+from clara.base.schema import PaginatedResponse
 from clara.deps import CurrentUser, Db, VaultAccess
 from clara.notes.repository import NoteRepository
 from clara.notes.schemas import NoteCreate, NoteRead, NoteUpdate
@@ -33,21 +33,31 @@ async def list_notes(
 ) -> PaginatedResponse[NoteRead]:
     if contact_id is not None:
         items, total = await svc.list_by_contact(
-            contact_id, offset=pagination.offset, limit=pagination.limit
+            contact_id,
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     elif activity_id is not None:
         items, total = await svc.list_by_activity(
-            activity_id, offset=pagination.offset, limit=pagination.limit
+            activity_id,
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     else:
         items, total = await svc.list_notes(
-            offset=pagination.offset, limit=pagination.limit, q=q
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            q=q,
+            after=pagination.after,
+            count=pagination.count,
         )
     return PaginatedResponse(
-        items=[NoteRead.model_validate(n) for n in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[NoteRead.model_validate(n) for n in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
@@ -1,6 +1,7 @@
 import uuid
 from collections.abc import Sequence
 
+from clara.base.repository import CountMode, Keyset
 from clara.exceptions import NotFoundError
 from clara.notes.models import Note
 from clara.notes.repository import NoteRepository
@@ -12,9 +13,17 @@ class NoteService:
         self.repo = repo
 
     async def list_notes(
-        self, *, offset: int = 0, limit: int = 50, q: str | None = None
-    ) -> tuple[Sequence[Note], int]:
-        return await self.repo.list(offset=offset, limit=limit, q=q)
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        q: str | None = None,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Note], int | None]:
+        return await self.repo.list(
+            offset=offset, limit=limit, q=q, after=after, count=count
+        )
 
     async def list_by_contact(
         self,
@@ -22,9 +31,11 @@ class NoteService:
         *,
         offset: int = 0,
         limit: int = 50,
-    ) -> tuple[Sequence[Note], int]:
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Note], int | None]:
         return await self.repo.list_by_contact(
-            contact_id, offset=offset, limit=limit
+            contact_id, offset=offset, limit=limit, after=after, count=count
         )
 
     async def list_by_activity(
@@ -33,9 +44,11 @@ class NoteService:
         *,
         offset: int = 0,
         limit: int = 50,
-    ) -> tuple[Sequence[Note], int]:
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Note], int | None]:
         return await self.repo.list_by_activity(
-            activity_id, offset=offset, limit=limit
+            activity_id, offset=offset, limit=limit, after=after, count=count
         )
 
     async def get_note(self, note_id: uuid.UUID) -> Note:
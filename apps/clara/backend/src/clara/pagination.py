@@ -1,9 +1,99 @@
+import base64
+import binascii
+import json
+import uuid
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
+from datetime import date, datetime
+from functools import cached_property
+from typing import Any
 
 from fastapi import Query
 
+from clara.base.repository import CountMode, Keyset
+from clara.base.schema import PaginationMeta
+from clara.exceptions import InvalidCursorError
+
+# JSON tags of the sort-key types a cursor carries besides numbers and strings
+_DECODERS: dict[str, Callable[[str], Any]] = {
+    "t": datetime.fromisoformat,
+    "d": date.fromisoformat,
+    "u": uuid.UUID,
+}
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"t": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"u": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        ((tag, raw),) = value.items()
+        return _DECODERS[tag](raw)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor pointing just past the row with these sort-key values."""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or not values:
+            raise ValueError(cursor)
+        return Keyset(tuple(_decode_value(v) for v in values), cursor)
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(cursor) from e
+
 
 @dataclass
 class PaginationParams:
     offset: int = Query(0, ge=0)
     limit: int = Query(50, ge=1, le=200)
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page; replaces offset"
+    )
+    count: CountMode = Query(
+        "exact",
+        description="total as an exact count, a planner estimate, or none "
+        "(has_more alone, for infinite scroll)",
+    )
+
+    @cached_property
+    def after(self) -> Keyset:
+        """Where the page starts; collects the sort keys for next_cursor."""
+        return decode_cursor(self.cursor) if self.cursor else Keyset()
+
+    @property
+    def fetch_limit(self) -> int:
+        """Rows to fetch: one past the page, to tell whether more follow."""
+        return self.limit + 1
+
+    def page(self, items: Sequence[Any]) -> Sequence[Any]:
+        """The items of this page, without the look-ahead row."""
+        return items[: self.limit]
+
+    def meta(self, items: Sequence[Any], total: int | None) -> PaginationMeta:
+        """Page metadata for items fetched with fetch_limit."""
+        has_more = len(items) > self.limit
+        return PaginationMeta(
+            total=total,
+            offset=self.offset,
+            limit=self.limit,
+            has_more=has_more,
+            next_cursor=(
+                encode_cursor(self.after.seen[self.limit - 1])
+                if has_more and self.after.seen
+                else None
+            ),
+        )
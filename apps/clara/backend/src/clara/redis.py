@@ -1,3 +1,7 @@
+import json
+import time
+from typing import Any
+
 from redis import Redis
 from redis.asyncio import Redis as AsyncRedis
 from rq import Queue
@@ -8,6 +12,8 @@ _redis: Redis | None = None
 _async_redis: AsyncRedis | None = None
 _queue: Queue | None = None
 
+AUTH_INVALIDATION_CHANNEL = "auth:invalidate"
+
 
 def get_redis() -> Redis:
     global _redis
@@ -31,11 +37,71 @@ def get_async_redis() -> AsyncRedis:
 
 
 async def blacklist_token(jti: str, ttl_seconds: int) -> None:
-    """Add a JWT ID to the blacklist with expiry matching token lifetime."""
+    """Add a JWT ID to the blacklist with expiry matching token lifetime.
+
+    The key holds the expiry as a unix timestamp, and the revocation is
+    published so API processes can update their local copy (see auth.cache).
+    """
     if ttl_seconds > 0:
-        await get_async_redis().setex(f"blacklist:{jti}", ttl_seconds, "1")
+        expires_at = int(time.time()) + ttl_seconds
+        r = get_async_redis()
+        await r.setex(f"blacklist:{jti}", ttl_seconds, str(expires_at))
+        await r.publish(AUTH_INVALIDATION_CHANNEL, f"token:{jti}:{expires_at}")
+
+
+async def blacklisted_tokens() -> dict[str, float]:
+    """Every blacklisted JWT ID with its expiry, for seeding a local copy."""
+    r = get_async_redis()
+    keys = [key async for key in r.scan_iter(match="blacklist:*", count=1000)]
+    if not keys:
+        return {}
+    # Entries written before expiries were stored hold "1"
+    fallback = time.time() + get_settings().access_token_expire_minutes * 60
+    revoked = {}
+    for key, value in zip(keys, await r.mget(keys), strict=True):
+        if value is None:
+            continue
+        jti = (key.decode() if isinstance(key, bytes) else key).removeprefix(
+            "blacklist:"
+        )
+        expires_at = float(value)
+        revoked[jti] = expires_at if expires_at > 1 else fallback
+    return revoked
 
 
 async def is_token_blacklisted(jti: str) -> bool:
     result: int = await get_async_redis().exists(f"blacklist:{jti}")
     return result > 0
+
+
+async def publish_auth_invalidation(message: str) -> None:
+    """Tell every API process to drop cached auth entries (see auth.cache)."""
+    await get_async_redis().publish(AUTH_INVALIDATION_CHANNEL, message)
+
+
+async def cache_pat(digest: str, pat_id: str, entry: dict[str, Any], ttl: int) -> None:
+    """Remember a verified PAT under the HMAC of the presented token.
+
+    A second key indexed by the PAT id lets revocation find the entry without
+    the token itself.
+    """
+    if ttl > 0:
+        r = get_async_redis()
+        await r.setex(f"pat:{digest}", ttl, json.dumps(entry))
+        await r.setex(f"pat_index:{pat_id}", ttl, f"pat:{digest}")
+
+
+async def get_cached_pat(digest: str) -> dict[str, Any] | None:
+    raw = await get_async_redis().get(f"pat:{digest}")
+    if raw is None:
+        return None
+    entry: dict[str, Any] = json.loads(raw)
+    return entry
+
+
+async def evict_pat(pat_id: str) -> None:
+    r = get_async_redis()
+    key = await r.get(f"pat_index:{pat_id}")
+    if key is not None:
+        await r.delete(key)
+    await r.delete(f"pat_index:{pat_id}")
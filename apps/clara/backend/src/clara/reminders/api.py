@@ -4,7 +4,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
 
-from clara.base.schema import PaginatedResponse, PaginationMeta
+from clara.base.schema import PaginatedResponse
 from clara.deps import Db, VaultAccess
 from clara.pagination import PaginationParams
 from clara.reminders.repository import ReminderRepository
@@ -33,21 +33,30 @@ async def list_reminders(
 ) -> PaginatedResponse[ReminderRead]:
     if contact_id is not None:
         items, total = await svc.list_by_contact(
-            contact_id, offset=pagination.offset, limit=pagination.limit
+            contact_id,
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     elif status is not None:
         items, total = await svc.list_by_status(
-            status, offset=pagination.offset, limit=pagination.limit
+            status,
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     else:
         items, total = await svc.list_reminders(
-            offset=pagination.offset, limit=pagination.limit
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     return PaginatedResponse(
-        items=[ReminderRead.model_validate(r) for r in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[ReminderRead.model_validate(r) for r in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
@@ -58,13 +67,15 @@ async def list_upcoming_reminders(
     as_of: date = Query(default_factory=date.today),
 ) -> PaginatedResponse[ReminderRead]:
     items, total = await svc.list_upcoming(
-        as_of, offset=pagination.offset, limit=pagination.limit
+        as_of,
+        offset=pagination.offset,
+        limit=pagination.fetch_limit,
+        after=pagination.after,
+        count=pagination.count,
     )
     return PaginatedResponse(
-        items=[ReminderRead.model_validate(r) for r in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[ReminderRead.model_validate(r) for r in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
@@ -75,13 +86,15 @@ async def list_overdue_reminders(
     as_of: date = Query(default_factory=date.today),
 ) -> PaginatedResponse[ReminderRead]:
     items, total = await svc.list_overdue(
-        as_of, offset=pagination.offset, limit=pagination.limit
+        as_of,
+        offset=pagination.offset,
+        limit=pagination.fetch_limit,
+        after=pagination.after,
+        count=pagination.count,
     )
     return PaginatedResponse(
-        items=[ReminderRead.model_validate(r) for r in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[ReminderRead.model_validate(r) for r in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
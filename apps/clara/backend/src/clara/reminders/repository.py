@@ -2,7 +2,7 @@ import uuid
 from collections.abc import Sequence
 from datetime import date
 
-from clara.base.repository import BaseRepository
+from clara.base.repository import BaseRepository, CountMode, Keyset
 from clara.reminders.models import Reminder, StayInTouchConfig
 
 
@@ -15,12 +15,16 @@ class ReminderRepository(BaseRepository[Reminder]):
         *,
         offset: int = 0,
         limit: int = 50,
-    ) -> tuple[Sequence[Reminder], int]:
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Reminder], int | None]:
         return await self.filtered_list(
             Reminder.status == status,
             order_by=Reminder.next_expected_date.asc(),
             offset=offset,
             limit=limit,
+            after=after,
+            count=count,
         )
 
     async def list_by_contact(
@@ -29,12 +33,16 @@ class ReminderRepository(BaseRepository[Reminder]):
         *,
         offset: int = 0,
         limit: int = 50,
-    ) -> tuple[Sequence[Reminder], int]:
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Reminder], int | None]:
         return await self.filtered_list(
             Reminder.contact_id == contact_id,
             order_by=Reminder.next_expected_date.asc(),
             offset=offset,
             limit=limit,
+            after=after,
+            count=count,
         )
 
     async def list_upcoming(
@@ -43,13 +51,17 @@ class ReminderRepository(BaseRepository[Reminder]):
         *,
         offset: int = 0,
         limit: int = 50,
-    ) -> tuple[Sequence[Reminder], int]:
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Reminder], int | None]:
         return await self.filtered_list(
             Reminder.status == "active",
             Reminder.next_expected_date >= as_of,
             order_by=Reminder.next_expected_date.asc(),
             offset=offset,
             limit=limit,
+            after=after,
+            count=count,
         )
 
     async def list_overdue(
@@ -58,13 +70,17 @@ class ReminderRepository(BaseRepository[Reminder]):
         *,
         offset: int = 0,
         limit: int = 50,
-    ) -> tuple[Sequence[Reminder], int]:
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Reminder], int | None]:
         return await self.filtered_list(
             Reminder.status == "active",
             Reminder.next_expected_date < as_of,
             order_by=Reminder.next_expected_date.asc(),
             offset=offset,
             limit=limit,
+            after=after,
+            count=count,
         )
 
 
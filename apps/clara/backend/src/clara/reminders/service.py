@@ -2,6 +2,7 @@ import uuid
 from collections.abc import Sequence
 from datetime import date
 
+from clara.base.repository import CountMode, Keyset
 from clara.exceptions import NotFoundError
 from clara.reminders.models import Reminder, StayInTouchConfig
 from clara.reminders.repository import ReminderRepository, StayInTouchRepository
@@ -17,15 +18,28 @@ class ReminderService:
         self.repo = repo
 
     async def list_reminders(
-        self, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Reminder], int]:
-        return await self.repo.list(offset=offset, limit=limit)
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Reminder], int | None]:
+        return await self.repo.list(
+            offset=offset, limit=limit, after=after, count=count
+        )
 
     async def list_by_status(
-        self, status: str, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Reminder], int]:
+        self,
+        status: str,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Reminder], int | None]:
         return await self.repo.list_by_status(
-            status, offset=offset, limit=limit
+            status, offset=offset, limit=limit, after=after, count=count
         )
 
     async def list_by_contact(
@@ -34,23 +48,37 @@ class ReminderService:
         *,
         offset: int = 0,
         limit: int = 50,
-    ) -> tuple[Sequence[Reminder], int]:
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Reminder], int | None]:
         return await self.repo.list_by_contact(
-            contact_id, offset=offset, limit=limit
+            contact_id, offset=offset, limit=limit, after=after, count=count
         )
 
     async def list_upcoming(
-        self, as_of: date, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Reminder], int]:
+        self,
+        as_of: date,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Reminder], int | None]:
         return await self.repo.list_upcoming(
-            as_of, offset=offset, limit=limit
+            as_of, offset=offset, limit=limit, after=after, count=count
         )
 
     async def list_overdue(
-        self, as_of: date, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Reminder], int]:
+        self,
+        as_of: date,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Reminder], int | None]:
         return await self.repo.list_overdue(
-            as_of, offset=offset, limit=limit
+            as_of, offset=offset, limit=limit, after=after, count=count
         )
 
     async def get_reminder(self, reminder_id: uuid.UUID) -> Reminder:
@@ -0,0 +1,43 @@
+import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+
+from clara.base.schema import PaginatedResponse
+from clara.contacts.repository import ContactRepository
+from clara.deps import Db, VaultAccess
+from clara.pagination import PaginationParams
+from clara.search.schemas import SearchHit
+from clara.search.service import SearchService
+
+router = APIRouter()
+
+
+def get_search_service(
+    vault_id: uuid.UUID, db: Db, _access: VaultAccess
+) -> SearchService:
+    return SearchService(
+        contacts=ContactRepository(session=db, vault_id=vault_id)
+    )
+
+
+SearchSvc = Annotated[SearchService, Depends(get_search_service)]
+
+
+@router.get("", response_model=PaginatedResponse[SearchHit])
+async def search(
+    svc: SearchSvc,
+    q: str = Query(..., min_length=1, max_length=200),
+    pagination: PaginationParams = Depends(),
+) -> PaginatedResponse[SearchHit]:
+    items, total = await svc.search(
+        q,
+        offset=pagination.offset,
+        limit=pagination.fetch_limit,
+        after=pagination.after,
+        count=pagination.count,
+    )
+    return PaginatedResponse(
+        items=pagination.page(items),
+        meta=pagination.meta(items, total),
+    )
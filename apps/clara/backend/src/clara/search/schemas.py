@@ -0,0 +1,12 @@
+import uuid
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    kind: Literal["contact"]
+    id: uuid.UUID
+    title: str
+    subtitle: str | None
+    rank: float
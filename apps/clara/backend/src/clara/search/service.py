@@ -0,0 +1,33 @@
+
+from clara.base.repository import CountMode, Keyset
+from clara.contacts.repository import ContactRepository
+from clara.search.schemas import SearchHit
+
+
+class SearchService:
+    def __init__(self, contacts: ContactRepository) -> None:
+        self.contacts = contacts
+
+    async def search(
+        self,
+        query: str,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[list[SearchHit], int | None]:
+        ranked, total = await self.contacts.search_ranked(
+            query, offset=offset, limit=limit, after=after, count=count
+        )
+        hits = [
+            SearchHit(
+                kind="contact",
+                id=contact.id,
+                title=contact.full_name,
+                subtitle=contact.nickname,
+                rank=rank,
+            )
+            for contact, rank in ranked
+        ]
+        return hits, total
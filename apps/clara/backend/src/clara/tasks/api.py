@@ -4,7 +4,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
 
-from clara.base.schema import PaginatedResponse, PaginationMeta
+from clara.base.schema import PaginatedResponse
 from clara.deps import CurrentUser, Db, VaultAccess
 from clara.pagination import PaginationParams
 from clara.tasks.repository import TaskRepository
@@ -35,25 +35,38 @@ async def list_tasks(
 ) -> PaginatedResponse[TaskRead]:
     if overdue:
         items, total = await svc.list_overdue(
-            offset=pagination.offset, limit=pagination.limit
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     elif status:
         items, total = await svc.list_by_status(
-            status, offset=pagination.offset, limit=pagination.limit
+            status,
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     elif due_from and due_to:
         items, total = await svc.list_by_due_date_range(
-            due_from, due_to, offset=pagination.offset, limit=pagination.limit
+            due_from,
+            due_to,
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     else:
         items, total = await svc.list_tasks(
-            offset=pagination.offset, limit=pagination.limit
+            offset=pagination.offset,
+            limit=pagination.fetch_limit,
+            after=pagination.after,
+            count=pagination.count,
         )
     return PaginatedResponse(
-        items=[TaskRead.model_validate(t) for t in items],
-        meta=PaginationMeta(
-            total=total, offset=pagination.offset, limit=pagination.limit
-        ),
+        items=[TaskRead.model_validate(t) for t in pagination.page(items)],
+        meta=pagination.meta(items, total),
     )
 
 
@@ -2,6 +2,7 @@ import uuid
 from collections.abc import Sequence
 from datetime import date
 
+from clara.base.repository import CountMode, Keyset
 from clara.exceptions import NotFoundError
 from clara.tasks.models import Task
 from clara.tasks.repository import TaskRepository
@@ -14,26 +15,55 @@ class TaskService:
         self.user_id = user_id
 
     async def list_tasks(
-        self, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Task], int]:
-        return await self.repo.list(offset=offset, limit=limit)
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Task], int | None]:
+        return await self.repo.list(
+            offset=offset, limit=limit, after=after, count=count
+        )
 
     async def list_by_status(
-        self, status: str, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Task], int]:
-        return await self.repo.list_by_status(status, offset=offset, limit=limit)
+        self,
+        status: str,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Task], int | None]:
+        return await self.repo.list_by_status(
+            status, offset=offset, limit=limit, after=after, count=count
+        )
 
     async def list_by_due_date_range(
-        self, start: date, end: date, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Task], int]:
+        self,
+        start: date,
+        end: date,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Task], int | None]:
         return await self.repo.list_by_due_date_range(
-            start, end, offset=offset, limit=limit
+            start, end, offset=offset, limit=limit, after=after, count=count
         )
 
     async def list_overdue(
-        self, *, offset: int = 0, limit: int = 50
-    ) -> tuple[Sequence[Task], int]:
-        return await self.repo.list_overdue(offset=offset, limit=limit)
+        self,
+        *,
+        offset: int = 0,
+        limit: int = 50,
+        after: Keyset | None = None,
+        count: CountMode = "exact",
+    ) -> tuple[Sequence[Task], int | None]:
+        return await self.repo.list_overdue(
+            offset=offset, limit=limit, after=after, count=count
+        )
 
     async def get_task(self, task_id: uuid.UUID) -> Task:
         task = await self.repo.get_by_id(task_id)
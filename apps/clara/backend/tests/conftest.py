@@ -2,6 +2,7 @@ import importlib
 import os
 import pkgutil
 from collections.abc import AsyncGenerator
+from pathlib import Path
 
 import pytest
 from httpx import ASGITransport, AsyncClient
@@ -20,11 +21,18 @@ os.environ.setdefault("COOKIE_SECURE", "false")
 from clara.auth.models import User, Vault, VaultMembership, VaultSettings
 from clara.auth.security import hash_password
 from clara.base.model import Base
+from clara.config import get_settings
 from clara.database import get_session as db_get_session
 from clara.deps import get_session as deps_get_session
 from clara.main import create_app
 
 
+@pytest.fixture(autouse=True)
+def storage_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Uploaded files go to the test's tmp_path, not ./uploads."""
+    monkeypatch.setattr(get_settings(), "storage_path", str(tmp_path / "uploads"))
+
+
 @pytest.fixture(autouse=True)
 def fake_redis(monkeypatch: pytest.MonkeyPatch) -> None:
     store: dict[str, int | str] = {}
@@ -63,6 +71,15 @@ def fake_redis(monkeypatch: pytest.MonkeyPatch) -> None:
         async def exists(self, key: str) -> int:
             return 1 if key in store else 0
 
+        async def get(self, key: str) -> int | str | None:
+            return store.get(key)
+
+        async def delete(self, *keys: str) -> int:
+            return sum(store.pop(key, None) is not None for key in keys)
+
+        async def publish(self, channel: str, message: str) -> int:
+            return 0
+
     fake = FakeRedis()
     fake_async = FakeAsyncRedis()
     monkeypatch.setattr("clara.redis.get_redis", lambda: fake)
@@ -162,6 +162,98 @@ async def test_pat_readwrite_scope_allows_write(
     assert resp.status_code == 201
 
 
+async def test_pat_verified_once_then_cached(
+    authenticated_client: AsyncClient, vault, monkeypatch: pytest.MonkeyPatch,
+):
+    """Repeat PAT calls are answered from the cache without argon2."""
+    import clara.deps
+
+    resp = await authenticated_client.post(
+        "/api/v1/auth/tokens",
+        json={"name": "sync", "scopes": ["read"]},
+    )
+    token = resp.json()["token"]
+
+    calls = []
+    verify = clara.deps.verify_password
+
+    def counting_verify(plain: str, hashed: str) -> bool:
+        calls.append(hashed)
+        return verify(plain, hashed)
+
+    monkeypatch.setattr("clara.deps.verify_password", counting_verify)
+    headers = {"Authorization": f"Bearer {token}", "Cookie": ""}
+    for _ in range(3):
+        resp = await authenticated_client.get(
+            f"/api/v1/vaults/{vault.id}/contacts", headers=headers
+        )
+        assert resp.status_code == 200
+    assert len(calls) == 1
+
+
+async def test_pat_revoked_while_cached(
+    authenticated_client: AsyncClient, vault,
+):
+    resp = await authenticated_client.post(
+        "/api/v1/auth/tokens",
+        json={"name": "sync", "scopes": ["read"]},
+    )
+    token_id, token = resp.json()["id"], resp.json()["token"]
+    headers = {"Authorization": f"Bearer {token}", "Cookie": ""}
+    url = f"/api/v1/vaults/{vault.id}/contacts"
+
+    resp = await authenticated_client.get(url, headers=headers)
+    assert resp.status_code == 200
+
+    resp = await authenticated_client.delete(f"/api/v1/auth/tokens/{token_id}")
+    assert resp.status_code == 204
+
+    resp = await authenticated_client.get(url, headers=headers)
+    assert resp.status_code == 401
+
+
+async def test_pat_last_used_written_behind(
+    authenticated_client: AsyncClient, vault, db_session,
+):
+    """PAT requests record use in memory; a batched UPDATE writes it later."""
+    import uuid
+    from datetime import timedelta
+
+    from clara.auth.models import PersonalAccessToken
+    from clara.auth.pat_usage import pat_usage, write_last_used
+
+    pat_usage.take()
+    resp = await authenticated_client.post(
+        "/api/v1/auth/tokens",
+        json={"name": "sync", "scopes": ["read"]},
+    )
+    token_id, token = uuid.UUID(resp.json()["id"]), resp.json()["token"]
+    headers = {"Authorization": f"Bearer {token}", "Cookie": ""}
+    for _ in range(2):
+        resp = await authenticated_client.get(
+            f"/api/v1/vaults/{vault.id}/contacts", headers=headers
+        )
+        assert resp.status_code == 200
+
+    pat = await db_session.get(PersonalAccessToken, token_id)
+    assert pat.last_used_at is None
+
+    pending = pat_usage.take()
+    assert list(pending) == [token_id]
+    # a token deleted before the flush is skipped
+    pending[uuid.uuid4()] = pending[token_id]
+    await write_last_used(db_session, pending)
+    await db_session.refresh(pat)
+    assert pat.last_used_at is not None
+    last_used_at = pat.last_used_at
+
+    # an older use flushed late by another process does not move it back
+    earlier = pending[token_id] - timedelta(hours=1)
+    await write_last_used(db_session, {token_id: earlier})
+    await db_session.refresh(pat)
+    assert pat.last_used_at == last_used_at
+
+
 async def test_register_rate_limited(client: AsyncClient):
     """Register endpoint should return 429 after 3 attempts per IP."""
     for i in range(3):
@@ -0,0 +1,299 @@
+import asyncio
+import time
+import uuid
+from collections.abc import Iterator
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from clara.auth.cache import AuthCache, auth_cache
+from clara.auth.models import User, Vault, VaultMembership
+from clara.auth.security import create_access_token, hash_password
+
+
+@pytest.fixture()
+def cache() -> Iterator[AuthCache]:
+    # Normally switched on by the Redis subscription in the app lifespan
+    auth_cache.clear()
+    auth_cache.enabled = True
+    yield auth_cache
+    auth_cache.enabled = False
+    auth_cache.clear()
+
+
+@pytest.fixture()
+async def member_token(db_session: AsyncSession, vault: Vault) -> tuple[User, str]:
+    member = User(
+        email="member@example.com",
+        name="Member",
+        hashed_password=hash_password("Password123!"),
+    )
+    db_session.add(member)
+    await db_session.flush()
+    db_session.add(
+        VaultMembership(user_id=member.id, vault_id=vault.id, role="member")
+    )
+    await db_session.flush()
+    return member, create_access_token(str(member.id))
+
+
+def test_cache_entries_expire(cache: AuthCache, monkeypatch: pytest.MonkeyPatch):
+    user_id, vault_id = uuid.uuid4(), uuid.uuid4()
+    cache.set_role(user_id, vault_id, "owner")
+    assert cache.get_role(user_id, vault_id) == "owner"
+
+    now = time.monotonic()
+    monkeypatch.setattr("clara.auth.cache.time.monotonic", lambda: now + 3600)
+    assert cache.get_role(user_id, vault_id) is None
+
+
+def test_cache_disabled_without_subscription():
+    user_id = uuid.uuid4()
+    auth_cache.set_user_id("jti", user_id)
+    assert auth_cache.get_user_id("jti") is None
+
+
+def test_cache_invalidation_messages(cache: AuthCache):
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+    vault_id, other_vault_id = uuid.uuid4(), uuid.uuid4()
+    cache.set_user_id("a", user_id)
+    cache.set_user_id("b", other_id)
+    cache.set_role(user_id, vault_id, "owner")
+    cache.set_role(other_id, vault_id, "member")
+    cache.set_role(other_id, other_vault_id, "admin")
+
+    cache.apply(f"user:{user_id}")
+    assert cache.get_user_id("a") is None
+    assert cache.get_role(user_id, vault_id) is None
+    assert cache.get_user_id("b") == other_id
+
+    cache.apply(f"member:{other_id}:{vault_id}")
+    assert cache.get_role(other_id, vault_id) is None
+    assert cache.get_role(other_id, other_vault_id) == "admin"
+
+    cache.apply(f"vault:{other_vault_id}")
+    assert cache.get_role(other_id, other_vault_id) is None
+
+    cache.apply(f"token:b:{time.time() + 60}")
+    assert cache.get_user_id("b") is None
+    assert cache.is_revoked("b") is True
+    assert cache.is_revoked("a") is False
+
+
+def test_revocations_expire(cache: AuthCache):
+    cache.revoke("old", time.time() - 1)
+    cache.revoke("new", time.time() + 60)
+    assert cache.is_revoked("old") is False
+    assert cache.is_revoked("new") is True
+
+
+@pytest.mark.asyncio
+async def test_revocation_check_falls_back_to_redis():
+    from clara.auth.cache import is_token_revoked
+    from clara.redis import blacklist_token
+
+    await blacklist_token("jti-1", 60)
+    # cache not subscribed: Redis answers
+    assert auth_cache.is_revoked("jti-1") is None
+    assert await is_token_revoked("jti-1") is True
+    assert await is_token_revoked("jti-2") is False
+
+
+class FakeRedis:
+    """Redis stand-in for the invalidation listener: one queue per subscription."""
+
+    def __init__(self, blacklist: dict[bytes, bytes], answer_pings: bool = True):
+        self.blacklist = blacklist
+        self.answer_pings = answer_pings
+        self.subscriptions: list[asyncio.Queue[dict | None]] = []
+        self.subscribed = asyncio.Event()
+
+    def pubsub(self) -> "FakeRedis.PubSub":
+        return FakeRedis.PubSub(self)
+
+    async def scan_iter(self, match: str, count: int):
+        for key in self.blacklist:
+            yield key
+
+    async def mget(self, keys: list[bytes]) -> list[bytes | None]:
+        return [self.blacklist.get(key) for key in keys]
+
+    def publish(self, data: bytes) -> None:
+        self.subscriptions[-1].put_nowait({"type": "message", "data": data})
+
+    class PubSub:
+        def __init__(self, redis: "FakeRedis"):
+            self.redis = redis
+            self.queue: asyncio.Queue[dict | None] = asyncio.Queue()
+
+        async def subscribe(self, channel: str) -> None:
+            self.redis.subscriptions.append(self.queue)
+            self.redis.subscribed.set()
+
+        async def get_message(self, timeout: float) -> dict | None:
+            try:
+                return await asyncio.wait_for(self.queue.get(), timeout)
+            except TimeoutError:
+                return None
+
+        async def ping(self) -> None:
+            if self.redis.answer_pings:
+                self.queue.put_nowait({"type": "pong", "data": b""})
+
+        async def aclose(self) -> None:
+            pass
+
+
+@pytest.fixture()
+async def listen(monkeypatch: pytest.MonkeyPatch):
+    """Run listen_for_invalidations against a FakeRedis until the test ends."""
+    from clara.auth.cache import listen_for_invalidations
+
+    tasks: list[asyncio.Task[None]] = []
+
+    def start(redis: FakeRedis) -> None:
+        monkeypatch.setattr("clara.auth.cache.get_async_redis", lambda: redis)
+        monkeypatch.setattr("clara.redis.get_async_redis", lambda: redis)
+        tasks.append(asyncio.create_task(listen_for_invalidations()))
+
+    yield start
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _resubscribed(redis: FakeRedis) -> None:
+    while len(redis.subscriptions) < 2:
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_listener_seeds_revocations(listen):
+    redis = FakeRedis({
+        b"blacklist:seeded": str(int(time.time()) + 60).encode(),
+        b"blacklist:legacy": b"1",
+    })
+    listen(redis)
+    await asyncio.wait_for(redis.subscribed.wait(), 1)
+    await asyncio.sleep(0)
+    assert auth_cache.is_revoked("seeded") is True
+    assert auth_cache.is_revoked("legacy") is True
+    assert auth_cache.is_revoked("other") is False
+
+
+@pytest.mark.asyncio
+async def test_listener_resubscribes_on_unknown_message(listen):
+    redis = FakeRedis({b"blacklist:seeded": str(int(time.time()) + 60).encode()})
+    listen(redis)
+    await asyncio.wait_for(redis.subscribed.wait(), 1)
+    await asyncio.sleep(0)
+
+    redis.publish(b"bogus:1")
+    await asyncio.sleep(0.01)
+    # Off until resubscribed, never on with the blacklist cleared
+    assert auth_cache.is_revoked("seeded") is None
+
+    await asyncio.wait_for(_resubscribed(redis), 3)
+    await asyncio.sleep(0)
+    assert auth_cache.is_revoked("seeded") is True
+
+
+@pytest.mark.asyncio
+async def test_listener_keeps_subscription_while_pings_answer(
+    listen, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr("clara.auth.cache.HEALTH_CHECK_SECONDS", 0.01)
+    redis = FakeRedis({})
+    listen(redis)
+
+    await asyncio.sleep(0.1)
+    assert len(redis.subscriptions) == 1
+    assert auth_cache.enabled
+
+
+@pytest.mark.asyncio
+async def test_listener_drops_subscription_without_pong(
+    listen, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr("clara.auth.cache.HEALTH_CHECK_SECONDS", 0.01)
+    redis = FakeRedis({}, answer_pings=False)
+    listen(redis)
+    await asyncio.wait_for(redis.subscribed.wait(), 1)
+
+    await asyncio.sleep(0.1)
+    assert not auth_cache.enabled
+    await asyncio.wait_for(_resubscribed(redis), 3)
+
+
+@pytest.mark.asyncio
+async def test_removed_member_loses_cached_access(
+    cache: AuthCache,
+    authenticated_client: AsyncClient,
+    vault: Vault,
+    member_token: tuple[User, str],
+):
+    member, token = member_token
+    headers = {"authorization": f"Bearer {token}"}
+    url = f"/api/v1/vaults/{vault.id}/contacts"
+
+    resp = await authenticated_client.get(url, headers=headers)
+    assert resp.status_code == 200
+    assert cache.get_role(member.id, vault.id) == "member"
+
+    resp = await authenticated_client.delete(
+        f"/api/v1/vaults/{vault.id}/members/{member.id}"
+    )
+    assert resp.status_code == 204
+
+    resp = await authenticated_client.get(url, headers=headers)
+    assert resp.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_role_change_applies_to_cached_member(
+    cache: AuthCache,
+    authenticated_client: AsyncClient,
+    vault: Vault,
+    member_token: tuple[User, str],
+):
+    member, token = member_token
+    headers = {"authorization": f"Bearer {token}"}
+    url = f"/api/v1/vaults/{vault.id}/settings"
+
+    resp = await authenticated_client.get(url, headers=headers)
+    assert resp.status_code == 403
+
+    resp = await authenticated_client.patch(
+        f"/api/v1/vaults/{vault.id}/members/{member.id}", json={"role": "admin"}
+    )
+    assert resp.status_code == 200
+
+    resp = await authenticated_client.get(url, headers=headers)
+    assert resp.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_cached_token(cache: AuthCache, client: AsyncClient):
+    resp = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "email": "cached@example.com",
+            "password": "Password123!",
+            "name": "Cached",
+        },
+    )
+    assert resp.status_code == 201
+    token = client.cookies.get("access_token")
+    headers = {"authorization": f"Bearer {token}"}
+
+    resp = await client.get("/api/v1/auth/me", headers=headers)
+    assert resp.status_code == 200
+
+    client.headers["x-csrf-token"] = client.cookies.get("csrf_token", "")
+    resp = await client.post("/api/v1/auth/logout")
+    assert resp.status_code == 200
+
+    client.cookies.clear()
+    resp = await client.get("/api/v1/auth/me", headers=headers)
+    assert resp.status_code == 401
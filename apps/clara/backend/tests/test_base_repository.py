@@ -1,13 +1,15 @@
 import uuid
+from datetime import UTC, datetime
 
 import pytest
-from sqlalchemy import String
+from sqlalchemy import String, cast
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
 from clara.base.model import VaultScopedModel
-from clara.base.repository import BaseRepository
-from clara.exceptions import NotFoundError
+from clara.base.repository import BaseRepository, Explain, Keyset
+from clara.exceptions import InvalidCursorError, NotFoundError
 
 
 class FakeModel(VaultScopedModel):
@@ -88,6 +90,124 @@ async def test_list_pagination(db_session: AsyncSession):
     assert len(all_ids) == 5
 
 
+async def test_list_keyset_pagination(db_session: AsyncSession):
+    vault_id = uuid.uuid4()
+    repo = FakeRepo(db_session, vault_id)
+    for i in range(5):
+        await repo.create(name=f"Item {i}")
+    everything, _ = await repo.list()
+
+    seen = []
+    after = Keyset()
+    while True:
+        page, total = await repo.list(limit=2, after=after)
+        assert total == 5
+        assert len(after.seen) == len(page)
+        seen.extend(page)
+        if len(page) < 2:
+            break
+        after = Keyset(after.seen[-1])
+
+    assert [o.id for o in seen] == [o.id for o in everything]
+
+
+async def test_filtered_list_keyset_follows_order_by(db_session: AsyncSession):
+    vault_id = uuid.uuid4()
+    repo = FakeRepo(db_session, vault_id)
+    for name in ["cherry", "apple", "banana", "apple"]:
+        await repo.create(name=name)
+
+    first = Keyset()
+    page1, _ = await repo.filtered_list(
+        order_by=FakeModel.name.asc(), limit=2, after=first
+    )
+    page2, _ = await repo.filtered_list(
+        order_by=FakeModel.name.asc(), limit=2, after=Keyset(first.seen[-1])
+    )
+
+    assert [o.name for o in page1 + page2] == ["apple", "apple", "banana", "cherry"]
+    assert len({o.id for o in page1 + page2}) == 4
+
+
+async def test_keyset_survives_deleted_anchor(db_session: AsyncSession):
+    vault_id = uuid.uuid4()
+    repo = FakeRepo(db_session, vault_id)
+    for i in range(4):
+        await repo.create(name=f"Item {i}")
+    everything, _ = await repo.list()
+
+    first = Keyset()
+    page1, _ = await repo.list(limit=2, after=first)
+    await db_session.delete(page1[-1])
+    await db_session.flush()
+    page2, _ = await repo.list(limit=2, after=Keyset(first.seen[-1]))
+
+    assert [o.id for o in page2] == [o.id for o in everything[2:]]
+
+
+async def test_keyset_compares_row_values(db_session: AsyncSession):
+    repo = FakeRepo(db_session, uuid.uuid4())
+    repo._is_postgres = lambda: True  # type: ignore[method-assign]
+    stmt = await repo._paginate(
+        repo._base_query(),
+        after=Keyset((datetime(2024, 1, 1, tzinfo=UTC), uuid.uuid4())),
+    )
+
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "(fake_for_test.created_at, fake_for_test.id) < (" in sql
+    assert "ORDER BY fake_for_test.created_at DESC, fake_for_test.id DESC" in sql
+    assert "NULLS" not in sql
+
+
+async def test_list_cursor_for_other_keys(db_session: AsyncSession):
+    repo = FakeRepo(db_session, uuid.uuid4())
+
+    with pytest.raises(InvalidCursorError):
+        await repo.list(after=Keyset((uuid.uuid4(),)))
+
+    # typed values are checked where the cursor carries them
+    repo._is_postgres = lambda: True  # type: ignore[method-assign]
+    with pytest.raises(InvalidCursorError):
+        await repo._paginate(
+            repo._base_query(), after=Keyset(("yesterday", uuid.uuid4()))
+        )
+
+
+async def test_list_count_modes(db_session: AsyncSession):
+    vault_id = uuid.uuid4()
+    repo = FakeRepo(db_session, vault_id)
+    for i in range(3):
+        await repo.create(name=f"Item {i}")
+
+    items, total = await repo.list(limit=2, count="none")
+    assert total is None
+    assert len(items) == 2
+
+    # no planner statistics off PostgreSQL: the estimate is the exact count
+    _, total = await repo.filtered_list(FakeModel.name != "Item 0", count="estimate")
+    assert total == 2
+
+
+def test_explain_binds_like_the_statement():
+    dialect = postgresql.asyncpg.dialect()  # type: ignore[attr-defined]
+    stmt = (
+        FakeRepo(None, uuid.uuid4())  # type: ignore[arg-type]
+        ._base_query()
+        .where(FakeModel.name.in_(["a", "b"]))
+        .where(cast(FakeModel.name, postgresql.JSONB).contains({"tag": "x"}))
+    )
+
+    explain = Explain(stmt).compile(dialect=dialect)
+    plain = stmt.compile(dialect=dialect)
+
+    assert str(explain) == f"EXPLAIN (FORMAT JSON) {plain}"
+    assert explain.construct_params() == plain.construct_params()
+    # parameters go through bind processing, e.g. JSON serialization
+    assert explain._bind_processors
+    assert explain._bind_processors.keys() == plain._bind_processors.keys()
+
+
 async def test_update(db_session: AsyncSession):
     vault_id = uuid.uuid4()
     repo = FakeRepo(db_session, vault_id)
@@ -180,6 +180,76 @@ async def test_contacts_pagination(authenticated_client: AsyncClient, vault: Vau
     assert len(body["items"]) == 1
 
 
+async def test_contacts_cursor_pagination(
+    authenticated_client: AsyncClient, vault: Vault
+):
+    for name in ["Alice", "Bob", "Carol", "Dave", "Eve"]:
+        resp = await authenticated_client.post(
+            f"/api/v1/vaults/{vault.id}/contacts",
+            json={"first_name": name},
+        )
+        assert resp.status_code == 201
+
+    names = []
+    url = f"/api/v1/vaults/{vault.id}/contacts?limit=2"
+    resp = await authenticated_client.get(url)
+    while True:
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["meta"]["total"] == 5
+        names += [c["first_name"] for c in body["items"]]
+        cursor = body["meta"]["next_cursor"]
+        if cursor is None:
+            break
+        resp = await authenticated_client.get(f"{url}&cursor={cursor}")
+
+    assert sorted(names) == ["Alice", "Bob", "Carol", "Dave", "Eve"]
+    # the last page was partial, so it carried no cursor
+    assert len(body["items"]) == 1
+
+
+async def test_contacts_has_more_without_count(
+    authenticated_client: AsyncClient, vault: Vault
+):
+    for name in ["Alice", "Bob", "Carol", "Dave"]:
+        resp = await authenticated_client.post(
+            f"/api/v1/vaults/{vault.id}/contacts",
+            json={"first_name": name},
+        )
+        assert resp.status_code == 201
+
+    url = f"/api/v1/vaults/{vault.id}/contacts?limit=2&count=none"
+    resp = await authenticated_client.get(url)
+    assert resp.status_code == 200
+    meta = resp.json()["meta"]
+    assert meta["total"] is None
+    assert meta["has_more"] is True
+
+    # the second page ends exactly at the last contact
+    resp = await authenticated_client.get(f"{url}&cursor={meta['next_cursor']}")
+    body = resp.json()
+    assert len(body["items"]) == 2
+    assert body["meta"]["has_more"] is False
+    assert body["meta"]["next_cursor"] is None
+
+
+async def test_contacts_invalid_cursor(
+    authenticated_client: AsyncClient, vault: Vault
+):
+    from clara.pagination import encode_cursor
+
+    resp = await authenticated_client.get(
+        f"/api/v1/vaults/{vault.id}/contacts?cursor=not-a-cursor"
+    )
+    assert resp.status_code == 400
+
+    # well-formed, but not the sort keys of this list
+    resp = await authenticated_client.get(
+        f"/api/v1/vaults/{vault.id}/contacts?cursor={encode_cursor([vault.id])}"
+    )
+    assert resp.status_code == 400
+
+
 async def test_update_contact_photo_file_id(
     authenticated_client: AsyncClient, vault: Vault
 ):
@@ -213,3 +283,126 @@ async def test_contacts_sorting_by_created_at(
     items = resp.json()["items"]
     dates = [item["created_at"] for item in items]
     assert dates == sorted(dates, reverse=True)
+
+
+async def test_contacts_summary_view(
+    authenticated_client: AsyncClient, vault: Vault
+):
+    tag = await authenticated_client.post(
+        f"/api/v1/vaults/{vault.id}/tags", json={"name": "climbing"},
+    )
+    contact = await authenticated_client.post(
+        f"/api/v1/vaults/{vault.id}/contacts",
+        json={"first_name": "Ada", "last_name": "Lovelace", "gender": "f"},
+    )
+    contact_id = contact.json()["id"]
+    await authenticated_client.post(
+        f"/api/v1/vaults/{vault.id}/contacts/{contact_id}/tags",
+        json={"tag_id": tag.json()["id"]},
+    )
+    await authenticated_client.post(
+        f"/api/v1/vaults/{vault.id}/contacts", json={"first_name": "Untagged"},
+    )
+
+    resp = await authenticated_client.get(
+        f"/api/v1/vaults/{vault.id}/contacts?view=summary"
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["meta"]["total"] == 2
+    ada = next(c for c in body["items"] if c["id"] == contact_id)
+    assert set(ada) == {
+        "id", "vault_id", "first_name", "last_name", "nickname",
+        "photo_file_id", "favorite", "tags",
+    }
+    assert [t["name"] for t in ada["tags"]] == ["climbing"]
+    other = next(c for c in body["items"] if c["id"] != contact_id)
+    assert other["tags"] == []
+
+
+async def test_contacts_sparse_fields(
+    authenticated_client: AsyncClient, vault: Vault
+):
+    contact = await authenticated_client.post(
+        f"/api/v1/vaults/{vault.id}/contacts", json={"first_name": "Ada"},
+    )
+    contact_id = contact.json()["id"]
+    await authenticated_client.post(
+        f"/api/v1/vaults/{vault.id}/contacts/{contact_id}/methods",
+        json={"type": "email", "value": "ada@example.com"},
+    )
+
+    resp = await authenticated_client.get(
+        f"/api/v1/vaults/{vault.id}/contacts"
+        "?fields=first_name,birthdate&include=contact_methods"
+    )
+    assert resp.status_code == 200
+    [item] = resp.json()["items"]
+    assert set(item) == {"id", "first_name", "birthdate", "contact_methods"}
+    assert item["birthdate"] is None
+    assert item["contact_methods"][0]["value"] == "ada@example.com"
+
+    resp = await authenticated_client.get(
+        f"/api/v1/vaults/{vault.id}/contacts?fields=first_name,password"
+    )
+    assert resp.status_code == 400
+
+
+async def test_get_contact_include(authenticated_client: AsyncClient, vault: Vault):
+    contact = await authenticated_client.post(
+        f"/api/v1/vaults/{vault.id}/contacts", json={"first_name": "Ada"},
+    )
+    contact_id = contact.json()["id"]
+    for title in ["One", "Two", "Three"]:
+        resp = await authenticated_client.post(
+            f"/api/v1/vaults/{vault.id}/tasks",
+            json={"title": title, "contact_id": contact_id},
+        )
+        assert resp.status_code == 201
+
+    resp = await authenticated_client.get(
+        f"/api/v1/vaults/{vault.id}/contacts/{contact_id}"
+        "?include=tasks:2,notes,stay_in_touch"
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["first_name"] == "Ada"
+    assert len(data["tasks"]["items"]) == 2
+    assert data["tasks"]["meta"]["total"] == 3
+    assert data["tasks"]["meta"]["has_more"] is True
+    # the rest is paged on the tasks list, not with a cursor from here
+    assert data["tasks"]["meta"]["next_cursor"] is None
+    assert data["notes"] == {
+        "items": [],
+        "meta": {
+            "total": 0,
+            "offset": 0,
+            "limit": 10,
+            "has_more": False,
+            "next_cursor": None,
+        },
+    }
+    assert data["stay_in_touch"] is None
+    assert "activities" not in data
+
+    from clara.contacts.includes import INCLUDES
+
+    resp = await authenticated_client.get(
+        f"/api/v1/vaults/{vault.id}/contacts/{contact_id}"
+        f"?include={','.join(INCLUDES)}"
+    )
+    assert resp.status_code == 200
+    assert set(INCLUDES) <= set(resp.json())
+
+
+async def test_get_contact_invalid_include(
+    authenticated_client: AsyncClient, vault: Vault
+):
+    contact = await authenticated_client.post(
+        f"/api/v1/vaults/{vault.id}/contacts", json={"first_name": "Ada"},
+    )
+    url = f"/api/v1/vaults/{vault.id}/contacts/{contact.json()['id']}"
+
+    for include in ["secrets", "tasks:0", "tasks:lots"]:
+        resp = await authenticated_client.get(f"{url}?include={include}")
+        assert resp.status_code == 400
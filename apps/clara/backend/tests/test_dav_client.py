@@ -0,0 +1,128 @@
+"""Tests for the DAV client's sync-collection (RFC 6578) handling."""
+
+import os
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-clara-tests-123")
+os.environ.setdefault("DATABASE_URL", "postgresql://u:p@localhost/testdb")
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from clara.dav_sync.client import DavClient, SyncTokenExpired
+
+VCARD = """BEGIN:VCARD
+VERSION:3.0
+FN:Test User
+UID:uid-1
+END:VCARD"""
+
+SYNC_RESPONSE = f"""<?xml version="1.0" encoding="utf-8"?>
+<D:multistatus xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:carddav">
+  <D:response>
+    <D:href>/dav/ab/uid-1.vcf</D:href>
+    <D:propstat>
+      <D:prop>
+        <D:getetag>"e1"</D:getetag>
+        <C:address-data>{VCARD}</C:address-data>
+      </D:prop>
+      <D:status>HTTP/1.1 200 OK</D:status>
+    </D:propstat>
+  </D:response>
+  <D:response>
+    <D:href>/dav/ab/uid-2.vcf</D:href>
+    <D:status>HTTP/1.1 404 Not Found</D:status>
+  </D:response>
+  <D:response>
+    <D:href>/dav/ab/uid-3.vcf</D:href>
+    <D:propstat>
+      <D:prop><D:getetag>"e3"</D:getetag></D:prop>
+      <D:status>HTTP/1.1 200 OK</D:status>
+    </D:propstat>
+  </D:response>
+  <D:sync-token>http://example.com/sync/2</D:sync-token>
+</D:multistatus>"""
+
+MULTIGET_RESPONSE = f"""<?xml version="1.0" encoding="utf-8"?>
+<D:multistatus xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:carddav">
+  <D:response>
+    <D:href>/dav/ab/uid-3.vcf</D:href>
+    <D:propstat>
+      <D:prop>
+        <D:getetag>"e3"</D:getetag>
+        <C:address-data>{VCARD.replace("uid-1", "uid-3")}</C:address-data>
+      </D:prop>
+      <D:status>HTTP/1.1 200 OK</D:status>
+    </D:propstat>
+  </D:response>
+</D:multistatus>"""
+
+
+def _response(status_code: int, text: str) -> MagicMock:
+    resp = MagicMock(status_code=status_code, text=text)
+    if status_code >= 400:
+        resp.raise_for_status.side_effect = RuntimeError(status_code)
+    return resp
+
+
+@patch("clara.dav_sync.client.requests.request")
+def test_sync_vcards_returns_changes_and_deletions(mock_request):
+    mock_request.side_effect = [
+        _response(207, SYNC_RESPONSE),
+        _response(207, MULTIGET_RESPONSE),
+    ]
+    client = DavClient("https://dav.example.com", "user", "pw")
+
+    changes = client.sync_vcards("/dav/ab/", "http://example.com/sync/1")
+
+    assert changes.sync_token == "http://example.com/sync/2"
+    assert [(r.uid, r.etag) for r in changes.changed] == [
+        ("uid-1", "e1"),
+        ("uid-3", "e3"),
+    ]
+    assert changes.changed[0].href == "https://dav.example.com/dav/ab/uid-1.vcf"
+    assert changes.deleted == ["https://dav.example.com/dav/ab/uid-2.vcf"]
+    report = mock_request.call_args_list[0]
+    assert b"<D:sync-token>http://example.com/sync/1</D:sync-token>" in (
+        report.kwargs["data"]
+    )
+    # Members sent without data are fetched by href
+    assert b"addressbook-multiget" in mock_request.call_args_list[1].kwargs["data"]
+
+
+@patch("clara.dav_sync.client.requests.request")
+def test_sync_vcards_rejected_token(mock_request):
+    mock_request.return_value = _response(
+        403,
+        '<D:error xmlns:D="DAV:"><D:valid-sync-token/></D:error>',
+    )
+    client = DavClient("https://dav.example.com", "user", "pw")
+
+    with pytest.raises(SyncTokenExpired):
+        client.sync_vcards("/dav/ab/", "stale")
+
+
+@patch("clara.dav_sync.client.requests.request")
+def test_collection_state(mock_request):
+    mock_request.return_value = _response(
+        207,
+        """<D:multistatus xmlns:D="DAV:" xmlns:CS="http://calendarserver.org/ns/">
+          <D:response>
+            <D:href>/dav/ab/</D:href>
+            <D:propstat>
+              <D:prop><CS:getctag>ctag-7</CS:getctag></D:prop>
+              <D:status>HTTP/1.1 200 OK</D:status>
+            </D:propstat>
+            <D:propstat>
+              <D:prop><D:sync-token/></D:prop>
+              <D:status>HTTP/1.1 404 Not Found</D:status>
+            </D:propstat>
+          </D:response>
+        </D:multistatus>""",
+    )
+    client = DavClient("https://dav.example.com", "user", "pw")
+
+    state = client.collection_state("/dav/ab/")
+
+    assert (state.sync_token, state.ctag) == (None, "ctag-7")
+    assert mock_request.call_args.kwargs["headers"]["Depth"] == "0"
@@ -10,9 +10,18 @@ from datetime import UTC, datetime, timedelta
 from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
-from clara.dav_sync.client import DavResource
+from clara.dav_sync.client import (
+    CollectionState,
+    DavChanges,
+    DavResource,
+    SyncTokenExpired,
+)
 from clara.dav_sync.models import DavSyncMapping
-from clara.dav_sync.sync_engine import sync_entity_type
+from clara.dav_sync.sync_engine import (
+    RemoteState,
+    fetch_collection,
+    sync_entity_type,
+)
 
 VAULT_ID = uuid.uuid4()
 ACCOUNT_ID = uuid.uuid4()
@@ -36,6 +45,10 @@ def _make_account(**overrides):
         caldav_enabled=False,
         carddav_path="/dav/addressbook",
         caldav_path=None,
+        sync_token_card=None,
+        ctag_card=None,
+        sync_token_cal=None,
+        ctag_cal=None,
     )
     defaults.update(overrides)
     return SimpleNamespace(**defaults)
@@ -194,3 +207,132 @@ def test_deleted_remote_soft_deletes_local():
     # Local entity and mapping should be soft-deleted
     assert contact.deleted_at is not None
     assert mapping.deleted_at is not None
+
+
+# -- Incremental sync: only changed and deleted members come from the server --
+
+
+@patch("clara.dav_sync.sync_engine._create_local_from_remote")
+def test_incremental_sync_keeps_unreported_mappings(mock_create):
+    """Mappings absent from the changes stay; reported deletions delete."""
+    kept_id, gone_id = uuid.uuid4(), uuid.uuid4()
+    kept = _make_contact(contact_id=kept_id, updated_at=PAST)
+    gone = _make_contact(contact_id=gone_id, updated_at=PAST)
+    kept_mapping = _make_mapping(kept_id, "kept-uid")
+    gone_mapping = _make_mapping(gone_id, "gone-uid")
+    new = DavResource(
+        uid="new-uid",
+        href="https://dav.example.com/dav/addressbook/new.vcf",
+        etag="e1",
+        data=VCARD_DATA,
+    )
+    remote = RemoteState(
+        [new],
+        # Absolute and percent-encoded, unlike the stored relative href
+        deleted_hrefs=["https://dav.example.com/dav/addressbook/gone%2Duid.vcf"],
+        complete=False,
+    )
+    created = _make_contact()
+    mock_create.return_value = created
+
+    client = MagicMock()
+    session = _mock_session(
+        mappings=[kept_mapping, gone_mapping], contacts=[kept, gone]
+    )
+
+    counts = sync_entity_type(session, client, _make_account(), "contact", remote)
+
+    assert counts == {"unchanged": 1, "deleted_remote": 1, "new_remote": 1}
+    client.list_vcards.assert_not_called()
+    assert kept.deleted_at is None
+    assert gone.deleted_at is not None
+    assert not remote.failed
+
+
+def test_incremental_sync_deletes_unreported_remote_for_local_deletion():
+    """A local deletion removes the remote copy from its stored href and etag."""
+    contact_id = uuid.uuid4()
+    contact = _make_contact(contact_id=contact_id, deleted_at=NOW)
+    mapping = _make_mapping(contact_id, "deleted-here", etag="e7")
+
+    client = MagicMock()
+    session = _mock_session(mappings=[mapping], contacts=[contact])
+    remote = RemoteState([], complete=False)
+
+    counts = sync_entity_type(session, client, _make_account(), "contact", remote)
+
+    assert counts == {"deleted_local": 1}
+    client.delete_vcard.assert_called_once_with(
+        "/dav/addressbook/deleted-here.vcf", "e7"
+    )
+
+
+def test_fetch_collection_skips_unchanged_collection():
+    client = MagicMock()
+    client.collection_state.return_value = CollectionState(
+        sync_token="tok-1", ctag="ctag-1"
+    )
+    account = _make_account(sync_token_card="tok-1", ctag_card="ctag-1")
+
+    remote = fetch_collection(client, account, "card")
+
+    assert remote == RemoteState(
+        [], complete=False, sync_token="tok-1", ctag="ctag-1"
+    )
+    client.sync_vcards.assert_not_called()
+    client.list_vcards.assert_not_called()
+
+
+def test_fetch_collection_requests_changes_since_token():
+    changed = DavResource(uid="u1", href="/dav/addressbook/u1.vcf", etag="e2",
+                          data=VCARD_DATA)
+    client = MagicMock()
+    client.collection_state.return_value = CollectionState(
+        sync_token="tok-2", ctag=None
+    )
+    client.sync_vcards.return_value = DavChanges(
+        sync_token="tok-2", changed=[changed], deleted=["/dav/addressbook/x.vcf"]
+    )
+    account = _make_account(sync_token_card="tok-1")
+
+    remote = fetch_collection(client, account, "card")
+
+    client.sync_vcards.assert_called_once_with("/dav/addressbook", "tok-1")
+    assert remote is not None
+    assert remote.resources == [changed]
+    assert remote.deleted_hrefs == ["/dav/addressbook/x.vcf"]
+    assert remote.complete is False
+    assert remote.sync_token == "tok-2"
+
+
+def test_fetch_collection_restarts_on_expired_token():
+    client = MagicMock()
+    client.collection_state.return_value = CollectionState(
+        sync_token="tok-9", ctag=None
+    )
+    client.sync_vcards.side_effect = [
+        SyncTokenExpired("/dav/addressbook"),
+        DavChanges(sync_token="tok-9"),
+    ]
+    account = _make_account(sync_token_card="tok-1")
+
+    remote = fetch_collection(client, account, "card")
+
+    assert client.sync_vcards.call_args_list[1].args == ("/dav/addressbook", None)
+    assert remote is not None
+    assert remote.complete is True
+    assert remote.sync_token == "tok-9"
+
+
+def test_fetch_collection_lists_all_without_sync_token_support():
+    client = MagicMock()
+    client.collection_state.return_value = CollectionState(
+        sync_token=None, ctag="ctag-2"
+    )
+    client.list_vcards.return_value = []
+    account = _make_account(ctag_card="ctag-1")
+
+    remote = fetch_collection(client, account, "card")
+
+    client.sync_vcards.assert_not_called()
+    assert remote == RemoteState([], complete=True, ctag="ctag-2")
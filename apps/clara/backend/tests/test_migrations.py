@@ -0,0 +1,47 @@
+import io
+from itertools import pairwise
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from alembic.script import Script, ScriptDirectory
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def _scripts() -> ScriptDirectory:
+    return ScriptDirectory.from_config(Config(str(ALEMBIC_INI)))
+
+
+def _revisions() -> list[Script]:
+    """Migrations from base to head."""
+    return list(reversed(list(_scripts().walk_revisions("base", "heads"))))
+
+
+def test_migrations_form_a_single_chain():
+    revisions = _revisions()
+
+    assert revisions[0].down_revision is None
+    for previous, revision in pairwise(revisions):
+        assert revision.down_revision == previous.revision
+    assert _scripts().get_heads() == [revisions[-1].revision]
+
+
+def test_migrations_render_for_postgres_both_ways():
+    buf = io.StringIO()
+    context = MigrationContext.configure(
+        dialect_name="postgresql", opts={"as_sql": True, "output_buffer": buf}
+    )
+    revisions = _revisions()
+
+    with Operations.context(context):
+        for revision in revisions:
+            revision.module.upgrade()
+        upgrade_sql = buf.getvalue()
+        for revision in reversed(revisions):
+            revision.module.downgrade()
+
+    assert "CREATE TABLE users" in upgrade_sql
+    assert "search_vector" in upgrade_sql
+    assert buf.getvalue().rstrip().endswith("DROP TABLE users;")
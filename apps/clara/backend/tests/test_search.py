@@ -0,0 +1,118 @@
+import pytest
+from conftest import create_contact
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from clara.auth.models import Vault
+from clara.contacts.repository import ContactRepository
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _seed(client: AsyncClient, vault_id: str) -> dict[str, str]:
+    ids = {
+        "ada": await create_contact(client, vault_id, "Ada"),
+        "bob": await create_contact(client, vault_id, "Bob"),
+        "cyd": await create_contact(client, vault_id, "Cyd"),
+        "dee": await create_contact(client, vault_id, "Dee"),
+    }
+    base = f"/api/v1/vaults/{vault_id}/contacts"
+    resp = await client.post(
+        f"{base}/{ids['bob']}/methods",
+        json={"type": "email", "value": "bob@lovelace.example"},
+    )
+    assert resp.status_code == 201
+    resp = await client.post(
+        f"{base}/{ids['cyd']}/addresses", json={"city": "Brno"}
+    )
+    assert resp.status_code == 201
+    resp = await client.post(
+        f"/api/v1/vaults/{vault_id}/tags", json={"name": "climbing"}
+    )
+    assert resp.status_code == 201
+    resp = await client.post(
+        f"{base}/{ids['dee']}/tags", json={"tag_id": resp.json()["id"]}
+    )
+    assert resp.status_code == 201
+    return ids
+
+
+async def test_contacts_q_matches_methods_cities_and_tags(
+    authenticated_client: AsyncClient, vault: Vault
+):
+    ids = await _seed(authenticated_client, str(vault.id))
+    base = f"/api/v1/vaults/{vault.id}/contacts"
+
+    cases = {"ada": "ada", "lovelace": "bob", "brn": "cyd", "CLIMB": "dee"}
+    for q, expected in cases.items():
+        resp = await authenticated_client.get(base, params={"q": q})
+        assert resp.status_code == 200
+        body = resp.json()
+        assert [c["id"] for c in body["items"]] == [ids[expected]], q
+        assert body["meta"]["total"] == 1
+
+
+async def test_contacts_q_escapes_like_wildcards(
+    authenticated_client: AsyncClient, vault: Vault
+):
+    await create_contact(authenticated_client, str(vault.id), "Eve")
+
+    resp = await authenticated_client.get(
+        f"/api/v1/vaults/{vault.id}/contacts", params={"q": "%"}
+    )
+    assert resp.json()["meta"]["total"] == 0
+
+
+async def test_vault_search_returns_ranked_hits(
+    authenticated_client: AsyncClient, vault: Vault
+):
+    ids = await _seed(authenticated_client, str(vault.id))
+
+    resp = await authenticated_client.get(
+        f"/api/v1/vaults/{vault.id}/search", params={"q": "brno", "limit": 5}
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["meta"] == {
+        "total": 1, "offset": 0, "limit": 5, "has_more": False, "next_cursor": None
+    }
+    hit = body["items"][0]
+    assert hit["kind"] == "contact"
+    assert hit["id"] == ids["cyd"]
+    assert hit["title"] == "Cyd"
+    assert isinstance(hit["rank"], float)
+
+
+async def test_vault_search_requires_query(
+    authenticated_client: AsyncClient, vault: Vault
+):
+    resp = await authenticated_client.get(f"/api/v1/vaults/{vault.id}/search")
+    assert resp.status_code == 422
+
+
+async def test_postgres_search_uses_indexed_columns(
+    db_session: AsyncSession, vault: Vault
+):
+    repo = ContactRepository(session=db_session, vault_id=vault.id)
+    repo._is_postgres = lambda: True  # type: ignore[method-assign]
+
+    stmt = repo._apply_filters(repo._base_query(), q="ada lovelace")
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "contacts.search_vector @@ websearch_to_tsquery" in sql
+    assert "contacts.search_text ILIKE" in sql
+    assert "<%% contacts.search_text" in sql
+
+
+async def test_postgres_search_rank_uses_indexed_columns(
+    db_session: AsyncSession, vault: Vault
+):
+    repo = ContactRepository(session=db_session, vault_id=vault.id)
+    repo._is_postgres = lambda: True  # type: ignore[method-assign]
+
+    sql = str(repo._search_rank("ada").compile(dialect=postgresql.dialect()))
+
+    assert "ts_rank_cd(contacts.search_vector, websearch_to_tsquery(" in sql
+    assert "word_similarity(" in sql
+    assert "contacts.search_text)" in sql
@@ -1,7 +1,9 @@
 export interface PaginationMeta {
-  total: number;
+  total: number | null;
   offset: number;
   limit: number;
+  has_more?: boolean;
+  next_cursor?: string | null;
 }
 
 export interface PaginatedResponse<T> {
@@ -0,0 +1,92 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Any, Callable, TypeVar
+
+from app.database import SQLiteDatabase
+from app.models import Symbol
+
+T = TypeVar("T")
+
+
+class AsyncDatabase:
+    """Awaitable facade over SQLiteDatabase for async route handlers.
+
+    Every call runs on one dedicated DB thread, fed through the executor's
+    queue. The SQLite connection is serialized by a lock anyway, so a single
+    thread loses no parallelism, and waiting requests hold no threads.
+    """
+
+    def __init__(self, db: SQLiteDatabase):
+        self._db = db
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+
+    @property
+    def sync(self) -> SQLiteDatabase:
+        return self._db
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run fn(*args, **kwargs) on the DB thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def get_data_version(self, scope: str) -> int:
+        return await self.run(self._db.get_data_version, scope)
+
+    async def get_rate(
+        self, date_str: str, provider_symbol: str, provider: str, as_of: datetime | None = None
+    ) -> float | None:
+        return await self.run(self._db.get_rate, date_str, provider_symbol, provider, as_of)
+
+    async def get_rates_for_date(self, date_str: str, provider: str | None = None) -> list[dict]:
+        return await self.run(self._db.get_rates_for_date, date_str, provider)
+
+    async def get_rates_range(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        provider: str | None = None,
+        provider_symbol: str | None = None,
+        as_of: datetime | None = None,
+    ) -> list[dict]:
+        return await self.run(
+            self._db.get_rates_range, symbol, start_date, end_date, provider, provider_symbol, as_of
+        )
+
+    async def get_coverage(
+        self, year: int, provider: str | None = None, symbols: list[str] | None = None
+    ) -> dict[str, int]:
+        return await self.run(self._db.get_coverage, year, provider, symbols)
+
+    async def get_missing_symbols(
+        self, year: int, symbols: list[str], provider: str | None = None
+    ) -> dict[str, list[str]]:
+        return await self.run(self._db.get_missing_symbols, year, symbols, provider)
+
+    async def get_symbol_variants(self, normalized_symbol: str) -> list[Symbol]:
+        return await self.run(self._db.get_symbol_variants, normalized_symbol)
+
+    async def list_favorites(self) -> list[dict]:
+        return await self.run(self._db.list_favorites)
+
+    async def store_rate(self, date_str: str, provider_symbol: str, provider: str, rate: float) -> None:
+        """Upsert and commit one rate in a single trip to the DB thread."""
+        def store() -> None:
+            self._db.upsert_rate(date_str, provider_symbol, provider, rate)
+            self._db.commit()
+
+        await self.run(store)
+
+    async def store_rates(self, provider: str, rows: list[tuple[str, str, float]]) -> int:
+        """Upsert and commit many (date, provider_symbol, rate) rows in one batch."""
+        def store() -> int:
+            written = self._db.upsert_rates(provider, rows)
+            self._db.commit()
+            return written
+
+        return await self.run(store)
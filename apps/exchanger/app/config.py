@@ -11,11 +11,16 @@ DEFAULT_SCHEDULER_TICK_SECONDS = 5.0
 DEFAULT_RATE_LIMIT_WAIT = 65
 DEFAULT_PROVIDER_CNB_FETCH_DELAY = 2.0
 DEFAULT_DASHBOARD_HISTORY_DAYS = 7
+DEFAULT_LEADER_LEASE_SECONDS = 30.0
+DEFAULT_ON_DEMAND_MAX_CONCURRENCY = 8
 
 
 @dataclass(frozen=True)
 class Settings:
     provider_api_keys: dict[str, str] = field(default_factory=dict)
+    provider_monthly_budgets: dict[str, int] = field(default_factory=dict)  # provider → credits/month
+    provider_max_concurrency: dict[str, int] = field(default_factory=dict)  # provider → concurrent tasks
+    on_demand_max_concurrency: int = DEFAULT_ON_DEMAND_MAX_CONCURRENCY  # upstream threads for missing rates
     db_path: str = DEFAULT_DB_PATH
     backup_dir: str = ""  # defaults to 'backups' subdir next to db_path
     symbols: dict[str, list[str]] = field(default_factory=dict)  # provider → symbols
@@ -26,6 +31,8 @@ class Settings:
     rate_limit_wait: int = DEFAULT_RATE_LIMIT_WAIT
     provider_cnb_fetch_delay: float = DEFAULT_PROVIDER_CNB_FETCH_DELAY
     dashboard_history_days: int = DEFAULT_DASHBOARD_HISTORY_DAYS
+    leader_lease_seconds: float = DEFAULT_LEADER_LEASE_SECONDS
+    rate_revisions: bool = False  # log changed rates for as-of reads
     log_level: str = DEFAULT_LOG_LEVEL
 
 
@@ -33,6 +40,11 @@ def load_settings() -> Settings:
     from pathlib import Path
 
     provider_api_keys = _load_provider_api_keys()
+    provider_monthly_budgets = _load_provider_monthly_budgets()
+    provider_max_concurrency = _load_provider_max_concurrency()
+    on_demand_max_concurrency = _parse_int("ON_DEMAND_MAX_CONCURRENCY", DEFAULT_ON_DEMAND_MAX_CONCURRENCY)
+    if on_demand_max_concurrency < 1:
+        raise ValueError(f"Invalid ON_DEMAND_MAX_CONCURRENCY={on_demand_max_concurrency} (expected positive integer)")
     symbols = _parse_symbols(os.getenv("SYMBOLS", ""))
 
     db_path = os.getenv("DB_PATH", DEFAULT_DB_PATH)
@@ -42,6 +54,9 @@ def load_settings() -> Settings:
 
     return Settings(
         provider_api_keys=provider_api_keys,
+        provider_monthly_budgets=provider_monthly_budgets,
+        provider_max_concurrency=provider_max_concurrency,
+        on_demand_max_concurrency=on_demand_max_concurrency,
         db_path=db_path,
         backup_dir=backup_dir,
         symbols=symbols,
@@ -56,6 +71,8 @@ def load_settings() -> Settings:
         rate_limit_wait=_parse_int("RATE_LIMIT_WAIT", DEFAULT_RATE_LIMIT_WAIT),
         provider_cnb_fetch_delay=_parse_float("PROVIDER_CNB_FETCH_DELAY", DEFAULT_PROVIDER_CNB_FETCH_DELAY),
         dashboard_history_days=_parse_int("DASHBOARD_HISTORY_DAYS", DEFAULT_DASHBOARD_HISTORY_DAYS),
+        leader_lease_seconds=_parse_float("LEADER_LEASE_SECONDS", DEFAULT_LEADER_LEASE_SECONDS),
+        rate_revisions=_parse_bool("RATE_REVISIONS", False),
         log_level=os.getenv("LOG_LEVEL", DEFAULT_LOG_LEVEL).upper(),
     )
 
@@ -80,6 +97,17 @@ def _parse_float(env_var: str, default: float) -> float:
         raise ValueError(f"Invalid {env_var}={val!r} (expected number)")
 
 
+def _parse_bool(env_var: str, default: bool) -> bool:
+    val = os.getenv(env_var)
+    if val is None or not val.strip():
+        return default
+    if val.strip().lower() in ("1", "true", "yes", "on"):
+        return True
+    if val.strip().lower() in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"Invalid {env_var}={val!r} (expected true or false)")
+
+
 def parse_backfill_times(raw: str) -> tuple[str, ...]:
     """Parse AUTO_BACKFILL_TIME into normalized, sorted, deduped HH:MM strings.
 
@@ -180,3 +208,39 @@ def _load_provider_api_keys() -> dict[str, str]:
                 keys[provider] = value
 
     return keys
+
+
+def _load_provider_monthly_budgets() -> dict[str, int]:
+    """Load API credit budgets from PROVIDER_<NAME>_MONTHLY_BUDGET env vars."""
+    prefix = "PROVIDER_"
+    suffix = "_MONTHLY_BUDGET"
+    budgets: dict[str, int] = {}
+
+    for name in os.environ:
+        if name.startswith(prefix) and name.endswith(suffix):
+            provider = name[len(prefix) : -len(suffix)].lower()
+            budget = _parse_int(name, 0)
+            if budget < 0:
+                raise ValueError(f"Invalid {name}={budget} (expected non-negative integer)")
+            if budget:
+                budgets[provider] = budget
+
+    return budgets
+
+
+def _load_provider_max_concurrency() -> dict[str, int]:
+    """Load task concurrency caps from PROVIDER_<NAME>_MAX_CONCURRENCY env vars."""
+    prefix = "PROVIDER_"
+    suffix = "_MAX_CONCURRENCY"
+    limits: dict[str, int] = {}
+
+    for name in os.environ:
+        if name.startswith(prefix) and name.endswith(suffix):
+            provider = name[len(prefix) : -len(suffix)].lower()
+            limit = _parse_int(name, 0)
+            if limit < 0:
+                raise ValueError(f"Invalid {name}={limit} (expected non-negative integer)")
+            if limit:
+                limits[provider] = limit
+
+    return limits
@@ -1,10 +1,13 @@
 import logging
+import os
 import sqlite3
 import threading
-from datetime import date, timedelta
-from typing import Protocol
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Iterator, Protocol
+from urllib.parse import quote
 
-from app.models import Rate, Symbol, SymbolType
+from app.metrics import InstrumentedLock
+from app.models import Rate, Symbol, SymbolInfo, SymbolType
 
 logger = logging.getLogger(__name__)
 
@@ -25,20 +28,70 @@ class RatesRepository(Protocol):
 
 
 class SymbolsRepository(Protocol):
-    def populate_symbols(self, provider: str, symbols: list[Symbol]) -> None: ...
+    def populate_symbols(self, provider: str, symbols: Iterable[Symbol | SymbolInfo]) -> None: ...
+    def stage_symbols(self, provider: str, symbols: Iterable[Symbol | SymbolInfo]) -> int: ...
+    def discard_staged_symbols(self, provider: str) -> None: ...
+    def apply_staged_symbols(self, provider: str) -> None: ...
     def commit(self) -> None: ...
 
 
-SCHEMA_VERSION = 7
+SCHEMA_VERSION = 12
+
+# Rows fetched per step when streaming an export
+EXPORT_BATCH_SIZE = 10_000
+
+
+class RatesExport:
+    """Rates matching an export filter, read in batches from one snapshot.
+
+    `symbols` maps symbol_id -> (provider, symbol, provider_symbol) for every
+    symbol that can appear in the rows; `batches()` yields
+    (date, symbol_id, rate) rows ordered by date and closes the export when done.
+    """
+
+    def __init__(
+        self,
+        symbols: dict[int, tuple[str, str, str]],
+        rows: Iterator[list[tuple[str, int, float]]],
+        conn: sqlite3.Connection | None = None,
+    ):
+        self.symbols = symbols
+        self._rows = rows
+        self._conn = conn
+
+    def batches(self) -> Iterator[list[tuple[str, int, float]]]:
+        try:
+            yield from self._rows
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
 
 class SQLiteDatabase:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, rate_revisions: bool = False):
         logger.debug("opening database at %s", db_path)
+        self._db_path = db_path
         self._conn = sqlite3.connect(db_path, check_same_thread=False)
-        self._lock = threading.Lock()
+        self._lock = InstrumentedLock()
         self._closed = False
+        self._changed_scopes: set[str] = set()
+        # Committed values replaced in the current transaction, by (symbol_id, date),
+        # logged to rate_revisions on commit
+        self._rate_revisions = rate_revisions
+        self._pending_revisions: dict[tuple[int, str], float | None] = {}
         self._init_db()
+        # Worker coordination (lease, task status, task requests) runs in autocommit
+        # on its own connection so it never commits or blocks on the main transaction
+        if db_path == ":memory:":
+            # A second connection would open a separate, empty database
+            self._coord_conn, self._coord_lock = self._conn, self._lock
+        else:
+            self._coord_conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._coord_lock = threading.Lock()
         logger.debug("database initialized")
 
     def _init_db(self) -> None:
@@ -75,6 +128,26 @@ class SQLiteDatabase:
             self._migrate_v6_to_v7()
             version = 7
 
+        if version == 7:
+            self._migrate_v7_to_v8()
+            version = 8
+
+        if version == 8:
+            self._migrate_v8_to_v9()
+            version = 9
+
+        if version == 9:
+            self._migrate_v9_to_v10()
+            version = 10
+
+        if version == 10:
+            self._migrate_v10_to_v11()
+            version = 11
+
+        if version == 11:
+            self._migrate_v11_to_v12()
+            version = 12
+
         self._set_schema_version(version)
 
     def _migrate_v0_to_v7(self) -> None:
@@ -130,6 +203,77 @@ class SQLiteDatabase:
                     (row[0], created_at),
                 )
 
+    def _migrate_v7_to_v8(self) -> None:
+        """Add tables shared between worker processes (leader lease, task status, task requests)."""
+        logger.debug("migrating v7 to v8: adding worker coordination tables")
+        self._create_worker_tables()
+
+    def _migrate_v8_to_v9(self) -> None:
+        """Add data version counters used for response caching and ETags."""
+        logger.debug("migrating v8 to v9: adding data_versions table")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS data_versions (
+                scope TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            )
+        """)
+
+    def _migrate_v9_to_v10(self) -> None:
+        """Add the append-only log of replaced rates (days and replace times as integers)."""
+        logger.debug("migrating v9 to v10: adding rate_revisions table")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rate_revisions (
+                symbol_id INTEGER NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+                day INTEGER NOT NULL,
+                rate REAL NOT NULL,
+                replaced_at INTEGER NOT NULL,
+                PRIMARY KEY(symbol_id, day, replaced_at)
+            ) WITHOUT ROWID
+        """)
+
+    def _migrate_v10_to_v11(self) -> None:
+        """Move API credit counters from metadata JSON to rows updated in place."""
+        import json
+        logger.debug("migrating v10 to v11: adding api_usage table")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS api_usage (
+                provider TEXT NOT NULL,
+                window TEXT NOT NULL,
+                period TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY(provider, window)
+            ) WITHOUT ROWID
+        """)
+        cur = self._conn.execute("SELECT key, value FROM metadata WHERE key LIKE 'api_usage:%'")
+        for key, value in cur.fetchall():
+            try:
+                usage = json.loads(value)
+            except (json.JSONDecodeError, TypeError):
+                continue
+            for window in ("minute", "day", "month"):
+                if window in usage:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO api_usage (provider, window, period, count) VALUES (?, ?, ?, ?)",
+                        (key.removeprefix("api_usage:"), window, usage[window], usage.get(f"{window}_count", 0)),
+                    )
+        self._conn.execute("DELETE FROM metadata WHERE key LIKE 'api_usage:%'")
+
+    def _migrate_v11_to_v12(self) -> None:
+        """Allow NULL revision rates, which mark when a day was first stored."""
+        logger.debug("migrating v11 to v12: making rate_revisions.rate nullable")
+        self._conn.execute("""
+            CREATE TABLE rate_revisions_new (
+                symbol_id INTEGER NOT NULL REFERENCES symbols(id) ON DELETE CASCADE,
+                day INTEGER NOT NULL,
+                rate REAL,
+                replaced_at INTEGER NOT NULL,
+                PRIMARY KEY(symbol_id, day, replaced_at)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("INSERT INTO rate_revisions_new SELECT symbol_id, day, rate, replaced_at FROM rate_revisions")
+        self._conn.execute("DROP TABLE rate_revisions")
+        self._conn.execute("ALTER TABLE rate_revisions_new RENAME TO rate_revisions")
+
     def _migrate_v2_to_v3(self) -> None:
         """Add metadata table."""
         logger.debug("migrating v2 to v3: adding metadata table")
@@ -156,6 +300,29 @@ class SQLiteDatabase:
             )
         """)
 
+    def _create_worker_tables(self) -> None:
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS task_status (
+                task TEXT PRIMARY KEY,
+                status TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS task_requests (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                params TEXT NOT NULL
+            )
+        """)
+
     def _get_schema_version(self) -> int:
         cur = self._conn.execute(
             "SELECT name FROM sqlite_master WHERE type='table' AND name='schema_version'"
@@ -227,7 +394,11 @@ class SQLiteDatabase:
         # v7: favorites uses symbol_id FK
         self._create_v5_schema()
 
-    def get_rate(self, date: str, provider_symbol: str, provider: str) -> float | None:
+    def get_rate(
+        self, date: str, provider_symbol: str, provider: str, as_of: datetime | None = None
+    ) -> float | None:
+        if as_of is not None:
+            return self._get_rate_as_of(date, provider_symbol, provider, as_of)
         with self._lock:
             if self._closed:
                 return None
@@ -244,6 +415,50 @@ class SQLiteDatabase:
             logger.debug("get_rate: date=%s provider_symbol=%s provider=%s -> %s", date, provider_symbol, provider, rate)
             return rate
 
+    def _get_rate_as_of(self, date: str, provider_symbol: str, provider: str, as_of: datetime) -> float | None:
+        """Rate as it was known at as_of, from the revision log.
+
+        The oldest value replaced after as_of was the one stored at as_of;
+        without one, the current value still is. A NULL revision marks the
+        first store, so a day stored after as_of returns None.
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            row = self._conn.execute(
+                """
+                SELECT CASE WHEN EXISTS (
+                    SELECT 1 FROM rate_revisions v
+                    WHERE v.symbol_id = s.id AND v.day = ?1 AND v.replaced_at > ?2
+                ) THEN (
+                    SELECT v.rate FROM rate_revisions v
+                    WHERE v.symbol_id = s.id AND v.day = ?1 AND v.replaced_at > ?2
+                    ORDER BY v.replaced_at LIMIT 1
+                ) ELSE (
+                    SELECT r.rate FROM rates r WHERE r.symbol_id = s.id AND r.date = ?3
+                ) END
+                FROM symbols s
+                WHERE s.provider_symbol = ?4 AND s.provider = ?5
+                """,
+                (_day_number(date), _timestamp(as_of), date, provider_symbol, provider),
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_latest_rate_date(self, provider_symbol: str, provider: str, after: str, before: str) -> str | None:
+        """Newest stored date strictly between after and before, for one symbol."""
+        with self._lock:
+            if self._closed:
+                return None
+            row = self._conn.execute(
+                """
+                SELECT MAX(r.date) FROM rates r
+                JOIN symbols s ON r.symbol_id = s.id
+                WHERE s.provider_symbol = ? AND s.provider = ? AND r.date > ? AND r.date < ?
+                """,
+                (provider_symbol, provider, after, before),
+            ).fetchone()
+            return row[0] if row else None
+
     def get_rates_for_date(self, date: str, provider: str | None = None) -> list[dict]:
         query = """
             SELECT s.symbol, s.provider_symbol, r.rate, s.provider, s.type
@@ -283,6 +498,7 @@ class SQLiteDatabase:
         to_date: date,
         provider: str | None = None,
         provider_symbol: str | None = None,
+        as_of: datetime | None = None,
     ) -> list[dict]:
         """Return daily rates for a symbol between two dates (inclusive).
 
@@ -292,6 +508,7 @@ class SQLiteDatabase:
             to_date: End date
             provider: Optional provider filter
             provider_symbol: If provided, query by this exact provider_symbol instead of normalized symbol
+            as_of: If provided, return rates as known at that time (see _get_rate_as_of)
         """
         if from_date > to_date:
             return []
@@ -324,12 +541,16 @@ class SQLiteDatabase:
             params.append(provider)
 
         query += " ORDER BY r.date ASC"
+        if as_of is not None:
+            query = query.replace("SELECT r.date, r.rate", "SELECT r.date, r.rate, r.symbol_id", 1)
 
         with self._lock:
             if self._closed:
                 return []
             cur = self._conn.execute(query, params)
             rows = cur.fetchall()
+            if as_of is not None:
+                rows = self._apply_revisions(rows, start, end, as_of)
 
         rates_by_date: dict[str, float] = {}
         for date_str, rate in rows:
@@ -344,6 +565,38 @@ class SQLiteDatabase:
 
         return result
 
+    def _apply_revisions(
+        self, rows: list[tuple[str, float, int]], start: str, end: str, as_of: datetime
+    ) -> list[tuple[str, float]]:
+        """Replace current (date, rate, symbol_id) rows with their values at as_of (caller must hold lock).
+
+        Days whose oldest revision after as_of is a NULL first-store marker
+        were not known yet and are dropped.
+        """
+        symbol_ids = sorted({row[2] for row in rows})
+        if not symbol_ids:
+            return []
+        marks = ",".join("?" * len(symbol_ids))
+        # Bare column with MIN(): SQLite returns the rate of the oldest row per group,
+        # i.e. the value that was still stored at as_of
+        replaced = {
+            (symbol_id, day): rate
+            for symbol_id, day, rate, _ in self._conn.execute(
+                f"""
+                SELECT symbol_id, day, rate, MIN(replaced_at) FROM rate_revisions
+                WHERE symbol_id IN ({marks}) AND day BETWEEN ? AND ? AND replaced_at > ?
+                GROUP BY symbol_id, day
+                """,
+                [*symbol_ids, _day_number(start), _day_number(end), _timestamp(as_of)],
+            )
+        }
+        result = []
+        for date_str, rate, symbol_id in rows:
+            known = replaced.get((symbol_id, _day_number(date_str)), rate)
+            if known is not None:
+                result.append((date_str, known))
+        return result
+
     def get_coverage(
         self,
         year: int,
@@ -433,6 +686,8 @@ class SQLiteDatabase:
         with self._lock:
             if self._closed:
                 return False
+            if self._rate_revisions:
+                self._queue_replaced(date, provider_symbol, provider, rate)
             # Atomic insert with subquery - no race between SELECT and INSERT
             cur = self._conn.execute(
                 """
@@ -444,9 +699,34 @@ class SQLiteDatabase:
             if cur.rowcount == 0:
                 logger.warning("upsert_rate: provider_symbol %s not found for provider %s", provider_symbol, provider)
                 return False
+            self._mark_changed("rates", f"rates:{provider}", f"rates:{provider}:{provider_symbol}")
             logger.debug("upsert_rate: date=%s provider_symbol=%s provider=%s rate=%s", date, provider_symbol, provider, rate)
             return True
 
+    def upsert_rates(self, provider: str, rows: list[tuple[str, str, float]]) -> int:
+        """Upsert many (date, provider_symbol, rate) rows of one provider in one statement.
+
+        Symbol ids are resolved once up front; rows for symbols not in the DB
+        are skipped. Caller commits. Returns the number of rows written.
+        """
+        with self._lock:
+            if self._closed or not rows:
+                return 0
+            ids = dict(self._conn.execute(
+                "SELECT provider_symbol, id FROM symbols WHERE provider = ?", (provider,)
+            ).fetchall())
+            params = [(day, ids[sym], rate) for day, sym, rate in rows if sym in ids]
+            if self._rate_revisions and params:
+                self._queue_replaced_many(params)
+            self._conn.executemany("INSERT OR REPLACE INTO rates (date, symbol_id, rate) VALUES (?, ?, ?)", params)
+
+            written = {sym for _, sym, _ in rows if sym in ids}
+            if written:
+                self._mark_changed("rates", f"rates:{provider}", *(f"rates:{provider}:{sym}" for sym in written))
+            if len(params) < len(rows):
+                logger.warning("upsert_rates: skipped %d rows (symbols not found for %s)", len(rows) - len(params), provider)
+            return len(params)
+
     def get_symbol(self, provider_symbol: str, provider: str) -> Symbol | None:
         with self._lock:
             if self._closed:
@@ -554,36 +834,67 @@ class SQLiteDatabase:
                 for row in cur.fetchall()
             ]
 
-    def populate_symbols(self, provider: str, symbols: list[Symbol]) -> None:
+    def populate_symbols(self, provider: str, symbols: Iterable[Symbol | SymbolInfo]) -> None:
         """Sync symbols for a provider - adds new, updates changed, removes stale.
 
-        Uses a temp table for atomic comparison and update.
+        Shorthand for staging the whole list and applying it.
+        """
+        self.discard_staged_symbols(provider)
+        self.stage_symbols(provider, symbols)
+        self.apply_staged_symbols(provider)
+
+    def _ensure_symbol_staging(self) -> None:
+        # Temp table (per connection) holding incoming symbols until applied
+        self._conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS _incoming_symbols (
+                provider TEXT NOT NULL,
+                provider_symbol TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                type TEXT NOT NULL,
+                name TEXT,
+                PRIMARY KEY (provider, provider_symbol)
+            )
+        """)
+
+    def stage_symbols(self, provider: str, symbols: Iterable[Symbol | SymbolInfo]) -> int:
+        """Add symbols to the provider's staging set; returns how many were given.
+
+        Called once per page while a listing is still being fetched. Nothing
+        is visible until apply_staged_symbols().
         """
+        with self._lock:
+            if self._closed:
+                return 0
+            self._ensure_symbol_staging()
+            rows = [(provider, s.provider_symbol, s.symbol, s.type, s.name) for s in symbols]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO _incoming_symbols (provider, provider_symbol, symbol, type, name) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            return len(rows)
+
+    def discard_staged_symbols(self, provider: str) -> None:
+        """Drop the provider's staged symbols (e.g. after a failed listing)."""
         with self._lock:
             if self._closed:
                 return
+            self._ensure_symbol_staging()
+            self._conn.execute("DELETE FROM _incoming_symbols WHERE provider = ?", (provider,))
 
-            logger.debug("populate_symbols: provider=%s, incoming=%d symbols", provider, len(symbols))
+    def apply_staged_symbols(self, provider: str) -> None:
+        """Replace the provider's symbols with the staged set - adds new, updates
+        changed, removes stale (and their rates) - then clears the staging set.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._ensure_symbol_staging()
 
-            # Create temp table for staging incoming symbols
-            self._conn.execute("""
-                CREATE TEMP TABLE IF NOT EXISTS _incoming_symbols (
-                    provider_symbol TEXT PRIMARY KEY,
-                    symbol TEXT NOT NULL,
-                    type TEXT NOT NULL,
-                    name TEXT
-                )
-            """)
+            cur = self._conn.execute("SELECT COUNT(*) FROM _incoming_symbols WHERE provider = ?", (provider,))
+            logger.debug("apply_staged_symbols: provider=%s, incoming=%d symbols", provider, cur.fetchone()[0])
 
             try:
-                # Clear temp table and populate with incoming data
-                self._conn.execute("DELETE FROM _incoming_symbols")
-                for s in symbols:
-                    self._conn.execute(
-                        "INSERT OR REPLACE INTO _incoming_symbols (provider_symbol, symbol, type, name) VALUES (?, ?, ?, ?)",
-                        (s.provider_symbol, s.symbol, s.type, s.name),
-                    )
-
                 # Use savepoint for atomic rollback on failure
                 self._conn.execute("SAVEPOINT populate_symbols_sp")
 
@@ -591,49 +902,52 @@ class SQLiteDatabase:
                 cur = self._conn.execute("""
                     SELECT COUNT(*) FROM symbols
                     WHERE provider = ?
-                    AND provider_symbol NOT IN (SELECT provider_symbol FROM _incoming_symbols)
-                """, (provider,))
+                    AND provider_symbol NOT IN (SELECT provider_symbol FROM _incoming_symbols WHERE provider = ?)
+                """, (provider, provider))
                 stale_count = cur.fetchone()[0]
                 if stale_count:
                     logger.debug("removing %d stale symbols from provider=%s", stale_count, provider)
+                    self._mark_changed("rates", f"rates:{provider}*")
 
                 # Delete rates for symbols being removed
                 self._conn.execute("""
                     DELETE FROM rates WHERE symbol_id IN (
                         SELECT s.id FROM symbols s
                         WHERE s.provider = ?
-                        AND s.provider_symbol NOT IN (SELECT provider_symbol FROM _incoming_symbols)
+                        AND s.provider_symbol NOT IN (SELECT provider_symbol FROM _incoming_symbols WHERE provider = ?)
                     )
-                """, (provider,))
+                """, (provider, provider))
 
                 # Delete stale symbols
                 self._conn.execute("""
                     DELETE FROM symbols
                     WHERE provider = ?
-                    AND provider_symbol NOT IN (SELECT provider_symbol FROM _incoming_symbols)
-                """, (provider,))
+                    AND provider_symbol NOT IN (SELECT provider_symbol FROM _incoming_symbols WHERE provider = ?)
+                """, (provider, provider))
 
                 # Update existing symbols
                 self._conn.execute("""
-                    UPDATE symbols SET
-                        symbol = (SELECT symbol FROM _incoming_symbols WHERE provider_symbol = symbols.provider_symbol),
-                        type = (SELECT type FROM _incoming_symbols WHERE provider_symbol = symbols.provider_symbol),
-                        name = (SELECT name FROM _incoming_symbols WHERE provider_symbol = symbols.provider_symbol)
+                    UPDATE symbols SET (symbol, type, name) = (
+                        SELECT i.symbol, i.type, i.name FROM _incoming_symbols i
+                        WHERE i.provider = symbols.provider AND i.provider_symbol = symbols.provider_symbol
+                    )
                     WHERE provider = ?
-                    AND provider_symbol IN (SELECT provider_symbol FROM _incoming_symbols)
-                """, (provider,))
+                    AND provider_symbol IN (SELECT provider_symbol FROM _incoming_symbols WHERE provider = ?)
+                """, (provider, provider))
 
                 # Insert new symbols (those not already in main table for this provider)
                 self._conn.execute("""
                     INSERT INTO symbols (provider, symbol, provider_symbol, type, name)
-                    SELECT ?, i.symbol, i.provider_symbol, i.type, i.name
+                    SELECT i.provider, i.symbol, i.provider_symbol, i.type, i.name
                     FROM _incoming_symbols i
-                    WHERE NOT EXISTS (
+                    WHERE i.provider = ?
+                    AND NOT EXISTS (
                         SELECT 1 FROM symbols s
-                        WHERE s.provider = ? AND s.provider_symbol = i.provider_symbol
+                        WHERE s.provider = i.provider AND s.provider_symbol = i.provider_symbol
                     )
-                """, (provider, provider))
+                """, (provider,))
 
+                self._mark_changed("symbols")
                 self._conn.execute("RELEASE populate_symbols_sp")
                 logger.debug("populate_symbols completed for provider=%s", provider)
 
@@ -642,8 +956,8 @@ class SQLiteDatabase:
                 self._conn.execute("RELEASE populate_symbols_sp")
                 raise
             finally:
-                # Clear temp table for next use
-                self._conn.execute("DELETE FROM _incoming_symbols")
+                # Clear staging for next use
+                self._conn.execute("DELETE FROM _incoming_symbols WHERE provider = ?", (provider,))
 
     def get_symbols_populated_at(self, provider: str) -> str | None:
         """Get ISO timestamp of when symbols were last populated for provider."""
@@ -731,6 +1045,291 @@ class SQLiteDatabase:
                 (f"backfill_checkpoint:{provider}",),
             )
 
+    def get_backfill_backlog(self, provider: str) -> list[dict]:
+        """Get symbols deferred by the budget planner.
+
+        Returns list of {symbol, length} dicts in processing order.
+        """
+        import json
+        with self._lock:
+            if self._closed:
+                return []
+            cur = self._conn.execute(
+                "SELECT value FROM metadata WHERE key = ?",
+                (f"backfill_backlog:{provider}",),
+            )
+            row = cur.fetchone()
+            if not row:
+                return []
+            try:
+                return json.loads(row[0])
+            except (json.JSONDecodeError, TypeError):
+                return []
+
+    def set_backfill_backlog(self, provider: str, backlog: list[dict]) -> None:
+        """Save deferred backfill symbols for provider (empty list clears)."""
+        import json
+        with self._lock:
+            if self._closed:
+                return
+            if not backlog:
+                self._conn.execute(
+                    "DELETE FROM metadata WHERE key = ?",
+                    (f"backfill_backlog:{provider}",),
+                )
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                (f"backfill_backlog:{provider}", json.dumps(backlog)),
+            )
+
+    def get_api_usage(self, provider: str) -> dict[str, tuple[str, int]]:
+        """API credits counted for provider, as {window: (period, count)}."""
+        with self._coord_lock:
+            if self._closed:
+                return {}
+            cur = self._coord_conn.execute(
+                "SELECT window, period, count FROM api_usage WHERE provider = ?",
+                (provider,),
+            )
+            return {window: (period, count) for window, period, count in cur.fetchall()}
+
+    def add_api_usage(self, provider: str, periods: dict[str, str], credits: int) -> None:
+        """Count credits in each window's current period.
+
+        A window's count restarts when its period changes. One autocommit
+        statement, so increments from concurrent workers all add up.
+        """
+        with self._coord_lock:
+            if self._closed:
+                return
+            self._coord_conn.execute(
+                f"""
+                INSERT INTO api_usage (provider, window, period, count)
+                VALUES {", ".join("(?, ?, ?, ?)" for _ in periods)}
+                ON CONFLICT(provider, window) DO UPDATE SET
+                    count = CASE WHEN api_usage.period = excluded.period
+                        THEN api_usage.count + excluded.count ELSE excluded.count END,
+                    period = excluded.period
+                WHERE excluded.period >= api_usage.period
+                """,
+                [value for window, period in periods.items() for value in (provider, window, period, credits)],
+            )
+            if self._coord_conn is self._conn:
+                self._conn.commit()
+
+    def get_data_version(self, scope: str) -> int:
+        """Current version of a data scope (e.g. "symbols"); 0 if never written."""
+        with self._lock:
+            if self._closed:
+                return 0
+            cur = self._conn.execute(
+                "SELECT version FROM data_versions WHERE scope = ?",
+                (scope,),
+            )
+            row = cur.fetchone()
+            return row[0] if row else 0
+
+    def _mark_changed(self, *scopes: str) -> None:
+        """Record data scopes written in the current transaction (caller must hold lock).
+
+        Versions are bumped once per scope on commit rather than per write. A
+        scope ending in "*" bumps every existing scope with that prefix.
+        """
+        self._changed_scopes.update(scopes)
+
+    def _queue_replaced(self, date: str, provider_symbol: str, provider: str, rate: float) -> None:
+        """Remember the stored value a rate write is about to replace (caller must hold lock).
+
+        A first store queues None, which is logged as the day's first-store marker.
+        """
+        row = self._conn.execute(
+            """
+            SELECT s.id, r.rate FROM symbols s
+            LEFT JOIN rates r ON r.symbol_id = s.id AND r.date = ?
+            WHERE s.provider_symbol = ? AND s.provider = ?
+            """,
+            (date, provider_symbol, provider),
+        ).fetchone()
+        if row and row[1] != rate:
+            # The first replaced value of a transaction is the committed one
+            self._pending_revisions.setdefault((row[0], date), row[1])
+
+    def _queue_replaced_many(self, params: list[tuple[str, int, float]]) -> None:
+        """Batched _queue_replaced for (date, symbol_id, rate) writes (caller must hold lock)."""
+        symbol_ids = sorted({symbol_id for _, symbol_id, _ in params})
+        days = [day for day, _, _ in params]
+        stored = {
+            (symbol_id, day): rate
+            for day, symbol_id, rate in self._conn.execute(
+                f"""
+                SELECT date, symbol_id, rate FROM rates
+                WHERE symbol_id IN ({",".join("?" * len(symbol_ids))}) AND date BETWEEN ? AND ?
+                """,
+                [*symbol_ids, min(days), max(days)],
+            )
+        }
+        for day, symbol_id, rate in params:
+            old = stored.get((symbol_id, day))
+            if old != rate:
+                self._pending_revisions.setdefault((symbol_id, day), old)
+
+    def _flush_revisions(self) -> None:
+        """Log the committed values this transaction replaced (caller must hold lock).
+
+        One batched insert at commit, stamped with the commit time. A value is
+        skipped when the transaction wrote it back, so only rates that really
+        changed are logged; the current value stays in rates alone. A NULL
+        rate records that the day had no value before replaced_at.
+        """
+        if not self._pending_revisions:
+            return
+        replaced_at = int(datetime.now(timezone.utc).timestamp())
+        self._conn.executemany(
+            """
+            INSERT OR IGNORE INTO rate_revisions (symbol_id, day, rate, replaced_at)
+            SELECT ?1, ?2, ?3, ?4
+            WHERE (SELECT r.rate FROM rates r WHERE r.symbol_id = ?1 AND r.date = ?5) IS NOT ?3
+            """,
+            [
+                (symbol_id, _day_number(day), rate, replaced_at, day)
+                for (symbol_id, day), rate in self._pending_revisions.items()
+            ],
+        )
+        self._pending_revisions.clear()
+
+    def get_rate_revisions(self, date: str, provider_symbol: str, provider: str) -> list[dict]:
+        """Replaced values of one rate, oldest first; a None rate marks the first store."""
+        with self._lock:
+            if self._closed:
+                return []
+            rows = self._conn.execute(
+                """
+                SELECT v.rate, v.replaced_at FROM rate_revisions v
+                JOIN symbols s ON v.symbol_id = s.id
+                WHERE s.provider_symbol = ? AND s.provider = ? AND v.day = ?
+                ORDER BY v.replaced_at
+                """,
+                (provider_symbol, provider, _day_number(date)),
+            ).fetchall()
+        return [
+            {"rate": rate, "replaced_at": datetime.fromtimestamp(replaced_at, timezone.utc).isoformat()}
+            for rate, replaced_at in rows
+        ]
+
+    def _flush_data_versions(self) -> None:
+        """Bump versions of changed scopes ahead of commit (caller must hold lock)."""
+        for scope in sorted(self._changed_scopes):
+            if scope.endswith("*"):
+                self._conn.execute(
+                    "UPDATE data_versions SET version = version + 1 WHERE scope LIKE ?",
+                    (scope[:-1] + "%",),
+                )
+            else:
+                self._conn.execute(
+                    """
+                    INSERT INTO data_versions (scope, version) VALUES (?, 1)
+                    ON CONFLICT(scope) DO UPDATE SET version = version + 1
+                    """,
+                    (scope,),
+                )
+        self._changed_scopes.clear()
+
+    def acquire_lease(self, name: str, holder: str, ttl_seconds: float, now: float) -> bool:
+        """Take or renew a named lease. Returns True if holder owns it afterwards.
+
+        Succeeds if the lease is free, already held by holder, or expired.
+        Single statement, so it is atomic across processes.
+        """
+        with self._coord_lock:
+            if self._closed:
+                return False
+            cur = self._coord_conn.execute(
+                """
+                INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    holder = excluded.holder,
+                    expires_at = excluded.expires_at
+                WHERE leases.holder = excluded.holder OR leases.expires_at < ?
+                """,
+                (name, holder, now + ttl_seconds, now),
+            )
+            return cur.rowcount > 0
+
+    def release_lease(self, name: str, holder: str) -> None:
+        """Give up a lease if holder still owns it."""
+        with self._coord_lock:
+            if self._closed:
+                return
+            self._coord_conn.execute(
+                "DELETE FROM leases WHERE name = ? AND holder = ?",
+                (name, holder),
+            )
+
+    def save_task_status(self, task: str, status: dict) -> None:
+        """Store task status so every worker can serve it."""
+        import json
+        with self._coord_lock:
+            if self._closed:
+                return
+            self._coord_conn.execute(
+                "INSERT OR REPLACE INTO task_status (task, status) VALUES (?, ?)",
+                (task, json.dumps(status)),
+            )
+
+    def load_task_statuses(self) -> dict[str, dict]:
+        """Load all stored task statuses."""
+        import json
+        with self._coord_lock:
+            if self._closed:
+                return {}
+            cur = self._coord_conn.execute("SELECT task, status FROM task_status")
+            rows = cur.fetchall()
+        result: dict[str, dict] = {}
+        for task, status in rows:
+            try:
+                result[task] = json.loads(status)
+            except (json.JSONDecodeError, TypeError):
+                continue
+        return result
+
+    def add_task_request(self, task: str, kind: str, params: dict) -> None:
+        """Queue a background job for the leader worker to start."""
+        import json
+        with self._coord_lock:
+            if self._closed:
+                return
+            self._coord_conn.execute(
+                "INSERT INTO task_requests (task, kind, params) VALUES (?, ?, ?)",
+                (task, kind, json.dumps(params)),
+            )
+
+    def pop_task_requests(self) -> list[dict]:
+        """Take all queued job requests (oldest first), removing them from the queue."""
+        import json
+        with self._coord_lock:
+            if self._closed:
+                return []
+            cur = self._coord_conn.execute(
+                "SELECT id, task, kind, params FROM task_requests ORDER BY id"
+            )
+            rows = cur.fetchall()
+            # Only the leader pops, so nothing else deletes between these statements
+            if rows:
+                self._coord_conn.execute("DELETE FROM task_requests WHERE id <= ?", (rows[-1][0],))
+        return [
+            {"task": row[1], "kind": row[2], "params": json.loads(row[3])}
+            for row in rows
+        ]
+
+    def list_requested_tasks(self) -> set[str]:
+        """Task keys with queued job requests."""
+        with self._coord_lock:
+            if self._closed:
+                return set()
+            cur = self._coord_conn.execute("SELECT DISTINCT task FROM task_requests")
+            return {row[0] for row in cur.fetchall()}
+
     def count_symbols(self, provider: str) -> int:
         """Count symbols for a provider."""
         with self._lock:
@@ -771,6 +1370,8 @@ class SQLiteDatabase:
                     """,
                     (provider, s.symbol, s.provider_symbol, s.type, s.name),
                 )
+            if symbols:
+                self._mark_changed("symbols")
 
     def _export_rates_internal(self) -> list[dict]:
         """Export rates without lock (caller must hold lock)."""
@@ -830,6 +1431,68 @@ class SQLiteDatabase:
                 self._conn.execute("ROLLBACK")
                 raise
 
+    def open_rates_export(
+        self,
+        providers: list[str] | None = None,
+        symbols: list[str] | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> RatesExport:
+        """Start a streaming export of rates.
+
+        Reads go through a separate read-only connection inside one read
+        transaction, so the rows form a consistent snapshot and a slow consumer
+        never holds the main connection lock (WAL lets writers continue).
+        `symbols` matches normalized or provider symbols.
+        """
+        where: list[str] = []
+        params: list[str] = []
+        if providers:
+            where.append(f"s.provider IN ({','.join('?' * len(providers))})")
+            params += providers
+        if symbols:
+            marks = ",".join("?" * len(symbols))
+            where.append(f"(s.symbol IN ({marks}) OR s.provider_symbol IN ({marks}))")
+            params += symbols + symbols
+        symbol_filter = " AND ".join(where) or "1"
+        symbols_query = f"SELECT s.id, s.provider, s.symbol, s.provider_symbol FROM symbols s WHERE {symbol_filter}"
+        rates_query = f"""
+            SELECT r.date, r.symbol_id, r.rate
+            FROM rates r
+            JOIN symbols s ON r.symbol_id = s.id
+            WHERE {symbol_filter} AND r.date BETWEEN ? AND ?
+            ORDER BY r.date, r.symbol_id
+        """
+        rates_params = params + [
+            from_date.isoformat() if from_date else "0000-00-00",
+            to_date.isoformat() if to_date else "9999-99-99",
+        ]
+
+        if self._db_path == ":memory:":
+            # No second connection can see this database: read it all under the lock
+            with self._lock:
+                symbol_rows = self._conn.execute(symbols_query, params).fetchall()
+                rows = self._conn.execute(rates_query, rates_params).fetchall()
+            batches = iter([rows[i : i + batch_size] for i in range(0, len(rows), batch_size)])
+            return RatesExport({r[0]: r[1:] for r in symbol_rows}, batches)
+
+        uri = f"file:{quote(os.path.abspath(self._db_path))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        try:
+            conn.execute("BEGIN")
+            symbol_rows = conn.execute(symbols_query, params).fetchall()
+            cursor = conn.execute(rates_query, rates_params)
+        except Exception:
+            conn.close()
+            raise
+
+        def fetch() -> Iterator[list[tuple[str, int, float]]]:
+            while rows := cursor.fetchmany(batch_size):
+                yield rows
+
+        return RatesExport({r[0]: r[1:] for r in symbol_rows}, fetch(), conn)
+
     def export_rates(self) -> list[dict]:
         """Export rates denormalized (includes provider_symbol and provider, not symbol_id)."""
         with self._lock:
@@ -937,6 +1600,7 @@ class SQLiteDatabase:
             if self._closed:
                 return 0
             self._conn.execute("DELETE FROM rates")
+            self._mark_changed("rates*")
             if not rows:
                 return 0
 
@@ -958,6 +1622,8 @@ class SQLiteDatabase:
                     "INSERT INTO rates (date, symbol_id, rate) VALUES (?, ?, ?)",
                     (row["date"], symbol_row[0], row["rate"]),
                 )
+                # Scopes that had no version yet still need one, or they stay at 0
+                self._mark_changed("rates", f"rates:{row['provider']}", f"rates:{row['provider']}:{provider_symbol}")
                 count += 1
 
             if skipped:
@@ -971,6 +1637,7 @@ class SQLiteDatabase:
                 return 0
             self._conn.execute("DELETE FROM rates")
             self._conn.execute("DELETE FROM symbols")
+            self._mark_changed("symbols", "rates*")
             if not rows:
                 return 0
 
@@ -1019,12 +1686,16 @@ class SQLiteDatabase:
         with self._lock:
             if self._closed:
                 return
+            self._changed_scopes.clear()
+            self._pending_revisions.clear()
             self._conn.execute("ROLLBACK")
 
     def commit(self) -> None:
         with self._lock:
             if self._closed:
                 return
+            self._flush_revisions()
+            self._flush_data_versions()
             self._conn.commit()
 
     def close(self) -> None:
@@ -1032,5 +1703,26 @@ class SQLiteDatabase:
             if self._closed:
                 return
             self._closed = True
+            self._flush_revisions()
+            self._flush_data_versions()
             self._conn.commit()
             self._conn.close()
+            if self._coord_conn is self._conn:
+                return
+        with self._coord_lock:
+            self._coord_conn.close()
+
+
+def _day_number(date_str: str) -> int:
+    """Compact day key for rate_revisions: days since 1970-01-01."""
+    return date.fromisoformat(date_str).toordinal() - _EPOCH_ORDINAL
+
+
+def _timestamp(dt: datetime) -> int:
+    """Unix seconds; naive datetimes are taken as UTC."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
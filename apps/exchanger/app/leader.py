@@ -0,0 +1,133 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Protocol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_NAME = "background"
+
+
+class LeaseDatabase(Protocol):
+    def acquire_lease(self, name: str, holder: str, ttl_seconds: float, now: float) -> bool: ...
+    def release_lease(self, name: str, holder: str) -> None: ...
+
+
+class LeaderElection:
+    """Elects one worker process to run background jobs via a SQLite lease row.
+
+    Every worker tries to take or renew the lease on each tick. The holder
+    renews it well before `ttl_seconds` runs out; if the holder dies, another
+    worker takes over once the lease has expired.
+
+    A holder whose renewals fail steps down one tick before its lease can
+    expire, so it stops its jobs before another worker can take over.
+    """
+
+    def __init__(
+        self,
+        db: LeaseDatabase,
+        ttl_seconds: float,
+        name: str = DEFAULT_LEASE_NAME,
+        holder: str | None = None,
+        tick_seconds: float = 1.0,
+    ):
+        self._db = db
+        self._ttl_seconds = ttl_seconds
+        self._name = name
+        self._holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tick_seconds = min(tick_seconds, ttl_seconds / 3)
+        self._is_leader = False
+        # time.monotonic() when the lease was last taken or renewed
+        self._renewed_at = 0.0
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def holder(self) -> str:
+        return self._holder
+
+    @property
+    def is_leader(self) -> bool:
+        return self._is_leader and not self._lease_running_out()
+
+    def try_acquire(self) -> bool:
+        """Take or renew the lease. Returns True if this worker holds it."""
+        attempted_at = time.monotonic()
+        try:
+            acquired = self._db.acquire_lease(self._name, self._holder, self._ttl_seconds, time.time())
+        except Exception as e:
+            # Locked by another process mid-write: keep the role while the lease lasts
+            logger.warning("lease %s check failed: %s", self._name, e)
+            return self.is_leader
+        if acquired:
+            self._renewed_at = attempted_at
+        return acquired
+
+    def _lease_running_out(self) -> bool:
+        """True once the last renewal is too old to keep acting as leader."""
+        return time.monotonic() - self._renewed_at >= self._ttl_seconds - self._tick_seconds
+
+    def start(
+        self,
+        on_elected: Callable[[], None],
+        on_tick: Callable[[bool], None] | None = None,
+        on_lost: Callable[[], None] | None = None,
+    ) -> None:
+        """Run the election loop.
+
+        The first attempt runs synchronously, so a single worker is leader as
+        soon as `start` returns.
+        """
+        self._step(on_elected, None, on_lost)
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._loop, args=(on_elected, on_tick, on_lost), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the loop and release the lease so another worker can take over."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._is_leader:
+            self._is_leader = False
+            try:
+                self._db.release_lease(self._name, self._holder)
+            except Exception as e:
+                logger.warning("failed to release lease %s: %s", self._name, e)
+
+    def _loop(
+        self,
+        on_elected: Callable[[], None],
+        on_tick: Callable[[bool], None] | None,
+        on_lost: Callable[[], None] | None,
+    ) -> None:
+        while not self._stop_event.wait(self._tick_seconds):
+            self._step(on_elected, on_tick, on_lost)
+
+    def _step(
+        self,
+        on_elected: Callable[[], None],
+        on_tick: Callable[[bool], None] | None,
+        on_lost: Callable[[], None] | None,
+    ) -> None:
+        acquired = self.try_acquire()
+        was_leader = self._is_leader
+        self._is_leader = acquired
+        try:
+            if acquired and not was_leader:
+                logger.info("worker %s elected leader", self._holder)
+                on_elected()
+            elif was_leader and not acquired:
+                logger.warning("worker %s lost leadership", self._holder)
+                if on_lost:
+                    on_lost()
+            if on_tick:
+                on_tick(acquired)
+        except Exception as e:
+            logger.error("leader callback failed: %s", e)
@@ -9,16 +9,21 @@ from fastapi import FastAPI, Request
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.async_database import AsyncDatabase
 from app.config import Settings, configure_logging, load_settings
 from app.database import SQLiteDatabase
+from app.leader import LeaderElection
+from app.metrics import metrics_endpoint
 from app.routes import create_router
 from app.scheduler import BackgroundScheduler
 from app.services.backfill import BackfillService
+from app.services.on_demand import OnDemandFetcher
+from app.services.quota import QuotaTracker
 from app.services.symbols import SymbolsService
 from app.sources.registry import SourceRegistry
 from app.sources.fcs import FcsSource
 from app.sources.cnb import CnbSource
-from app.task_manager import TaskManager
+from app.task_manager import TaskCancelled, TaskManager
 from app.utils.retry import set_shutdown
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
@@ -38,10 +43,13 @@ class Application:
     def __init__(self, settings: Settings):
         logger.debug("initializing app with db_path=%s", settings.db_path)
         self.settings = settings
-        self.db = SQLiteDatabase(settings.db_path)
-        self.task_manager = TaskManager()
+        self.db = SQLiteDatabase(settings.db_path, rate_revisions=settings.rate_revisions)
+        self.task_manager = TaskManager(store=self.db, provider_limits=settings.provider_max_concurrency)
+        self.leader = LeaderElection(self.db, settings.leader_lease_seconds)
+        self.task_manager.set_leader_check(lambda: self.leader.is_leader)
         self.scheduler = BackgroundScheduler(settings.scheduler_tick_seconds)
         self._backfill_retry_delays: dict[str, int] = {}
+        self.quotas: dict[str, QuotaTracker] = {}
 
         # Create source registry and register providers
         self.registry = SourceRegistry()
@@ -52,12 +60,16 @@ class Application:
             db=self.db,
             registry=self.registry,
             auto_backfill_times=settings.auto_backfill_times,
+            quotas=self.quotas,
+            configured_symbols=settings.symbols,
         )
         self.symbols_service = SymbolsService(
             db=self.db,
             registry=self.registry,
             max_age_days=settings.symbols_max_age_days,
         )
+        self.async_db = AsyncDatabase(self.db)
+        self.on_demand = OnDemandFetcher(self.registry, self.async_db, settings.on_demand_max_concurrency)
         logger.debug("app initialized, providers=%s", self.registry.ids())
 
     def _register_sources(self, settings: Settings) -> None:
@@ -65,9 +77,17 @@ class Application:
         # FCS source (requires API key)
         if "fcs" in settings.provider_api_keys:
             logger.debug("registering fcs source")
+            quota = QuotaTracker(
+                self.db,
+                "fcs",
+                monthly_budget=settings.provider_monthly_budgets.get("fcs", 0),
+                runs_per_day=len(settings.auto_backfill_times),
+            )
+            self.quotas["fcs"] = quota
             fcs_source = FcsSource(
                 settings.provider_api_keys["fcs"],
                 settings.rate_limit_wait,
+                on_request=quota.record,
             )
             self.registry.register(fcs_source)
 
@@ -77,28 +97,46 @@ class Application:
         self.registry.register(cnb_source)
 
     def start_backfill_if_idle(
-        self, provider: str, symbols: list[str], length: int, retry_on_failure: bool = False
+        self,
+        provider: str,
+        symbols: list[str],
+        length: int,
+        retry_on_failure: bool = False,
+        backlog_only: bool = False,
+        latest_only: bool = False,
     ) -> bool:
         task_key = f"backfill:{provider}"
 
         def on_progress(data: str | dict) -> None:
             if self.task_manager.shutdown_requested:
                 raise ShutdownRequested()
+            self.task_manager.raise_if_cancelled(task_key)
             if isinstance(data, dict):
                 self.task_manager.update_status(task_key, **data)
             else:
                 self.task_manager.update_status(task_key, message=data)
 
         def run() -> None:
-            logger.info(f"Backfill started: provider={provider}, symbols={symbols}, days={length}")
+            if backlog_only:
+                logger.info(f"Backfill started: provider={provider}, deferred backlog")
+            elif latest_only:
+                logger.info(f"Latest refresh started: provider={provider}, symbols={symbols}")
+            else:
+                logger.info(f"Backfill started: provider={provider}, symbols={symbols}, days={length}")
             self.task_manager.update_status(task_key, per_symbol={})
             try:
-                results, failures = self.backfill_service.backfill(
-                    provider,
-                    symbols,
-                    length,
-                    on_progress=on_progress,
-                )
+                if latest_only:
+                    results, failures = self.backfill_service.refresh_latest(
+                        provider, symbols, on_progress=on_progress
+                    )
+                else:
+                    results, failures = self.backfill_service.backfill(
+                        provider,
+                        symbols,
+                        length,
+                        on_progress=on_progress,
+                        backlog_only=backlog_only,
+                    )
                 total = sum(results.values())
                 self.backfill_service.mark_done(provider)
                 msg = f"Completed: {total} rows"
@@ -118,13 +156,16 @@ class Application:
             except ShutdownRequested:
                 logger.info(f"Backfill {provider} interrupted by shutdown")
                 self.task_manager.set_status(task_key, {"status": "cancelled", "message": "Shutdown requested"})
+            except TaskCancelled:
+                logger.info(f"Backfill {provider} cancelled")
+                self.task_manager.set_status(task_key, {"status": "cancelled", "message": "Cancelled"})
             except Exception as e:
                 logger.error(f"Backfill {provider} failed: {e}")
                 if retry_on_failure:
                     self._schedule_backfill_retry(provider, symbols, length)
                 self.task_manager.set_status(task_key, {"status": "error", "message": str(e)})
 
-        return self.task_manager.start_if_idle(task_key, run)
+        return self.task_manager.start_if_idle(task_key, run, lane="bulk")
 
     def _schedule_backfill_retry(self, provider: str, symbols: list[str], length: int) -> None:
         delay = self._backfill_retry_delays.get(provider, BACKFILL_RETRY_INITIAL_SECONDS)
@@ -164,6 +205,7 @@ class Application:
         def on_progress(msg: str) -> None:
             if self.task_manager.shutdown_requested:
                 raise ShutdownRequested()
+            self.task_manager.raise_if_cancelled(task_key)
             self.task_manager.update_status(task_key, message=msg)
 
         def run() -> None:
@@ -193,6 +235,9 @@ class Application:
             except ShutdownRequested:
                 logger.info(f"Populate symbols {provider} interrupted by shutdown")
                 self.task_manager.set_status(task_key, {"status": "cancelled", "message": "Shutdown requested"})
+            except TaskCancelled:
+                logger.info(f"Populate symbols {provider} cancelled")
+                self.task_manager.set_status(task_key, {"status": "cancelled", "message": "Cancelled"})
             except Exception as e:
                 logger.error(f"Populate symbols {provider} failed: {e}")
                 self.task_manager.set_status(task_key, {"status": "error", "message": str(e)})
@@ -200,6 +245,29 @@ class Application:
         return self.task_manager.start_if_idle(task_key, run)
 
     def startup(self) -> None:
+        """Join the leader election; only the elected worker runs background jobs."""
+        self.leader.start(
+            on_elected=self._on_elected,
+            on_tick=self._on_leader_tick,
+            on_lost=self._on_leadership_lost,
+        )
+
+    def _on_elected(self) -> None:
+        self.task_manager.adopt_store()
+        self._start_background()
+
+    def _on_leader_tick(self, is_leader: bool) -> None:
+        if is_leader:
+            self.task_manager.run_requested()
+        else:
+            self.task_manager.sync_from_store()
+
+    def _on_leadership_lost(self) -> None:
+        # The new leader owns the schedule and adopts the jobs from now on
+        self.scheduler.stop()
+        self.task_manager.cancel_all("Cancelled (leadership lost)")
+
+    def _start_background(self) -> None:
         logger.debug(
             "startup: symbols=%s, backfill_times=%s",
             self.settings.symbols,
@@ -244,9 +312,17 @@ class Application:
                     # Population chains backfill when done
                     self._start_populate_then_backfill(provider)
                 elif provider in backfill_map and self.backfill_service.needs_backfill(provider):
+                    # Up to date apart from today: one batched latest-price call per
+                    # chunk of symbols instead of a history page per symbol
                     self.start_backfill_if_idle(
                         provider, backfill_map[provider], self.settings.auto_backfill_days,
                         retry_on_failure=True,
+                        latest_only=self.backfill_service.can_refresh_latest(provider),
+                    )
+                elif self.backfill_service.has_backlog(provider):
+                    # Budget-deferred symbols drain one allowance per scheduled run
+                    self.start_backfill_if_idle(
+                        provider, [], self.settings.auto_backfill_days, backlog_only=True,
                     )
 
         for backfill_time in self.settings.auto_backfill_times:
@@ -257,8 +333,11 @@ class Application:
     def shutdown(self) -> None:
         logger.debug("shutting down")
         set_shutdown()  # Interrupt any rate-limit waits
+        self.leader.stop()
         self.scheduler.stop()
         self.task_manager.shutdown()
+        self.on_demand.close()
+        self.async_db.close()
         self.db.close()
         logger.info("app shutdown complete")
 
@@ -293,8 +372,12 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         backfill_service=application.backfill_service,
         symbols_service=application.symbols_service,
         registry=application.registry,
+        quotas=application.quotas,
+        async_db=application.async_db,
+        on_demand=application.on_demand,
     )
     fastapi_app.include_router(router, prefix="/api")
+    fastapi_app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
     static_directory = Path(__file__).resolve().parent / "static"
     fastapi_app.mount("/", StaticFiles(directory=static_directory, html=True), name="static")
 
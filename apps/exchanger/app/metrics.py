@@ -0,0 +1,117 @@
+import os
+import sys
+import threading
+from time import perf_counter
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Upstream calls range from ~50 ms (CNB) to several seconds (paged FCS history)
+UPSTREAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# SQLite work under the connection lock is mostly sub-millisecond
+DB_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+UPSTREAM_REQUEST_SECONDS = Histogram(
+    "exchanger_upstream_request_seconds",
+    "Latency of upstream provider requests",
+    ["provider", "endpoint"],
+    buckets=UPSTREAM_BUCKETS,
+)
+UPSTREAM_ERRORS = Counter(
+    "exchanger_upstream_errors_total",
+    "Failed upstream requests (kind: exception, error, rate_limited)",
+    ["provider", "kind"],
+)
+RATE_LIMIT_WAIT_SECONDS = Counter(
+    "exchanger_rate_limit_wait_seconds_total",
+    "Time spent waiting out provider rate limits",
+    ["provider"],
+)
+BACKFILL_ROWS = Counter(
+    "exchanger_backfill_rows_total",
+    "Rates written by backfills",
+    ["provider"],
+)
+BACKFILL_WORK_UNITS = Counter(
+    "exchanger_backfill_work_units_total",
+    "Backfill work units completed (upstream pages or days)",
+    ["provider"],
+)
+BACKFILL_SECONDS = Histogram(
+    "exchanger_backfill_seconds",
+    "Duration of a backfill run per provider",
+    ["provider"],
+    buckets=(1, 5, 15, 60, 300, 900, 3600, 4 * 3600),
+)
+BACKFILL_ROWS_PER_SECOND = Gauge(
+    "exchanger_backfill_rows_per_second",
+    "Write throughput of the last backfill run",
+    ["provider"],
+    multiprocess_mode="mostrecent",
+)
+DB_LOCK_WAIT_SECONDS = Histogram(
+    "exchanger_db_lock_wait_seconds",
+    "Time spent waiting for the SQLite connection lock",
+    ["method"],
+    buckets=DB_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "exchanger_db_query_seconds",
+    "Time spent holding the SQLite connection lock",
+    ["method"],
+    buckets=DB_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "exchanger_cache_requests_total",
+    "Cache lookups (result: hit, miss, not_modified)",
+    ["cache", "result"],
+)
+
+
+class InstrumentedLock:
+    """threading.Lock that records wait and hold time per calling method.
+
+    Used as the SQLiteDatabase connection lock, so hold time is the time a
+    method spends running its statements.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._method = ""
+        self._acquired_at = 0.0
+
+    def __enter__(self) -> "InstrumentedLock":
+        method = sys._getframe(1).f_code.co_name
+        start = perf_counter()
+        self._lock.acquire()
+        # Only the holder writes these, so they are safe without another lock
+        self._acquired_at = perf_counter()
+        self._method = method
+        DB_LOCK_WAIT_SECONDS.labels(method).observe(self._acquired_at - start)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        DB_QUERY_SECONDS.labels(self._method).observe(perf_counter() - self._acquired_at)
+        self._lock.release()
+
+
+def metrics_endpoint(request: Request) -> Response:
+    """Prometheus scrape endpoint.
+
+    With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR so every worker
+    writes its samples there and any worker can serve the combined view.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import Literal, Any
 
 SymbolType = Literal["forex", "crypto"]
-TaskStatus = Literal["running", "done", "error"]
+TaskStatus = Literal["queued", "running", "done", "error", "cancelled"]
 
 
 @dataclass
@@ -93,6 +93,11 @@ class RateHistoryItem(BaseModel):
     rate: float | None
 
 
+class RateRevisionItem(BaseModel):
+    rate: float | None
+    replaced_at: str
+
+
 class ScheduledResponse(BaseModel):
     scheduled: bool
     message: str
@@ -100,6 +105,11 @@ class ScheduledResponse(BaseModel):
     already_running: list[str] = Field(default_factory=list)
 
 
+class CancelTaskResponse(BaseModel):
+    cancelled: bool
+    message: str
+
+
 class SymbolResponse(BaseModel):
     provider: str
     symbol: str  # normalized symbol
@@ -125,6 +135,18 @@ class TaskStateResponse(BaseModel):
     progress: int | None = None  # 0-100 percentage
     progress_detail: str | None = None  # e.g., "2/5 symbols, page 3/4"
     rate_limit_until: str | None = None  # ISO timestamp when rate limit ends
+    lane: str | None = None  # interactive or bulk
+    queue_position: int | None = None  # 1-based, while queued
+
+
+class QuotaStatusResponse(BaseModel):
+    used_minute: int
+    used_day: int
+    used_month: int
+    monthly_budget: int | None = None  # None = unlimited
+    remaining: int | None = None  # credits left this billing period
+    run_allowance: int | None = None  # credits one scheduled run may spend
+    deferred_symbols: int = 0  # symbols waiting in the budget backlog
 
 
 class ProviderStatusResponse(BaseModel):
@@ -132,6 +154,7 @@ class ProviderStatusResponse(BaseModel):
     healthy: bool
     symbol_count: int
     symbol_counts_by_type: dict[str, int] = {}
+    quota: QuotaStatusResponse | None = None
 
 
 class BackupResponse(BaseModel):
@@ -156,6 +179,13 @@ class RestoreResponse(BaseModel):
     favorites: int | None = None
 
 
+class IngestResponse(BaseModel):
+    provider: str
+    rates: int
+    symbols: int
+    skipped: int
+
+
 class FrontendConfigResponse(BaseModel):
     dashboard_history_days: int
 
@@ -5,19 +5,24 @@ import logging
 import re
 from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import Callable, Literal
 
-from fastapi import APIRouter, Body, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Body, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 
 logger = logging.getLogger(__name__)
 
+from app.async_database import AsyncDatabase
 from app.config import Settings
 from app.database import SQLiteDatabase
+from app.metrics import CACHE_REQUESTS
 from app.models import (
     SymbolType,
     HealthResponse,
     RateResponse,
     RateListItem,
     RateHistoryItem,
+    RateRevisionItem,
     ScheduledResponse,
     SymbolResponse,
     ForexCryptoSymbolResponse,
@@ -26,14 +31,29 @@ from app.models import (
     BackupInfo,
     RestoreResponse,
     ProviderStatusResponse,
+    QuotaStatusResponse,
     FrontendConfigResponse,
     FavoriteResponse,
     ChainRateResponse,
+    CancelTaskResponse,
+    IngestResponse,
 )
 from app.services.backfill import BackfillService
+from app.services.export import (
+    ARROW_MEDIA_TYPE,
+    CSV_MEDIA_TYPE,
+    ArrowUnavailableError,
+    arrow_stream,
+    csv_stream,
+    require_arrow,
+)
+from app.services.ingest import INGEST_CHUNK_RATES, INGEST_MAX_BYTES, RatesFileError, chunk_history, parse_rates_file
+from app.services.on_demand import OnDemandFetcher
+from app.services.quota import QuotaTracker
 from app.services.symbols import SymbolsService
 from app.sources.registry import SourceRegistry
-from app.task_manager import TaskManager
+from app.task_manager import TaskCancelled, TaskManager
+from app.utils.response_cache import ResponseCache, cached_response, etag_matches, make_etag, not_modified
 
 
 def _sanitize_error(e: Exception) -> str:
@@ -71,46 +91,92 @@ def create_router(
     backfill_service: BackfillService,
     symbols_service: SymbolsService,
     registry: SourceRegistry,
+    quotas: dict[str, QuotaTracker] | None = None,
+    async_db: AsyncDatabase | None = None,
+    on_demand: OnDemandFetcher | None = None,
 ) -> APIRouter:
     router = APIRouter()
+    quotas = quotas or {}
+    # Read routes are async and reach SQLite and upstreams through these,
+    # keeping the request threadpool for the remaining sync admin routes
+    adb = async_db or AsyncDatabase(db)
+    on_demand = on_demand or OnDemandFetcher(registry, adb)
+    # Symbol lists change only when symbols are (re)populated or restored
+    symbols_cache = ResponseCache("symbols")
+
+    async def _cached_symbols(request: Request, key: tuple, build: Callable[[], list]) -> Response:
+        version = await adb.get_data_version("symbols")
+        etag = make_etag(symbols_cache.scope, version, key)
+        if etag_matches(request, etag):
+            CACHE_REQUESTS.labels("symbols", "not_modified").inc()
+            return not_modified(etag)
+        # Only the version read queues on the DB thread: hits are served from the
+        # event loop, and misses query and serialize on the DB thread
+        cached = symbols_cache.peek(key, version)
+        if cached is None:
+            cached = await adb.run(symbols_cache.get, key, version, build)
+        return cached_response(request, cached)
+
+    async def _check_rates_etag(request: Request, response: Response, scope: str, key: tuple) -> Response | None:
+        """Answer 304 if the client has the current version of scope, else tag the response."""
+        etag = make_etag(scope, await adb.get_data_version(scope), key)
+        if etag_matches(request, etag):
+            CACHE_REQUESTS.labels("rates_etag", "not_modified").inc()
+            return not_modified(etag)
+        CACHE_REQUESTS.labels("rates_etag", "miss").inc()
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+        return None
+
+    def _require_revisions() -> None:
+        if not settings.rate_revisions:
+            raise HTTPException(400, "as_of needs the rate revision log (set RATE_REVISIONS=true)")
 
     @router.get("/health", response_model=HealthResponse)
-    def health() -> HealthResponse:
+    async def health() -> HealthResponse:
         return HealthResponse(status="ok")
 
     @router.get("/config", response_model=FrontendConfigResponse)
-    def get_config() -> FrontendConfigResponse:
+    async def get_config() -> FrontendConfigResponse:
         return FrontendConfigResponse(dashboard_history_days=settings.dashboard_history_days)
 
     @router.get("/providers")
-    def list_providers() -> list[str]:
+    async def list_providers() -> list[str]:
         logger.debug("list_providers called")
         return registry.ids()
 
     @router.get("/providers/status", response_model=list[ProviderStatusResponse])
-    def providers_status() -> list[ProviderStatusResponse]:
+    async def providers_status() -> list[ProviderStatusResponse]:
         logger.debug("providers_status requested")
         statuses: list[ProviderStatusResponse] = []
         for provider_id in registry.ids():
-            symbol_count = db.count_symbols(provider_id)
-            counts_by_type = db.count_symbols_by_type(provider_id)
+            symbol_count = await adb.run(db.count_symbols, provider_id)
+            counts_by_type = await adb.run(db.count_symbols_by_type, provider_id)
+            quota_status = None
+            if provider_id in quotas:
+                quota_status = QuotaStatusResponse(
+                    **await adb.run(quotas[provider_id].status),
+                    deferred_symbols=len(await adb.run(db.get_backfill_backlog, provider_id)),
+                )
             statuses.append(
                 ProviderStatusResponse(
                     name=provider_id,
                     healthy=symbol_count > 0,
                     symbol_count=symbol_count,
                     symbol_counts_by_type=counts_by_type,
+                    quota=quota_status,
                 )
             )
         return statuses
 
     @router.get("/rates", response_model=RateResponse)
-    def get_rate(
+    async def get_rate(
         date_str: str = Query(..., alias="date", description="YYYY-MM-DD"),
         symbol: str = Query(..., description="e.g. EURCZK"),
         provider: str = Query(..., description="Provider: fcs, cnb, or all"),
+        as_of: datetime | None = Query(None, description="Return the rate as known at this time (needs RATE_REVISIONS)"),
     ) -> RateResponse:
-        logger.debug("get_rate: date=%s symbol=%s provider=%s", date_str, symbol, provider)
+        logger.debug("get_rate: date=%s symbol=%s provider=%s as_of=%s", date_str, symbol, provider, as_of)
 
         # Validate date format
         try:
@@ -118,12 +184,24 @@ def create_router(
         except ValueError:
             raise HTTPException(400, f"Invalid date format: {date_str}, expected YYYY-MM-DD")
 
+        # As-of reads come from the revision log only: no on-demand fetch of the past
+        if as_of is not None:
+            _require_revisions()
+            providers = registry.ids() if provider == "all" else [provider]
+            if provider != "all":
+                _require_provider(registry, provider)
+            for p in providers:
+                rate = await adb.get_rate(date_str, symbol, p, as_of)
+                if rate is not None:
+                    return RateResponse(rate=rate, provider=p if provider == "all" else None)
+            return RateResponse(rate=None)
+
         # Handle "all" provider - return first successful rate (fallback chain)
         if provider == "all":
             for p in registry.ids():
-                rate = db.get_rate(date_str, symbol, p)
+                rate = await _stored_rate(date_str, symbol, p)
                 if rate is None:
-                    rate = _fetch_rate_on_demand(dt, symbol, p)
+                    rate = await on_demand.fetch_rate(dt, symbol, p)
                 if rate is not None:
                     logger.debug("returning rate=%s from provider=%s", rate, p)
                     return RateResponse(rate=rate, provider=p)
@@ -133,21 +211,38 @@ def create_router(
         # Validate provider
         _require_provider(registry, provider)
 
-        rate = db.get_rate(date_str, symbol, provider)
+        rate = await _stored_rate(date_str, symbol, provider)
 
         # On-demand fetch if rate not found
         if rate is None:
             logger.debug("rate not cached, fetching on-demand")
-            rate = _fetch_rate_on_demand(dt, symbol, provider)
+            rate = await on_demand.fetch_rate(dt, symbol, provider)
 
         logger.debug("returning rate=%s", rate)
         return RateResponse(rate=rate)
 
+    @router.get("/rates/revisions", response_model=list[RateRevisionItem])
+    async def rate_revisions(
+        date_str: str = Query(..., alias="date", description="YYYY-MM-DD"),
+        symbol: str = Query(..., description="Provider symbol, e.g. EURCZK"),
+        provider: str = Query(..., description="Provider: fcs or cnb"),
+    ) -> list[RateRevisionItem]:
+        """Every replaced value of one rate, oldest first."""
+        _require_revisions()
+        _require_provider(registry, provider)
+        try:
+            datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            raise HTTPException(400, f"Invalid date format: {date_str}, expected YYYY-MM-DD")
+        return await adb.run(db.get_rate_revisions, date_str, symbol, provider)
+
     @router.get("/rates/list", response_model=list[RateListItem])
-    def rates_list(
+    async def rates_list(
+        request: Request,
+        response: Response,
         date_str: str = Query(..., alias="date", description="YYYY-MM-DD"),
         provider: str = Query(..., description="Provider: fcs, cnb, or all"),
-    ) -> list[RateListItem]:
+    ) -> list[RateListItem] | Response:
         logger.debug("rates_list: date=%s provider=%s", date_str, provider)
 
         try:
@@ -160,26 +255,37 @@ def create_router(
             _require_provider(registry, provider)
             provider_filter = provider
 
-        rates = db.get_rates_for_date(date_str, provider_filter)
+        scope = f"rates:{provider_filter}" if provider_filter else "rates"
+        unchanged = await _check_rates_etag(request, response, scope, ("list", date_str))
+        if unchanged:
+            return unchanged
+
+        rates = await adb.get_rates_for_date(date_str, provider_filter)
         logger.debug("returning %d rates", len(rates))
         return rates
 
     @router.get("/rates/history", response_model=list[RateHistoryItem])
-    def rates_history(
+    async def rates_history(
+        request: Request,
+        response: Response,
         symbol: str = Query(..., description="Normalized symbol, e.g. EURCZK"),
         from_date: date | None = Query(None, description="Start date (YYYY-MM-DD)"),
         to_date: date | None = Query(None, description="End date (YYYY-MM-DD)"),
         provider: str | None = Query(None, description="Provider: fcs, cnb, or all"),
         provider_symbol: str | None = Query(None, description="Provider-specific symbol (e.g. EURCZK.ONE). If provided, queries exact match."),
-    ) -> list[RateHistoryItem]:
+        as_of: datetime | None = Query(None, description="Return rates as known at this time (needs RATE_REVISIONS)"),
+    ) -> list[RateHistoryItem] | Response:
         logger.debug(
-            "rates_history: symbol=%s provider_symbol=%s from=%s to=%s provider=%s",
+            "rates_history: symbol=%s provider_symbol=%s from=%s to=%s provider=%s as_of=%s",
             symbol,
             provider_symbol,
             from_date,
             to_date,
             provider,
+            as_of,
         )
+        if as_of is not None:
+            _require_revisions()
 
         end_date = to_date or date.today()
         start_date = from_date or (end_date - timedelta(days=30))
@@ -191,16 +297,27 @@ def create_router(
             _require_provider(registry, provider)
             provider_filter = provider
 
-        history = db.get_rates_range(symbol, start_date, end_date, provider_filter, provider_symbol)
+        if provider_filter and provider_symbol:
+            scope = f"rates:{provider_filter}:{provider_symbol}"
+        else:
+            scope = f"rates:{provider_filter}" if provider_filter else "rates"
+        key = ("history", symbol, provider_symbol, start_date.isoformat(), end_date.isoformat(), as_of and as_of.isoformat())
+        unchanged = await _check_rates_etag(request, response, scope, key)
+        if unchanged:
+            return unchanged
+
+        history = await adb.get_rates_range(symbol, start_date, end_date, provider_filter, provider_symbol, as_of)
         logger.debug("returning %d rate entries", len(history))
         return history
 
     @router.get("/rates/coverage", response_model=dict[str, int])
-    def rates_coverage(
+    async def rates_coverage(
+        request: Request,
+        response: Response,
         year: int = Query(..., description="Year to analyze"),
         provider: str | None = Query(None, description="Optional provider filter: fcs, cnb, or all"),
         symbols: str | None = Query(None, description="Optional comma-separated symbol list"),
-    ) -> dict[str, int]:
+    ) -> dict[str, int] | Response:
         logger.debug("rates_coverage: year=%d provider=%s symbols=%s", year, provider, symbols)
 
         provider_filter: str | None = None
@@ -212,12 +329,18 @@ def create_router(
                 provider_filter = provider
 
         symbol_list = [s.strip() for s in symbols.split(",") if s.strip()] if symbols else None
-        coverage = db.get_coverage(year, provider_filter, symbol_list)
+        scope = f"rates:{provider_filter}" if provider_filter else "rates"
+        key = ("coverage", year, tuple(symbol_list or ()))
+        unchanged = await _check_rates_etag(request, response, scope, key)
+        if unchanged:
+            return unchanged
+
+        coverage = await adb.get_coverage(year, provider_filter, symbol_list)
         logger.debug("rates_coverage returning %d entries", len(coverage))
         return coverage
 
     @router.get("/rates/missing", response_model=dict[str, list[str]])
-    def rates_missing(
+    async def rates_missing(
         year: int = Query(..., description="Year to analyze"),
         symbols: str = Query(..., description="Comma-separated symbol list"),
         provider: str | None = Query(None, description="Optional provider filter"),
@@ -234,33 +357,59 @@ def create_router(
             _require_provider(registry, provider)
             provider_filter = provider
 
-        missing = db.get_missing_symbols(year, symbol_list, provider_filter)
+        missing = await adb.get_missing_symbols(year, symbol_list, provider_filter)
         logger.debug("rates_missing returning %d entries", len(missing))
         return missing
 
-    def _fetch_rate_on_demand(dt: date, symbol: str, provider: str) -> float | None:
-        source = registry.get(provider)
-        if not source:
-            return None
+    @router.get("/rates/export")
+    async def rates_export(
+        format: Literal["csv", "arrow"] = Query("csv", description="csv or arrow (Arrow IPC stream)"),
+        providers: str | None = Query(None, description="Optional comma-separated provider list"),
+        symbols: str | None = Query(None, description="Optional comma-separated normalized or provider symbols"),
+        from_date: date | None = Query(None, description="Start date (YYYY-MM-DD)"),
+        to_date: date | None = Query(None, description="End date (YYYY-MM-DD)"),
+    ) -> StreamingResponse:
+        """Stream matching rates ordered by date, without loading them into memory."""
+        logger.debug(
+            "rates_export: format=%s providers=%s symbols=%s from=%s to=%s",
+            format,
+            providers,
+            symbols,
+            from_date,
+            to_date,
+        )
+        if from_date and to_date and from_date > to_date:
+            raise HTTPException(400, "from_date must be on or before to_date")
 
-        logger.debug("fetching rate from source %s", provider)
-        try:
-            rate = source.fetch_rate(symbol, dt)
-        except Exception as e:
-            logger.warning("source fetch failed: %s", e)
-            return None
-        if rate is None:
-            logger.debug("source returned no rate")
-            return None
+        provider_list = [p.strip() for p in providers.split(",") if p.strip()] if providers else None
+        for provider in provider_list or ():
+            _require_provider(registry, provider)
+        symbol_list = [s.strip() for s in symbols.split(",") if s.strip()] if symbols else None
 
-        logger.debug("caching rate=%s", rate)
-        date_str = dt.strftime("%Y-%m-%d")
-        db.upsert_rate(date_str, symbol, provider, rate)
-        db.commit()
+        if format == "arrow":
+            try:
+                require_arrow()
+            except ArrowUnavailableError as e:
+                raise HTTPException(501, _sanitize_error(e))
+
+        export = await adb.run(db.open_rates_export, provider_list, symbol_list, from_date, to_date)
+        if format == "arrow":
+            body, media_type, ext = arrow_stream(export), ARROW_MEDIA_TYPE, "arrows"
+        else:
+            body, media_type, ext = csv_stream(export), CSV_MEDIA_TYPE, "csv"
+        return StreamingResponse(
+            body,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="rates.{ext}"'},
+        )
+
+    async def _stored_rate(date_str: str, symbol: str, provider: str) -> float | None:
+        rate = await adb.get_rate(date_str, symbol, provider)
+        CACHE_REQUESTS.labels("rates", "hit" if rate is not None else "miss").inc()
         return rate
 
     @router.get("/rates/chain", response_model=ChainRateResponse)
-    def get_chain_rate(
+    async def get_chain_rate(
         date_str: str = Query(..., alias="date", description="YYYY-MM-DD"),
         from_currency: str = Query(..., description="Source currency (e.g., BTC)"),
         intermediate: str = Query(..., description="Intermediate currency (e.g., EUR)"),
@@ -287,7 +436,7 @@ def create_router(
         _require_provider(registry, from_provider)
         _require_provider(registry, to_provider)
 
-        def fetch_rate_with_inversion(
+        async def fetch_rate_with_inversion(
             base: str, quote: str, provider: str, dt: date, date_str: str
         ) -> tuple[float | None, str, bool]:
             """Try direct symbol, then inverted. Returns (rate, symbol_used, inverted)."""
@@ -295,28 +444,28 @@ def create_router(
             inverted = f"{quote}{base}"
 
             # Try direct symbol first
-            rate = db.get_rate(date_str, direct, provider)
+            rate = await adb.get_rate(date_str, direct, provider)
             if rate is None:
-                rate = _fetch_rate_on_demand(dt, direct, provider)
+                rate = await on_demand.fetch_rate(dt, direct, provider)
             if rate is not None:
                 return rate, direct, False
 
             # Try inverted symbol
-            rate = db.get_rate(date_str, inverted, provider)
+            rate = await adb.get_rate(date_str, inverted, provider)
             if rate is None:
-                rate = _fetch_rate_on_demand(dt, inverted, provider)
+                rate = await on_demand.fetch_rate(dt, inverted, provider)
             if rate is not None:
                 return 1.0 / rate, inverted, True
 
             return None, direct, False
 
         # Fetch first leg: from_currency -> intermediate
-        from_rate, from_symbol, from_inverted = fetch_rate_with_inversion(
+        from_rate, from_symbol, from_inverted = await fetch_rate_with_inversion(
             from_currency, intermediate, from_provider, dt, date_str
         )
 
         # Fetch second leg: intermediate -> to_currency
-        to_rate, to_symbol, to_inverted = fetch_rate_with_inversion(
+        to_rate, to_symbol, to_inverted = await fetch_rate_with_inversion(
             intermediate, to_currency, to_provider, dt, date_str
         )
 
@@ -345,6 +494,72 @@ def create_router(
             intermediate=intermediate,
         )
 
+    def _progress(key: str) -> Callable[[str | dict], None]:
+        """Progress callback for a job that also aborts it once cancelled."""
+        def on_progress(update: str | dict) -> None:
+            task_manager.raise_if_cancelled(key)
+            task_manager.update_status(key, **(update if isinstance(update, dict) else {"message": update}))
+        return on_progress
+
+    # Background jobs are registered by name so a worker that is not the
+    # leader can queue them for the leader to run
+    def backfill_job(key: str, params: dict) -> Callable[[], None]:
+        prov, days, syms = params["provider"], params["length"], params["symbols"]
+
+        def run() -> None:
+            logger.info(f"Manual backfill started: provider={prov}, symbols={syms or 'all'}, days={days}")
+            task_manager.update_status(key, per_symbol={})
+            try:
+                results, failures = backfill_service.backfill(
+                    prov,
+                    syms,
+                    days,
+                    on_progress=_progress(key),
+                )
+                total = sum(results.values())
+                msg = f"Completed: {total} rows"
+                if failures:
+                    msg += f" ({len(failures)} failed: {', '.join(failures)})"
+                task_manager.set_status(key, {
+                    "status": "done",
+                    "message": msg,
+                    "per_symbol": results,
+                    "rows_written": total,
+                })
+                logger.info(f"Manual backfill completed for {prov}: {total} rows, {len(failures)} failures")
+            except TaskCancelled:
+                logger.info(f"Manual backfill cancelled for {prov}")
+                task_manager.set_status(key, {"status": "cancelled", "message": "Cancelled"})
+            except Exception as e:
+                logger.error(f"Manual backfill failed for {prov}: {e}")
+                task_manager.set_status(key, {"status": "error", "message": _sanitize_error(e)})
+        return run
+
+    def populate_symbols_job(key: str, params: dict) -> Callable[[], None]:
+        prov = params["provider"]
+
+        def run() -> None:
+            logger.info(f"Populate symbols started: provider={prov}")
+            try:
+                results = symbols_service.populate(prov, on_progress=_progress(key))
+                total = sum(results.values())
+                task_manager.set_status(key, {
+                    "status": "done",
+                    "message": f"Completed: {total} symbols",
+                    "symbols_added": total,
+                })
+                logger.info(f"Populate symbols completed for {prov}: {results}")
+            except TaskCancelled:
+                logger.info(f"Populate symbols cancelled for {prov}")
+                task_manager.set_status(key, {"status": "cancelled", "message": "Cancelled"})
+            except Exception as e:
+                logger.error(f"Populate symbols failed for {prov}: {e}")
+                task_manager.set_status(key, {"status": "error", "message": _sanitize_error(e)})
+        return run
+
+    task_manager.register_job("manual_backfill", backfill_job, lane="bulk")
+    task_manager.register_job("populate_symbols", populate_symbols_job)
+
     @router.post("/backfill", response_model=ScheduledResponse)
     def manual_backfill(
         provider: str = Query(..., description="Provider: fcs, cnb, or all"),
@@ -370,35 +585,8 @@ def create_router(
 
         for p in providers:
             task_key = f"backfill:{p}"
-
-            def make_run(prov: str, key: str, days: int, syms: list[str]):
-                def run() -> None:
-                    logger.info(f"Manual backfill started: provider={prov}, symbols={syms or 'all'}, days={days}")
-                    task_manager.update_status(key, per_symbol={})
-                    try:
-                        results, failures = backfill_service.backfill(
-                            prov,
-                            syms,
-                            days,
-                            on_progress=lambda u: task_manager.update_status(key, **(u if isinstance(u, dict) else {"message": u})),
-                        )
-                        total = sum(results.values())
-                        msg = f"Completed: {total} rows"
-                        if failures:
-                            msg += f" ({len(failures)} failed: {', '.join(failures)})"
-                        task_manager.set_status(key, {
-                            "status": "done",
-                            "message": msg,
-                            "per_symbol": results,
-                            "rows_written": total,
-                        })
-                        logger.info(f"Manual backfill completed for {prov}: {total} rows, {len(failures)} failures")
-                    except Exception as e:
-                        logger.error(f"Manual backfill failed for {prov}: {e}")
-                        task_manager.set_status(key, {"status": "error", "message": _sanitize_error(e)})
-                return run
-
-            if task_manager.start_if_idle(task_key, make_run(p, task_key, length, selected)):
+            params = {"provider": p, "length": length, "symbols": selected}
+            if task_manager.submit(task_key, "manual_backfill", params):
                 started.append(p)
             else:
                 already_running.append(p)
@@ -432,28 +620,7 @@ def create_router(
 
         for p in providers:
             task_key = f"populate_symbols:{p}"
-
-            def make_run(prov: str, key: str):
-                def run() -> None:
-                    logger.info(f"Populate symbols started: provider={prov}")
-                    try:
-                        results = symbols_service.populate(
-                            prov,
-                            on_progress=lambda u: task_manager.update_status(key, **(u if isinstance(u, dict) else {"message": u})),
-                        )
-                        total = sum(results.values())
-                        task_manager.set_status(key, {
-                            "status": "done",
-                            "message": f"Completed: {total} symbols",
-                            "symbols_added": total,
-                        })
-                        logger.info(f"Populate symbols completed for {prov}: {results}")
-                    except Exception as e:
-                        logger.error(f"Populate symbols failed for {prov}: {e}")
-                        task_manager.set_status(key, {"status": "error", "message": _sanitize_error(e)})
-                return run
-
-            if task_manager.start_if_idle(task_key, make_run(p, task_key)):
+            if task_manager.submit(task_key, "populate_symbols", {"provider": p}):
                 started.append(p)
             else:
                 already_running.append(p)
@@ -472,9 +639,18 @@ def create_router(
         )
 
     @router.get("/task_status", response_model=dict[str, TaskStateResponse])
-    def task_status() -> dict[str, TaskStateResponse]:
+    async def task_status() -> dict[str, TaskStateResponse]:
         return task_manager.get_all_status()
 
+    @router.post("/cancel_task", response_model=CancelTaskResponse)
+    def cancel_task(
+        task: str = Query(..., description="Task key from /task_status, e.g. backfill:fcs"),
+    ) -> CancelTaskResponse:
+        if not task_manager.cancel(task):
+            return CancelTaskResponse(cancelled=False, message=f"{task} is not queued or running")
+        logger.info("cancellation requested for %s", task)
+        return CancelTaskResponse(cancelled=True, message="Cancellation requested, check /task_status")
+
     @router.websocket("/ws/tasks")
     async def tasks_ws(websocket: WebSocket) -> None:
         await task_manager.connect(websocket)
@@ -494,54 +670,76 @@ def create_router(
             task_manager.disconnect(websocket)
 
     @router.get("/symbols/list", response_model=list[SymbolResponse])
-    def symbols_list(
+    async def symbols_list(
+        request: Request,
         provider: str | None = Query(None, description="Filter by provider: fcs, cnb"),
         type: SymbolType | None = Query(None, description="Filter by type: forex, crypto"),
         q: str | None = Query(None, description="Substring filter (case-insensitive)"),
-    ) -> list[SymbolResponse]:
+    ) -> Response:
         logger.debug("symbols_list: provider=%s type=%s q=%s", provider, type, q)
-        symbols = db.list_symbols(provider=provider, sym_type=type, query=q)
-        logger.debug("returning %d symbols", len(symbols))
-        return [SymbolResponse(provider=s.provider, symbol=s.symbol, provider_symbol=s.provider_symbol, name=s.name, type=s.type) for s in symbols]
+
+        def build() -> list[dict]:
+            symbols = db.list_symbols(provider=provider, sym_type=type, query=q)
+            logger.debug("returning %d symbols", len(symbols))
+            return [
+                {"provider": s.provider, "symbol": s.symbol, "provider_symbol": s.provider_symbol, "name": s.name, "type": s.type}
+                for s in symbols
+            ]
+
+        return await _cached_symbols(request, ("list", provider, type, q), build)
 
     @router.get("/symbols/multi-provider", response_model=list[dict])
-    def symbols_multi_provider() -> list[dict]:
+    async def symbols_multi_provider(request: Request) -> Response:
         """Get normalized symbols available from multiple providers."""
         logger.debug("symbols_multi_provider requested")
-        result = db.list_multi_provider_symbols()
-        logger.debug("returning %d multi-provider symbols", len(result))
-        return result
+
+        def build() -> list[dict]:
+            result = db.list_multi_provider_symbols()
+            logger.debug("returning %d multi-provider symbols", len(result))
+            return result
+
+        return await _cached_symbols(request, ("multi-provider",), build)
 
     @router.get("/symbols/by-normalized/{normalized_symbol}", response_model=list[SymbolResponse])
-    def symbols_by_normalized(normalized_symbol: str) -> list[SymbolResponse]:
+    async def symbols_by_normalized(normalized_symbol: str) -> list[SymbolResponse]:
         """Get all symbol variants for a normalized symbol."""
         logger.debug("symbols_by_normalized: %s", normalized_symbol)
-        symbols = db.get_symbol_variants(normalized_symbol)
+        symbols = await adb.get_symbol_variants(normalized_symbol)
         logger.debug("returning %d symbols", len(symbols))
         return [SymbolResponse(provider=s.provider, symbol=s.symbol, provider_symbol=s.provider_symbol, name=s.name, type=s.type) for s in symbols]
 
     @router.get("/forex/list", response_model=list[ForexCryptoSymbolResponse])
-    def forex_list(
+    async def forex_list(
+        request: Request,
         q: str | None = Query(None, description="Substring filter (case-insensitive)"),
-    ) -> list[ForexCryptoSymbolResponse]:
+    ) -> Response:
         logger.debug("forex_list: q=%s", q)
-        symbols = db.list_symbols(sym_type="forex", query=q)
-        logger.debug("returning %d forex symbols", len(symbols))
-        return [ForexCryptoSymbolResponse(provider=s.provider, symbol=s.symbol, name=s.name) for s in symbols]
+
+        def build() -> list[dict]:
+            symbols = db.list_symbols(sym_type="forex", query=q)
+            logger.debug("returning %d forex symbols", len(symbols))
+            return [{"provider": s.provider, "symbol": s.symbol, "name": s.name} for s in symbols]
+
+        return await _cached_symbols(request, ("forex", q), build)
 
     @router.get("/crypto/list", response_model=list[ForexCryptoSymbolResponse])
-    def crypto_list(
+    async def crypto_list(
+        request: Request,
         q: str | None = Query(None, description="Substring filter (case-insensitive)"),
-    ) -> list[ForexCryptoSymbolResponse]:
+    ) -> Response:
         logger.debug("crypto_list: q=%s", q)
-        symbols = db.list_symbols(sym_type="crypto", query=q)
-        logger.debug("returning %d crypto symbols", len(symbols))
-        return [ForexCryptoSymbolResponse(provider=s.provider, symbol=s.symbol, name=s.name) for s in symbols]
+
+        def build() -> list[dict]:
+            symbols = db.list_symbols(sym_type="crypto", query=q)
+            logger.debug("returning %d crypto symbols", len(symbols))
+            return [{"provider": s.provider, "symbol": s.symbol, "name": s.name} for s in symbols]
+
+        return await _cached_symbols(request, ("crypto", q), build)
 
     @router.get("/favorites", response_model=list[FavoriteResponse])
-    def favorites_list() -> list[FavoriteResponse]:
+    async def favorites_list() -> list[FavoriteResponse]:
         logger.debug("favorites_list requested")
-        return [FavoriteResponse(**f) for f in db.list_favorites()]
+        return [FavoriteResponse(**f) for f in await adb.list_favorites()]
 
     @router.post("/favorites", response_model=FavoriteResponse)
     def add_favorite(
@@ -668,6 +866,36 @@ def create_router(
         logger.info("restored from %s: %d symbols, %d rates, %d metadata, %d favorites", timestamp, symbols_count or 0, rates_count or 0, metadata_count or 0, favorites_count or 0)
         return RestoreResponse(timestamp=timestamp, rates=rates_count, symbols=symbols_count, metadata=metadata_count, favorites=favorites_count)
 
+    @router.post("/ingest", response_model=IngestResponse)
+    async def ingest(
+        request: Request,
+        provider: str = Query(..., description="Provider the rates belong to"),
+    ) -> IngestResponse:
+        """Load a bulk historical rates file (CNB yearly table or CSV) sent as the request body."""
+        logger.debug("ingest requested: provider=%s", provider)
+        _require_provider(registry, provider)
+        body = bytearray()
+        async for part in request.stream():
+            body += part
+            if len(body) > INGEST_MAX_BYTES:
+                raise HTTPException(413, f"Rates file exceeds {INGEST_MAX_BYTES // (1024 * 1024)} MiB; split it")
+        try:
+            text = body.decode("utf-8")
+            history = await asyncio.to_thread(parse_rates_file, text, provider)
+        except (UnicodeDecodeError, RatesFileError) as e:
+            raise HTTPException(400, f"Invalid rates file: {_sanitize_error(e)}")
+
+        # Written in chunks, each its own trip to the DB thread, so read
+        # routes queued behind a large file are not stalled until it is done
+        counts: dict[str, int] = {}
+        for chunk in chunk_history(history, INGEST_CHUNK_RATES):
+            for key, count in (await adb.run(backfill_service.ingest_history, provider, chunk)).items():
+                counts[key] = counts.get(key, 0) + count
+        total = sum(len(rates) for rates in history.values())
+        written = sum(counts.values())
+        logger.info("ingested %d %s rates for %d symbols (%d skipped)", written, provider, len(counts), total - written)
+        return IngestResponse(provider=provider, rates=written, symbols=len(counts), skipped=total - written)
+
     def _check_no_task_running() -> None:
         # Check for any provider-specific running tasks
         provider_ids = registry.ids()
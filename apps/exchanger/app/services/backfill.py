@@ -1,24 +1,35 @@
 import logging
-from datetime import datetime, time, timezone
+from datetime import date, datetime, time, timedelta, timezone
+from time import perf_counter
 from typing import Any, Callable, Protocol
 
+from app.metrics import BACKFILL_ROWS, BACKFILL_ROWS_PER_SECOND, BACKFILL_SECONDS, BACKFILL_WORK_UNITS
 from app.models import Symbol, SymbolType
-from app.sources.protocol import RateSource
+from app.services.quota import QuotaTracker
+from app.sources.protocol import LatestRatesSource, RateSource, YearlyRatesSource
 from app.sources.registry import SourceRegistry
+from app.task_manager import TaskCancelled
 
 logger = logging.getLogger(__name__)
 
+# Backfills at least this long use a source's yearly files (fetch_year), if it has them
+YEARLY_MIN_DAYS = 31
+
 
 class BackfillDatabase(Protocol):
     def get_rate(self, date: str, provider_symbol: str, provider: str) -> float | None: ...
     def get_symbol(self, provider_symbol: str, provider: str) -> Symbol | None: ...
     def list_symbols(self, provider: str | None = None, sym_type: SymbolType | None = None, query: str | None = None) -> list[Symbol]: ...
     def upsert_rate(self, date: str, provider_symbol: str, provider: str, rate: float) -> None: ...
+    def upsert_rates(self, provider: str, rows: list[tuple[str, str, float]]) -> int: ...
     def get_backfill_done_at(self, provider: str) -> str | None: ...
     def set_backfill_done_at(self, provider: str, timestamp: str) -> None: ...
     def get_backfill_checkpoint(self, provider: str) -> dict | None: ...
     def set_backfill_checkpoint(self, provider: str, checkpoint: dict) -> None: ...
     def clear_backfill_checkpoint(self, provider: str) -> None: ...
+    def get_backfill_backlog(self, provider: str) -> list[dict]: ...
+    def set_backfill_backlog(self, provider: str, backlog: list[dict]) -> None: ...
+    def list_favorites(self) -> list[dict]: ...
     def commit(self) -> None: ...
 
 
@@ -28,9 +39,13 @@ class BackfillService:
         db: BackfillDatabase,
         registry: SourceRegistry,
         auto_backfill_times: tuple[str, ...] = ("16:30",),
+        quotas: dict[str, QuotaTracker] | None = None,
+        configured_symbols: dict[str, list[str]] | None = None,
     ):
         self._db = db
         self._registry = registry
+        self._quotas = quotas or {}
+        self._configured_symbols = configured_symbols or {}
         self._scheduled_times = sorted(
             time(int(hour), int(minute))
             for hour, minute in (t.split(":") for t in auto_backfill_times)
@@ -78,6 +93,108 @@ class BackfillService:
         # Need backfill if we haven't run since that slot (catch up).
         return last_dt.time() < passed[-1]
 
+    def priority_symbols(self, provider: str) -> list[str]:
+        """Configured symbols and favorites for provider, in that order."""
+        result: list[str] = []
+        for sym in self._configured_symbols.get(provider, []):
+            if sym not in result:
+                result.append(sym)
+        for fav in self._db.list_favorites():
+            if fav["provider"] == provider and fav["provider_symbol"] not in result:
+                result.append(fav["provider_symbol"])
+        return result
+
+    def has_backlog(self, provider: str) -> bool:
+        """Check if the budget planner deferred symbols for provider.
+
+        Only a budgeted provider drains its backlog, so a backlog left behind
+        after its budget was unset does not count.
+        """
+        quota = self._quotas.get(provider)
+        if quota is None or quota.monthly_budget <= 0:
+            return False
+        return bool(self._db.get_backfill_backlog(provider))
+
+    def can_refresh_latest(self, provider: str) -> bool:
+        """Check if a latest-price refresh is enough to keep provider current.
+
+        True when the source supports batched latest prices, no backfill is
+        interrupted and the last completed backfill was today or yesterday
+        (so there is no gap for the history endpoint to fill).
+        """
+        source = self._registry.get(provider)
+        if not isinstance(source, LatestRatesSource):
+            return False
+        if self._db.get_backfill_checkpoint(provider):
+            return False
+        last_done = self._db.get_backfill_done_at(provider)
+        if not last_done:
+            return False
+        try:
+            last_dt = datetime.fromisoformat(last_done)
+            if last_dt.tzinfo is not None:
+                last_dt = last_dt.astimezone()
+        except ValueError:
+            return False
+        return (datetime.now().date() - last_dt.date()).days <= 1
+
+    def refresh_latest(
+        self,
+        provider: str,
+        symbols: list[str],
+        on_progress: Any | None = None,
+    ) -> tuple[dict[str, int], list[str]]:
+        """Store today's close for symbols via the source's batched latest endpoint.
+
+        Sources without `fetch_latest` fall back to a one-day backfill.
+
+        Returns:
+            (symbol -> count of rates written, failed symbols)
+        """
+        source = self._registry.get(provider)
+        if not source:
+            logger.debug("provider %s not found", provider)
+            return {}, []
+        if not isinstance(source, LatestRatesSource):
+            return self._backfill_source(source, symbols, 1, on_progress)
+
+        symbol_types = self._resolve_symbol_types(provider, symbols)
+        if not symbol_types:
+            return {}, []
+
+        counts: dict[str, int] = {}
+
+        def handle_rate(sym: str, date_str: str, rate: float) -> None:
+            self._db.upsert_rate(date_str, sym, provider, rate)
+            BACKFILL_ROWS.labels(provider).inc()
+            counts[sym] = counts.get(sym, 0) + 1
+
+        try:
+            source.fetch_latest(
+                list(symbol_types),
+                on_progress=on_progress,
+                on_rates=handle_rate,
+                symbol_types=symbol_types,
+            )
+        except TaskCancelled:
+            self._db.commit()
+            raise
+        except Exception as e:
+            logger.error("latest refresh from %s failed: %s", provider, e)
+            self._db.commit()
+            return {f"{provider}:{sym}": n for sym, n in counts.items()}, [
+                sym for sym in symbol_types if sym not in counts
+            ]
+        self._db.commit()
+        logger.debug("latest refresh %s: %d/%d symbols updated", provider, len(counts), len(symbol_types))
+
+        results = {f"{provider}:{sym}": n for sym, n in counts.items()}
+        if self.has_backlog(provider):
+            backlog_results, failures = self._backfill_source(source, [], 0, on_progress, backlog_only=True)
+            results.update(backlog_results)
+            return results, failures
+        return results, []
+
     def mark_done(self, provider: str) -> None:
         """Record backfill completion timestamp."""
         self._db.set_backfill_done_at(provider, datetime.now(timezone.utc).isoformat())
@@ -89,21 +206,27 @@ class BackfillService:
         symbols: list[str],
         length: int,
         on_progress: Any | None = None,
-    ) -> dict[str, int]:
+        backlog_only: bool = False,
+    ) -> tuple[dict[str, int], list[str]]:
         """Backfill rates for symbols from a provider.
 
         Symbols MUST already exist in DB (via populate_symbols). This ensures
         correct type/name metadata and prevents guessing.
 
+        Providers with a monthly credit budget only spend their per-run
+        allowance: priority symbols (configured + favorites) go first, the
+        rest is deferred to a persistent backlog that later runs work through.
+
         Args:
             provider: Provider ID ('fcs', 'cnb', or 'all')
             symbols: List of symbol names to backfill. If empty, backfills all
                     symbols in DB for this provider.
             length: Number of days of history
             on_progress: Optional callback for progress updates
+            backlog_only: Only work through previously deferred symbols
 
         Returns:
-            Dict mapping symbol -> count of rates written
+            (symbol -> count of rates written, failed symbols)
         """
         logger.debug("backfill: provider=%s symbols=%s length=%d", provider, symbols, length)
         results: dict[str, int] = {}
@@ -112,13 +235,17 @@ class BackfillService:
         if provider == "all":
             logger.debug("backfilling from all providers")
             for source in self._registry.all():
-                source_results, source_failures = self._backfill_source(source, symbols, length, on_progress)
+                source_results, source_failures = self._backfill_source(
+                    source, symbols, length, on_progress, backlog_only=backlog_only
+                )
                 results.update(source_results)
                 all_failures.extend(source_failures)
         else:
             source = self._registry.get(provider)
             if source:
-                results, all_failures = self._backfill_source(source, symbols, length, on_progress)
+                results, all_failures = self._backfill_source(
+                    source, symbols, length, on_progress, backlog_only=backlog_only
+                )
             else:
                 logger.debug("provider %s not found", provider)
 
@@ -132,35 +259,53 @@ class BackfillService:
         length: int,
         on_progress: Any | None,
         on_rates: Callable[[str, str, float], None] | None = None,
-    ) -> dict[str, int]:
+        backlog_only: bool = False,
+    ) -> tuple[dict[str, int], list[str]]:
+        start = perf_counter()
+        results, failures = self._run_backfill_source(
+            source, symbols, length, on_progress, on_rates, backlog_only
+        )
+        if results or failures:
+            elapsed = perf_counter() - start
+            BACKFILL_SECONDS.labels(source.source_id).observe(elapsed)
+            if elapsed > 0:
+                BACKFILL_ROWS_PER_SECOND.labels(source.source_id).set(sum(results.values()) / elapsed)
+        return results, failures
+
+    def _run_backfill_source(
+        self,
+        source: RateSource,
+        symbols: list[str],
+        length: int,
+        on_progress: Any | None,
+        on_rates: Callable[[str, str, float], None] | None,
+        backlog_only: bool,
+    ) -> tuple[dict[str, int], list[str]]:
         provider = source.source_id
+        quota = self._quotas.get(provider)
+        budgeted = quota is not None and quota.monthly_budget > 0
 
-        # Build provider_symbol -> type map from DB (source of truth for metadata)
-        if symbols:
-            # Specific symbols requested - look them up in DB
-            symbol_types: dict[str, SymbolType] = {}
-            for provider_sym in symbols:
-                db_symbol = self._db.get_symbol(provider_sym, provider)
-                if db_symbol:
-                    symbol_types[provider_sym] = db_symbol.type
-                else:
-                    logger.warning("provider_symbol %s not in DB for provider %s, skipping (run populate_symbols first)", provider_sym, provider)
-            source_symbols = list(symbol_types.keys())
-        else:
-            # No specific symbols - use all from DB for this provider
-            db_symbols = self._db.list_symbols(provider=provider)
-            symbol_types = {s.provider_symbol: s.type for s in db_symbols}
-            source_symbols = list(symbol_types.keys())
-            logger.debug("_backfill_source: provider=%s, using %d symbols from DB", provider, len(source_symbols))
+        symbol_types = {} if backlog_only else self._resolve_symbol_types(provider, symbols)
+        source_symbols = list(symbol_types.keys())
 
-        if not source_symbols:
+        if not source_symbols and not self.has_backlog(provider):
             logger.debug("no symbols to backfill for provider=%s (populate_symbols first?)", provider)
-            return {}
+            return {}, []
+
+        if isinstance(source, YearlyRatesSource) and length >= YEARLY_MIN_DAYS and not budgeted:
+            return self._backfill_years(provider, source, source_symbols, length, on_progress, on_rates)
+
+        if budgeted:
+            # Stable priority-first order, so checkpoint indexes stay valid between runs
+            priority = self.priority_symbols(provider)
+            source_symbols = [s for s in priority if s in symbol_types] + [
+                s for s in source_symbols if s not in priority
+            ]
 
         # Check for resumable checkpoint
         start_idx = 0
         checkpoint = self._db.get_backfill_checkpoint(provider)
-        if checkpoint and checkpoint.get("length") == length:
+        if not backlog_only and checkpoint and checkpoint.get("length") == length:
             resume_idx = checkpoint.get("last_symbol_idx", -1) + 1
             if 0 < resume_idx < len(source_symbols):
                 start_idx = resume_idx
@@ -168,15 +313,24 @@ class BackfillService:
                 if on_progress:
                     on_progress({"message": f"Resuming from symbol {start_idx + 1}/{len(source_symbols)}"})
 
-        logger.debug("backfilling %d symbols from %s (starting at %d)", len(source_symbols), provider, start_idx)
+        pending = source_symbols[start_idx:]
+        backlog_items: list[dict] = []
+        if budgeted:
+            pending, backlog_items = self._plan_budget(source, quota, pending, length, on_progress)
+
+        logger.debug("backfilling %d symbols from %s (starting at %d)", len(pending), provider, start_idx)
 
         # Get total work units from source
-        total_units = source.estimate_work_units(len(source_symbols) - start_idx, length)
+        total_units = source.estimate_work_units(len(pending), length) + sum(
+            source.estimate_work_units(1, item["length"]) for item in backlog_items
+        )
         completed_units = 0
 
         def track_progress(data: str | dict[str, Any]) -> None:
             """Track work unit completions and forward other progress info."""
             nonlocal completed_units
+            if isinstance(data, dict) and data.get("work_unit_done"):
+                BACKFILL_WORK_UNITS.labels(provider).inc()
             if not on_progress:
                 return
 
@@ -196,37 +350,29 @@ class BackfillService:
             elif isinstance(data, str):
                 on_progress({"message": data})
 
-        # Fetch and store one symbol at a time
-        results: dict[str, int] = {}
-        failures: list[str] = []
-        for i, provider_sym in enumerate(source_symbols[start_idx:], start_idx + 1):
+        def report_symbol(provider_sym: str, detail: str) -> None:
             if on_progress:
                 pct = int((completed_units / total_units) * 100) if total_units > 0 else 0
                 on_progress({
                     "message": f"Fetching {provider_sym}...",
                     "progress": pct,
-                    "progress_detail": f"{i}/{len(source_symbols)} symbols",
+                    "progress_detail": detail,
                 })
 
+        # Fetch and store one symbol at a time
+        results: dict[str, int] = {}
+        failures: list[str] = []
+        for i, provider_sym in enumerate(pending, start_idx + 1):
+            report_symbol(provider_sym, f"{i}/{len(source_symbols)} symbols")
+
             try:
-                # Pass symbol types so source knows which endpoint to use
-                count = 0
-
-                def handle_rate(sym: str, date_str: str, rate: float) -> None:
-                    nonlocal count
-                    self._db.upsert_rate(date_str, sym, provider, rate)
-                    self._db.commit()
-                    count += 1
-                    if on_rates:
-                        on_rates(sym, date_str, rate)
-
-                history = source.fetch_history(
-                    [provider_sym],
-                    length,
-                    track_progress,
-                    on_rates=handle_rate,
-                    symbol_types=symbol_types,
+                count = self._fetch_symbol(
+                    source, provider_sym, length, symbol_types, track_progress, on_rates
                 )
+            except TaskCancelled:
+                # The checkpoint stays on the last finished symbol, so a
+                # resumed run fetches this one again
+                raise
             except Exception as e:
                 logger.error("failed to fetch %s from %s: %s", provider_sym, provider, e)
                 failures.append(provider_sym)
@@ -234,18 +380,14 @@ class BackfillService:
                 self._db.commit()
                 continue
 
-            if not history or provider_sym not in history or not history[provider_sym]:
+            # Save checkpoint after each symbol
+            self._db.set_backfill_checkpoint(provider, {"last_symbol_idx": i - 1, "length": length})
+            self._db.commit()
+            if count is None:
                 logger.debug("no history returned for %s from %s", provider_sym, provider)
-                # Still save checkpoint
-                self._db.set_backfill_checkpoint(provider, {"last_symbol_idx": i - 1, "length": length})
-                self._db.commit()
                 continue
 
             logger.debug("received history for %s", provider_sym)
-
-            # Save checkpoint after each symbol
-            self._db.set_backfill_checkpoint(provider, {"last_symbol_idx": i - 1, "length": length})
-            self._db.commit()
             results[f"{provider}:{provider_sym}"] = count
             logger.debug("stored %d rates for %s:%s", count, provider, provider_sym)
 
@@ -253,7 +395,234 @@ class BackfillService:
         self._db.clear_backfill_checkpoint(provider)
         self._db.commit()
 
+        # Work through deferred symbols within what is left of this run's allowance
+        for n, item in enumerate(backlog_items, 1):
+            provider_sym = item["symbol"]
+            report_symbol(provider_sym, f"{n}/{len(backlog_items)} deferred symbols")
+            db_symbol = self._db.get_symbol(provider_sym, provider)
+            try:
+                count = None
+                if db_symbol:
+                    count = self._fetch_symbol(
+                        source, provider_sym, item["length"], {provider_sym: db_symbol.type},
+                        track_progress, on_rates,
+                    )
+            except TaskCancelled:
+                raise
+            except Exception as e:
+                logger.error("failed to fetch deferred %s from %s: %s", provider_sym, provider, e)
+                failures.append(provider_sym)
+                continue
+
+            # Done (or gone from DB) - drop it from the persistent backlog
+            self._db.set_backfill_backlog(provider, [
+                entry for entry in self._db.get_backfill_backlog(provider) if entry["symbol"] != provider_sym
+            ])
+            self._db.commit()
+            if count is not None:
+                results[f"{provider}:{provider_sym}"] = count
+
         if failures:
             logger.warning("backfill %s: %d failures: %s", provider, len(failures), failures)
 
         return results, failures
+
+    def ingest_history(
+        self,
+        provider: str,
+        history: dict[str, dict[str, float]],
+        symbols: list[str] | None = None,
+        on_rates: Callable[[str, str, float], None] | None = None,
+    ) -> dict[str, int]:
+        """Store {date: {provider_symbol: rate}} in one batched transaction per year.
+
+        Only symbols already in the DB are stored (and only `symbols`, if
+        given). Data versions are bumped on each commit like any rate write,
+        so coverage and history ETags pick the new rates up.
+
+        Returns:
+            Dict mapping provider:symbol -> count of rates written
+        """
+        wanted = set(symbols) if symbols is not None else None
+        by_year: dict[str, list[tuple[str, str, float]]] = {}
+        for day, rates in history.items():
+            by_year.setdefault(day[:4], []).extend(
+                (day, sym, rate) for sym, rate in rates.items() if wanted is None or sym in wanted
+            )
+
+        known = {s.provider_symbol for s in self._db.list_symbols(provider=provider)}
+        counts: dict[str, int] = {}
+        for year in sorted(by_year, reverse=True):
+            rows = [row for row in by_year[year] if row[1] in known]
+            written = self._db.upsert_rates(provider, rows)
+            self._db.commit()
+            BACKFILL_ROWS.labels(provider).inc(written)
+            for day, sym, rate in rows:
+                counts[f"{provider}:{sym}"] = counts.get(f"{provider}:{sym}", 0) + 1
+                if on_rates:
+                    on_rates(sym, day, rate)
+            logger.debug("ingested %d %s rates for %s", written, provider, year)
+        return counts
+
+    def _backfill_years(
+        self,
+        provider: str,
+        source: YearlyRatesSource,
+        symbols: list[str],
+        length: int,
+        on_progress: Any | None,
+        on_rates: Callable[[str, str, float], None] | None,
+    ) -> tuple[dict[str, int], list[str]]:
+        """Backfill from yearly files: one request and one transaction per year."""
+        today = date.today()
+        first = (today - timedelta(days=length - 1)).isoformat()
+        years = range(today.year, int(first[:4]) - 1, -1)
+
+        results: dict[str, int] = {}
+        failed_years: list[int] = []
+        for n, year in enumerate(years, 1):
+            if on_progress:
+                on_progress({
+                    "message": f"Fetching {provider} {year}...",
+                    "progress": int((n - 1) / len(years) * 100),
+                    "progress_detail": f"{n - 1}/{len(years)} years",
+                })
+            try:
+                table = source.fetch_year(year)
+            except Exception as e:
+                logger.error("failed to fetch %s rates for %d: %s", provider, year, e)
+                failed_years.append(year)
+                continue
+            history = {day: rates for day, rates in table.items() if day >= first}
+            for key, count in self.ingest_history(provider, history, symbols, on_rates).items():
+                results[key] = results.get(key, 0) + count
+            BACKFILL_WORK_UNITS.labels(provider).inc()
+
+        # A per-symbol checkpoint from an earlier daily run no longer applies
+        self._db.clear_backfill_checkpoint(provider)
+        self._db.commit()
+
+        if failed_years:
+            logger.warning("backfill %s: failed years %s", provider, failed_years)
+            return results, list(symbols)
+        return results, []
+
+    def _resolve_symbol_types(self, provider: str, symbols: list[str]) -> dict[str, SymbolType]:
+        """Build provider_symbol -> type map from DB (source of truth for metadata)."""
+        if symbols:
+            # Specific symbols requested - look them up in DB
+            symbol_types: dict[str, SymbolType] = {}
+            for provider_sym in symbols:
+                db_symbol = self._db.get_symbol(provider_sym, provider)
+                if db_symbol:
+                    symbol_types[provider_sym] = db_symbol.type
+                else:
+                    logger.warning("provider_symbol %s not in DB for provider %s, skipping (run populate_symbols first)", provider_sym, provider)
+            return symbol_types
+
+        # No specific symbols - use all from DB for this provider
+        db_symbols = self._db.list_symbols(provider=provider)
+        logger.debug("_resolve_symbol_types: provider=%s, using %d symbols from DB", provider, len(db_symbols))
+        return {s.provider_symbol: s.type for s in db_symbols}
+
+    def _fetch_symbol(
+        self,
+        source: RateSource,
+        provider_sym: str,
+        length: int,
+        symbol_types: dict[str, SymbolType],
+        track_progress: Callable[[str | dict[str, Any]], None],
+        on_rates: Callable[[str, str, float], None] | None,
+    ) -> int | None:
+        """Fetch one symbol and store its rates. Returns rows written, None if no history."""
+        provider = source.source_id
+        count = 0
+
+        def handle_rate(sym: str, date_str: str, rate: float) -> None:
+            nonlocal count
+            self._db.upsert_rate(date_str, sym, provider, rate)
+            self._db.commit()
+            BACKFILL_ROWS.labels(provider).inc()
+            count += 1
+            if on_rates:
+                on_rates(sym, date_str, rate)
+
+        # Pass symbol types so source knows which endpoint to use
+        history = source.fetch_history(
+            [provider_sym],
+            length,
+            track_progress,
+            on_rates=handle_rate,
+            symbol_types=symbol_types,
+        )
+        if not history or provider_sym not in history or not history[provider_sym]:
+            return None
+        return count
+
+    def _plan_budget(
+        self,
+        source: RateSource,
+        quota: QuotaTracker,
+        pending: list[str],
+        length: int,
+        on_progress: Any | None,
+    ) -> tuple[list[str], list[dict]]:
+        """Fit this run into the provider's credit budget.
+
+        Priority symbols always run while the month has credits left. Other
+        symbols run while the per-run allowance lasts; the rest is appended to
+        the persistent backlog. Leftover allowance is spent on backlog entries.
+
+        Returns (symbols to fetch now, backlog entries to fetch now).
+        """
+        provider = source.source_id
+        remaining = quota.remaining() or 0
+        allowance = min(quota.run_allowance() or 0, remaining)
+        priority = set(self.priority_symbols(provider))
+        cost = source.estimate_work_units(1, length)
+
+        spent = 0
+        cut = 0
+        for provider_sym in pending:
+            in_priority = provider_sym in priority and spent + cost <= remaining
+            if not in_priority and spent + cost > allowance:
+                break
+            spent += cost
+            cut += 1
+        run_now, deferred = pending[:cut], pending[cut:]
+
+        # Merge newly deferred symbols into the backlog, keeping the longest request
+        # (entries covered by this run's fetches are dropped)
+        backlog = [
+            entry for entry in self._db.get_backfill_backlog(provider)
+            if not (entry["symbol"] in run_now and entry["length"] <= length)
+        ]
+        by_symbol = {entry["symbol"]: entry for entry in backlog}
+        for provider_sym in deferred:
+            if provider_sym in priority:
+                continue  # Scheduled runs pick these up anyway
+            if provider_sym in by_symbol:
+                by_symbol[provider_sym]["length"] = max(by_symbol[provider_sym]["length"], length)
+            else:
+                entry = {"symbol": provider_sym, "length": length}
+                backlog.append(entry)
+                by_symbol[provider_sym] = entry
+        self._db.set_backfill_backlog(provider, backlog)
+        self._db.commit()
+
+        backlog_now: list[dict] = []
+        for entry in backlog:
+            entry_cost = source.estimate_work_units(1, entry["length"])
+            if spent + entry_cost > allowance:
+                break
+            spent += entry_cost
+            backlog_now.append(entry)
+
+        if deferred or backlog:
+            logger.info(
+                "budget %s: running %d symbols + %d deferred (%d credits, allowance %d), %d remain deferred",
+                provider, len(run_now), len(backlog_now), spent, allowance, len(backlog) - len(backlog_now),
+            )
+            if on_progress and deferred:
+                on_progress({"message": f"Deferred {len(deferred)} symbols to stay within budget"})
+        return run_now, backlog_now
@@ -0,0 +1,131 @@
+import csv
+import io
+from typing import Iterator
+
+from app.database import RatesExport
+
+CSV_MEDIA_TYPE = "text/csv"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+CSV_HEADER = ("date", "provider", "symbol", "provider_symbol", "rate")
+
+
+class ArrowUnavailableError(RuntimeError):
+    """pyarrow is not installed (install the `arrow` extra)."""
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as e:
+        raise ArrowUnavailableError("Arrow export requires pyarrow (install exchanger[arrow])") from e
+    return pyarrow
+
+
+def require_arrow() -> None:
+    """Raise ArrowUnavailableError if pyarrow cannot be imported."""
+    _pyarrow()
+
+
+def csv_stream(export: RatesExport) -> Iterator[bytes]:
+    """Yield the export as CSV, one chunk per database batch.
+
+    The export is closed however the stream ends, including a client
+    disconnecting before the first batch.
+    """
+    try:
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(CSV_HEADER)
+        yield buf.getvalue().encode()
+
+        symbols = export.symbols
+        for batch in export.batches():
+            buf.seek(0)
+            buf.truncate()
+            writer.writerows((day, *symbols[symbol_id], rate) for day, symbol_id, rate in batch)
+            yield buf.getvalue().encode()
+    finally:
+        export.close()
+
+
+class _Sink:
+    """Write-only file object the IPC writer drains into between batches."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def arrow_stream(export: RatesExport) -> Iterator[bytes]:
+    """Yield the export as an Arrow IPC stream, one record batch per database batch.
+
+    Columns: date (date32), provider/symbol/provider_symbol (dictionary-encoded
+    strings) and rate (float64). The dictionaries are built once from the
+    export's symbol table, so every batch shares them and carries only int32
+    indices. The export is closed however the stream ends.
+    """
+    try:
+        yield from _arrow_batches(export)
+    finally:
+        export.close()
+
+
+def _arrow_batches(export: RatesExport) -> Iterator[bytes]:
+    pa = _pyarrow()
+
+    ids = list(export.symbols)
+    position = {symbol_id: i for i, symbol_id in enumerate(ids)}
+    dictionaries = []
+    index_columns = []
+    for field in range(3):
+        values: list[str] = []
+        seen: dict[str, int] = {}
+        indices = []
+        for symbol_id in ids:
+            value = export.symbols[symbol_id][field]
+            if value not in seen:
+                seen[value] = len(values)
+                values.append(value)
+            indices.append(seen[value])
+        dictionaries.append(pa.array(values, pa.string()))
+        index_columns.append(indices)
+
+    string_dict = pa.dictionary(pa.int32(), pa.string())
+    schema = pa.schema([
+        ("date", pa.date32()),
+        ("provider", string_dict),
+        ("symbol", string_dict),
+        ("provider_symbol", string_dict),
+        ("rate", pa.float64()),
+    ])
+
+    sink = _Sink()
+    writer = pa.ipc.new_stream(sink, schema)
+    for batch in export.batches():
+        rows = [position[symbol_id] for _, symbol_id, _ in batch]
+        columns = [pa.array([day for day, _, _ in batch], pa.string()).cast(pa.date32())]
+        for dictionary, indices in zip(dictionaries, index_columns):
+            codes = pa.array([indices[row] for row in rows], pa.int32())
+            columns.append(pa.DictionaryArray.from_arrays(codes, dictionary))
+        columns.append(pa.array([rate for _, _, rate in batch], pa.float64()))
+        writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
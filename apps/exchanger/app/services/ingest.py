@@ -0,0 +1,78 @@
+import csv
+import io
+from datetime import datetime
+from typing import Iterator
+
+from app.sources.cnb import parse_year_table
+
+# Largest rates file POST /ingest accepts; bigger files are split by the operator
+INGEST_MAX_BYTES = 32 * 1024 * 1024
+# Rates written per trip to the DB thread, so reads interleave with a large ingest
+INGEST_CHUNK_RATES = 5000
+
+
+class RatesFileError(ValueError):
+    """Uploaded rates file is not in a supported format."""
+
+
+def parse_rates_file(text: str, provider: str) -> dict[str, dict[str, float]]:
+    """Parse a bulk historical rates file into {date: {provider_symbol: rate}}.
+
+    Two formats are accepted:
+    - a CNB yearly table (`Datum|1 AUD|...`, rates per header amount)
+    - CSV with a header row: `date` (YYYY-MM-DD or DD.MM.YYYY), `provider_symbol`
+      or `symbol`, `rate`, and optionally `amount` (rate is per that many units)
+      and `provider` (rows of other providers are ignored). The CSV that
+      /rates/export produces fits.
+    """
+    text = text.lstrip("\ufeff")
+    if text.startswith("Datum|"):
+        return parse_year_table(text)
+
+    reader = csv.DictReader(io.StringIO(text))
+    fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+    symbol_field = fields.get("provider_symbol") or fields.get("symbol")
+    if "date" not in fields or "rate" not in fields or not symbol_field:
+        raise RatesFileError("expected a CNB yearly table or CSV with date, symbol (or provider_symbol) and rate columns")
+
+    rates: dict[str, dict[str, float]] = {}
+    for line, row in enumerate(reader, start=2):
+        # DictReader fills the columns missing from a short row with None
+        if None in row.values():
+            raise RatesFileError(f"line {line}: expected {len(fields)} columns")
+        if "provider" in fields and row[fields["provider"]].strip() != provider:
+            continue
+        try:
+            symbol = row[symbol_field].strip()
+            day = _parse_date(row[fields["date"]].strip())
+            rate = float(row[fields["rate"]].strip().replace(",", "."))
+            amount = int(row[fields["amount"]]) if "amount" in fields and row[fields["amount"]] else 1
+        except ValueError as e:
+            raise RatesFileError(f"line {line}: {e}") from e
+        rates.setdefault(day, {})[symbol] = rate / amount if amount > 0 else rate
+    return rates
+
+
+def chunk_history(
+    history: dict[str, dict[str, float]], max_rates: int
+) -> Iterator[dict[str, dict[str, float]]]:
+    """Split {date: {symbol: rate}} into whole days of about max_rates rates each."""
+    chunk: dict[str, dict[str, float]] = {}
+    size = 0
+    for day, rates in history.items():
+        if chunk and size + len(rates) > max_rates:
+            yield chunk
+            chunk, size = {}, 0
+        chunk[day] = rates
+        size += len(rates)
+    if chunk:
+        yield chunk
+
+
+def _parse_date(value: str) -> str:
+    for fmt in ("%Y-%m-%d", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(value, fmt).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"invalid date {value!r}")
@@ -0,0 +1,96 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from app.async_database import AsyncDatabase
+from app.config import DEFAULT_ON_DEMAND_MAX_CONCURRENCY
+from app.sources.protocol import RateWindowSource
+from app.sources.registry import SourceRegistry
+
+logger = logging.getLogger(__name__)
+
+# How far back a window fetch (fetch_rate_window) may usefully reach
+WINDOW_MAX_DAYS = 300
+
+
+class OnDemandFetcher:
+    """Fetches single missing rates from providers for async route handlers.
+
+    Source clients are blocking (fcsapi-rest, requests), so upstream calls
+    run on a bounded pool of their own instead of the event loop, and a slow
+    provider cannot exhaust the request threadpool. Concurrent requests for the same
+    (provider, symbol, date) share one upstream call.
+
+    Sources with `fetch_rate_window` return a whole history window per call;
+    every rate in it is stored in one batch, so later lookups of nearby
+    dates are DB hits. The window starts right after the newest rate already
+    stored before the requested date, so stored history is not fetched again.
+    """
+
+    def __init__(self, registry: SourceRegistry, db: AsyncDatabase, max_workers: int = DEFAULT_ON_DEMAND_MAX_CONCURRENCY):
+        self._registry = registry
+        self._db = db
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="on-demand")
+        self._inflight: dict[tuple[str, str, date], asyncio.Task[float | None]] = {}
+
+    async def fetch_rate(self, dt: date, symbol: str, provider: str) -> float | None:
+        key = (provider, symbol, dt)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(dt, symbol, provider))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded: a client disconnecting must not cancel a fetch others wait on
+        return await asyncio.shield(task)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _fetch(self, dt: date, symbol: str, provider: str) -> float | None:
+        source = self._registry.get(provider)
+        if not source:
+            return None
+
+        if isinstance(source, RateWindowSource):
+            return await self._fetch_window(source, dt, symbol, provider)
+
+        logger.debug("fetching rate from source %s", provider)
+        loop = asyncio.get_running_loop()
+        try:
+            rate = await loop.run_in_executor(self._executor, source.fetch_rate, symbol, dt)
+        except Exception as e:
+            logger.warning("source fetch failed: %s", e)
+            return None
+        if rate is None:
+            logger.debug("source returned no rate")
+            return None
+
+        logger.debug("caching rate=%s", rate)
+        await self._db.store_rate(dt.strftime("%Y-%m-%d"), symbol, provider, rate)
+        return rate
+
+    async def _fetch_window(self, source: RateWindowSource, dt: date, symbol: str, provider: str) -> float | None:
+        date_str = dt.isoformat()
+        floor = dt - timedelta(days=WINDOW_MAX_DAYS)
+        stored = await self._db.run(
+            self._db.sync.get_latest_rate_date, symbol, provider, floor.isoformat(), date_str
+        )
+        window_start = date.fromisoformat(stored) + timedelta(days=1) if stored else floor
+
+        logger.debug("fetching %s window %s..%s from source %s", symbol, window_start, dt, provider)
+        loop = asyncio.get_running_loop()
+        fetch = functools.partial(source.fetch_rate_window, symbol, dt, window_start=window_start)
+        try:
+            rates = await loop.run_in_executor(self._executor, fetch)
+        except Exception as e:
+            logger.warning("source fetch failed: %s", e)
+            return None
+        if not rates:
+            logger.debug("source returned no rates")
+            return None
+
+        written = await self._db.store_rates(provider, [(day, symbol, rate) for day, rate in rates.items()])
+        logger.debug("cached %d rates for %s from one window fetch", written, symbol)
+        return rates.get(date_str)
@@ -0,0 +1,98 @@
+import calendar
+import logging
+from datetime import datetime, timezone
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Usage windows tracked per provider, with the strftime format of each window's key
+USAGE_WINDOWS: dict[str, str] = {
+    "minute": "%Y-%m-%dT%H:%M",
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m",
+}
+
+
+class QuotaDatabase(Protocol):
+    def get_api_usage(self, provider: str) -> dict[str, tuple[str, int]]: ...
+    def add_api_usage(self, provider: str, periods: dict[str, str], credits: int) -> None: ...
+
+
+class QuotaTracker:
+    """Persistent per-provider accounting of API credits.
+
+    Counts are kept per minute, day and month (UTC calendar month is the billing
+    period) in the `api_usage` table, so they survive restarts and add up across
+    worker processes. A window's count resets as soon as the current time moves
+    into a new window.
+    """
+
+    def __init__(
+        self,
+        db: QuotaDatabase,
+        provider: str,
+        monthly_budget: int = 0,
+        runs_per_day: int = 1,
+    ):
+        self._db = db
+        self._provider = provider
+        self._monthly_budget = monthly_budget
+        self._runs_per_day = max(1, runs_per_day)
+
+    @property
+    def provider(self) -> str:
+        return self._provider
+
+    @property
+    def monthly_budget(self) -> int:
+        """Credits allowed per billing period (0 = unlimited)."""
+        return self._monthly_budget
+
+    def record(self, credits: int = 1) -> None:
+        """Account for credits spent on upstream requests."""
+        now = datetime.now(timezone.utc)
+        periods = {window: now.strftime(fmt) for window, fmt in USAGE_WINDOWS.items()}
+        self._db.add_api_usage(self._provider, periods, credits)
+        logger.debug("quota %s: +%d in %s", self._provider, credits, periods)
+
+    def usage(self) -> dict[str, int]:
+        """Return credits used in the current minute, day and month."""
+        now = datetime.now(timezone.utc)
+        stored = self._db.get_api_usage(self._provider)
+        usage: dict[str, int] = {}
+        for window, fmt in USAGE_WINDOWS.items():
+            period, count = stored.get(window, ("", 0))
+            usage[window] = count if period == now.strftime(fmt) else 0
+        return usage
+
+    def remaining(self) -> int | None:
+        """Credits left in the billing period, or None if no budget is configured."""
+        if not self._monthly_budget:
+            return None
+        return max(0, self._monthly_budget - self.usage()["month"])
+
+    def run_allowance(self) -> int | None:
+        """Credits a single scheduled run may spend to last until the period ends.
+
+        Spreads the remaining budget evenly over the days left in the month
+        (including today) and the configured backfill runs per day.
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return None
+        today = datetime.now(timezone.utc).date()
+        days_in_month = calendar.monthrange(today.year, today.month)[1]
+        days_left = days_in_month - today.day + 1
+        return remaining // (days_left * self._runs_per_day)
+
+    def status(self) -> dict[str, Any]:
+        """Usage snapshot for provider status reporting."""
+        usage = self.usage()
+        return {
+            "used_minute": usage["minute"],
+            "used_day": usage["day"],
+            "used_month": usage["month"],
+            "monthly_budget": self._monthly_budget or None,
+            "remaining": self.remaining(),
+            "run_allowance": self.run_allowance(),
+        }
@@ -1,10 +1,11 @@
 import logging
 from datetime import datetime, timezone
-from typing import Any, Protocol
+from typing import Any, Iterable, Protocol
 
-from app.models import Symbol
-from app.sources.protocol import RateSource
+from app.models import SymbolInfo
+from app.sources.protocol import PagedSymbolsSource, RateSource, SymbolCacheSource
 from app.sources.registry import SourceRegistry
+from app.utils.retry import is_cancelled
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +13,9 @@ DEFAULT_SYMBOLS_MAX_AGE_DAYS = 30
 
 
 class SymbolsDatabase(Protocol):
-    def populate_symbols(self, provider: str, symbols: list[Symbol]) -> None: ...
+    def stage_symbols(self, provider: str, symbols: Iterable[SymbolInfo]) -> int: ...
+    def discard_staged_symbols(self, provider: str) -> None: ...
+    def apply_staged_symbols(self, provider: str) -> None: ...
     def get_symbols_populated_at(self, provider: str) -> str | None: ...
     def set_symbols_populated_at(self, provider: str, timestamp: str) -> None: ...
     def count_symbols(self, provider: str) -> int: ...
@@ -88,28 +91,44 @@ class SymbolsService:
         if on_progress:
             on_progress(f"Fetching symbols from {provider}...")
 
-        symbol_infos = source.list_symbols()
-        logger.debug("fetched %d symbol infos from %s", len(symbol_infos), provider)
-
-        # Convert SymbolInfo to Symbol with provider
-        symbols = [
-            Symbol(provider=provider, symbol=si.symbol, provider_symbol=si.provider_symbol, type=si.type, name=si.name)
-            for si in symbol_infos
-        ]
+        # Pages are staged in the DB as they arrive; sources that page in
+        # parallel (list_symbol_pages) keep fetching while a page is written
+        if isinstance(source, PagedSymbolsSource):
+            pages: Iterable[list[SymbolInfo]] = source.list_symbol_pages(on_progress)
+        else:
+            pages = [source.list_symbols(on_progress)]
+        # The staged SymbolInfo objects double as the source's cache
+        cache: list[SymbolInfo] | None = [] if isinstance(source, SymbolCacheSource) else None
 
-        if on_progress:
-            on_progress(f"Saving {len(symbols)} symbols from {provider}...")
+        count = 0
+        self._db.discard_staged_symbols(provider)
+        try:
+            for page in pages:
+                count += self._db.stage_symbols(provider, page)
+                if cache is not None:
+                    cache.extend(page)
+                if on_progress:
+                    on_progress(f"Fetched {count} symbols from {provider}...")
+            if is_cancelled():
+                # A partial listing must not remove the symbols it missed
+                logger.debug("populate cancelled for provider=%s, discarding %d staged symbols", provider, count)
+                self._db.discard_staged_symbols(provider)
+                return 0
+
+            if on_progress:
+                on_progress(f"Saving {count} symbols from {provider}...")
+            self._db.apply_staged_symbols(provider)
+        except BaseException:
+            self._db.discard_staged_symbols(provider)
+            raise
 
-        self._db.populate_symbols(provider, symbols)
         self._db.set_symbols_populated_at(provider, datetime.now(timezone.utc).isoformat())
         self._db.commit()
-        logger.debug("saved %d symbols for provider=%s", len(symbols), provider)
+        logger.debug("saved %d symbols for provider=%s", count, provider)
 
         # Update source's internal cache (needed for FCS backfill to know types)
-        if hasattr(source, "set_symbol_cache"):
-            from app.models import SymbolInfo
-            symbol_infos_for_cache = [SymbolInfo(symbol=s.symbol, provider_symbol=s.provider_symbol, type=s.type, name=s.name) for s in symbols]
-            source.set_symbol_cache(symbol_infos_for_cache)
-            logger.debug("set %d symbols in %s source cache", len(symbol_infos_for_cache), provider)
+        if cache is not None and isinstance(source, SymbolCacheSource):
+            source.set_symbol_cache(cache)
+            logger.debug("set %d symbols in %s source cache", len(cache), provider)
 
-        return len(symbols)
+        return count
@@ -1,11 +1,12 @@
 import logging
 import time
 import urllib.request
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from typing import Callable
 
+from app.metrics import UPSTREAM_ERRORS, UPSTREAM_REQUEST_SECONDS
 from app.models import SymbolInfo, SymbolType
-from app.utils.retry import is_shutting_down
+from app.utils.retry import is_cancelled
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,8 @@ RETRY_DELAY = 2
 
 
 CNB_URL = "https://www.cnb.cz/cs/financni-trhy/devizovy-trh/kurzy-devizoveho-trhu/kurzy-devizoveho-trhu/denni_kurz.txt"
+# Whole year of fixings in one table, ?rok=YYYY
+CNB_YEAR_URL = "https://www.cnb.cz/cs/financni-trhy/devizovy-trh/kurzy-devizoveho-trhu/kurzy-devizoveho-trhu/rok.txt"
 
 # CNB publishes rates for these currencies (codes)
 CNB_CURRENCIES = [
@@ -90,7 +93,7 @@ class CnbSource:
         today = date.today()
 
         for day_offset in range(days):
-            if is_shutting_down():
+            if is_cancelled():
                 break
 
             dt = today - timedelta(days=day_offset)
@@ -110,7 +113,7 @@ class CnbSource:
                 on_progress({"work_unit_done": True, "message": f"Fetched CNB {date_str}"})
 
             # Polite delay (except after last)
-            if day_offset < days - 1 and not is_shutting_down() and self._fetch_delay > 0:
+            if day_offset < days - 1 and not is_cancelled() and self._fetch_delay > 0:
                 time.sleep(self._fetch_delay)
 
         return results
@@ -119,6 +122,12 @@ class CnbSource:
         rates = self._fetch_rates_for_date(dt)
         return rates.get(symbol)
 
+    def fetch_year(self, year: int) -> dict[str, dict[str, float]]:
+        """Fetch a year's fixings in one request: {date: {symbol: rate}}."""
+        url = f"{CNB_YEAR_URL}?rok={year}"
+        logger.debug("fetching CNB yearly rates from %s", url)
+        return parse_year_table(self._get(url, "rok", str(year)))
+
     def list_symbols(
         self, on_progress: Callable[[str], None] | None = None
     ) -> list[SymbolInfo]:
@@ -158,19 +167,25 @@ class CnbSource:
     def _fetch_rates_for_date(self, dt: date) -> dict[str, float]:
         url = f"{CNB_URL}?date={dt.strftime('%d.%m.%Y')}"
         logger.debug("fetching CNB rates from %s", url)
+        return _parse_response(self._get(url, "denni_kurz", str(dt)))
+
+    def _get(self, url: str, endpoint: str, what: str) -> str:
         last_error: Exception | None = None
 
         for attempt in range(MAX_RETRIES):
+            start = time.perf_counter()
             try:
-                text = self._http_get(url)
-                return _parse_response(text)
+                return self._http_get(url)
             except Exception as e:
+                UPSTREAM_ERRORS.labels("cnb", "exception").inc()
                 last_error = e
                 logger.warning("CNB fetch attempt %d/%d failed: %s", attempt + 1, MAX_RETRIES, e)
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_DELAY * (attempt + 1))
+            finally:
+                UPSTREAM_REQUEST_SECONDS.labels("cnb", endpoint).observe(time.perf_counter() - start)
+            if attempt < MAX_RETRIES - 1:
+                time.sleep(RETRY_DELAY * (attempt + 1))
 
-        raise ConnectionError(f"CNB fetch failed after {MAX_RETRIES} attempts for {dt}") from last_error
+        raise ConnectionError(f"CNB fetch failed after {MAX_RETRIES} attempts for {what}") from last_error
 
 
 def _default_http_get(url: str) -> str:
@@ -217,6 +232,52 @@ def _parse_response(text: str) -> dict[str, float]:
     return rates
 
 
+def parse_year_table(text: str) -> dict[str, dict[str, float]]:
+    """Parse a CNB yearly table into {date: {symbol: rate}}.
+
+    CNB format:
+    Datum|1 AUD|1 BGN|...|100 JPY|...
+    02.01.2024|15,194|12,362|...|15,836|...
+    ...
+
+    The header repeats with a new column set when CNB adds or drops a
+    currency mid-year. Like the daily file, rates are per Amount units
+    (the number in the header), so we divide to get the rate per 1 unit.
+    """
+    rates: dict[str, dict[str, float]] = {}
+    columns: list[tuple[str, int] | None] = []
+
+    for line in text.strip().split("\n"):
+        parts = [p.strip() for p in line.split("|")]
+        if parts[0] == "Datum":
+            columns = []
+            for header in parts[1:]:
+                amount, _, code = header.partition(" ")
+                try:
+                    columns.append((f"{code}CZK", int(amount)))
+                except ValueError:
+                    columns.append(None)
+            continue
+
+        try:
+            day = datetime.strptime(parts[0], "%d.%m.%Y").date().isoformat()
+        except ValueError:
+            continue
+
+        day_rates = rates.setdefault(day, {})
+        for column, value in zip(columns, parts[1:]):
+            if column is None or not value:
+                continue
+            symbol, amount = column
+            try:
+                rate = float(value.replace(",", "."))
+            except ValueError:
+                continue
+            day_rates[symbol] = rate / amount if amount > 0 else rate
+
+    return {day: day_rates for day, day_rates in rates.items() if day_rates}
+
+
 def _parse_symbol_names(text: str) -> dict[str, str]:
     """Parse CNB response to extract symbol names.
 
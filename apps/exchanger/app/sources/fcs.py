@@ -1,20 +1,42 @@
 import logging
 import math
+import queue
+import threading
 from datetime import date, datetime, timezone
-from typing import Callable
+from typing import Callable, Iterator
 
 from src import FcsApi  # fcsapi-rest package installs as 'src'
 
 from app.models import SymbolInfo, SymbolType
-from app.utils.retry import fetch_with_retry, is_shutting_down
+from app.utils.retry import fetch_with_retry, get_task_cancel_event, is_cancelled, set_task_cancel_event
 
 logger = logging.getLogger(__name__)
 
+# Max symbols per {type}/latest request (comma-separated symbol list)
+LATEST_BATCH_SIZE = 50
+# Max candles per {type}/history request (API limit)
+HISTORY_MAX_LENGTH = 300
+# Symbol types listed by list_symbols, paged in parallel
+SYMBOL_TYPES: tuple[SymbolType, ...] = ("forex", "crypto")
+# Symbols per {type}/list page
+LIST_PAGE_SIZE = 1500
+
 
 class FcsSource:
-    def __init__(self, api_key: str, rate_limit_wait: int = 65):
+    def __init__(
+        self,
+        api_key: str,
+        rate_limit_wait: int = 65,
+        on_request: Callable[[], None] | None = None,
+        base_url: str | None = None,
+    ):
         self._api = FcsApi(api_key)
+        if base_url:
+            # Point the client at another server (e.g. a local stand-in for load tests)
+            self._api.BASE_URL = base_url.rstrip("/") + "/"
         self._rate_limit_wait = rate_limit_wait
+        # Called once per credit-consuming API request (quota accounting)
+        self._on_request = on_request
         # Cache: symbol -> SymbolInfo (type + name)
         self._symbol_cache: dict[str, SymbolInfo] = {}
 
@@ -23,7 +45,7 @@ class FcsSource:
         return "fcs"
 
     def estimate_work_units(self, symbol_count: int, days: int) -> int:
-        return symbol_count * math.ceil(days / 300)
+        return symbol_count * math.ceil(days / HISTORY_MAX_LENGTH)
 
     def available_symbols(
         self, on_progress: Callable[[str], None] | None = None
@@ -76,7 +98,7 @@ class FcsSource:
         results: dict[str, dict[str, float]] = {}
 
         for symbol in symbols:
-            if is_shutting_down():
+            if is_cancelled():
                 break
             # Get type from: 1) explicit param, 2) internal cache, 3) skip with warning
             sym_type = None
@@ -113,9 +135,9 @@ class FcsSource:
         logger.debug("_fetch_symbol_history: symbol=%s type=%s length=%d", symbol, sym_type, length)
 
         while remaining > 0:
-            if is_shutting_down():
+            if is_cancelled():
                 break
-            page_length = min(remaining, 300)
+            page_length = min(remaining, HISTORY_MAX_LENGTH)
             params = {"symbol": symbol, "period": "1D", "length": page_length, "page": page}
 
             if on_progress:
@@ -123,7 +145,7 @@ class FcsSource:
 
             logger.debug("requesting %s page=%d length=%d", endpoint, page, page_length)
             response = fetch_with_retry(
-                self._api, endpoint, params, self._rate_limit_wait, on_progress
+                self._api, endpoint, params, self._rate_limit_wait, on_progress, self._on_request
             )
 
             if not response or response.get("code") != 200:
@@ -164,6 +186,22 @@ class FcsSource:
             dt: Date to fetch
             symbol_type: Optional explicit type. If not provided, uses internal cache.
         """
+        return self.fetch_rate_window(symbol, dt, symbol_type=symbol_type).get(dt.strftime("%Y-%m-%d"))
+
+    def fetch_rate_window(
+        self,
+        symbol: str,
+        dt: date,
+        window_start: date | None = None,
+        symbol_type: SymbolType | None = None,
+    ) -> dict[str, float]:
+        """Fetch the history window that contains dt, as {date_str: close}.
+
+        `{type}/history` always ends today and costs one credit up to
+        HISTORY_MAX_LENGTH candles, so the window reaches back to dt and,
+        if window_start is earlier, on to window_start (capped). Callers
+        store every candle, not just dt's.
+        """
         # Get type from: 1) explicit param, 2) internal cache
         sym_type = symbol_type
         if not sym_type and symbol in self._symbol_cache:
@@ -171,42 +209,159 @@ class FcsSource:
 
         if not sym_type:
             logger.warning("unknown symbol type for %s, cannot fetch rate (populate symbols first)", symbol)
-            return None
+            return {}
 
-        days_back = (date.today() - dt).days + 1
-        length = max(1, min(days_back, 300))  # Cap at 300 (API limit)
-        target_date = dt.strftime("%Y-%m-%d")
+        today = date.today()
+        days_back = (today - dt).days + 1
+        if window_start is not None:
+            days_back = max(days_back, (today - window_start).days + 1)
+        length = max(1, min(days_back, HISTORY_MAX_LENGTH))
 
         endpoint = f"{sym_type}/history"
         params = {"symbol": symbol, "period": "1D", "length": length}
 
-        response = fetch_with_retry(self._api, endpoint, params, self._rate_limit_wait)
+        response = fetch_with_retry(
+            self._api, endpoint, params, self._rate_limit_wait, on_request=self._on_request
+        )
         if not response or response.get("code") != 200:
-            return None
+            return {}
 
         candles_data = response.get("response") or {}
-        if not candles_data:
-            return None
+        return {self._unix_to_ymd(candle["t"]): float(candle["c"]) for candle in candles_data.values()}
+
+    def fetch_latest(
+        self,
+        symbols: list[str],
+        on_progress: Callable[[str], None] | None = None,
+        on_rates: Callable[[str, str, float], None] | None = None,
+        symbol_types: dict[str, SymbolType] | None = None,
+    ) -> dict[str, dict[str, float]]:
+        """Fetch the latest daily close for many symbols at once.
+
+        Symbols are grouped by type and requested from `{type}/latest` in
+        batches of LATEST_BATCH_SIZE, so one API credit covers a whole batch.
+
+        Returns:
+            Dict mapping symbol -> {date_str: rate} (date of the latest candle)
+        """
+        by_type: dict[SymbolType, list[str]] = {}
+        for symbol in symbols:
+            sym_type = None
+            if symbol_types and symbol in symbol_types:
+                sym_type = symbol_types[symbol]
+            elif symbol in self._symbol_cache:
+                sym_type = self._symbol_cache[symbol].type
+
+            if not sym_type:
+                logger.warning("unknown symbol type for %s, skipping (populate symbols first)", symbol)
+                continue
+            by_type.setdefault(sym_type, []).append(symbol)
+
+        batches = [
+            (sym_type, type_symbols[i : i + LATEST_BATCH_SIZE])
+            for sym_type, type_symbols in by_type.items()
+            for i in range(0, len(type_symbols), LATEST_BATCH_SIZE)
+        ]
+        logger.debug("fetch_latest: %d symbols in %d batches", len(symbols), len(batches))
+        results: dict[str, dict[str, float]] = {}
+
+        for n, (sym_type, batch) in enumerate(batches, 1):
+            if is_cancelled():
+                break
+            if on_progress:
+                on_progress({
+                    "message": f"Fetching latest {sym_type} batch {n}/{len(batches)}...",
+                    "progress": int(((n - 1) / len(batches)) * 100),
+                    "progress_detail": f"{n - 1}/{len(batches)} batches",
+                })
+
+            endpoint = f"{sym_type}/latest"
+            params = {"symbol": ",".join(batch), "period": "1D"}
+            response = fetch_with_retry(
+                self._api, endpoint, params, self._rate_limit_wait, on_progress, self._on_request
+            )
+            if not response or response.get("code") != 200:
+                logger.debug("bad response from API: %s", response.get("code") if response else "None")
+                continue
 
-        candles = list(candles_data.values())
-        for candle in candles:
-            day = self._unix_to_ymd(candle["t"])
-            if day == target_date:
-                return float(candle["c"])
+            items = response.get("response") or []
+            if isinstance(items, dict):
+                items = list(items.values())
 
+            for item in items:
+                symbol = self._match_latest_symbol(item, batch)
+                candle = item.get("active") or item
+                if not symbol or "c" not in candle or "t" not in candle:
+                    continue
+                day = self._unix_to_ymd(candle["t"])
+                rate = float(candle["c"])
+                results.setdefault(symbol, {})[day] = rate
+                if on_rates:
+                    on_rates(symbol, day, rate)
+
+        return results
+
+    @staticmethod
+    def _match_latest_symbol(item: dict, requested: list[str]) -> str | None:
+        """Map a {type}/latest item back to the provider_symbol we asked for.
+
+        Items carry the symbol in profile.symbol and/or as an exchange-prefixed
+        ticker (e.g. FX:EURUSD).
+        """
+        profile = item.get("profile") or {}
+        ticker = item.get("ticker") or ""
+        for candidate in (profile.get("symbol"), item.get("symbol"), ticker, ticker.split(":")[-1]):
+            if candidate and candidate in requested:
+                return candidate
         return None
 
     def list_symbols(
         self, on_progress: Callable[[str], None] | None = None
     ) -> list[SymbolInfo]:
-        symbols: list[SymbolInfo] = []
+        return [info for page in self.list_symbol_pages(on_progress) for info in page]
 
-        for sym_type in ("forex", "crypto"):
-            if is_shutting_down():
-                break
-            symbols.extend(self._fetch_symbols_of_type(sym_type, on_progress))
+    def list_symbol_pages(
+        self, on_progress: Callable[[str], None] | None = None
+    ) -> Iterator[list[SymbolInfo]]:
+        """Yield {type}/list pages as they arrive.
 
-        return symbols
+        Every symbol type is paged on a thread of its own, so the types are
+        fetched in parallel while the caller consumes (e.g. stages) the pages
+        already received. Pages of different types interleave. A failed
+        request ends that type's listing, as in list_symbols.
+        """
+        pages: queue.Queue[list[SymbolInfo] | BaseException | None] = queue.Queue()
+        stop = threading.Event()
+        cancel_event = get_task_cancel_event()
+
+        def produce(sym_type: SymbolType) -> None:
+            # Cancelling the caller's task stops the listing threads too
+            set_task_cancel_event(cancel_event)
+            try:
+                for page in self._symbol_pages_of_type(sym_type, on_progress):
+                    if stop.is_set():
+                        break
+                    pages.put(page)
+            except BaseException as e:
+                pages.put(e)
+            finally:
+                pages.put(None)
+
+        for sym_type in SYMBOL_TYPES:
+            threading.Thread(target=produce, args=(sym_type,), name=f"fcs-list-{sym_type}", daemon=True).start()
+
+        try:
+            running = len(SYMBOL_TYPES)
+            while running:
+                item = pages.get()
+                if item is None:
+                    running -= 1
+                elif isinstance(item, BaseException):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stop.set()
 
     def get_symbol_info(self, symbol: str) -> SymbolInfo | None:
         """Get symbol info from internal cache.
@@ -216,28 +371,32 @@ class FcsSource:
         """
         return self._symbol_cache.get(symbol)
 
-    def _fetch_symbols_of_type(
+    def _symbol_pages_of_type(
         self,
         sym_type: SymbolType,
         on_progress: Callable[[str], None] | None = None,
-    ) -> list[SymbolInfo]:
+    ) -> Iterator[list[SymbolInfo]]:
         endpoint = f"{sym_type}/list"
         page = 1
-        symbols: list[SymbolInfo] = []
 
         while True:
-            if is_shutting_down():
+            if is_cancelled():
                 break
             if on_progress:
                 on_progress(f"Fetching {sym_type} page {page}...")
 
             response = fetch_with_retry(
-                self._api, endpoint, {"page": page, "per_page": 1500}, self._rate_limit_wait, on_progress
+                self._api, endpoint, {"page": page, "per_page": LIST_PAGE_SIZE}, self._rate_limit_wait, on_progress,
+                self._on_request,
             )
 
             if not response or response.get("code") != 200:
-                break
+                if is_cancelled():
+                    break
+                # Ending the listing here would make the caller prune every symbol it missed
+                raise RuntimeError(f"Failed to list FCS {sym_type} symbols (page {page})")
 
+            symbols: list[SymbolInfo] = []
             for item in response.get("response") or []:
                 profile = item.get("profile") or {}
                 sym = profile.get("symbol")
@@ -248,6 +407,8 @@ class FcsSource:
 
                 normalized = self._normalize_symbol(sym)
                 symbols.append(SymbolInfo(symbol=normalized, provider_symbol=sym, type=sym_type, name=name))
+            if symbols:
+                yield symbols
 
             pagination = response.get("info", {}).get("pagination", {})
             if not pagination.get("has_next"):
@@ -255,8 +416,6 @@ class FcsSource:
 
             page += 1
 
-        return symbols
-
     @staticmethod
     def _unix_to_ymd(ts) -> str:
         return datetime.fromtimestamp(int(ts), tz=timezone.utc).strftime("%Y-%m-%d")
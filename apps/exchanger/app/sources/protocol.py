@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Protocol, Callable
+from typing import Callable, Iterator, Protocol, runtime_checkable
 
 from app.models import SymbolInfo, SymbolType
 
@@ -80,3 +80,64 @@ class RateSource(Protocol):
         - CNB: days (one call returns all symbols)
         """
         ...
+
+
+# Optional capabilities. A source declares one by implementing its method;
+# callers check with isinstance and fall back to the RateSource methods.
+
+
+@runtime_checkable
+class LatestRatesSource(Protocol):
+    def fetch_latest(
+        self,
+        symbols: list[str],
+        on_progress: Callable[[str], None] | None = None,
+        on_rates: Callable[[str, str, float], None] | None = None,
+        symbol_types: dict[str, SymbolType] | None = None,
+    ) -> dict[str, dict[str, float]]:
+        """Fetch the latest daily close for many symbols in batched requests.
+
+        Returns:
+            Dict mapping symbol -> {date_str: rate}
+        """
+        ...
+
+
+@runtime_checkable
+class YearlyRatesSource(Protocol):
+    def fetch_year(self, year: int) -> dict[str, dict[str, float]]:
+        """Fetch every rate of a calendar year in one request: {date_str: {symbol: rate}}."""
+        ...
+
+
+@runtime_checkable
+class RateWindowSource(Protocol):
+    def fetch_rate_window(
+        self,
+        symbol: str,
+        dt: date,
+        window_start: date | None = None,
+        symbol_type: SymbolType | None = None,
+    ) -> dict[str, float]:
+        """Fetch the history window containing dt, as {date_str: rate}.
+
+        One request returns every rate of the window, so callers store them
+        all instead of just dt's.
+        """
+        ...
+
+
+@runtime_checkable
+class PagedSymbolsSource(Protocol):
+    def list_symbol_pages(
+        self, on_progress: Callable[[str], None] | None = None
+    ) -> Iterator[list[SymbolInfo]]:
+        """Yield the symbols of list_symbols page by page as they arrive."""
+        ...
+
+
+@runtime_checkable
+class SymbolCacheSource(Protocol):
+    def set_symbol_cache(self, symbols: list[SymbolInfo]) -> None:
+        """Replace the source's symbol cache with the populated symbols."""
+        ...
@@ -1,24 +1,86 @@
 import asyncio
 import logging
 import threading
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from concurrent.futures import Future, ThreadPoolExecutor
-from typing import Any, Callable
+from typing import Any, Callable, Literal, Protocol
 
 from fastapi import WebSocket
 
+from app.utils.retry import set_task_cancel_event
+
 logger = logging.getLogger(__name__)
 
+# Builds the callable for a named job from its task key and JSON-serializable params
+JobFactory = Callable[[str, dict[str, Any]], Callable[[], None]]
+
+Lane = Literal["interactive", "bulk"]
+# Dispatch order: interactive work (populate, user-triggered lookups) goes first
+LANES: tuple[Lane, ...] = ("interactive", "bulk")
+ACTIVE_STATUSES = ("running", "queued")
+# Request kind a follower stores to cancel a task running on the leader
+CANCEL_REQUEST = "cancel"
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task once it has been cancelled."""
+
+
+@dataclass
+class _Pending:
+    task: str
+    fn: Callable[[], None]
+    lane: Lane
+    provider: str | None
+
+
+class TaskStore(Protocol):
+    def save_task_status(self, task: str, status: dict) -> None: ...
+    def load_task_statuses(self) -> dict[str, dict]: ...
+    def add_task_request(self, task: str, kind: str, params: dict) -> None: ...
+    def pop_task_requests(self) -> list[dict]: ...
+    def list_requested_tasks(self) -> set[str]: ...
+
 
 class TaskManager:
-    def __init__(self, max_workers: int = 4):
+    """Background task runner with status reporting.
+
+    Tasks wait in one of two lanes until a worker is free. Interactive tasks
+    are dispatched first and bulk tasks never take the last `interactive_reserve`
+    workers, so a long backfill cannot hold up symbol population. A task key
+    of the form `kind:provider` counts against that provider's limit in
+    `provider_limits`.
+
+    With a `store`, status is written through to the database so every worker
+    process can serve it, and jobs submitted on a worker that is not the leader
+    are queued in the store for the leader to pick up.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        store: TaskStore | None = None,
+        provider_limits: dict[str, int] | None = None,
+        interactive_reserve: int = 1,
+    ):
         self._status: dict[str, dict[str, Any]] = {}
         self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._bulk_limit = max(1, max_workers - interactive_reserve)
+        self._provider_limits = provider_limits or {}
         self._executor = ThreadPoolExecutor(max_workers=max_workers)
         self._futures: dict[str, Future] = {}
+        self._queues: dict[Lane, deque[_Pending]] = {lane: deque() for lane in LANES}
+        self._running: dict[str, _Pending] = {}
+        self._cancel_events: dict[str, threading.Event] = {}
         self._shutdown_requested = False
         self._clients: set[WebSocket] = set()
         self._loop: asyncio.AbstractEventLoop | None = None
+        self._store = store
+        self._jobs: dict[str, tuple[JobFactory, Lane]] = {}
+        self._is_leader: Callable[[], bool] = lambda: True
 
     def set_event_loop(self, loop: asyncio.AbstractEventLoop) -> None:
         self._loop = loop
@@ -64,6 +126,7 @@ class TaskManager:
     def set_status(self, task: str, status: dict[str, Any]) -> None:
         with self._lock:
             self._status[task] = self._normalize_status(status)
+            self._persist(task)
         self._broadcast()
 
     def update_status(self, task: str, **updates: Any) -> None:
@@ -75,39 +138,280 @@ class TaskManager:
                 if updates.get("status") != "error":
                     self._status[task].pop("error", None)
             self._status[task].update(updates)
+            self._persist(task)
         self._broadcast()
 
     def is_running(self, task: str) -> bool:
+        """True if the task is running or waiting for a worker."""
         with self._lock:
-            return self._status.get(task, {}).get("status") == "running"
+            return self._status.get(task, {}).get("status") in ACTIVE_STATUSES
 
     def any_running(self, tasks: list[str]) -> str | None:
         with self._lock:
             for task in tasks:
-                if self._status.get(task, {}).get("status") == "running":
+                if self._status.get(task, {}).get("status") in ACTIVE_STATUSES:
                     return task
         return None
 
-    def start_if_idle(self, task: str, fn: Callable[[], None]) -> bool:
-        """Atomically check if task is idle and start it. Returns True if started."""
+    def start_if_idle(self, task: str, fn: Callable[[], None], lane: Lane = "interactive") -> bool:
+        """Atomically check if task is idle and queue it. Returns True if accepted.
+
+        The task starts right away when its lane and provider have a free worker.
+        """
         with self._lock:
-            if self._status.get(task, {}).get("status") == "running":
+            if self._is_busy(task):
                 return False
-            self._status[task] = self._normalize_status({"status": "running", "message": "Starting..."})
-            future = self._executor.submit(fn)
-            self._futures[task] = future
+            self._cancel_events[task] = threading.Event()
+            self._queues[lane].append(_Pending(task, fn, lane, self._provider_of(task)))
+            self._status[task] = self._normalize_status({"status": "queued", "message": "Queued...", "lane": lane})
+            self._persist(task)
+            self._dispatch()
+        self._broadcast()
+        return True
+
+    def cancel(self, task: str) -> bool:
+        """Cancel a queued or running task. Returns True if there was one to cancel.
+
+        Queued tasks are dropped. Running tasks are asked to stop: sources check
+        `is_cancelled()` and progress callbacks `raise_if_cancelled()`. On a
+        worker that is not the leader the request is passed on via the store.
+        """
+        with self._lock:
+            for queue in self._queues.values():
+                pending = next((p for p in queue if p.task == task), None)
+                if pending:
+                    queue.remove(pending)
+                    self._cancel_events.pop(task, None)
+                    self._status[task] = self._normalize_status({"status": "cancelled", "message": "Cancelled before start"})
+                    self._persist(task)
+                    self._update_queue_positions()
+                    break
+            else:
+                if task in self._running:
+                    self._cancel_events[task].set()
+                    self._status[task]["message"] = "Cancelling..."
+                    self._persist(task)
+                elif (
+                    self._store is not None
+                    and not self._is_leader()
+                    and self._status.get(task, {}).get("status") in ACTIVE_STATUSES
+                ):
+                    self._store.add_task_request(task, CANCEL_REQUEST, {})
+                else:
+                    return False
         self._broadcast()
         return True
 
+    def cancel_all(self, message: str = "Cancelled") -> None:
+        """Drop queued tasks and ask running ones to stop, e.g. on losing leadership."""
+        with self._lock:
+            for queue in self._queues.values():
+                for pending in queue:
+                    self._cancel_events.pop(pending.task, None)
+                    self._status[pending.task] = self._normalize_status({"status": "cancelled", "message": message})
+                    self._persist(pending.task)
+                queue.clear()
+            for task in self._running:
+                self._cancel_events[task].set()
+                self._status[task]["message"] = "Cancelling..."
+                self._persist(task)
+        self._broadcast()
+
+    def cancel_requested(self, task: str) -> bool:
+        with self._lock:
+            event = self._cancel_events.get(task)
+        return bool(event and event.is_set())
+
+    def raise_if_cancelled(self, task: str) -> None:
+        """For progress callbacks: abort the task once it has been cancelled."""
+        if self.cancel_requested(task):
+            raise TaskCancelled(task)
+
+    def set_leader_check(self, is_leader: Callable[[], bool]) -> None:
+        """Decide whether submitted jobs run here or are queued for the leader."""
+        self._is_leader = is_leader
+
+    def register_job(self, kind: str, factory: JobFactory, lane: Lane = "interactive") -> None:
+        """Register a named job so it can be requested from any worker."""
+        self._jobs[kind] = (factory, lane)
+
+    def submit(self, task: str, kind: str, params: dict[str, Any]) -> bool:
+        """Start a registered job, or queue it for the leader. Returns True if accepted.
+
+        Like `start_if_idle`, a task that is already running is not started again.
+        """
+        factory, lane = self._jobs[kind]
+        if self._store is None or self._is_leader():
+            return self.start_if_idle(task, factory(task, params), lane)
+        with self._lock:
+            if self._status.get(task, {}).get("status") in ACTIVE_STATUSES:
+                return False
+            if task in self._store.list_requested_tasks():
+                return False
+            self._store.add_task_request(task, kind, params)
+            self._status[task] = self._normalize_status({"status": "queued", "message": "Queued...", "lane": lane})
+            self._persist(task)
+        self._broadcast()
+        return True
+
+    def run_requested(self) -> None:
+        """Start jobs queued by other workers (leader only)."""
+        if self._store is None:
+            return
+        requests = self._store.pop_task_requests()
+        for req in requests:
+            if req["kind"] == CANCEL_REQUEST:
+                self.cancel(req["task"])
+                continue
+            job = self._jobs.get(req["kind"])
+            if job is None:
+                logger.warning("unknown job kind %s for %s, dropping", req["kind"], req["task"])
+                continue
+            factory, lane = job
+            if not self.start_if_idle(req["task"], factory(req["task"], req["params"]), lane):
+                logger.debug("requested task %s already running", req["task"])
+
+    def adopt_store(self) -> None:
+        """Take over stored status when becoming leader.
+
+        Tasks left running by a previous leader are marked cancelled, except
+        queued requests that are about to be started here.
+        """
+        if self._store is None:
+            return
+        with self._lock:
+            stored = self._store.load_task_statuses()
+            requested = self._store.list_requested_tasks()
+            for task, status in stored.items():
+                if self._is_busy(task):
+                    continue
+                if status.get("status") in ACTIVE_STATUSES and task not in requested:
+                    status = {
+                        **status,
+                        "status": "cancelled",
+                        "message": "Interrupted (worker restarted)",
+                        "last_run": datetime.now(timezone.utc).isoformat(),
+                        "error": None,
+                    }
+                    self._store.save_task_status(task, status)
+                self._status[task] = status
+        self._broadcast()
+
+    def sync_from_store(self) -> None:
+        """Refresh status from the store (followers), broadcasting on change."""
+        if self._store is None:
+            return
+        with self._lock:
+            stored = self._store.load_task_statuses()
+            if stored == self._status:
+                return
+            self._status = stored
+        self._broadcast()
+
     def shutdown(self) -> None:
         """Signal shutdown and cancel pending tasks."""
         self._shutdown_requested = True
+        with self._lock:
+            for queue in self._queues.values():
+                queue.clear()
         # Cancel any pending futures
         for future in self._futures.values():
             future.cancel()
         # Don't wait - let threads check shutdown_requested flag
         self._executor.shutdown(wait=False, cancel_futures=True)
 
+    def _is_busy(self, task: str) -> bool:
+        """Caller holds self._lock."""
+        return (
+            self._status.get(task, {}).get("status") in ACTIVE_STATUSES
+            or task in self._running
+            or any(p.task == task for queue in self._queues.values() for p in queue)
+        )
+
+    @staticmethod
+    def _provider_of(task: str) -> str | None:
+        _, _, provider = task.partition(":")
+        return provider or None
+
+    def _has_capacity(self, pending: _Pending) -> bool:
+        """Caller holds self._lock."""
+        if len(self._running) >= self._max_workers:
+            return False
+        running = self._running.values()
+        if pending.lane == "bulk" and sum(p.lane == "bulk" for p in running) >= self._bulk_limit:
+            return False
+        limit = self._provider_limits.get(pending.provider or "")
+        if limit and sum(p.provider == pending.provider for p in running) >= limit:
+            return False
+        return True
+
+    def _dispatch(self) -> None:
+        """Start queued tasks that fit, interactive lane first. Caller holds self._lock."""
+        if self._shutdown_requested:
+            return
+        for lane in LANES:
+            queue = self._queues[lane]
+            for pending in list(queue):
+                if self._has_capacity(pending):
+                    queue.remove(pending)
+                    self._start(pending)
+        self._update_queue_positions()
+
+    def _start(self, pending: _Pending) -> None:
+        """Caller holds self._lock."""
+        self._running[pending.task] = pending
+        self._status[pending.task] = self._normalize_status(
+            {"status": "running", "message": "Starting...", "lane": pending.lane}
+        )
+        self._persist(pending.task)
+        self._futures[pending.task] = self._executor.submit(self._run, pending)
+
+    def _run(self, pending: _Pending) -> None:
+        task = pending.task
+        with self._lock:
+            cancel_event = self._cancel_events[task]
+        set_task_cancel_event(cancel_event)
+        try:
+            pending.fn()
+        except TaskCancelled:
+            self.set_status(task, {"status": "cancelled", "message": "Cancelled"})
+        except Exception as e:
+            logger.error("task %s failed: %s", task, e)
+            if self.get_status(task).get("status") == "running":
+                self.set_status(task, {"status": "error", "message": str(e)})
+        finally:
+            set_task_cancel_event(None)
+            with self._lock:
+                self._running.pop(task, None)
+                self._cancel_events.pop(task, None)
+                # Stopped early via is_cancelled() without reporting it
+                if cancel_event.is_set() and self._status.get(task, {}).get("status") == "running":
+                    self._status[task] = self._normalize_status({"status": "cancelled", "message": "Cancelled"})
+                    self._persist(task)
+                self._dispatch()
+            self._broadcast()
+
+    def _update_queue_positions(self) -> None:
+        """Caller holds self._lock."""
+        position = 0
+        for lane in LANES:
+            for pending in self._queues[lane]:
+                position += 1
+                status = self._status.get(pending.task)
+                if status is not None and status.get("queue_position") != position:
+                    status["queue_position"] = position
+                    status["message"] = f"Queued (position {position})"
+                    self._persist(pending.task)
+
+    def _persist(self, task: str) -> None:
+        """Write a task's status through to the store. Caller holds self._lock."""
+        if self._store is None:
+            return
+        try:
+            self._store.save_task_status(task, self._status[task])
+        except Exception as e:
+            logger.warning("failed to persist status of %s: %s", task, e)
+
     @staticmethod
     def _normalize_status(status: dict[str, Any]) -> dict[str, Any]:
         normalized = dict(status)
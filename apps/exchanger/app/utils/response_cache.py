@@ -0,0 +1,104 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+import orjson
+from fastapi import Request, Response
+
+from app.metrics import CACHE_REQUESTS
+
+# Below this size gzip saves too little to be worth the Content-Encoding round trip
+GZIP_MIN_SIZE = 500
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    etag: str
+    body: bytes
+    gzipped: bytes | None
+
+
+def make_etag(scope: str, version: int, key: Hashable) -> str:
+    """Strong ETag for one query variant of a data scope at a given version."""
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=6).hexdigest()
+    return f'"{scope}-{version}-{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [c.strip().removeprefix("W/") for c in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def serialize(scope: str, version: int, key: Hashable, payload: Any) -> CachedBody:
+    body = orjson.dumps(payload)
+    gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None
+    return CachedBody(etag=make_etag(scope, version, key), body=body, gzipped=gzipped)
+
+
+def cached_response(request: Request, cached: CachedBody) -> Response:
+    """Serve pre-serialized JSON, gzip-encoded if the client accepts it."""
+    if etag_matches(request, cached.etag):
+        return not_modified(cached.etag)
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if cached.gzipped is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(cached.gzipped, media_type="application/json", headers=headers)
+    return Response(cached.body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """LRU cache of serialized JSON responses for one data scope.
+
+    Entries are keyed by query variant and remember the data version they were
+    built from; a lookup with a newer version rebuilds the entry.
+    """
+
+    def __init__(self, scope: str, max_entries: int = 128):
+        self._scope = scope
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[int, CachedBody]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def scope(self) -> str:
+        return self._scope
+
+    def peek(self, key: Hashable, version: int) -> CachedBody | None:
+        """Return the cached body for key if it is current, without building it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                self._entries.move_to_end(key)
+                CACHE_REQUESTS.labels(self._scope, "hit").inc()
+                return entry[1]
+        return None
+
+    def get(self, key: Hashable, version: int, build: Callable[[], Any]) -> CachedBody:
+        """Return the cached body for key, building it if missing or stale."""
+        hit = self.peek(key, version)
+        if hit is not None:
+            return hit
+        CACHE_REQUESTS.labels(self._scope, "miss").inc()
+        # Build outside the lock; concurrent misses may build twice, which is harmless
+        cached = serialize(self._scope, version, key, build())
+        with self._lock:
+            self._entries[key] = (version, cached)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
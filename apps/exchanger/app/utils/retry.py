@@ -1,9 +1,16 @@
 import threading
 from datetime import datetime, timezone
+from time import perf_counter
 from typing import Protocol, Callable, Any
 
+from app.metrics import RATE_LIMIT_WAIT_SECONDS, UPSTREAM_ERRORS, UPSTREAM_REQUEST_SECONDS
+
 # Global shutdown event - set when app is shutting down
 _shutdown_event = threading.Event()
+# Per-thread cancel event of the task the thread is running (set by TaskManager)
+_task_state = threading.local()
+# How often a rate-limit wait checks for task cancellation
+CANCEL_POLL_SECONDS = 0.5
 
 
 def set_shutdown() -> None:
@@ -15,6 +22,38 @@ def is_shutting_down() -> bool:
     return _shutdown_event.is_set()
 
 
+def set_task_cancel_event(event: threading.Event | None) -> None:
+    """Bind the current thread to a task's cancel event (None to unbind)."""
+    _task_state.cancel_event = event
+
+
+def get_task_cancel_event() -> threading.Event | None:
+    """Cancel event bound to the current thread, to hand on to helper threads."""
+    return getattr(_task_state, "cancel_event", None)
+
+
+def is_cancelled() -> bool:
+    """True if the app is shutting down or the current thread's task was cancelled.
+
+    Sources check this between requests to stop long fetches cooperatively.
+    """
+    if _shutdown_event.is_set():
+        return True
+    event = getattr(_task_state, "cancel_event", None)
+    return event is not None and event.is_set()
+
+
+def _wait_interruptible(seconds: float) -> bool:
+    """Sleep up to `seconds`; returns True if interrupted by shutdown or cancellation."""
+    deadline = perf_counter() + seconds
+    while not is_cancelled():
+        remaining = deadline - perf_counter()
+        if remaining <= 0:
+            return False
+        _shutdown_event.wait(min(remaining, CANCEL_POLL_SECONDS))
+    return True
+
+
 class FcsApiClient(Protocol):
     def request(self, endpoint: str, params: dict) -> dict | None: ...
 
@@ -31,8 +70,15 @@ def fetch_with_retry(
     params: dict,
     rate_limit_wait: int = 65,
     on_progress: Callable[[str | dict[str, Any]], None] | None = None,
+    on_request: Callable[[], None] | None = None,
+    provider: str = "fcs",
 ) -> dict | None:
-    response = api.request(endpoint, params)
+    """Request an FCS endpoint, waiting out one rate limit (code 213).
+
+    on_request is called for every request that consumed an API credit
+    (i.e. got a response that was not rate limited).
+    """
+    response = _request(api, endpoint, params, on_request, provider)
 
     if is_rate_limited(response):
         if on_progress:
@@ -42,14 +88,41 @@ def fetch_with_retry(
                 "message": f"Rate limited, waiting {rate_limit_wait}s...",
                 "rate_limit_until": until_iso,
             })
-        # Use event.wait() so shutdown can interrupt
-        if _shutdown_event.wait(rate_limit_wait):
-            return None  # Shutdown requested
+        # Interruptible so shutdown or task cancellation ends the wait early
+        wait_start = perf_counter()
+        interrupted = _wait_interruptible(rate_limit_wait)
+        RATE_LIMIT_WAIT_SECONDS.labels(provider).inc(perf_counter() - wait_start)
+        if interrupted:
+            return None  # Shutdown or cancellation requested
         if on_progress:
             on_progress({"rate_limit_until": None})  # Clear rate limit
-        response = api.request(endpoint, params)
+        response = _request(api, endpoint, params, on_request, provider)
 
         if is_rate_limited(response):
             raise RuntimeError("Rate limit persists after retry - likely monthly quota exceeded")
 
     return response
+
+
+def _request(
+    api: FcsApiClient,
+    endpoint: str,
+    params: dict,
+    on_request: Callable[[], None] | None,
+    provider: str,
+) -> dict | None:
+    start = perf_counter()
+    try:
+        response = api.request(endpoint, params)
+    except Exception:
+        UPSTREAM_ERRORS.labels(provider, "exception").inc()
+        raise
+    finally:
+        UPSTREAM_REQUEST_SECONDS.labels(provider, endpoint).observe(perf_counter() - start)
+    if is_rate_limited(response):
+        UPSTREAM_ERRORS.labels(provider, "rate_limited").inc()
+    elif not response or response.get("code") != 200:
+        UPSTREAM_ERRORS.labels(provider, "error").inc()
+    if on_request and response and not is_rate_limited(response):
+        on_request()
+    return response
@@ -0,0 +1,357 @@
+"""Local stand-in for the FCS and CNB APIs, for load and throughput testing.
+
+Serves deterministic data without a network or API quota:
+
+    POST /fcs/{type}/list       paginated symbol list (page, per_page)
+    POST /fcs/{type}/history    daily candles, newest first (symbol, length, page)
+    POST /fcs/{type}/latest     latest candle for comma-separated symbols
+    GET  /cnb/denni_kurz.txt    CNB daily fixing for ?date=DD.MM.YYYY
+    GET  /cnb/rok.txt           CNB yearly table for ?rok=YYYY
+
+Latency, a transient error rate and FCS code-213 rate limiting are
+configurable. Run standalone:
+
+    uv run python -m benchmarks.fake_upstream --port 8900 --latency 0.05 --rate-limit 60
+
+or in-process via FakeUpstream, which also provides the hooks the sources take:
+
+    with FakeUpstream(FakeUpstreamConfig(latency=0.01)) as upstream:
+        fcs = FcsSource("any-key", base_url=upstream.fcs_base_url)
+        cnb = CnbSource(http_get=upstream.cnb_http_get, fetch_delay=0)
+"""
+
+import argparse
+import math
+import random
+import threading
+import time
+import urllib.request
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import orjson
+
+from app.sources.cnb import CNB_CURRENCIES, CNB_CURRENCY_NAMES, CNB_URL
+from benchmarks.synthetic import FOREX_CODES
+
+# Currencies CNB quotes per 100 units
+CNB_AMOUNT_100 = {"HUF", "IDR", "ISK", "JPY", "KRW", "PHP", "INR"}
+
+
+@dataclass(frozen=True)
+class FakeUpstreamConfig:
+    forex_symbols: int = 200
+    crypto_symbols: int = 50
+    # Oldest candle served; history requests past it return short pages
+    history_days: int = 3650
+    # Seconds added to every response, plus up to `jitter` more
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Probability of an HTTP 500 (FCS) or 503 (CNB) instead of data
+    error_rate: float = 0.0
+    # FCS requests allowed per rate_limit_window seconds (0 = unlimited);
+    # requests beyond that get code 213 until the window rolls over
+    rate_limit: int = 0
+    rate_limit_window: float = 60.0
+    seed: int = 1
+
+
+class FakeUpstream:
+    """Threaded HTTP server speaking enough of the FCS and CNB protocols for the sources."""
+
+    def __init__(self, config: FakeUpstreamConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeUpstreamConfig()
+        self.stats: Counter[str] = Counter()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._symbols = {
+            "forex": _forex_symbols(self.config.forex_symbols),
+            "crypto": [(f"C{i:04d}USD", f"Coin {i} / US Dollar") for i in range(self.config.crypto_symbols)],
+        }
+        self._names = {sym_type: dict(symbols) for sym_type, symbols in self._symbols.items()}
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def fcs_base_url(self) -> str:
+        """Base URL for FcsSource(base_url=...)."""
+        return f"{self.url}/fcs/"
+
+    def cnb_http_get(self, url: str) -> str:
+        """http_get for CnbSource: fetches the same file and query from this server."""
+        parts = urlsplit(url)
+        local = f"{self.url}/cnb/{parts.path.rsplit('/', 1)[-1]}" + (f"?{parts.query}" if parts.query else "")
+        with urllib.request.urlopen(local, timeout=30) as resp:
+            return resp.read().decode("utf-8")
+
+    def symbols(self, sym_type: str) -> list[str]:
+        return [sym for sym, _ in self._symbols[sym_type]]
+
+    def start(self) -> "FakeUpstream":
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeUpstream":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    # -- behaviour shared by all endpoints --
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _delay(self) -> None:
+        with self._lock:
+            extra = self._rng.uniform(0, self.config.jitter) if self.config.jitter else 0.0
+        if self.config.latency or extra:
+            time.sleep(self.config.latency + extra)
+
+    def _should_fail(self) -> bool:
+        if not self.config.error_rate:
+            return False
+        with self._lock:
+            return self._rng.random() < self.config.error_rate
+
+    def _rate_limited(self) -> bool:
+        if not self.config.rate_limit:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.config.rate_limit_window:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            return self._window_count > self.config.rate_limit
+
+    # -- FCS --
+
+    def fcs(self, endpoint: str, params: dict[str, str]) -> dict[str, Any]:
+        sym_type, _, action = endpoint.partition("/")
+        if sym_type not in self._symbols:
+            return {"status": False, "code": 101, "msg": f"Unknown endpoint {endpoint}", "response": None}
+        if action == "list":
+            return self._fcs_list(sym_type, int(params.get("page", 1)), int(params.get("per_page", 1500)))
+        if action == "history":
+            return self._fcs_history(
+                sym_type, params.get("symbol", ""), int(params.get("length", 300)), int(params.get("page", 1))
+            )
+        if action == "latest":
+            return self._fcs_latest(sym_type, params.get("symbol", "").split(","))
+        return {"status": False, "code": 101, "msg": f"Unknown endpoint {endpoint}", "response": None}
+
+    def _fcs_list(self, sym_type: str, page: int, per_page: int) -> dict[str, Any]:
+        symbols = self._symbols[sym_type]
+        chunk = symbols[(page - 1) * per_page : page * per_page]
+        return {
+            "status": True,
+            "code": 200,
+            "response": [{"ticker": f"FX:{sym}", "profile": {"symbol": sym, "name": name}} for sym, name in chunk],
+            "info": {"pagination": {"page": page, "per_page": per_page, "has_next": page * per_page < len(symbols)}},
+        }
+
+    def _fcs_history(self, sym_type: str, symbol: str, length: int, page: int) -> dict[str, Any]:
+        if symbol not in self._names[sym_type]:
+            return {"status": False, "code": 102, "msg": f"Symbol {symbol} not found", "response": None}
+        days = _trading_days(sym_type, date.today(), self.config.history_days)
+        chunk = days[(page - 1) * length : page * length]
+        candles = {
+            str(i): {"t": _unix(day), "c": f"{_rate(symbol, day):.6f}"}
+            for i, day in enumerate(chunk)
+        }
+        return {"status": True, "code": 200, "response": candles}
+
+    def _fcs_latest(self, sym_type: str, requested: list[str]) -> dict[str, Any]:
+        known = self._names[sym_type]
+        day = _trading_days(sym_type, date.today(), 7)[0]
+        items = [
+            {
+                "ticker": f"FX:{sym}",
+                "profile": {"symbol": sym, "name": known[sym]},
+                "active": {"t": _unix(day), "c": f"{_rate(sym, day):.6f}"},
+            }
+            for sym in requested
+            if sym in known
+        ]
+        return {"status": True, "code": 200, "response": items}
+
+    # -- CNB --
+
+    def cnb(self, query: dict[str, str]) -> str:
+        """CNB fixing text; weekends and future dates fall back to the last business day, like CNB."""
+        requested = date.today()
+        if "date" in query:
+            requested = datetime.strptime(query["date"], "%d.%m.%Y").date()
+        day = min(requested, date.today())
+        while day.weekday() >= 5:
+            day -= timedelta(days=1)
+        lines = [f"{day.strftime('%d %b %Y')} #{day.timetuple().tm_yday}", "Country|Currency|Amount|Code|Rate"]
+        for code in CNB_CURRENCIES:
+            amount = 100 if code in CNB_AMOUNT_100 else 1
+            rate = f"{_rate(f'{code}CZK', day) * amount:.3f}".replace(".", ",")
+            lines.append(f"{CNB_CURRENCY_NAMES[code]}|{code.lower()}|{amount}|{code}|{rate}")
+        return "\n".join(lines) + "\n"
+
+    def cnb_year(self, query: dict[str, str]) -> str:
+        """CNB yearly table: one row per business day of the year up to today."""
+        year = int(query.get("rok", date.today().year))
+        amounts = {code: 100 if code in CNB_AMOUNT_100 else 1 for code in CNB_CURRENCIES}
+        lines = ["Datum|" + "|".join(f"{amounts[code]} {code}" for code in CNB_CURRENCIES)]
+        day = date(year, 1, 1)
+        while day.year == year and day <= date.today():
+            if day.weekday() < 5:
+                rates = (f"{_rate(f'{code}CZK', day) * amounts[code]:.3f}".replace(".", ",") for code in CNB_CURRENCIES)
+                lines.append(f"{day.strftime('%d.%m.%Y')}|" + "|".join(rates))
+            day += timedelta(days=1)
+        return "\n".join(lines) + "\n"
+
+
+def _make_handler(upstream: FakeUpstream) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            path = urlsplit(self.path).path
+            if not path.startswith("/fcs/"):
+                self._send(404, b"not found", "text/plain")
+                return
+            endpoint = path.removeprefix("/fcs/")
+            length = int(self.headers.get("Content-Length") or 0)
+            form = parse_qs(self.rfile.read(length).decode())
+            params = {key: values[-1] for key, values in form.items()}
+
+            upstream._delay()
+            upstream._count(f"fcs {endpoint}")
+            if upstream._rate_limited():
+                upstream._count("fcs rate_limited")
+                body = {"status": False, "code": 213, "msg": "API rate limit exceeded", "response": None}
+                self._send(200, orjson.dumps(body), "application/json")
+                return
+            if upstream._should_fail():
+                upstream._count("fcs errors")
+                self._send(500, b"<html>Internal Server Error</html>", "text/html")
+                return
+            self._send(200, orjson.dumps(upstream.fcs(endpoint, params)), "application/json")
+
+        def do_GET(self) -> None:
+            parts = urlsplit(self.path)
+            files = {"/cnb/denni_kurz.txt": ("denni_kurz", upstream.cnb), "/cnb/rok.txt": ("rok", upstream.cnb_year)}
+            if parts.path not in files:
+                self._send(404, b"not found", "text/plain")
+                return
+            name, render = files[parts.path]
+            query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+            upstream._delay()
+            upstream._count(f"cnb {name}")
+            if upstream._should_fail():
+                upstream._count("cnb errors")
+                self._send(503, b"Service Unavailable", "text/plain")
+                return
+            try:
+                text = render(query)
+            except ValueError:
+                self._send(400, b"bad date", "text/plain")
+                return
+            self._send(200, text.encode(), "text/plain; charset=utf-8")
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # per-request logging would dominate load tests
+
+    return Handler
+
+
+def _forex_symbols(count: int) -> list[tuple[str, str]]:
+    # Real CNB crosses first so configured symbols like EURCZK exist, then synthetic pairs
+    real = [(f"{code}CZK", f"{CNB_CURRENCY_NAMES[code]} / Czech Koruna") for code in CNB_CURRENCIES]
+    synthetic = ((f"{a}{b}", f"{a} / {b}") for a in FOREX_CODES for b in FOREX_CODES if a != b)
+    pairs = real + [pair for _, pair in zip(range(max(0, count - len(real))), synthetic)]
+    return pairs[:count]
+
+
+def _trading_days(sym_type: str, newest: date, days: int) -> list[date]:
+    """Days with candles, newest first: every day for crypto, weekdays for forex."""
+    candidates = (newest - timedelta(days=i) for i in range(days))
+    return [d for d in candidates if sym_type == "crypto" or d.weekday() < 5]
+
+
+def _rate(symbol: str, day: date) -> float:
+    """Deterministic, smoothly varying rate for a symbol on a day."""
+    seed = zlib.crc32(symbol.encode())
+    base = 0.5 + (seed % 10_000) / 100
+    return base * (1 + 0.05 * math.sin(day.toordinal() / 30 + seed % 628 / 100))
+
+
+def _unix(day: date) -> int:
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--forex", type=int, default=FakeUpstreamConfig.forex_symbols, help="Forex symbols listed")
+    parser.add_argument("--crypto", type=int, default=FakeUpstreamConfig.crypto_symbols, help="Crypto symbols listed")
+    parser.add_argument("--history-days", type=int, default=FakeUpstreamConfig.history_days)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds, random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail (0-1)")
+    parser.add_argument("--rate-limit", type=int, default=0, help="FCS requests per window before code 213")
+    parser.add_argument("--rate-limit-window", type=float, default=60.0, help="Rate limit window in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    config = FakeUpstreamConfig(
+        forex_symbols=args.forex,
+        crypto_symbols=args.crypto,
+        history_days=args.history_days,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_limit_window=args.rate_limit_window,
+        seed=args.seed,
+    )
+    upstream = FakeUpstream(config, host=args.host, port=args.port)
+    print(f"FCS base URL: {upstream.fcs_base_url}")
+    print(f"CNB URL:      {upstream.url}/cnb/denni_kurz.txt  (stands in for {CNB_URL})")
+    try:
+        upstream._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        upstream._server.server_close()
+        print(dict(upstream.stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""Exchanger benchmark runner.
+
+Builds (or reuses) a synthetic database, times the hot database paths and
+the backfill write path, and writes machine-readable results:
+
+    uv run python -m benchmarks.run --scale full --output bench.json
+    uv run python -m benchmarks.run --scale full --compare bench.json
+
+With --upstream, also runs end-to-end FCS and CNB backfills over HTTP
+against a local fake upstream (benchmarks.fake_upstream).
+
+With --compare, exits non-zero if any benchmark's median got slower than
+the baseline by more than --threshold.
+"""
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from app.database import SQLiteDatabase
+from app.models import Symbol
+from app.services.backfill import BackfillService
+from app.sources.cnb import CnbSource
+from app.sources.fcs import FcsSource
+from app.sources.registry import SourceRegistry
+from benchmarks.fake_upstream import FakeUpstream, FakeUpstreamConfig
+from benchmarks.synthetic import (
+    ANCHOR_DATE,
+    SCALES,
+    Scale,
+    SyntheticSource,
+    build_database,
+    fcs_symbols,
+)
+
+DEFAULT_CACHE_DIR = Path(".cache/bench")
+DEFAULT_THRESHOLD = 0.2
+
+
+def measure(name: str, fn: Callable[[], Any], iterations: int, rows: Callable[[], int] | None = None) -> dict:
+    """Run fn `iterations` times and summarize wall-clock timings."""
+    samples: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    result = {
+        "name": name,
+        "iterations": iterations,
+        "total_s": sum(samples),
+        "mean_s": statistics.fmean(samples),
+        "median_s": statistics.median(samples),
+        "p95_s": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "min_s": samples[0],
+    }
+    if rows:
+        result["rows_per_s"] = rows() / result["total_s"] if result["total_s"] else 0.0
+    return result
+
+
+def prepare_database(scale: Scale, cache_dir: Path, rebuild: bool) -> Path:
+    """Return a cached synthetic database for the scale, building it if needed."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"exchanger-{scale.label}.db"
+    if path.exists() and not rebuild:
+        return path
+    path.unlink(missing_ok=True)
+    print(f"building {path} ...", file=sys.stderr)
+    start = time.perf_counter()
+    rows = build_database(path, scale)
+    print(f"built {rows} rates in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return path
+
+
+def run_read_benchmarks(db: SQLiteDatabase, scale: Scale, rng: random.Random) -> list[dict]:
+    symbols = [s.provider_symbol for s in fcs_symbols(scale)]
+    last_year = ANCHOR_DATE.year
+    span_start = ANCHOR_DATE - timedelta(days=365 * scale.years)
+
+    def random_day() -> str:
+        return (span_start + timedelta(days=rng.randrange((ANCHOR_DATE - span_start).days))).isoformat()
+
+    results = [
+        measure("get_rate", lambda: db.get_rate(random_day(), rng.choice(symbols), "fcs"), 2000),
+        measure(
+            "get_rates_range_1y",
+            lambda: db.get_rates_range(rng.choice(symbols), ANCHOR_DATE - timedelta(days=365), ANCHOR_DATE, "fcs"),
+            200,
+        ),
+        measure("get_rates_for_date", lambda: db.get_rates_for_date(random_day()), 50),
+        measure("get_coverage_year", lambda: db.get_coverage(last_year), 5),
+        measure("get_coverage_year_symbols", lambda: db.get_coverage(last_year, "fcs", rng.sample(symbols, 20)), 20),
+        measure("get_missing_symbols", lambda: db.get_missing_symbols(last_year, rng.sample(symbols, 20), "fcs"), 20),
+    ]
+    return results
+
+
+def run_write_benchmarks(db_path: Path, scale: Scale, work_dir: Path) -> list[dict]:
+    results: list[dict] = []
+
+    # Writes run against a copy so the cached database stays pristine
+    copy_path = work_dir / "write.db"
+    shutil.copy(db_path, copy_path)
+    db = SQLiteDatabase(str(copy_path))
+    try:
+        incoming = [
+            Symbol(provider="fcs", symbol=s.symbol, provider_symbol=s.provider_symbol, type=s.type, name=s.name)
+            for s in fcs_symbols(scale)
+        ]
+        # Same list again: compare, update names, nothing stale
+        results.append(measure("populate_symbols", lambda: (db.populate_symbols("fcs", incoming), db.commit()), 3))
+
+        exported: dict = {}
+
+        def export() -> None:
+            exported.update(db.export_all())
+
+        results.append(measure("export_all", export, 1, rows=lambda: len(exported["rates"])))
+
+        def import_all() -> None:
+            db.begin_transaction()
+            db.import_rates(exported["rates"])
+            db.commit()
+
+        results.append(measure("import_rates", import_all, 1, rows=lambda: len(exported["rates"])))
+
+        # Backfill write path: one upsert + commit per rate, as in production
+        backfill_symbols = fcs_symbols(Scale(fcs_forex=scale.backfill_symbols, fcs_crypto=0, years=1))
+        db.populate_symbols("bench", [
+            Symbol(provider="bench", symbol=s.symbol, provider_symbol=s.provider_symbol, type=s.type, name=s.name)
+            for s in backfill_symbols
+        ])
+        db.commit()
+        registry = SourceRegistry()
+        registry.register(SyntheticSource("bench", backfill_symbols))
+        service = BackfillService(db=db, registry=registry)
+        days = scale.backfill_days
+        results.append(measure(
+            "backfill_write_path",
+            lambda: service.backfill("bench", [], days),
+            1,
+            rows=lambda: len(backfill_symbols) * days,
+        ))
+    finally:
+        db.close()
+    return results
+
+
+def run_upstream_benchmarks(scale: Scale, work_dir: Path, latency: float) -> list[dict]:
+    """Backfill over HTTP from the fake upstream into an empty database."""
+    results: list[dict] = []
+    config = FakeUpstreamConfig(
+        forex_symbols=scale.backfill_symbols, crypto_symbols=0, history_days=scale.backfill_days, latency=latency
+    )
+    db = SQLiteDatabase(str(work_dir / "upstream.db"))
+    try:
+        with FakeUpstream(config) as upstream:
+            registry = SourceRegistry()
+            registry.register(FcsSource("bench", rate_limit_wait=0, base_url=upstream.fcs_base_url))
+            registry.register(CnbSource(http_get=upstream.cnb_http_get, fetch_delay=0))
+            for source in registry.all():
+                db.populate_symbols(source.source_id, [
+                    Symbol(provider=source.source_id, symbol=s.symbol, provider_symbol=s.provider_symbol,
+                           type=s.type, name=s.name)
+                    for s in source.list_symbols()
+                ])
+            db.commit()
+            service = BackfillService(db=db, registry=registry)
+
+            for provider in ("fcs", "cnb"):
+                written: list[int] = []
+
+                def backfill() -> None:
+                    counts, _ = service.backfill(provider, [], scale.backfill_days)
+                    written.append(sum(counts.values()))
+
+                result = measure(f"upstream_backfill_{provider}", backfill, 1, rows=lambda: written[-1])
+                result["requests"] = sum(n for key, n in upstream.stats.items() if key.startswith(provider))
+                results.append(result)
+    finally:
+        db.close()
+    return results
+
+
+def environment(scale_name: str, db_path: Path) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    conn = sqlite3.connect(db_path)
+    try:
+        rate_count = conn.execute("SELECT COUNT(*) FROM rates").fetchone()[0]
+        symbol_count = conn.execute("SELECT COUNT(*) FROM symbols").fetchone()[0]
+    finally:
+        conn.close()
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "scale": scale_name,
+        "symbols": symbol_count,
+        "rates": rate_count,
+    }
+
+
+def compare(current: list[dict], baseline: dict, threshold: float) -> list[str]:
+    """Print deltas against a baseline; return names that regressed beyond threshold."""
+    base = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+    print(f"\n{'benchmark':<28} {'baseline':>12} {'current':>12} {'change':>8}")
+    for result in current:
+        old = base.get(result["name"])
+        if not old or not old["median_s"]:
+            print(f"{result['name']:<28} {'-':>12} {result['median_s'] * 1000:>10.3f}ms {'new':>8}")
+            continue
+        change = result["median_s"] / old["median_s"] - 1
+        flag = " !" if change > threshold else ""
+        print(
+            f"{result['name']:<28} {old['median_s'] * 1000:>10.3f}ms {result['median_s'] * 1000:>10.3f}ms"
+            f" {change:>+7.1%}{flag}"
+        )
+        if change > threshold:
+            regressions.append(result["name"])
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Where synthetic databases are kept")
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate the synthetic database")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed median slowdown (0.2 = 20%%)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--upstream", action="store_true", help="Also backfill over HTTP from a fake upstream")
+    parser.add_argument("--upstream-latency", type=float, default=0.0, help="Fake upstream latency in seconds")
+    args = parser.parse_args(argv)
+
+    scale = SCALES[args.scale]
+    db_path = prepare_database(scale, args.cache_dir, args.rebuild)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Reads use a copy too: WAL checkpoints would otherwise touch the cached file
+        read_path = Path(work_dir) / "read.db"
+        shutil.copy(db_path, read_path)
+        db = SQLiteDatabase(str(read_path))
+        try:
+            results = run_read_benchmarks(db, scale, rng)
+        finally:
+            db.close()
+        results += run_write_benchmarks(db_path, scale, Path(work_dir))
+        if args.upstream:
+            results += run_upstream_benchmarks(scale, Path(work_dir), args.upstream_latency)
+
+    report = {"environment": environment(args.scale, db_path), "results": results}
+
+    print(f"{'benchmark':<28} {'iter':>5} {'median':>12} {'p95':>12} {'rows/s':>12}")
+    for r in results:
+        rows_per_s = f"{r['rows_per_s']:,.0f}" if "rows_per_s" in r else "-"
+        print(
+            f"{r['name']:<28} {r['iterations']:>5} {r['median_s'] * 1000:>10.3f}ms"
+            f" {r['p95_s'] * 1000:>10.3f}ms {rows_per_s:>12}"
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"\nregressed beyond {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
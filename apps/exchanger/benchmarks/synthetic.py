@@ -0,0 +1,162 @@
+"""Synthetic exchanger databases and sources for benchmarks."""
+
+import itertools
+import random
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable
+
+from app.database import SQLiteDatabase
+from app.models import SymbolInfo, SymbolType
+from app.sources.cnb import CNB_CURRENCIES
+
+# Fixed anchor so the same scale always produces the same database
+ANCHOR_DATE = date(2025, 12, 31)
+
+# Enough codes for thousands of forex pairs (60 * 59 = 3540)
+FOREX_CODES = [
+    "".join(code) for code in itertools.islice(itertools.product("ABCDEFGHJKLMNPRSTUVWXYZ", repeat=3), 60)
+]
+
+INSERT_BATCH = 50_000
+
+
+@dataclass(frozen=True)
+class Scale:
+    fcs_forex: int
+    fcs_crypto: int
+    years: int
+    # Backfill write path: symbols x days fetched from a synthetic source
+    backfill_symbols: int = 20
+    backfill_days: int = 365
+
+    @property
+    def label(self) -> str:
+        return f"fx{self.fcs_forex}-cr{self.fcs_crypto}-y{self.years}"
+
+
+SCALES: dict[str, Scale] = {
+    "tiny": Scale(fcs_forex=20, fcs_crypto=10, years=1, backfill_symbols=5, backfill_days=60),
+    "small": Scale(fcs_forex=300, fcs_crypto=100, years=3),
+    # ~5M rates: 2000 forex + 31 CNB on business days, 500 crypto daily, 10 years
+    "full": Scale(fcs_forex=2000, fcs_crypto=500, years=10),
+}
+
+
+def fcs_symbols(scale: Scale) -> list[SymbolInfo]:
+    pairs = ((a, b) for a in FOREX_CODES for b in FOREX_CODES if a != b)
+    forex = [
+        SymbolInfo(symbol=f"{a}{b}", provider_symbol=f"{a}{b}", type="forex", name=f"{a}/{b}")
+        for a, b in itertools.islice(pairs, scale.fcs_forex)
+    ]
+    crypto = [
+        SymbolInfo(symbol=f"C{i:04d}USD", provider_symbol=f"C{i:04d}USD", type="crypto", name=f"Coin {i}")
+        for i in range(scale.fcs_crypto)
+    ]
+    return forex + crypto
+
+
+def cnb_symbols() -> list[SymbolInfo]:
+    return [
+        SymbolInfo(symbol=f"{code}CZK", provider_symbol=f"{code}CZK", type="forex", name=code)
+        for code in CNB_CURRENCIES
+    ]
+
+
+def trading_days(sym_type: SymbolType, years: int) -> list[str]:
+    """ISO dates a symbol of this type has rates for: every day for crypto, weekdays otherwise."""
+    start = ANCHOR_DATE - timedelta(days=365 * years)
+    days = (start + timedelta(days=i) for i in range((ANCHOR_DATE - start).days + 1))
+    return [d.isoformat() for d in days if sym_type == "crypto" or d.weekday() < 5]
+
+
+def build_database(path: Path, scale: Scale, seed: int = 42) -> int:
+    """Create a database at path with the given scale. Returns the number of rates."""
+    SQLiteDatabase(str(path)).close()  # schema and migrations
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA synchronous=OFF")
+        provider_symbols = [("fcs", s) for s in fcs_symbols(scale)] + [("cnb", s) for s in cnb_symbols()]
+        conn.executemany(
+            "INSERT INTO symbols (provider, symbol, provider_symbol, type, name) VALUES (?, ?, ?, ?, ?)",
+            [(p, s.symbol, s.provider_symbol, s.type, s.name) for p, s in provider_symbols],
+        )
+        ids = {
+            (row[0], row[1]): row[2]
+            for row in conn.execute("SELECT provider, provider_symbol, id FROM symbols")
+        }
+        days_by_type = {t: trading_days(t, scale.years) for t in ("forex", "crypto")}
+
+        total = 0
+        batch: list[tuple[str, int, float]] = []
+        for provider, info in provider_symbols:
+            symbol_id = ids[(provider, info.provider_symbol)]
+            rate = rng.uniform(0.01, 500.0)
+            for day in days_by_type[info.type]:
+                # Random walk, roughly 0.5 % daily moves
+                rate *= 1 + rng.gauss(0, 0.005)
+                batch.append((day, symbol_id, round(rate, 6)))
+            if len(batch) >= INSERT_BATCH:
+                conn.executemany("INSERT INTO rates (date, symbol_id, rate) VALUES (?, ?, ?)", batch)
+                total += len(batch)
+                batch.clear()
+        conn.executemany("INSERT INTO rates (date, symbol_id, rate) VALUES (?, ?, ?)", batch)
+        total += len(batch)
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return total
+
+
+class SyntheticSource:
+    """In-memory rate source with deterministic history, for the backfill write path."""
+
+    def __init__(self, source_id: str, symbols: list[SymbolInfo], seed: int = 7):
+        self._source_id = source_id
+        self._symbols = {s.provider_symbol: s for s in symbols}
+        self._seed = seed
+
+    @property
+    def source_id(self) -> str:
+        return self._source_id
+
+    def estimate_work_units(self, symbol_count: int, days: int) -> int:
+        return symbol_count
+
+    def available_symbols(self, on_progress: Callable[[str], None] | None = None) -> list[str]:
+        return list(self._symbols)
+
+    def fetch_history(
+        self,
+        symbols: list[str],
+        days: int,
+        on_progress: Callable[[str], None] | None = None,
+        on_rates: Callable[[str, str, float], None] | None = None,
+        symbol_types: dict[str, SymbolType] | None = None,
+    ) -> dict[str, dict[str, float]]:
+        results: dict[str, dict[str, float]] = {}
+        for symbol in symbols:
+            rng = random.Random(f"{self._seed}:{symbol}")
+            rates: dict[str, float] = {}
+            for offset in range(days):
+                day = (ANCHOR_DATE - timedelta(days=offset)).isoformat()
+                rates[day] = round(rng.uniform(0.5, 2.0), 6)
+                if on_rates:
+                    on_rates(symbol, day, rates[day])
+            results[symbol] = rates
+            if on_progress:
+                on_progress({"work_unit_done": True, "message": f"Fetched {symbol}"})
+        return results
+
+    def fetch_rate(self, symbol: str, dt: date) -> float | None:
+        return None
+
+    def list_symbols(self, on_progress: Callable[[str], None] | None = None) -> list[SymbolInfo]:
+        return list(self._symbols.values())
+
+    def get_symbol_info(self, symbol: str) -> SymbolInfo | None:
+        return self._symbols.get(symbol)
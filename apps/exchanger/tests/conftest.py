@@ -6,6 +6,20 @@ import pytest
 
 from app.config import Settings
 from app.database import SQLiteDatabase
+from app.utils.retry import _shutdown_event, set_task_cancel_event
+
+
+@pytest.fixture(autouse=True)
+def reset_cancellation() -> Generator[None, None, None]:
+    """Reset the global shutdown flag and this thread's task cancel event.
+
+    App shutdown in route tests and shutdown tests set them process-wide.
+    """
+    _shutdown_event.clear()
+    set_task_cancel_event(None)
+    yield
+    _shutdown_event.clear()
+    set_task_cancel_event(None)
 
 
 @pytest.fixture
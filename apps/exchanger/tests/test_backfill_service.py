@@ -7,6 +7,7 @@ from app.database import SQLiteDatabase
 from app.models import Symbol, SymbolInfo, SymbolType
 from app.services.backfill import BackfillService
 from app.sources.registry import SourceRegistry
+from app.task_manager import TaskCancelled
 
 
 class FixedDatetime(datetime):
@@ -302,6 +303,41 @@ class TestCheckpointResume:
         assert "fcs:EURUSD" in results
         assert "GBPUSD" in failures
 
+    def test_cancel_during_fetch_keeps_checkpoint(self, temp_db: SQLiteDatabase) -> None:
+        """A task cancelled mid-symbol stops the run without skipping that symbol."""
+        symbols = ["AAA", "BBB", "CCC"]
+        _setup_symbols(temp_db, "fcs", [("forex", sym) for sym in symbols])
+        source = MockSource(
+            "fcs",
+            [SymbolInfo(symbol=sym, provider_symbol=sym, type="forex") for sym in symbols],
+            {sym: {"2024-01-15": 1.0} for sym in symbols},
+        )
+        fetch_history = source.fetch_history
+
+        def cancel_on_bbb(symbols, days, on_progress=None, on_rates=None, symbol_types=None):
+            if symbols == ["BBB"]:
+                on_progress({"message": "rate limited, waiting"})
+            return fetch_history(symbols, days, on_progress, on_rates, symbol_types)
+
+        source.fetch_history = cancel_on_bbb
+        registry = SourceRegistry()
+        registry.register(source)
+        service = BackfillService(db=temp_db, registry=registry)
+
+        def on_progress(data: dict) -> None:
+            if data.get("message") == "rate limited, waiting":
+                raise TaskCancelled("backfill:fcs")
+
+        with pytest.raises(TaskCancelled):
+            service.backfill("fcs", symbols, length=5, on_progress=on_progress)
+
+        assert temp_db.get_backfill_checkpoint("fcs") == {"last_symbol_idx": 0, "length": 5}
+        assert temp_db.get_rate("2024-01-15", "CCC", "fcs") is None
+
+        results, failures = service.backfill("fcs", symbols, length=5)
+        assert sorted(results) == ["fcs:BBB", "fcs:CCC"]
+        assert failures == []
+
     def test_needs_backfill_true_with_checkpoint(self, temp_db: SQLiteDatabase) -> None:
         """needs_backfill returns True when checkpoint exists."""
         import json
@@ -311,3 +347,140 @@ class TestCheckpointResume:
         registry = SourceRegistry()
         service = BackfillService(db=temp_db, registry=registry, auto_backfill_times=("16:30",))
         assert service.needs_backfill("fcs") is True
+
+
+class LatestSource(MockSource):
+    """MockSource with a batched latest endpoint."""
+
+    def __init__(self, *args, latest: dict[str, float], **kwargs):
+        super().__init__(*args, **kwargs)
+        self._latest = latest
+        self.latest_calls: list[list[str]] = []
+
+    def fetch_latest(self, symbols, on_progress=None, on_rates=None, symbol_types=None):
+        self.latest_calls.append(list(symbols))
+        result = {}
+        for sym in symbols:
+            if sym in self._latest:
+                result[sym] = {"2024-06-01": self._latest[sym]}
+                if on_rates:
+                    on_rates(sym, "2024-06-01", self._latest[sym])
+        return result
+
+
+class TestRefreshLatest:
+    def _registry(self, source) -> SourceRegistry:
+        registry = SourceRegistry()
+        registry.register(source)
+        return registry
+
+    def test_refresh_latest_uses_one_batched_call(self, temp_db: SQLiteDatabase) -> None:
+        _setup_symbols(temp_db, "fcs", [("forex", "EURUSD"), ("crypto", "BTCUSD")])
+        source = LatestSource("fcs", [], latest={"EURUSD": 1.08, "BTCUSD": 65000.0})
+        service = BackfillService(db=temp_db, registry=self._registry(source))
+
+        results, failures = service.refresh_latest("fcs", ["EURUSD", "BTCUSD"])
+
+        assert source.latest_calls == [["EURUSD", "BTCUSD"]]
+        assert results == {"fcs:EURUSD": 1, "fcs:BTCUSD": 1}
+        assert failures == []
+        assert temp_db.get_rate("2024-06-01", "BTCUSD", "fcs") == 65000.0
+
+    def test_refresh_latest_falls_back_to_one_day_backfill(self, temp_db: SQLiteDatabase) -> None:
+        _setup_symbols(temp_db, "cnb", [("forex", "EURCZK")])
+        source = MockSource("cnb", [], {"EURCZK": {"2024-06-01": 25.0}})
+        service = BackfillService(db=temp_db, registry=self._registry(source))
+
+        results, failures = service.refresh_latest("cnb", ["EURCZK"])
+
+        assert results == {"cnb:EURCZK": 1}
+        assert failures == []
+
+    def test_can_refresh_latest_requires_recent_backfill(
+        self, temp_db: SQLiteDatabase, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import app.services.backfill as backfill_mod
+
+        monkeypatch.setattr(backfill_mod, "datetime", FixedDatetime)  # now = 2024-06-01 17:00
+        source = LatestSource("fcs", [], latest={})
+        service = BackfillService(db=temp_db, registry=self._registry(source))
+
+        assert service.can_refresh_latest("fcs") is False  # never backfilled
+
+        temp_db.set_backfill_done_at("fcs", "2024-05-31T16:30:00")
+        assert service.can_refresh_latest("fcs") is True
+
+        temp_db.set_backfill_done_at("fcs", "2024-05-20T16:30:00")
+        assert service.can_refresh_latest("fcs") is False  # gap to fill
+
+    def test_can_refresh_latest_needs_source_support(self, temp_db: SQLiteDatabase) -> None:
+        source = MockSource("cnb", [])
+        service = BackfillService(db=temp_db, registry=self._registry(source))
+        temp_db.set_backfill_done_at("cnb", datetime.now(timezone.utc).isoformat())
+
+        assert service.can_refresh_latest("cnb") is False
+
+
+class YearlySource(MockSource):
+    """MockSource with yearly files, newest year ending today."""
+
+    def __init__(self, *args, years: dict[int, dict[str, dict[str, float]]], **kwargs):
+        super().__init__(*args, **kwargs)
+        self._years = years
+        self.year_calls: list[int] = []
+
+    def fetch_year(self, year: int) -> dict[str, dict[str, float]]:
+        self.year_calls.append(year)
+        if year not in self._years:
+            raise ConnectionError("no such year")
+        return self._years[year]
+
+
+class TestYearlyBackfill:
+    def test_long_backfill_loads_whole_years(self, temp_db: SQLiteDatabase) -> None:
+        _setup_symbols(temp_db, "cnb", [("forex", "EURCZK"), ("forex", "USDCZK")])
+        today = date.today()
+        last_year = date(today.year - 1, 12, 31).isoformat()
+        too_old = date(today.year - 5, 1, 2).isoformat()
+        source = YearlySource("cnb", [], years={
+            today.year: {today.isoformat(): {"EURCZK": 25.0, "USDCZK": 23.0, "GBPCZK": 29.0}},
+            today.year - 1: {last_year: {"EURCZK": 24.9}, too_old: {"EURCZK": 1.0}},
+        })
+        registry = SourceRegistry()
+        registry.register(source)
+        service = BackfillService(db=temp_db, registry=registry)
+        rates_version = temp_db.get_data_version("rates:cnb")
+
+        results, failures = service.backfill("cnb", [], length=400)
+
+        assert source.year_calls == [today.year, today.year - 1]
+        assert results == {"cnb:EURCZK": 2, "cnb:USDCZK": 1}
+        assert failures == []
+        assert temp_db.get_rate(last_year, "EURCZK", "cnb") == 24.9
+        assert temp_db.get_rate(too_old, "EURCZK", "cnb") is None
+        assert temp_db.get_data_version("rates:cnb") == rates_version + 2  # one commit per year
+        assert temp_db.get_coverage(today.year - 1, "cnb") == {last_year: 1}
+
+    def test_failed_year_reports_failures(self, temp_db: SQLiteDatabase) -> None:
+        _setup_symbols(temp_db, "cnb", [("forex", "EURCZK")])
+        today = date.today()
+        source = YearlySource("cnb", [], years={today.year: {today.isoformat(): {"EURCZK": 25.0}}})
+        registry = SourceRegistry()
+        registry.register(source)
+        service = BackfillService(db=temp_db, registry=registry)
+
+        results, failures = service.backfill("cnb", [], length=400)
+
+        assert results == {"cnb:EURCZK": 1}
+        assert failures == ["EURCZK"]
+
+    def test_short_backfill_stays_daily(self, temp_db: SQLiteDatabase) -> None:
+        _setup_symbols(temp_db, "cnb", [("forex", "EURCZK")])
+        source = YearlySource("cnb", [], {"EURCZK": {"2024-06-01": 25.0}}, years={})
+        registry = SourceRegistry()
+        registry.register(source)
+
+        results, _ = BackfillService(db=temp_db, registry=registry).backfill("cnb", [], length=5)
+
+        assert source.year_calls == []
+        assert results == {"cnb:EURCZK": 1}
@@ -0,0 +1,24 @@
+import json
+from pathlib import Path
+
+from benchmarks.run import main
+
+
+class TestBenchmarkRunner:
+    def test_tiny_run_writes_results_and_compares(self, tmp_path: Path) -> None:
+        output = tmp_path / "bench.json"
+
+        assert main(["--scale", "tiny", "--cache-dir", str(tmp_path / "cache"), "--output", str(output), "--upstream"]) == 0
+
+        report = json.loads(output.read_text())
+        names = {r["name"] for r in report["results"]}
+        assert {"get_rate", "get_coverage_year", "import_rates", "backfill_write_path"} <= names
+        assert report["environment"]["rates"] > 10_000
+        upstream = {r["name"]: r for r in report["results"] if r["name"].startswith("upstream_")}
+        assert all(r["requests"] > 0 and r["rows_per_s"] > 0 for r in upstream.values())
+        assert set(upstream) == {"upstream_backfill_fcs", "upstream_backfill_cnb"}
+
+        for result in report["results"]:
+            result["median_s"] /= 1000  # pretend the baseline was 1000x faster
+        output.write_text(json.dumps(report))
+        assert main(["--scale", "tiny", "--cache-dir", str(tmp_path / "cache"), "--compare", str(output)]) == 1
@@ -2,7 +2,7 @@ from datetime import date
 
 import pytest
 
-from app.sources.cnb import CnbSource, CNB_CURRENCIES, _parse_response
+from app.sources.cnb import CnbSource, CNB_CURRENCIES, _parse_response, parse_year_table
 
 
 SAMPLE_CNB_RESPONSE = """20 Jan 2026 #15
@@ -14,6 +14,13 @@ Japan|yen|100|JPY|15,694
 USA|dollar|1|USD|24,704
 """
 
+SAMPLE_CNB_YEAR = """Datum|1 AUD|1 EUR|100 JPY|1 RUB
+02.01.2024|15,194|24,725|15,836|0,251
+03.01.2024|15,102|24,640|15,790|
+Datum|1 AUD|1 EUR|100 JPY
+04.01.2024|15,080|24,600|15,701
+"""
+
 
 class TestCnbSource:
     def test_source_id(self) -> None:
@@ -110,6 +117,34 @@ USA|dollar|1|USD|24,704
         assert "USDCZK" in rates
 
 
+class TestParseYearTable:
+    def test_parses_rows_per_date(self) -> None:
+        rates = parse_year_table(SAMPLE_CNB_YEAR)
+
+        assert list(rates) == ["2024-01-02", "2024-01-03", "2024-01-04"]
+        assert rates["2024-01-02"]["EURCZK"] == 24.725
+        assert abs(rates["2024-01-02"]["JPYCZK"] - 0.15836) < 0.0001
+
+    def test_header_change_mid_year(self) -> None:
+        rates = parse_year_table(SAMPLE_CNB_YEAR)
+
+        assert "RUBCZK" in rates["2024-01-02"]
+        assert "RUBCZK" not in rates["2024-01-03"]  # empty cell
+        assert rates["2024-01-04"] == {"AUDCZK": 15.08, "EURCZK": 24.6, "JPYCZK": 0.15701}
+
+    def test_fetch_year_url(self) -> None:
+        called_urls: list[str] = []
+
+        def mock_get(url: str) -> str:
+            called_urls.append(url)
+            return SAMPLE_CNB_YEAR
+
+        rates = CnbSource(http_get=mock_get).fetch_year(2024)
+
+        assert called_urls[0].endswith("rok.txt?rok=2024")
+        assert len(rates) == 3
+
+
 class TestFetchRatesIntegration:
     def test_constructs_correct_url(self) -> None:
         called_urls: list[str] = []
@@ -79,6 +79,43 @@ class TestLoadSettings:
         assert settings.provider_api_keys["fcs"] == "fcs-key"
         assert settings.provider_api_keys["other"] == "other-key"
 
+    def test_load_provider_monthly_budgets(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PROVIDER_FCS_MONTHLY_BUDGET", "500000")
+        monkeypatch.setenv("PROVIDER_CNB_MONTHLY_BUDGET", "0")
+
+        settings = load_settings()
+
+        assert settings.provider_monthly_budgets == {"fcs": 500000}
+
+    def test_invalid_monthly_budget_raises(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PROVIDER_FCS_MONTHLY_BUDGET", "lots")
+        with pytest.raises(ValueError):
+            load_settings()
+
+    def test_load_provider_max_concurrency(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("PROVIDER_FCS_MAX_CONCURRENCY", "1")
+        monkeypatch.setenv("PROVIDER_CNB_MAX_CONCURRENCY", "0")
+
+        settings = load_settings()
+
+        assert settings.provider_max_concurrency == {"fcs": 1}
+
+    def test_load_on_demand_max_concurrency(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        assert load_settings().on_demand_max_concurrency == 8
+        monkeypatch.setenv("ON_DEMAND_MAX_CONCURRENCY", "2")
+        assert load_settings().on_demand_max_concurrency == 2
+        monkeypatch.setenv("ON_DEMAND_MAX_CONCURRENCY", "0")
+        with pytest.raises(ValueError):
+            load_settings()
+
+    def test_load_rate_revisions(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        assert load_settings().rate_revisions is False
+        monkeypatch.setenv("RATE_REVISIONS", "true")
+        assert load_settings().rate_revisions is True
+        monkeypatch.setenv("RATE_REVISIONS", "maybe")
+        with pytest.raises(ValueError):
+            load_settings()
+
 
 class TestParseBackfillTimes:
     def test_single(self) -> None:
@@ -1,9 +1,10 @@
+from datetime import date, datetime, timezone
 from unittest.mock import patch
 
 import pytest
 
 from app.database import SQLiteDatabase
-from app.models import Symbol
+from app.models import Symbol, SymbolInfo
 
 
 class TestSQLiteDatabase:
@@ -201,6 +202,72 @@ class TestSQLiteDatabase:
         assert providers == []
 
 
+class TestSymbolStaging:
+    def test_staged_pages_of_providers_stay_apart(self, temp_db: SQLiteDatabase) -> None:
+        temp_db.populate_symbols("fcs", [Symbol(provider="fcs", symbol="OLDUSD", provider_symbol="OLDUSD", type="forex")])
+
+        temp_db.stage_symbols("fcs", [SymbolInfo(symbol="EURUSD", provider_symbol="EURUSD.ONE", type="forex")])
+        temp_db.stage_symbols("cnb", [SymbolInfo(symbol="EURCZK", provider_symbol="EURCZK", type="forex")])
+        temp_db.stage_symbols("fcs", [SymbolInfo(symbol="BTCUSD", provider_symbol="BTCUSD", type="crypto")])
+        # Nothing is visible before apply
+        assert [s.symbol for s in temp_db.list_symbols(provider="fcs")] == ["OLDUSD"]
+
+        temp_db.apply_staged_symbols("fcs")
+
+        assert sorted(s.symbol for s in temp_db.list_symbols(provider="fcs")) == ["BTCUSD", "EURUSD"]
+        assert temp_db.list_symbols(provider="cnb") == []
+        temp_db.apply_staged_symbols("cnb")
+        assert [s.symbol for s in temp_db.list_symbols(provider="cnb")] == ["EURCZK"]
+
+    def test_discarded_pages_are_not_applied(self, temp_db: SQLiteDatabase) -> None:
+        temp_db.stage_symbols("fcs", [SymbolInfo(symbol="GBPUSD", provider_symbol="GBPUSD", type="forex")])
+        temp_db.discard_staged_symbols("fcs")
+        temp_db.stage_symbols("fcs", [SymbolInfo(symbol="JPYUSD", provider_symbol="JPYUSD", type="forex")])
+
+        temp_db.apply_staged_symbols("fcs")
+
+        assert [s.symbol for s in temp_db.list_symbols(provider="fcs")] == ["JPYUSD"]
+
+
+class TestDataVersions:
+    def test_rate_write_bumps_scopes_once_per_commit(self, temp_db: SQLiteDatabase) -> None:
+        temp_db.populate_symbols("fcs", [Symbol(provider="fcs", symbol="EURUSD", provider_symbol="EURUSD", type="forex", name="Euro")])
+        temp_db.commit()
+
+        temp_db.upsert_rate("2024-01-15", "EURUSD", "fcs", 1.0850)
+        temp_db.upsert_rate("2024-01-16", "EURUSD", "fcs", 1.0860)
+        assert temp_db.get_data_version("rates") == 0
+        temp_db.commit()
+
+        assert temp_db.get_data_version("rates") == 1
+        assert temp_db.get_data_version("rates:fcs") == 1
+        assert temp_db.get_data_version("rates:fcs:EURUSD") == 1
+        assert temp_db.get_data_version("rates:cnb") == 0
+
+    def test_rollback_discards_changes(self, temp_db: SQLiteDatabase) -> None:
+        temp_db.populate_symbols("fcs", [Symbol(provider="fcs", symbol="EURUSD", provider_symbol="EURUSD", type="forex", name="Euro")])
+        temp_db.commit()
+        symbols_version = temp_db.get_data_version("symbols")
+
+        temp_db.begin_transaction()
+        temp_db.upsert_rate("2024-01-15", "EURUSD", "fcs", 1.0850)
+        temp_db.rollback()
+        temp_db.commit()
+
+        assert temp_db.get_data_version("rates") == 0
+        assert temp_db.get_data_version("symbols") == symbols_version
+
+    def test_restore_bumps_all_rate_scopes(self, temp_db: SQLiteDatabase) -> None:
+        temp_db.populate_symbols("fcs", [Symbol(provider="fcs", symbol="EURUSD", provider_symbol="EURUSD", type="forex", name="Euro")])
+        temp_db.upsert_rate("2024-01-15", "EURUSD", "fcs", 1.0850)
+        temp_db.commit()
+
+        temp_db.import_rates([])
+        temp_db.commit()
+
+        assert temp_db.get_data_version("rates:fcs:EURUSD") == 2
+
+
 class TestRestoreAtomicity:
     def test_restore_rolls_back_on_import_rates_failure(self, temp_db: SQLiteDatabase) -> None:
         """If import_rates fails mid-restore, symbols should also be rolled back."""
@@ -258,3 +325,171 @@ class TestRestoreAtomicity:
         temp_db.commit()
 
         assert temp_db.get_rate("2024-01-15", "EURUSD", "fcs") == 1.0850
+
+
+class TestUpsertRates:
+    def test_upsert_rates_batch(self, temp_db: SQLiteDatabase) -> None:
+        temp_db.populate_symbols("cnb", [Symbol(provider="cnb", symbol="EURCZK", provider_symbol="EURCZK", type="forex", name="Euro")])
+        temp_db.commit()
+        temp_db.upsert_rate("2024-01-15", "EURCZK", "cnb", 1.0)
+        temp_db.commit()
+
+        written = temp_db.upsert_rates("cnb", [
+            ("2024-01-15", "EURCZK", 25.5),
+            ("2024-01-16", "EURCZK", 25.6),
+            ("2024-01-16", "XXXCZK", 9.9),
+        ])
+        temp_db.commit()
+
+        assert written == 2
+        assert temp_db.get_rate("2024-01-15", "EURCZK", "cnb") == 25.5
+        assert temp_db.get_rate("2024-01-16", "EURCZK", "cnb") == 25.6
+        assert temp_db.get_data_version("rates:cnb:EURCZK") == 2
+
+
+class Clock(datetime):
+    """datetime whose now() returns a settable time."""
+
+    current = datetime(2024, 1, 15, 17, 0, tzinfo=timezone.utc)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+class TestRateRevisions:
+    @pytest.fixture
+    def db(self, tmp_path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr("app.database.datetime", Clock)
+        db = SQLiteDatabase(str(tmp_path / "revisions.db"), rate_revisions=True)
+        db.populate_symbols("cnb", [Symbol(provider="cnb", symbol="EURCZK", provider_symbol="EURCZK", type="forex", name="Euro")])
+        db.commit()
+        yield db
+        db.close()
+
+    def _write(self, db: SQLiteDatabase, at: datetime, rate: float, day: str = "2024-01-15") -> None:
+        Clock.current = at
+        db.upsert_rate(day, "EURCZK", "cnb", rate)
+        db.commit()
+
+    def test_logs_only_replaced_values(self, db: SQLiteDatabase) -> None:
+        self._write(db, datetime(2024, 1, 15, 15, 0, tzinfo=timezone.utc), 25.1)
+        self._write(db, datetime(2024, 1, 15, 16, 0, tzinfo=timezone.utc), 25.1)
+        first_store = {"rate": None, "replaced_at": "2024-01-15T15:00:00+00:00"}
+        assert db.get_rate_revisions("2024-01-15", "EURCZK", "cnb") == [first_store]
+
+        self._write(db, datetime(2024, 1, 16, 9, 0, tzinfo=timezone.utc), 25.2)
+
+        revisions = db.get_rate_revisions("2024-01-15", "EURCZK", "cnb")
+        assert revisions == [first_store, {"rate": 25.1, "replaced_at": "2024-01-16T09:00:00+00:00"}]
+        assert db.get_rate("2024-01-15", "EURCZK", "cnb") == 25.2
+
+    def test_batched_writes_log_replaced_values(self, db: SQLiteDatabase) -> None:
+        Clock.current = datetime(2024, 1, 16, 9, 0, tzinfo=timezone.utc)
+        db.upsert_rates("cnb", [("2024-01-15", "EURCZK", 25.1), ("2024-01-16", "EURCZK", 25.3)])
+        db.commit()
+        Clock.current = datetime(2024, 1, 17, 9, 0, tzinfo=timezone.utc)
+        db.upsert_rates("cnb", [("2024-01-15", "EURCZK", 25.2), ("2024-01-16", "EURCZK", 25.3)])
+        db.commit()
+
+        assert [r["rate"] for r in db.get_rate_revisions("2024-01-15", "EURCZK", "cnb")] == [None, 25.1]
+        assert [r["rate"] for r in db.get_rate_revisions("2024-01-16", "EURCZK", "cnb")] == [None]
+
+    def test_value_written_back_in_one_transaction_is_not_logged(self, db: SQLiteDatabase) -> None:
+        self._write(db, datetime(2024, 1, 15, 15, 0, tzinfo=timezone.utc), 25.1)
+        db.begin_transaction()
+        db.upsert_rate("2024-01-15", "EURCZK", "cnb", 25.2)
+        db.upsert_rate("2024-01-15", "EURCZK", "cnb", 25.1)
+        db.commit()
+
+        assert [r["rate"] for r in db.get_rate_revisions("2024-01-15", "EURCZK", "cnb")] == [None]
+
+    def test_as_of_reads(self, db: SQLiteDatabase) -> None:
+        self._write(db, datetime(2024, 1, 15, 15, 0, tzinfo=timezone.utc), 25.1)
+        self._write(db, datetime(2024, 1, 16, 9, 0, tzinfo=timezone.utc), 25.2)
+        self._write(db, datetime(2024, 1, 16, 9, 0, tzinfo=timezone.utc), 25.3, day="2024-01-16")
+        self._write(db, datetime(2024, 1, 17, 9, 0, tzinfo=timezone.utc), 25.4)
+
+        assert db.get_rate("2024-01-15", "EURCZK", "cnb", as_of=datetime(2024, 1, 15, 18, 0)) == 25.1
+        assert db.get_rate("2024-01-15", "EURCZK", "cnb", as_of=datetime(2024, 1, 16, 12, 0)) == 25.2
+        assert db.get_rate("2024-01-15", "EURCZK", "cnb", as_of=datetime(2024, 1, 18)) == 25.4
+
+        history = db.get_rates_range("EURCZK", date(2024, 1, 15), date(2024, 1, 16), "cnb", as_of=datetime(2024, 1, 15, 18, 0))
+        assert history == [{"date": "2024-01-15", "rate": 25.1}, {"date": "2024-01-16", "rate": None}]
+        history = db.get_rates_range("EURCZK", date(2024, 1, 15), date(2024, 1, 16), "cnb", as_of=datetime(2024, 1, 16, 12, 0))
+        assert history == [{"date": "2024-01-15", "rate": 25.2}, {"date": "2024-01-16", "rate": 25.3}]
+
+    def test_day_first_stored_after_as_of_is_not_known(self, db: SQLiteDatabase) -> None:
+        self._write(db, datetime(2024, 1, 16, 9, 0, tzinfo=timezone.utc), 25.1)
+
+        assert db.get_rate("2024-01-15", "EURCZK", "cnb", as_of=datetime(2024, 1, 15, 18, 0)) is None
+        assert db.get_rate("2024-01-15", "EURCZK", "cnb", as_of=datetime(2024, 1, 16, 12, 0)) == 25.1
+
+    def test_rates_stored_before_the_log_read_as_current(self, db: SQLiteDatabase) -> None:
+        db._rate_revisions = False
+        self._write(db, datetime(2024, 1, 15, 15, 0, tzinfo=timezone.utc), 25.1)
+        db._rate_revisions = True
+
+        assert db.get_rate("2024-01-15", "EURCZK", "cnb", as_of=datetime(2020, 1, 1)) == 25.1
+        assert db.get_rate_revisions("2024-01-15", "EURCZK", "cnb") == []
+
+    def test_rollback_discards_pending_revisions(self, db: SQLiteDatabase) -> None:
+        self._write(db, datetime(2024, 1, 15, 15, 0, tzinfo=timezone.utc), 25.1)
+        db.begin_transaction()
+        db.upsert_rate("2024-01-15", "EURCZK", "cnb", 25.2)
+        db.rollback()
+        db.commit()
+
+        assert [r["rate"] for r in db.get_rate_revisions("2024-01-15", "EURCZK", "cnb")] == [None]
+
+
+class TestRatesExport:
+    def _seed(self, db: SQLiteDatabase) -> None:
+        db.populate_symbols("fcs", [Symbol(provider="fcs", symbol="EURUSD", provider_symbol="EURUSD", type="forex", name="Euro")])
+        db.populate_symbols("cnb", [Symbol(provider="cnb", symbol="EURCZK", provider_symbol="EURCZK", type="forex", name="Euro CZK")])
+        for day in ("2024-01-15", "2024-01-16", "2024-01-17"):
+            db.upsert_rate(day, "EURUSD", "fcs", 1.08)
+            db.upsert_rate(day, "EURCZK", "cnb", 25.5)
+        db.commit()
+
+    def _rows(self, export) -> list[tuple]:
+        return [(day, export.symbols[symbol_id][0], rate) for batch in export.batches() for day, symbol_id, rate in batch]
+
+    def test_export_streams_in_batches_ordered_by_date(self, temp_db: SQLiteDatabase) -> None:
+        self._seed(temp_db)
+        export = temp_db.open_rates_export(batch_size=4)
+        batches = list(export.batches())
+        assert [len(b) for b in batches] == [4, 2]
+        days = [row[0] for batch in batches for row in batch]
+        assert days == sorted(days)
+
+    def test_export_filters(self, temp_db: SQLiteDatabase) -> None:
+        self._seed(temp_db)
+        export = temp_db.open_rates_export(providers=["cnb"], from_date=date(2024, 1, 16))
+        assert self._rows(export) == [("2024-01-16", "cnb", 25.5), ("2024-01-17", "cnb", 25.5)]
+
+        export = temp_db.open_rates_export(symbols=["EURUSD"], to_date=date(2024, 1, 15))
+        assert self._rows(export) == [("2024-01-15", "fcs", 1.08)]
+
+    @pytest.mark.parametrize("fmt", ["csv", "arrow"])
+    def test_abandoned_stream_closes_export(self, temp_db: SQLiteDatabase, fmt: str) -> None:
+        from app.services.export import arrow_stream, csv_stream
+
+        if fmt == "arrow":
+            pytest.importorskip("pyarrow")
+        self._seed(temp_db)
+        export = temp_db.open_rates_export(batch_size=1)
+        stream = (csv_stream if fmt == "csv" else arrow_stream)(export)
+        next(stream)
+        # Client gone after the first chunk
+        stream.close()
+        assert export._conn is None
+
+    def test_export_reads_a_snapshot(self, temp_db: SQLiteDatabase) -> None:
+        self._seed(temp_db)
+        export = temp_db.open_rates_export(providers=["fcs"], batch_size=1)
+        batches = export.batches()
+        next(batches)
+        temp_db.upsert_rate("2024-01-18", "EURUSD", "fcs", 1.09)
+        temp_db.commit()
+        assert len(list(batches)) == 2
@@ -0,0 +1,91 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.sources.cnb import CNB_CURRENCIES, CnbSource
+from app.sources.fcs import FcsSource
+from benchmarks.fake_upstream import FakeUpstream, FakeUpstreamConfig
+
+
+@pytest.fixture
+def upstream():
+    with FakeUpstream(FakeUpstreamConfig(forex_symbols=40, crypto_symbols=5, history_days=700)) as server:
+        yield server
+
+
+def last_weekday() -> date:
+    day = date.today()
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+
+class TestFcs:
+    def test_lists_symbols_across_pages(self, upstream: FakeUpstream, monkeypatch: pytest.MonkeyPatch) -> None:
+        source = FcsSource("key", rate_limit_wait=0, base_url=upstream.fcs_base_url)
+        original = source._api.request
+        # Small pages so the pagination path is exercised
+        monkeypatch.setattr(source._api, "request", lambda ep, params: original(ep, {**params, "per_page": 15}))
+
+        symbols = source.list_symbols()
+
+        assert len(symbols) == 45
+        assert {s.type for s in symbols} == {"forex", "crypto"}
+        assert upstream.stats["fcs forex/list"] == 3
+
+    def test_history_pages_until_short_page(self, upstream: FakeUpstream) -> None:
+        source = FcsSource("key", rate_limit_wait=0, base_url=upstream.fcs_base_url)
+
+        rates = source.fetch_history(["C0000USD"], 1000, symbol_types={"C0000USD": "crypto"})
+
+        # 700 calendar days of crypto: pages of 300, 300, 100
+        assert len(rates["C0000USD"]) == 700
+        assert upstream.stats["fcs crypto/history"] == 3
+        assert rates == source.fetch_history(["C0000USD"], 1000, symbol_types={"C0000USD": "crypto"})
+
+    def test_rate_limit_returns_213_until_window_rolls(self) -> None:
+        config = FakeUpstreamConfig(forex_symbols=40, rate_limit=1, rate_limit_window=0.2)
+        credits: list[int] = []
+        with FakeUpstream(config) as upstream:
+            source = FcsSource(
+                "key", rate_limit_wait=1, base_url=upstream.fcs_base_url, on_request=lambda: credits.append(1)
+            )
+            types = {"EURCZK": "forex", "USDCZK": "forex"}
+
+            rates = source.fetch_latest(["EURCZK"], symbol_types=types)
+            rates.update(source.fetch_latest(["USDCZK"], symbol_types=types))
+
+        assert set(rates) == {"EURCZK", "USDCZK"}
+        assert upstream.stats["fcs rate_limited"] == 1
+        assert credits == [1, 1]
+
+    def test_errors_surface_as_failed_requests(self) -> None:
+        with FakeUpstream(FakeUpstreamConfig(error_rate=1.0)) as upstream:
+            source = FcsSource("key", rate_limit_wait=0, base_url=upstream.fcs_base_url)
+            with pytest.raises(RuntimeError, match="Failed to list FCS"):
+                source.list_symbols()
+        # The first failed type ends the listing; the other may not have been requested yet
+        assert upstream.stats["fcs errors"] >= 1
+
+
+class TestCnb:
+    def test_serves_fixing_for_any_date(self, upstream: FakeUpstream) -> None:
+        source = CnbSource(http_get=upstream.cnb_http_get, fetch_delay=0)
+
+        rates = source.fetch_history(["EURCZK", "JPYCZK"], 10)
+
+        assert len(rates["EURCZK"]) == 10
+        assert upstream.stats["cnb denni_kurz"] == 10
+        # Weekends repeat the previous business day's fixing
+        day = last_weekday()
+        assert source.fetch_rate("EURCZK", day) == rates["EURCZK"][day.isoformat()]
+        assert len(source.list_symbols()) == len(CNB_CURRENCIES)
+
+    def test_year_table_matches_daily_fixings(self, upstream: FakeUpstream) -> None:
+        source = CnbSource(http_get=upstream.cnb_http_get, fetch_delay=0)
+        day = last_weekday()
+
+        table = source.fetch_year(day.year)
+
+        assert upstream.stats["cnb rok"] == 1
+        assert table[day.isoformat()]["JPYCZK"] == pytest.approx(source.fetch_rate("JPYCZK", day), rel=1e-3)
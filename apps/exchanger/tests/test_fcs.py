@@ -0,0 +1,185 @@
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.database import SQLiteDatabase
+from app.services.symbols import SymbolsService
+from app.sources import fcs as fcs_mod
+from app.sources.fcs import LATEST_BATCH_SIZE, FcsSource
+from app.sources.registry import SourceRegistry
+
+# 2024-01-15 00:00:00 UTC
+TS = 1705276800
+
+
+class RecordingApi:
+    """FcsApi stand-in answering {type}/latest with one candle per requested symbol."""
+
+    def __init__(self, key: str):
+        self.calls: list[tuple[str, dict]] = []
+
+    def request(self, endpoint: str, params: dict) -> dict | None:
+        self.calls.append((endpoint, params))
+        items = [
+            {"ticker": f"FX:{sym}", "profile": {"symbol": sym}, "active": {"c": "1.5", "t": TS}}
+            for sym in params["symbol"].split(",")
+        ]
+        return {"code": 200, "response": items}
+
+
+@pytest.fixture
+def source(monkeypatch: pytest.MonkeyPatch) -> FcsSource:
+    monkeypatch.setattr(fcs_mod, "FcsApi", RecordingApi)
+    return FcsSource("test-key", rate_limit_wait=0)
+
+
+class TestFetchLatest:
+    def test_batches_symbols_by_type(self, source: FcsSource) -> None:
+        forex = [f"FX{i:03d}" for i in range(LATEST_BATCH_SIZE + 1)]
+        types = {sym: "forex" for sym in forex}
+        types["BTCUSD"] = "crypto"
+
+        results = source.fetch_latest(list(types), symbol_types=types)
+
+        calls = source._api.calls
+        assert [endpoint for endpoint, _ in calls] == ["forex/latest", "forex/latest", "crypto/latest"]
+        assert len(calls[0][1]["symbol"].split(",")) == LATEST_BATCH_SIZE
+        assert calls[2][1]["symbol"] == "BTCUSD"
+        assert len(results) == len(types)
+        assert results["BTCUSD"] == {"2024-01-15": 1.5}
+
+    def test_reports_rates_and_credits(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(fcs_mod, "FcsApi", RecordingApi)
+        credits: list[int] = []
+        source = FcsSource("test-key", rate_limit_wait=0, on_request=lambda: credits.append(1))
+        rates: list[tuple[str, str, float]] = []
+
+        source.fetch_latest(
+            ["EURUSD", "GBPUSD"],
+            on_rates=lambda sym, day, rate: rates.append((sym, day, rate)),
+            symbol_types={"EURUSD": "forex", "GBPUSD": "forex"},
+        )
+
+        assert rates == [("EURUSD", "2024-01-15", 1.5), ("GBPUSD", "2024-01-15", 1.5)]
+        assert credits == [1]
+
+    def test_skips_unknown_type(self, source: FcsSource) -> None:
+        assert source.fetch_latest(["EURUSD"]) == {}
+        assert source._api.calls == []
+
+    def test_matches_prefixed_ticker(self) -> None:
+        item = {"ticker": "FX:EURCZK.ONE", "active": {"c": 25.0, "t": TS}}
+        assert FcsSource._match_latest_symbol(item, ["EURCZK.ONE"]) == "EURCZK.ONE"
+        assert FcsSource._match_latest_symbol(item, ["USDCZK"]) is None
+
+
+class HistoryApi:
+    """FcsApi stand-in answering {type}/history with `length` daily candles ending today."""
+
+    def __init__(self, key: str):
+        self.calls: list[tuple[str, dict]] = []
+
+    def request(self, endpoint: str, params: dict) -> dict | None:
+        self.calls.append((endpoint, params))
+        today = date.today()
+        candles = {}
+        for i in range(params["length"]):
+            day = today - timedelta(days=i)
+            ts = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+            candles[str(i)] = {"t": ts, "c": str(1 + i / 100)}
+        return {"code": 200, "response": candles}
+
+
+class TestFetchRateWindow:
+    def test_window_reaches_back_to_window_start(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(fcs_mod, "FcsApi", HistoryApi)
+        source = FcsSource("test-key", rate_limit_wait=0)
+        today = date.today()
+
+        rates = source.fetch_rate_window("EURUSD", today - timedelta(days=4), window_start=today - timedelta(days=9), symbol_type="forex")
+
+        assert source._api.calls[0][1]["length"] == 10
+        assert len(rates) == 10
+        assert rates[(today - timedelta(days=4)).isoformat()] == 1.04
+
+    def test_window_is_capped_and_fetch_rate_picks_one_day(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(fcs_mod, "FcsApi", HistoryApi)
+        source = FcsSource("test-key", rate_limit_wait=0)
+        today = date.today()
+
+        source.fetch_rate_window("EURUSD", today, window_start=today - timedelta(days=1000), symbol_type="forex")
+        assert source._api.calls[0][1]["length"] == fcs_mod.HISTORY_MAX_LENGTH
+        assert source.fetch_rate("EURUSD", today - timedelta(days=2), symbol_type="forex") == 1.02
+        assert source._api.calls[1][1]["length"] == 3
+
+
+class ListApi:
+    """FcsApi stand-in answering {type}/list with two pages per type.
+
+    The first forex page is held until crypto has been requested, so a
+    sequential listing would time out.
+    """
+
+    def __init__(self, key: str):
+        self.crypto_requested = threading.Event()
+        self.overlapped = False
+
+    def request(self, endpoint: str, params: dict) -> dict | None:
+        sym_type = endpoint.split("/")[0]
+        if sym_type == "crypto":
+            self.crypto_requested.set()
+        elif params["page"] == 1:
+            self.overlapped = self.crypto_requested.wait(timeout=5)
+        page = params["page"]
+        items = [{"profile": {"symbol": f"{sym_type[:2].upper()}{page}{i}.ONE", "name": None}} for i in range(3)]
+        return {"code": 200, "response": items, "info": {"pagination": {"has_next": page < 2}}}
+
+
+class TestListSymbolPages:
+    def test_types_are_paged_in_parallel(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(fcs_mod, "FcsApi", ListApi)
+        source = FcsSource("test-key", rate_limit_wait=0)
+
+        pages = list(source.list_symbol_pages())
+
+        assert source._api.overlapped
+        assert len(pages) == 4
+        assert {page[0].type for page in pages} == {"forex", "crypto"}
+        assert pages[0][0].symbol == pages[0][0].provider_symbol.removesuffix(".ONE")
+
+    def test_listing_error_is_raised_to_consumer(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(fcs_mod, "FcsApi", ListApi)
+        source = FcsSource("test-key", rate_limit_wait=0)
+
+        def fail(endpoint: str, params: dict) -> dict | None:
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(source._api, "request", fail)
+        monkeypatch.setattr(fcs_mod, "fetch_with_retry", lambda api, endpoint, params, *args: api.request(endpoint, params))
+
+        with pytest.raises(RuntimeError, match="boom"):
+            list(source.list_symbol_pages())
+
+    def test_failed_page_keeps_existing_symbols(self, temp_db: SQLiteDatabase, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(fcs_mod, "FcsApi", ListApi)
+        source = FcsSource("test-key", rate_limit_wait=0)
+        registry = SourceRegistry()
+        registry.register(source)
+        service = SymbolsService(db=temp_db, registry=registry)
+        service.populate("fcs")
+        listed = {s.provider_symbol for s in temp_db.list_symbols(provider="fcs")}
+
+        list_page = source._api.request
+
+        def fail_page_two(endpoint: str, params: dict) -> dict | None:
+            if params["page"] == 2:
+                return {"code": 500, "msg": "Internal error"}
+            return list_page(endpoint, params)
+
+        monkeypatch.setattr(source._api, "request", fail_page_two)
+
+        with pytest.raises(RuntimeError, match="page 2"):
+            service.populate("fcs")
+
+        assert {s.provider_symbol for s in temp_db.list_symbols(provider="fcs")} == listed
@@ -0,0 +1,201 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from app.database import SQLiteDatabase
+from app.leader import LeaderElection
+from app.task_manager import TaskManager
+
+
+class TestLease:
+    def test_first_holder_acquires(self, temp_db: SQLiteDatabase) -> None:
+        assert temp_db.acquire_lease("background", "a", 30, now=1000.0)
+        assert not temp_db.acquire_lease("background", "b", 30, now=1001.0)
+
+    def test_holder_renews(self, temp_db: SQLiteDatabase) -> None:
+        temp_db.acquire_lease("background", "a", 30, now=1000.0)
+        assert temp_db.acquire_lease("background", "a", 30, now=1020.0)
+        # Renewal moved expiry to 1050, so b is still locked out at 1040
+        assert not temp_db.acquire_lease("background", "b", 30, now=1040.0)
+
+    def test_expired_lease_taken_over(self, temp_db: SQLiteDatabase) -> None:
+        temp_db.acquire_lease("background", "a", 30, now=1000.0)
+        assert temp_db.acquire_lease("background", "b", 30, now=1031.0)
+        assert not temp_db.acquire_lease("background", "a", 30, now=1032.0)
+
+    def test_release(self, temp_db: SQLiteDatabase) -> None:
+        temp_db.acquire_lease("background", "a", 30, now=1000.0)
+        temp_db.release_lease("background", "b")  # not the holder, no-op
+        assert not temp_db.acquire_lease("background", "b", 30, now=1001.0)
+        temp_db.release_lease("background", "a")
+        assert temp_db.acquire_lease("background", "b", 30, now=1002.0)
+
+    def test_visible_to_other_process(self, tmp_path: Path) -> None:
+        """Lease writes commit immediately, so another worker's connection sees them."""
+        db_path = str(tmp_path / "exchanger.db")
+        first, second = SQLiteDatabase(db_path), SQLiteDatabase(db_path)
+        try:
+            assert first.acquire_lease("background", "a", 30, now=time.time())
+            assert not second.acquire_lease("background", "b", 30, now=time.time())
+        finally:
+            first.close()
+            second.close()
+
+
+class TestLeaderElection:
+    def test_single_worker_elected_on_start(self, temp_db: SQLiteDatabase) -> None:
+        elected: list[str] = []
+        leader = LeaderElection(temp_db, ttl_seconds=30, holder="a")
+        leader.start(on_elected=lambda: elected.append("a"))
+        try:
+            assert leader.is_leader
+            assert elected == ["a"]
+        finally:
+            leader.stop()
+        assert not leader.is_leader
+
+    def test_second_worker_follows_until_leader_stops(self, temp_db: SQLiteDatabase) -> None:
+        first = LeaderElection(temp_db, ttl_seconds=30, holder="a")
+        second = LeaderElection(temp_db, ttl_seconds=30, holder="b")
+        first.start(on_elected=lambda: None)
+        second.start(on_elected=lambda: None)
+        try:
+            assert first.is_leader
+            assert not second.is_leader
+            first.stop()
+            assert second.try_acquire()
+        finally:
+            first.stop()
+            second.stop()
+
+    def test_failing_renewals_demote_before_lease_expires(
+        self, temp_db: SQLiteDatabase, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        clock = [1000.0]
+        monkeypatch.setattr("app.leader.time.monotonic", lambda: clock[0])
+        lost: list[str] = []
+        leader = LeaderElection(temp_db, ttl_seconds=30, holder="a", tick_seconds=10)
+        leader._step(lambda: None, None, lambda: lost.append("a"))
+        assert leader.is_leader
+
+        def locked(*args: object) -> bool:
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(temp_db, "acquire_lease", locked)
+        clock[0] += 10
+        leader._step(lambda: None, None, lambda: lost.append("a"))
+        assert leader.is_leader
+        # One tick before the lease could be taken over by another worker
+        clock[0] += 10
+        leader._step(lambda: None, None, lambda: lost.append("a"))
+        assert not leader.is_leader
+        assert lost == ["a"]
+
+    def test_lost_leadership_stops_running_jobs(
+        self, temp_db: SQLiteDatabase, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        started = threading.Event()
+        tm = TaskManager(store=temp_db)
+
+        def run() -> None:
+            started.set()
+            while True:
+                tm.raise_if_cancelled("backfill:fcs")
+                time.sleep(0.01)
+
+        leader = LeaderElection(temp_db, ttl_seconds=30, holder="a")
+        tm.set_leader_check(lambda: leader.is_leader)
+        leader._step(lambda: None, None, lambda: tm.cancel_all())
+        assert tm.start_if_idle("backfill:fcs", run, lane="bulk")
+        assert started.wait(timeout=5)
+
+        # Another worker took the lease (e.g. this one stalled past its TTL)
+        temp_db.acquire_lease("background", "b", 30, now=time.time() + 60)
+        leader._step(lambda: None, None, lambda: tm.cancel_all())
+
+        assert not leader.is_leader
+        tm._futures["backfill:fcs"].result(timeout=5)
+        assert tm.get_status("backfill:fcs")["status"] == "cancelled"
+
+
+class TestSharedTaskStatus:
+    def test_follower_queues_and_leader_runs(self, temp_db: SQLiteDatabase) -> None:
+        ran: list[dict] = []
+        done = threading.Event()
+
+        def job(key: str, params: dict):
+            def run() -> None:
+                ran.append(params)
+                done.set()
+            return run
+
+        leader_tm = TaskManager(store=temp_db)
+        follower_tm = TaskManager(store=temp_db)
+        follower_tm.set_leader_check(lambda: False)
+        for tm in (leader_tm, follower_tm):
+            tm.register_job("job", job)
+
+        assert follower_tm.submit("job:x", "job", {"n": 1})
+        assert follower_tm.get_status("job:x")["message"] == "Queued..."
+        # Already queued: a second request is rejected
+        assert not follower_tm.submit("job:x", "job", {"n": 2})
+
+        leader_tm.run_requested()
+
+        assert done.wait(timeout=5)
+        assert ran == [{"n": 1}]
+        assert temp_db.pop_task_requests() == []
+
+    def test_follower_sees_leader_status(self, temp_db: SQLiteDatabase) -> None:
+        leader_tm = TaskManager(store=temp_db)
+        follower_tm = TaskManager(store=temp_db)
+        leader_tm.set_status("backfill:fcs", {"status": "done", "message": "Completed: 3 rows"})
+
+        follower_tm.sync_from_store()
+
+        assert follower_tm.get_status("backfill:fcs")["message"] == "Completed: 3 rows"
+
+    def test_adopt_marks_orphaned_tasks_cancelled(self, temp_db: SQLiteDatabase) -> None:
+        temp_db.save_task_status("backfill:fcs", {"status": "running", "message": "Page 3..."})
+        temp_db.save_task_status("populate_symbols:cnb", {"status": "running", "message": "Queued..."})
+        temp_db.add_task_request("populate_symbols:cnb", "populate_symbols", {"provider": "cnb"})
+
+        tm = TaskManager(store=temp_db)
+        tm.adopt_store()
+
+        assert tm.get_status("backfill:fcs")["status"] == "cancelled"
+        assert temp_db.load_task_statuses()["backfill:fcs"]["status"] == "cancelled"
+        # Still queued, about to be started by the new leader
+        assert tm.get_status("populate_symbols:cnb")["status"] == "running"
+
+    def test_follower_cancel_reaches_leader(self, temp_db: SQLiteDatabase) -> None:
+        started = threading.Event()
+
+        def job(key: str, params: dict):
+            def run() -> None:
+                started.set()
+                while True:
+                    leader_tm.raise_if_cancelled(key)
+                    time.sleep(0.01)
+            return run
+
+        leader_tm = TaskManager(store=temp_db)
+        follower_tm = TaskManager(store=temp_db)
+        follower_tm.set_leader_check(lambda: False)
+        for tm in (leader_tm, follower_tm):
+            tm.register_job("job", job, lane="bulk")
+
+        follower_tm.submit("job:x", "job", {})
+        assert follower_tm.get_status("job:x")["status"] == "queued"
+        leader_tm.run_requested()
+        assert started.wait(timeout=5)
+
+        follower_tm.sync_from_store()
+        assert follower_tm.cancel("job:x")
+        leader_tm.run_requested()
+        leader_tm._futures["job:x"].result(timeout=5)
+
+        follower_tm.sync_from_store()
+        assert follower_tm.get_status("job:x")["status"] == "cancelled"
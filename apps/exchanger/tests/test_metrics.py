@@ -0,0 +1,31 @@
+from prometheus_client import REGISTRY
+
+from app.database import SQLiteDatabase
+from app.utils.retry import fetch_with_retry
+from tests.test_retry import MockApi
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestUpstreamMetrics:
+    def test_rate_limit_counted_and_wait_timed(self) -> None:
+        before_213 = _sample("exchanger_upstream_errors_total", provider="fcs", kind="rate_limited")
+        before_requests = _sample("exchanger_upstream_request_seconds_count", provider="fcs", endpoint="forex/history")
+        api = MockApi([{"code": 213}, {"code": 200, "response": {}}])
+
+        fetch_with_retry(api, "forex/history", {}, rate_limit_wait=0)
+
+        assert _sample("exchanger_upstream_errors_total", provider="fcs", kind="rate_limited") == before_213 + 1
+        assert _sample("exchanger_upstream_request_seconds_count", provider="fcs", endpoint="forex/history") == before_requests + 2
+
+
+class TestDatabaseMetrics:
+    def test_lock_timed_per_method(self, temp_db: SQLiteDatabase) -> None:
+        before = _sample("exchanger_db_query_seconds_count", method="get_rate")
+
+        temp_db.get_rate("2024-01-15", "EURUSD", "fcs")
+
+        assert _sample("exchanger_db_query_seconds_count", method="get_rate") == before + 1
+        assert _sample("exchanger_db_lock_wait_seconds_count", method="get_rate") >= 1
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from datetime import date, timedelta
+
+from app.async_database import AsyncDatabase
+from app.database import SQLiteDatabase
+from app.models import Symbol
+from app.services.on_demand import OnDemandFetcher
+from app.sources.registry import SourceRegistry
+
+
+class SlowSource:
+    source_id = "slow"
+
+    def __init__(self, rate: float | None = 1.25, error: Exception | None = None):
+        self.calls = 0
+        self._rate = rate
+        self._error = error
+
+    def fetch_rate(self, symbol: str, dt: date) -> float | None:
+        self.calls += 1
+        time.sleep(0.1)
+        if self._error:
+            raise self._error
+        return self._rate
+
+
+class WindowSource(SlowSource):
+    """Source that returns a whole window of rates per call, like FCS history."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.windows: list[tuple[date, date]] = []
+
+    def fetch_rate_window(self, symbol: str, dt: date, window_start: date | None = None) -> dict[str, float]:
+        self.calls += 1
+        self.windows.append((window_start, dt))
+        start = min(window_start or dt, dt)
+        return {(start + timedelta(days=i)).isoformat(): 2.0 + i for i in range((dt - start).days + 1)}
+
+
+def make_fetcher(temp_db: SQLiteDatabase, source: SlowSource) -> tuple[OnDemandFetcher, AsyncDatabase]:
+    temp_db.populate_symbols("slow", [Symbol(provider="slow", symbol="EURCZK", provider_symbol="EURCZK", type="forex")])
+    temp_db.commit()
+    registry = SourceRegistry()
+    registry.register(source)
+    adb = AsyncDatabase(temp_db)
+    return OnDemandFetcher(registry, adb), adb
+
+
+class TestOnDemandFetcher:
+    def test_concurrent_requests_share_one_upstream_call(self, temp_db: SQLiteDatabase) -> None:
+        source = SlowSource()
+        fetcher, adb = make_fetcher(temp_db, source)
+
+        async def run() -> list[float | None]:
+            return await asyncio.gather(*(fetcher.fetch_rate(date(2024, 1, 15), "EURCZK", "slow") for _ in range(20)))
+
+        try:
+            assert asyncio.run(run()) == [1.25] * 20
+        finally:
+            fetcher.close()
+            adb.close()
+        assert source.calls == 1
+        assert temp_db.get_rate("2024-01-15", "EURCZK", "slow") == 1.25
+
+    def test_upstream_failure_returns_none(self, temp_db: SQLiteDatabase) -> None:
+        fetcher, adb = make_fetcher(temp_db, SlowSource(error=ConnectionError("down")))
+        try:
+            assert asyncio.run(fetcher.fetch_rate(date(2024, 1, 15), "EURCZK", "slow")) is None
+            assert asyncio.run(fetcher.fetch_rate(date(2024, 1, 15), "EURCZK", "unknown")) is None
+        finally:
+            fetcher.close()
+            adb.close()
+
+    def test_window_fetch_stores_every_rate(self, temp_db: SQLiteDatabase) -> None:
+        source = WindowSource()
+        fetcher, adb = make_fetcher(temp_db, source)
+        temp_db.upsert_rate("2024-01-05", "EURCZK", "slow", 1.0)
+        temp_db.commit()
+
+        try:
+            assert asyncio.run(fetcher.fetch_rate(date(2024, 1, 10), "EURCZK", "slow")) == 6.0
+        finally:
+            fetcher.close()
+            adb.close()
+
+        # Window starts right after the newest stored rate before the target
+        assert source.windows == [(date(2024, 1, 6), date(2024, 1, 10))]
+        assert temp_db.get_rate("2024-01-06", "EURCZK", "slow") == 2.0
+        assert temp_db.get_rate("2024-01-05", "EURCZK", "slow") == 1.0
+
+
+class TestAsyncDatabase:
+    def test_calls_run_on_one_db_thread(self, temp_db: SQLiteDatabase) -> None:
+        adb = AsyncDatabase(temp_db)
+
+        async def run() -> set[str]:
+            names = await asyncio.gather(*(adb.run(lambda: threading.current_thread().name) for _ in range(10)))
+            return set(names)
+
+        try:
+            names = asyncio.run(run())
+        finally:
+            adb.close()
+        assert len(names) == 1
+        assert names.pop().startswith("db")
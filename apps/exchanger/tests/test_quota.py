@@ -0,0 +1,161 @@
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+from app.database import SQLiteDatabase
+from app.models import SymbolInfo
+from app.services.backfill import BackfillService
+from app.services.quota import QuotaTracker
+from app.sources.registry import SourceRegistry
+from tests.test_backfill_service import MockSource, _setup_symbols
+
+
+class PinnedDatetime(datetime):
+    """datetime whose now() is settable, for window rollover tests."""
+
+    current = datetime(2024, 6, 21, 12, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current.replace(tzinfo=tz) if tz else cls.current
+
+
+@pytest.fixture
+def pinned_now(monkeypatch: pytest.MonkeyPatch) -> type[PinnedDatetime]:
+    import app.services.quota as quota_mod
+
+    PinnedDatetime.current = datetime(2024, 6, 21, 12, 0)
+    monkeypatch.setattr(quota_mod, "datetime", PinnedDatetime)
+    return PinnedDatetime
+
+
+class TestQuotaTracker:
+    def test_record_counts_all_windows(self, temp_db: SQLiteDatabase, pinned_now) -> None:
+        quota = QuotaTracker(temp_db, "fcs")
+        quota.record()
+        quota.record(2)
+
+        assert quota.usage() == {"minute": 3, "day": 3, "month": 3}
+
+    def test_windows_roll_over(self, temp_db: SQLiteDatabase, pinned_now) -> None:
+        quota = QuotaTracker(temp_db, "fcs")
+        quota.record(5)
+
+        pinned_now.current = datetime(2024, 6, 22, 9, 0)
+        assert quota.usage() == {"minute": 0, "day": 0, "month": 5}
+
+        quota.record()
+        assert quota.usage() == {"minute": 1, "day": 1, "month": 6}
+
+        pinned_now.current = datetime(2024, 7, 1, 0, 0)
+        assert quota.usage() == {"minute": 0, "day": 0, "month": 0}
+
+    def test_usage_persists_across_instances(self, temp_db: SQLiteDatabase, pinned_now) -> None:
+        QuotaTracker(temp_db, "fcs").record(4)
+        assert QuotaTracker(temp_db, "fcs").usage()["month"] == 4
+
+    def test_concurrent_workers_all_count(self, temp_db: SQLiteDatabase, pinned_now) -> None:
+        # One connection per worker, as with several uvicorn workers on one file
+        workers = [SQLiteDatabase(temp_db._db_path) for _ in range(4)]
+        threads = [
+            threading.Thread(target=lambda db=db: [QuotaTracker(db, "fcs").record() for _ in range(50)])
+            for db in workers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for db in workers:
+            db.close()
+
+        assert QuotaTracker(temp_db, "fcs").usage() == {"minute": 200, "day": 200, "month": 200}
+
+    def test_counts_move_from_metadata(self, temp_db: SQLiteDatabase, pinned_now) -> None:
+        usage = {"minute": "2024-06-21T12:00", "minute_count": 2, "day": "2024-06-21", "day_count": 7, "month": "2024-06", "month_count": 30}
+        conn = temp_db._conn
+        conn.execute("DROP TABLE api_usage")
+        conn.execute("INSERT INTO metadata (key, value) VALUES ('api_usage:fcs', ?)", (json.dumps(usage),))
+        conn.execute("UPDATE schema_version SET version = 10")
+        conn.commit()
+
+        db = SQLiteDatabase(temp_db._db_path)
+        try:
+            assert QuotaTracker(db, "fcs").usage() == {"minute": 2, "day": 7, "month": 30}
+            assert db._conn.execute("SELECT COUNT(*) FROM metadata WHERE key LIKE 'api_usage:%'").fetchone() == (0,)
+        finally:
+            db.close()
+
+    def test_unlimited_without_budget(self, temp_db: SQLiteDatabase, pinned_now) -> None:
+        quota = QuotaTracker(temp_db, "fcs")
+        assert quota.remaining() is None
+        assert quota.run_allowance() is None
+
+    def test_allowance_spreads_remaining_budget(self, temp_db: SQLiteDatabase, pinned_now) -> None:
+        # June 21 → 10 days left including today, 2 runs per day
+        quota = QuotaTracker(temp_db, "fcs", monthly_budget=500, runs_per_day=2)
+        quota.record(100)
+
+        assert quota.remaining() == 400
+        assert quota.run_allowance() == 20
+
+
+class TestBudgetedBackfill:
+    def _service(self, db: SQLiteDatabase, budget: int, favorites: tuple[str, ...] = ()) -> BackfillService:
+        symbols = ["AAA", "BBB", "CCC", "DDD"]
+        _setup_symbols(db, "fcs", [("forex", sym) for sym in symbols])
+        for sym in favorites:
+            db.add_favorite("fcs", sym)
+        db.commit()
+        source = MockSource(
+            "fcs",
+            [SymbolInfo(symbol=sym, provider_symbol=sym, type="forex") for sym in symbols],
+            {sym: {"2024-06-20": 1.0} for sym in symbols},
+        )
+        registry = SourceRegistry()
+        registry.register(source)
+        quota = QuotaTracker(db, "fcs", monthly_budget=budget)
+        return BackfillService(db=db, registry=registry, quotas={"fcs": quota})
+
+    def test_defers_symbols_over_allowance(self, temp_db: SQLiteDatabase, pinned_now) -> None:
+        # 20 credits over 10 days → 2 symbols per run (MockSource: 1 unit per symbol)
+        service = self._service(temp_db, budget=20)
+
+        results, failures = service.backfill("fcs", [], length=5)
+
+        assert sorted(results) == ["fcs:AAA", "fcs:BBB"]
+        assert failures == []
+        assert temp_db.get_backfill_backlog("fcs") == [
+            {"symbol": "CCC", "length": 5},
+            {"symbol": "DDD", "length": 5},
+        ]
+
+    def test_priority_symbols_run_first(self, temp_db: SQLiteDatabase, pinned_now) -> None:
+        service = self._service(temp_db, budget=10, favorites=("DDD",))
+
+        results, _ = service.backfill("fcs", [], length=5)
+
+        assert list(results) == ["fcs:DDD"]
+        assert [entry["symbol"] for entry in temp_db.get_backfill_backlog("fcs")] == ["AAA", "BBB", "CCC"]
+
+    def test_backlog_drains_on_later_runs(self, temp_db: SQLiteDatabase, pinned_now) -> None:
+        service = self._service(temp_db, budget=20)
+        service.backfill("fcs", [], length=5)
+
+        pinned_now.current = datetime(2024, 6, 22, 12, 0)
+        results, _ = service.backfill("fcs", [], length=5, backlog_only=True)
+
+        assert sorted(results) == ["fcs:CCC", "fcs:DDD"]
+        assert temp_db.get_backfill_backlog("fcs") == []
+        assert not service.has_backlog("fcs")
+
+    def test_backlog_ignored_once_budget_unset(self, temp_db: SQLiteDatabase, pinned_now) -> None:
+        self._service(temp_db, budget=20).backfill("fcs", [], length=5)
+        assert temp_db.get_backfill_backlog("fcs")
+
+        unbudgeted = self._service(temp_db, budget=0)
+
+        # Nothing would drain it, so the scheduler must not queue backlog runs
+        assert not unbudgeted.has_backlog("fcs")
+        assert unbudgeted.backfill("fcs", [], length=5, backlog_only=True) == ({}, [])
@@ -0,0 +1,55 @@
+import gzip
+
+from app.utils.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    def test_builds_once_per_version(self) -> None:
+        calls: list[int] = []
+        cache = ResponseCache("symbols")
+
+        def build() -> list[dict]:
+            calls.append(1)
+            return [{"symbol": "EURUSD"}]
+
+        first = cache.get(("list",), 1, build)
+        again = cache.get(("list",), 1, build)
+        bumped = cache.get(("list",), 2, build)
+
+        assert len(calls) == 2
+        assert first is again
+        assert first.body == b'[{"symbol":"EURUSD"}]'
+        assert bumped.etag != first.etag
+
+    def test_peek_never_builds(self) -> None:
+        cache = ResponseCache("symbols")
+
+        assert cache.peek(("list",), 1) is None
+        built = cache.get(("list",), 1, lambda: [])
+
+        assert cache.peek(("list",), 1) is built
+        assert cache.peek(("list",), 2) is None
+
+    def test_evicts_least_recently_used(self) -> None:
+        calls: list[str] = []
+        cache = ResponseCache("symbols", max_entries=2)
+
+        def build_for(key: str):
+            return lambda: calls.append(key) or []
+
+        cache.get("a", 1, build_for("a"))
+        cache.get("b", 1, build_for("b"))
+        cache.get("a", 1, build_for("a"))
+        cache.get("c", 1, build_for("c"))  # evicts b
+        cache.get("b", 1, build_for("b"))
+
+        assert calls == ["a", "b", "c", "b"]
+
+    def test_gzip_only_above_threshold(self) -> None:
+        cache = ResponseCache("symbols")
+
+        small = cache.get("small", 1, lambda: [])
+        large = cache.get("large", 1, lambda: [{"name": f"Coin {i}"} for i in range(100)])
+
+        assert small.gzipped is None
+        assert gzip.decompress(large.gzipped) == large.body
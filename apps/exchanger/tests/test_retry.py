@@ -71,3 +71,10 @@ class TestFetchWithRetry:
         api = MockApi([None])
         result = fetch_with_retry(api, "forex/history", {})
         assert result is None
+
+    def test_on_request_counts_only_served_requests(self):
+        api = MockApi([{"code": 213}, {"code": 200}])
+        calls: list[int] = []
+        fetch_with_retry(api, "forex/history", {}, rate_limit_wait=0, on_request=lambda: calls.append(1))
+        assert api.call_count == 2
+        assert calls == [1]
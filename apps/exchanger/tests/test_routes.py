@@ -1,7 +1,7 @@
 import os
 import tempfile
 import time
-from datetime import date
+from datetime import date, datetime, timezone
 from typing import Callable, Generator
 
 import pytest
@@ -60,6 +60,18 @@ class TestHealthEndpoint:
         assert response.json() == {"status": "ok"}
 
 
+class TestMetricsEndpoint:
+    def test_metrics_exposed(self, client: TestClient) -> None:
+        client.get("/api/symbols/list")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'exchanger_cache_requests_total{cache="symbols",result="miss"}' in response.text
+        assert "exchanger_db_query_seconds_bucket" in response.text
+
+
 class TestProvidersEndpoint:
     def test_list_providers(self, client: TestClient) -> None:
         response = client.get("/api/providers")
@@ -86,6 +98,15 @@ class TestProvidersStatusEndpoint:
         assert status_by_name["cnb"]["symbol_count"] == 0
         assert status_by_name["cnb"]["healthy"] is False
 
+    def test_providers_status_reports_quota(self, client: TestClient) -> None:
+        response = client.get("/api/providers/status")
+        status_by_name = {item["name"]: item for item in response.json()}
+        assert status_by_name["cnb"]["quota"] is None
+        quota = status_by_name["fcs"]["quota"]
+        assert quota["monthly_budget"] is None
+        assert quota["remaining"] is None
+        assert quota["deferred_symbols"] == 0
+
 
 class TestRatesEndpoint:
     def test_get_rate_not_found(self, client: TestClient) -> None:
@@ -126,6 +147,24 @@ class TestRatesListEndpoint:
         ]
 
 
+    def test_rates_list_etag_scoped_to_provider(self, client: TestClient, test_settings: Settings) -> None:
+        db = SQLiteDatabase(test_settings.db_path)
+        db.populate_symbols("fcs", [Symbol(provider="fcs", symbol="EURUSD", provider_symbol="EURUSD", type="forex", name="Euro")])
+        db.populate_symbols("cnb", [Symbol(provider="cnb", symbol="EURCZK", provider_symbol="EURCZK", type="forex", name="Euro")])
+        db.commit()
+        fcs_etag = client.get("/api/rates/list", params={"date": "2024-01-15", "provider": "fcs"}).headers["etag"]
+        all_etag = client.get("/api/rates/list", params={"date": "2024-01-15", "provider": "all"}).headers["etag"]
+
+        db.upsert_rate("2024-01-15", "EURCZK", "cnb", 25.0)
+        db.commit()
+        db.close()
+
+        fcs = client.get("/api/rates/list", params={"date": "2024-01-15", "provider": "fcs"}, headers={"If-None-Match": fcs_etag})
+        everything = client.get("/api/rates/list", params={"date": "2024-01-15", "provider": "all"}, headers={"If-None-Match": all_etag})
+        assert fcs.status_code == 304
+        assert everything.status_code == 200
+
+
 class TestBackfillEndpoint:
     def test_backfill_starts(self, client: TestClient) -> None:
         response = client.post("/api/backfill", params={"provider": "fcs", "length": 5})
@@ -172,6 +211,11 @@ class TestTaskStatusEndpoint:
         assert response.status_code == 200
         assert isinstance(response.json(), dict)
 
+    def test_cancel_task_not_running(self, client: TestClient) -> None:
+        response = client.post("/api/cancel_task", params={"task": "backfill:nope"})
+        assert response.status_code == 200
+        assert response.json()["cancelled"] is False
+
 
 class TestSymbolListEndpoints:
     def test_forex_list_empty(self, client: TestClient) -> None:
@@ -225,6 +269,52 @@ class TestSymbolListEndpoints:
         assert len(data) == 1
         assert data[0]["provider"] == "cnb"
 
+    def test_symbols_list_etag_not_modified(self, client: TestClient, test_settings: Settings) -> None:
+        db = SQLiteDatabase(test_settings.db_path)
+        db.populate_symbols("fcs", [Symbol(provider="fcs", symbol="EURUSD", provider_symbol="EURUSD", type="forex", name="Euro")])
+        db.commit()
+        db.close()
+
+        first = client.get("/api/symbols/list")
+        etag = first.headers["etag"]
+        second = client.get("/api/symbols/list", headers={"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        # Different query variant, different ETag
+        assert client.get("/api/symbols/list", params={"q": "EUR"}).headers["etag"] != etag
+
+    def test_symbols_list_invalidated_by_populate(self, client: TestClient, test_settings: Settings) -> None:
+        db = SQLiteDatabase(test_settings.db_path)
+        db.populate_symbols("fcs", [Symbol(provider="fcs", symbol="EURUSD", provider_symbol="EURUSD", type="forex", name="Euro")])
+        db.commit()
+        first = client.get("/api/forex/list")
+
+        db.populate_symbols("fcs", [
+            Symbol(provider="fcs", symbol="EURUSD", provider_symbol="EURUSD", type="forex", name="Euro"),
+            Symbol(provider="fcs", symbol="GBPUSD", provider_symbol="GBPUSD", type="forex", name="Pound"),
+        ])
+        db.commit()
+        db.close()
+        second = client.get("/api/forex/list", headers={"If-None-Match": first.headers["etag"]})
+
+        assert second.status_code == 200
+        assert len(second.json()) == 2
+
+    def test_symbols_list_gzip(self, client: TestClient, test_settings: Settings) -> None:
+        db = SQLiteDatabase(test_settings.db_path)
+        db.populate_symbols("fcs", [
+            Symbol(provider="fcs", symbol=f"SYM{i}", provider_symbol=f"SYM{i}", type="crypto", name=f"Coin {i}")
+            for i in range(50)
+        ])
+        db.commit()
+        db.close()
+
+        response = client.get("/api/crypto/list", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()) == 50
+
 
 class TestBackupRestoreEndpoints:
     def test_backup_creates_file(self, client: TestClient, test_settings: Settings) -> None:
@@ -369,6 +459,24 @@ class TestRatesHistoryEndpoint:
         assert response.status_code == 400
 
 
+    def test_rates_history_not_modified_until_write(self, client: TestClient, test_settings: Settings) -> None:
+        db = SQLiteDatabase(test_settings.db_path)
+        db.populate_symbols("fcs", [Symbol(provider="fcs", symbol="EURUSD", provider_symbol="EURUSD", type="forex", name="Euro")])
+        db.upsert_rate("2024-01-02", "EURUSD", "fcs", 1.0850)
+        db.commit()
+        params = {"symbol": "EURUSD", "from_date": "2024-01-01", "to_date": "2024-01-05", "provider": "fcs", "provider_symbol": "EURUSD"}
+
+        etag = client.get("/api/rates/history", params=params).headers["etag"]
+        assert client.get("/api/rates/history", params=params, headers={"If-None-Match": etag}).status_code == 304
+
+        db.upsert_rate("2024-01-03", "EURUSD", "fcs", 1.0860)
+        db.commit()
+        db.close()
+        response = client.get("/api/rates/history", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+
 class TestRatesCoverageEndpoint:
     def test_coverage_empty(self, client: TestClient) -> None:
         response = client.get("/api/rates/coverage", params={"year": 2024})
@@ -464,3 +572,152 @@ class TestFavoritesEndpoints:
         favorites = response.json()
         matches = [f for f in favorites if f["provider"] == "cnb" and f["provider_symbol"] == "JPYUSD"]
         assert len(matches) == 1
+
+
+class TestRatesExportEndpoint:
+    def _seed(self, test_settings: Settings) -> None:
+        db = SQLiteDatabase(test_settings.db_path)
+        db.populate_symbols("fcs", [Symbol(provider="fcs", symbol="EURUSD", provider_symbol="EURUSD", type="forex", name="Euro")])
+        db.populate_symbols("cnb", [Symbol(provider="cnb", symbol="EURCZK", provider_symbol="EURCZK", type="forex", name="Euro CZK")])
+        db.upsert_rate("2024-01-15", "EURUSD", "fcs", 1.085)
+        db.upsert_rate("2024-01-15", "EURCZK", "cnb", 25.5)
+        db.upsert_rate("2024-01-16", "EURCZK", "cnb", 25.6)
+        db.commit()
+        db.close()
+
+    def test_export_csv(self, client: TestClient, test_settings: Settings) -> None:
+        self._seed(test_settings)
+        response = client.get("/api/rates/export", params={"providers": "cnb", "from_date": "2024-01-16"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.text.splitlines() == [
+            "date,provider,symbol,provider_symbol,rate",
+            "2024-01-16,cnb,EURCZK,EURCZK,25.6",
+        ]
+
+    def test_export_arrow(self, client: TestClient, test_settings: Settings) -> None:
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.ipc
+
+        self._seed(test_settings)
+        response = client.get("/api/rates/export", params={"format": "arrow"})
+        assert response.status_code == 200
+        table = pyarrow.ipc.open_stream(response.content).read_all()
+        assert table.schema.field("date").type == pa.date32()
+        assert table.schema.field("rate").type == pa.float64()
+        assert pa.types.is_dictionary(table.schema.field("symbol").type)
+        assert table.column("symbol").to_pylist() == ["EURUSD", "EURCZK", "EURCZK"]
+        assert table.column("rate").to_pylist() == [1.085, 25.5, 25.6]
+
+    def test_export_rejects_bad_filters(self, client: TestClient) -> None:
+        assert client.get("/api/rates/export", params={"providers": "nope"}).status_code == 400
+        assert client.get("/api/rates/export", params={"from_date": "2024-02-01", "to_date": "2024-01-01"}).status_code == 400
+        assert client.get("/api/rates/export", params={"format": "xml"}).status_code == 422
+
+
+class TestIngestEndpoint:
+    def test_ingest_cnb_year_table(self, client: TestClient, test_settings: Settings) -> None:
+        db = SQLiteDatabase(test_settings.db_path)
+        db.populate_symbols("cnb", [Symbol(provider="cnb", symbol="EURCZK", provider_symbol="EURCZK", type="forex", name="Euro CZK")])
+        db.commit()
+        db.close()
+        body = "Datum|1 EUR|100 JPY\n02.01.2024|24,725|15,836\n03.01.2024|24,640|15,790\n"
+
+        response = client.post("/api/ingest", params={"provider": "cnb"}, content=body)
+
+        assert response.status_code == 200
+        assert response.json() == {"provider": "cnb", "rates": 2, "symbols": 1, "skipped": 2}
+        assert client.get("/api/rates/coverage", params={"year": 2024, "provider": "cnb"}).json() == {
+            "2024-01-02": 1,
+            "2024-01-03": 1,
+        }
+
+    def test_ingest_csv(self, client: TestClient, test_settings: Settings) -> None:
+        db = SQLiteDatabase(test_settings.db_path)
+        db.populate_symbols("cnb", [Symbol(provider="cnb", symbol="JPYCZK", provider_symbol="JPYCZK", type="forex", name="Yen")])
+        db.commit()
+        db.close()
+        body = "date,symbol,amount,rate\n2024-01-02,JPYCZK,100,15.836\n"
+
+        response = client.post("/api/ingest", params={"provider": "cnb"}, content=body)
+
+        assert response.json()["rates"] == 1
+        assert client.get("/api/rates", params={"date": "2024-01-02", "symbol": "JPYCZK", "provider": "cnb"}).json()["rate"] == pytest.approx(0.15836)
+
+    def test_ingest_rejects_unknown_format(self, client: TestClient) -> None:
+        response = client.post("/api/ingest", params={"provider": "cnb"}, content="hello\nworld\n")
+        assert response.status_code == 400
+
+    def test_ingest_rejects_short_row(self, client: TestClient) -> None:
+        body = "date,symbol,rate,provider\n2024-01-02,JPYCZK\n"
+
+        response = client.post("/api/ingest", params={"provider": "cnb"}, content=body)
+
+        assert response.status_code == 400
+        assert "line 2" in response.json()["detail"]
+
+    def test_ingest_rejects_oversized_file(self, client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("app.routes.INGEST_MAX_BYTES", 16)
+
+        response = client.post("/api/ingest", params={"provider": "cnb"}, content="date,symbol,rate\n" * 4)
+
+        assert response.status_code == 413
+
+    def test_ingest_writes_in_chunks(self, client: TestClient, test_settings: Settings, monkeypatch: pytest.MonkeyPatch) -> None:
+        from app.services.backfill import BackfillService
+
+        calls: list[int] = []
+        ingest_history = BackfillService.ingest_history
+
+        def counting(self, provider, history, *args, **kwargs):
+            calls.append(sum(len(rates) for rates in history.values()))
+            return ingest_history(self, provider, history, *args, **kwargs)
+
+        monkeypatch.setattr(BackfillService, "ingest_history", counting)
+        monkeypatch.setattr("app.routes.INGEST_CHUNK_RATES", 2)
+        db = SQLiteDatabase(test_settings.db_path)
+        db.populate_symbols("cnb", [Symbol(provider="cnb", symbol="JPYCZK", provider_symbol="JPYCZK", type="forex", name="Yen")])
+        db.commit()
+        db.close()
+        body = "date,symbol,rate\n2024-01-02,JPYCZK,0.15\n2024-01-03,JPYCZK,0.16\n2024-01-04,JPYCZK,0.17\n"
+
+        response = client.post("/api/ingest", params={"provider": "cnb"}, content=body)
+
+        assert response.json() == {"provider": "cnb", "rates": 3, "symbols": 1, "skipped": 0}
+        assert calls == [2, 1]
+
+
+class TestRateRevisionsEndpoints:
+    def test_as_of_needs_revision_log(self, client: TestClient) -> None:
+        response = client.get("/api/rates", params={"date": "2024-01-15", "symbol": "EURCZK", "provider": "cnb", "as_of": "2024-01-16T00:00:00"})
+        assert response.status_code == 400
+
+    def test_as_of_reads(self, test_settings: Settings, monkeypatch: pytest.MonkeyPatch) -> None:
+        from dataclasses import replace
+
+        from tests.test_database import Clock
+
+        monkeypatch.setattr("app.sources.fcs.FcsApi", MockFcsApi)
+        settings = replace(test_settings, rate_revisions=True)
+        with TestClient(create_app(settings), raise_server_exceptions=False) as client:
+            monkeypatch.setattr("app.database.datetime", Clock)
+            db = SQLiteDatabase(settings.db_path, rate_revisions=True)
+            db.populate_symbols("cnb", [Symbol(provider="cnb", symbol="EURCZK", provider_symbol="EURCZK", type="forex", name="Euro CZK")])
+            Clock.current = datetime(2024, 1, 15, 15, 0, tzinfo=timezone.utc)
+            db.upsert_rate("2024-01-15", "EURCZK", "cnb", 25.1)
+            db.commit()
+            Clock.current = datetime(2024, 1, 16, 9, 0, tzinfo=timezone.utc)
+            db.upsert_rate("2024-01-15", "EURCZK", "cnb", 25.2)
+            db.commit()
+            db.close()
+
+            params = {"date": "2024-01-15", "symbol": "EURCZK", "provider": "cnb"}
+            assert client.get("/api/rates", params={**params, "as_of": "2000-01-01T00:00:00"}).json()["rate"] is None
+            assert client.get("/api/rates", params={**params, "as_of": "2024-01-15T18:00:00"}).json()["rate"] == 25.1
+            assert client.get("/api/rates", params={**params, "as_of": "2100-01-01T00:00:00"}).json()["rate"] == 25.2
+            revisions = client.get("/api/rates/revisions", params=params).json()
+            assert [r["rate"] for r in revisions] == [None, 25.1]
+            history = client.get("/api/rates/history", params={
+                "symbol": "EURCZK", "provider": "cnb", "from_date": "2024-01-15", "to_date": "2024-01-15", "as_of": "2024-01-15T18:00:00",
+            }).json()
+            assert history == [{"date": "2024-01-15", "rate": 25.1}]
@@ -7,6 +7,7 @@ from app.database import SQLiteDatabase
 from app.models import SymbolInfo
 from app.services.symbols import SymbolsService
 from app.sources.registry import SourceRegistry
+from app.utils.retry import _shutdown_event
 
 
 class MockSource:
@@ -46,6 +47,25 @@ class MockSource:
         return None
 
 
+class PagedSource(MockSource):
+    """Source that lists symbols page by page and keeps a symbol cache, like FCS."""
+
+    def __init__(self, source_id: str, pages: list[list[SymbolInfo]], fail_after: int | None = None):
+        super().__init__(source_id, [s for page in pages for s in page])
+        self._pages = pages
+        self._fail_after = fail_after
+        self.cache: list[SymbolInfo] | None = None
+
+    def list_symbol_pages(self, on_progress: Callable[[str], None] | None = None):
+        for n, page in enumerate(self._pages):
+            if n == self._fail_after:
+                raise RuntimeError("listing failed")
+            yield page
+
+    def set_symbol_cache(self, symbols: list[SymbolInfo]) -> None:
+        self.cache = symbols
+
+
 class TestSymbolsService:
     def test_populate_single_provider(self, temp_db: SQLiteDatabase) -> None:
         source = MockSource("fcs", [
@@ -149,3 +169,47 @@ class TestSymbolsService:
 
         assert results["fcs"] == 0
         assert temp_db.list_symbols(provider="fcs") == []
+
+    def test_populate_streams_pages_and_fills_source_cache(self, temp_db: SQLiteDatabase) -> None:
+        pages = [
+            [SymbolInfo(symbol="EURUSD", provider_symbol="EURUSD", type="forex", name="Euro")],
+            [SymbolInfo(symbol="BTCUSD", provider_symbol="BTCUSD", type="crypto", name="Bitcoin")],
+        ]
+        source = PagedSource("fcs", pages)
+        registry = SourceRegistry()
+        registry.register(source)
+
+        results = SymbolsService(db=temp_db, registry=registry).populate("fcs")
+
+        assert results["fcs"] == 2
+        assert sorted(s.symbol for s in temp_db.list_symbols(provider="fcs")) == ["BTCUSD", "EURUSD"]
+        # The listed objects go to the cache as they are, without copies
+        assert source.cache is not None
+        assert [id(s) for s in source.cache] == [id(pages[0][0]), id(pages[1][0])]
+
+    def test_failed_listing_keeps_existing_symbols(self, temp_db: SQLiteDatabase) -> None:
+        registry = SourceRegistry()
+        registry.register(MockSource("fcs", [SymbolInfo(symbol="EURUSD", provider_symbol="EURUSD", type="forex")]))
+        service = SymbolsService(db=temp_db, registry=registry)
+        service.populate("fcs")
+
+        registry._sources["fcs"] = PagedSource(
+            "fcs", [[SymbolInfo(symbol="GBPUSD", provider_symbol="GBPUSD", type="forex")], []], fail_after=1
+        )
+        with pytest.raises(RuntimeError):
+            service.populate("fcs")
+
+        assert [s.symbol for s in temp_db.list_symbols(provider="fcs")] == ["EURUSD"]
+
+    def test_cancelled_listing_keeps_existing_symbols(self, temp_db: SQLiteDatabase) -> None:
+        registry = SourceRegistry()
+        registry.register(MockSource("fcs", [SymbolInfo(symbol="EURUSD", provider_symbol="EURUSD", type="forex")]))
+        service = SymbolsService(db=temp_db, registry=registry)
+        service.populate("fcs")
+
+        registry._sources["fcs"] = MockSource("fcs", [SymbolInfo(symbol="GBPUSD", provider_symbol="GBPUSD", type="forex")])
+        _shutdown_event.set()
+        results = service.populate("fcs")
+
+        assert results["fcs"] == 0
+        assert [s.symbol for s in temp_db.list_symbols(provider="fcs")] == ["EURUSD"]
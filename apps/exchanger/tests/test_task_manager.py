@@ -1,4 +1,8 @@
+import threading
+import time
+
 from app.task_manager import TaskManager
+from app.utils.retry import is_cancelled
 
 
 class TestTaskManager:
@@ -75,3 +79,131 @@ class TestTaskManager:
 
         all_status["task1"]["status"] = "modified"
         assert tm.get_status("task1")["status"] == "running"
+
+
+def blocking_task(started: list[str], name: str, release: threading.Event):
+    def run() -> None:
+        started.append(name)
+        release.wait(timeout=5)
+    return run
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+class TestLanes:
+    def test_bulk_leaves_a_worker_for_interactive(self) -> None:
+        tm = TaskManager(max_workers=2)
+        release = threading.Event()
+        started: list[str] = []
+        try:
+            assert tm.start_if_idle("backfill:fcs", blocking_task(started, "fcs", release), lane="bulk")
+            assert tm.start_if_idle("backfill:cnb", blocking_task(started, "cnb", release), lane="bulk")
+            assert tm.start_if_idle("populate_symbols:fcs", blocking_task(started, "populate", release))
+
+            wait_for(lambda: len(started) == 2)
+            assert sorted(started) == ["fcs", "populate"]
+            queued = tm.get_status("backfill:cnb")
+            assert queued["status"] == "queued"
+            assert queued["lane"] == "bulk"
+            assert queued["queue_position"] == 1
+            # Queued counts as busy: not accepted twice
+            assert not tm.start_if_idle("backfill:cnb", lambda: None, lane="bulk")
+        finally:
+            release.set()
+        wait_for(lambda: len(started) == 3)
+
+    def test_interactive_jumps_the_bulk_queue(self) -> None:
+        tm = TaskManager(max_workers=1, interactive_reserve=0)
+        release = threading.Event()
+        started: list[str] = []
+        tm.start_if_idle("backfill:fcs", blocking_task(started, "first", release), lane="bulk")
+        tm.start_if_idle("backfill:cnb", blocking_task(started, "bulk", release), lane="bulk")
+        tm.start_if_idle("populate_symbols:fcs", blocking_task(started, "interactive", release))
+
+        assert tm.get_status("populate_symbols:fcs")["queue_position"] == 1
+        assert tm.get_status("backfill:cnb")["queue_position"] == 2
+        release.set()
+        wait_for(lambda: len(started) == 3)
+        assert started == ["first", "interactive", "bulk"]
+
+    def test_provider_limit(self) -> None:
+        tm = TaskManager(max_workers=4, provider_limits={"fcs": 1})
+        release = threading.Event()
+        started: list[str] = []
+        try:
+            tm.start_if_idle("backfill:fcs", blocking_task(started, "backfill", release), lane="bulk")
+            tm.start_if_idle("populate_symbols:fcs", blocking_task(started, "populate", release))
+            tm.start_if_idle("populate_symbols:cnb", blocking_task(started, "cnb", release))
+
+            wait_for(lambda: len(started) == 2)
+            assert sorted(started) == ["backfill", "cnb"]
+            assert tm.get_status("populate_symbols:fcs")["status"] == "queued"
+        finally:
+            release.set()
+        wait_for(lambda: len(started) == 3)
+
+
+class TestCancel:
+    def test_cancel_queued_task(self) -> None:
+        tm = TaskManager(max_workers=1, interactive_reserve=0)
+        release = threading.Event()
+        ran: list[str] = []
+        tm.start_if_idle("backfill:fcs", blocking_task(ran, "first", release), lane="bulk")
+        tm.start_if_idle("backfill:cnb", blocking_task(ran, "second", release), lane="bulk")
+
+        assert tm.cancel("backfill:cnb")
+
+        assert tm.get_status("backfill:cnb")["status"] == "cancelled"
+        release.set()
+        tm._futures["backfill:fcs"].result(timeout=5)
+        assert ran == ["first"]
+
+    def test_cancel_running_task_cooperatively(self) -> None:
+        tm = TaskManager()
+        started = threading.Event()
+        loops: list[int] = []
+
+        def run() -> None:
+            started.set()
+            while not is_cancelled():
+                loops.append(1)
+                time.sleep(0.01)
+
+        tm.start_if_idle("backfill:fcs", run, lane="bulk")
+        assert started.wait(timeout=5)
+
+        assert tm.cancel("backfill:fcs")
+        tm._futures["backfill:fcs"].result(timeout=5)
+
+        assert tm.get_status("backfill:fcs")["status"] == "cancelled"
+        # Only that task's thread sees the cancellation
+        assert not is_cancelled()
+
+    def test_raise_if_cancelled_ends_task(self) -> None:
+        tm = TaskManager()
+        started = threading.Event()
+
+        def run() -> None:
+            started.set()
+            while True:
+                tm.raise_if_cancelled("populate_symbols:fcs")
+                time.sleep(0.01)
+
+        tm.start_if_idle("populate_symbols:fcs", run)
+        assert started.wait(timeout=5)
+        tm.cancel("populate_symbols:fcs")
+        tm._futures["populate_symbols:fcs"].result(timeout=5)
+
+        assert tm.get_status("populate_symbols:fcs")["status"] == "cancelled"
+
+    def test_cancel_unknown_task(self) -> None:
+        tm = TaskManager()
+        tm.set_status("backfill:fcs", {"status": "done"})
+
+        assert not tm.cancel("backfill:fcs")
+        assert not tm.cancel("missing")